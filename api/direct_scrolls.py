@@ -0,0 +1,98 @@
+"""
+Arkadia — Direct Scroll Store
+=============================
+Scrolls added through POST /api/scrolls and /api/codex/upload live in the
+runtime DB (kernel/storage/direct_scroll_store.py), one row each. This module
+keeps the list in memory so _get_scrolls() merges them without touching disk:
+
+    scrolls()            — the cached list, newest first (loaded once)
+    add(scroll)          — insert one row, drop the cached list
+    remove(scroll_id)    — delete one row, drop the cached list
+    invalidate()         — drop the cached list (tests, manual DB edits)
+
+A legacy direct_scrolls.json is imported on first open when the table is
+empty, then renamed to direct_scrolls.json.imported so later deletes stick.
+The old store always wrote the CWD-relative data/direct_scrolls.json, so that
+path is checked as well as $SOLSPIRE_DATA_DIR/direct_scrolls.json.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from typing import Optional
+
+from kernel.storage.direct_scroll_store import DirectScrollStore
+
+logger = logging.getLogger("arkadia.direct_scrolls")
+
+_DATA_DIR = os.environ.get("SOLSPIRE_DATA_DIR", "data")
+LEGACY_PATHS = tuple(dict.fromkeys((
+    os.path.join("data", "direct_scrolls.json"),
+    os.path.join(_DATA_DIR, "direct_scrolls.json"),
+)))
+
+_lock = threading.Lock()
+_store: Optional[DirectScrollStore] = None
+_view: Optional[tuple[dict, ...]] = None
+_generation = 0                     # bumped by every mutation; a load racing one is not kept
+
+
+def _get_store() -> DirectScrollStore:
+    """Process-wide store; the first open imports any legacy JSON document."""
+    global _store
+    if _store is None:
+        with _lock:
+            if _store is None:
+                store = DirectScrollStore()
+                legacy = [p for p in LEGACY_PATHS if os.path.exists(p)]
+                if legacy and store.count() == 0:
+                    for path in legacy:
+                        imported = store.import_json(path)
+                        logger.info(f"[DIRECT-SCROLL] Imported {imported} scrolls from {path}")
+                        try:
+                            os.replace(path, path + ".imported")
+                        except OSError as e:
+                            # Read-only or cross-device: keep the store; the
+                            # import is idempotent (INSERT OR IGNORE).
+                            logger.warning(f"[DIRECT-SCROLL] Could not rename {path}: {e}")
+                _store = store
+    return _store
+
+
+def scrolls() -> list[dict]:
+    """All direct scrolls, newest first. Reads the DB only after a mutation."""
+    global _view
+    view = _view
+    if view is None:
+        generation = _generation
+        try:
+            view = tuple(_get_store().all())
+        except Exception as e:
+            logger.warning(f"direct scrolls load error: {e}")
+            return []
+        with _lock:
+            if generation == _generation:
+                _view = view
+    return list(view)
+
+
+def add(scroll: dict) -> None:
+    _get_store().add(scroll)
+    invalidate()
+
+
+def remove(scroll_id: str) -> bool:
+    removed = _get_store().remove(scroll_id)
+    invalidate()
+    return removed
+
+
+def invalidate() -> None:
+    global _view, _generation
+    with _lock:
+        _generation += 1
+        _view = None
+
+
+__all__ = ["add", "invalidate", "remove", "scrolls"]
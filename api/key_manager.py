@@ -59,6 +59,11 @@ def _save(store: dict[str, Any]) -> None:
     _KEYS_PATH.parent.mkdir(parents=True, exist_ok=True)
     with open(_KEYS_PATH, "w", encoding="utf-8") as f:
         json.dump(store, f, indent=2)
+    try:
+        from api.key_pool import invalidate
+        invalidate()
+    except Exception:
+        pass
 
 
 def _mask(key: str) -> str:
@@ -19,9 +19,20 @@ This module is the single source of truth for "which key should a Gemini
 caller use right now". Both `api/main.py::_gemini_chat` and
 `solspire/provider_manager.py` should route through `acquire_key()` /
 `report_failure()` so load is distributed, not duplicated.
+
+The key set lives in memory. The stores call `invalidate()` when they save,
+and out-of-process edits are picked up by comparing the store files'
+mtime/size (plus the env fallbacks) at most every RECHECK_S seconds — so an
+acquisition is a short critical section with no file I/O.
+
+Selection is smooth weighted round-robin (the nginx scheme): every key starts
+at weight BASE_WEIGHT, each quota error (report_failure(..., quota=True))
+within PENALTY_WINDOW halves it (floor 1), and keys in cooldown are skipped.
+A transient 5xx or timeout cools the key but leaves its weight alone. Equal weights reduce to plain round-robin.
 """
 from __future__ import annotations
 
+import importlib
 import logging
 import os
 import threading
@@ -36,16 +47,30 @@ logger = logging.getLogger("arkadia.key_pool")
 # enough that parallel callers naturally migrate to a fresh key mid-burst.
 DEFAULT_COOLDOWN = float(os.environ.get("ARKADIA_KEY_COOLDOWN", "45"))
 
+# How often the key stores are stat()ed for out-of-process edits (seconds).
+RECHECK_S = float(os.environ.get("ARKADIA_KEY_POOL_RECHECK_S", "2"))
+
+# Weighted round-robin: a clean key's weight, and how long a 429 keeps
+# halving it.
+BASE_WEIGHT = 8
+PENALTY_WINDOW = float(os.environ.get("ARKADIA_KEY_PENALTY_WINDOW", "600"))
+
 _lock = threading.Lock()
 
 # key -> expiry epoch (0 = available). Survives across calls within the
 # process so concurrent threads cooperate without a coordinator service.
 _cooldowns: dict[str, float] = {}
 
-# Round-robin cursor per "pool" so distribute weights fairly. The cursor is a
-# deque of keys ordered by preference; we rotate so the least-recently-used
-# available key is served next.
-_cursor: deque[str] = deque()
+# key -> epochs of recent 429s (weight penalty), and the smooth-WRR running
+# score per key.
+_recent_failures: dict[str, deque[float]] = {}
+_current: dict[str, int] = {}
+
+# In-memory key set and the store signature it was built from.
+_keys: list[str] = []
+_signature: Optional[tuple] = None
+_checked_at = 0.0
+_dirty = True           # set by invalidate(); forces the next reload
 
 
 def _collect_keys() -> list[str]:
@@ -90,6 +115,61 @@ def _collect_keys() -> list[str]:
     return keys
 
 
+def _store_paths() -> list:
+    paths = []
+    for mod, attr in (("api.provider_key_store", "_PATH"), ("api.key_manager", "_KEYS_PATH")):
+        try:
+            paths.append(getattr(importlib.import_module(mod), attr))
+        except Exception:
+            pass
+    return paths
+
+
+def _store_signature() -> tuple:
+    sig: list = [os.environ.get("GEMINI_API_KEY"), os.environ.get("GOOGLE_API_KEY")]
+    for path in _store_paths():
+        try:
+            st = os.stat(path)
+            sig.append((str(path), st.st_mtime_ns, st.st_size))
+        except OSError:
+            sig.append((str(path), None))
+    return tuple(sig)
+
+
+def invalidate() -> None:
+    """Drop the in-memory key set; the next acquisition reloads it.
+
+    Called by the key stores after they save. Deliberately lock-free so a
+    store can call it while holding its own lock.
+    """
+    global _dirty
+    _dirty = True
+
+
+def _current_keys(now: float) -> list[str]:
+    """The cached key set, reloaded when invalidated or the stores changed on disk."""
+    global _keys, _signature, _checked_at, _dirty
+    if not _dirty and now - _checked_at < RECHECK_S:
+        return _keys
+    _checked_at = now
+    sig = _store_signature()
+    if _dirty or sig != _signature:
+        _dirty = False
+        _keys, _signature = _collect_keys(), sig
+        for stale in set(_current) - set(_keys):
+            del _current[stale]
+    return _keys
+
+
+def _weight(key: str, now: float) -> int:
+    failures = _recent_failures.get(key)
+    if not failures:
+        return BASE_WEIGHT
+    while failures and now - failures[0] > PENALTY_WINDOW:
+        failures.popleft()
+    return max(1, BASE_WEIGHT >> len(failures))
+
+
 def _available(keys: list[str], now: float) -> list[str]:
     """Filter to keys not currently in cooldown."""
     out = []
@@ -105,7 +185,7 @@ def pool_snapshot() -> dict:
     """Return a diagnostic view of the current pool (no secrets)."""
     with _lock:
         now = time.time()
-        keys = _collect_keys()
+        keys = _current_keys(now)
         return {
             "size": len(keys),
             "available": sum(1 for k in keys if not _cooldowns.get(k, 0) or now >= _cooldowns[k]),
@@ -124,9 +204,10 @@ def _mask(k: str) -> str:
 def acquire_key() -> str:
     """Return the best available Gemini key, distributing load across the pool.
 
-    Selection: round-robin over available (non-cooled) keys so concurrent
-    callers naturally spread. Falls back to any key (even cooled) if every key
-    is in cooldown — a cooled key is still preferable to no key.
+    Selection: weighted round-robin over available (non-cooled) keys so
+    concurrent callers naturally spread and recently rate-limited keys get a
+    smaller share. Falls back to any key (even cooled) if every key is in
+    cooldown — a cooled key is still preferable to no key.
     """
     with _lock:
         return _acquire_key_locked()
@@ -134,43 +215,48 @@ def acquire_key() -> str:
 
 def _acquire_key_locked() -> str:
     """Lock-held implementation — caller must already own `_lock`."""
-    keys = _collect_keys()
     now = time.time()
+    keys = _current_keys(now)
     avail = _available(keys, now)
 
     if not avail:
         if keys:
             # Everything is cooled — return the soonest-to-recover key.
-            avail = [min(keys, key=lambda k: _cooldowns.get(k, 0))]
             logger.warning("[key_pool] all keys in cooldown — reusing soonest key")
-        else:
-            return ""
-
-    # Maintain cursor so the same caller doesn't always get key[0].
-    # Rotate cursor to align with available set, then pick + rotate.
+            return min(keys, key=lambda k: _cooldowns.get(k, 0))
+        return ""
+    if len(avail) == 1:
+        return avail[0]
+
+    # Smooth weighted round-robin: every candidate gains its weight, the
+    # leader is served and pays back the total.
+    total = 0
     target = avail[0]
-    if _cursor and _cursor[0] in avail:
-        target = _cursor[0]
-    # Advance cursor to the next available key for fairness.
-    try:
-        idx = avail.index(target)
-        _cursor.clear()
-        _cursor.extend(avail[idx + 1:] + avail[:idx + 1])
-    except ValueError:
-        pass
+    best = None
+    for k in avail:
+        w = _weight(k, now)
+        total += w
+        score = _current.get(k, 0) + w
+        _current[k] = score
+        if best is None or score > best:
+            best, target = score, k
+    _current[target] -= total
     return target
 
 
-def report_failure(key: str, cooldown: float = DEFAULT_COOLDOWN) -> str:
-    """Mark `key` as rate-limited and return the next available key.
+def report_failure(key: str, cooldown: float = DEFAULT_COOLDOWN, *, quota: bool = False) -> str:
+    """Mark `key` as failing and return the next available key.
 
-    Called when a Gemini call gets 429/403/RESOURCE_EXHAUSTED. Cools the key
-    for `cooldown` seconds so subsequent acquire_key() calls skip it.
+    Cools the key for `cooldown` seconds so subsequent acquire_key() calls
+    skip it. Pass quota=True when the call got 429/403/RESOURCE_EXHAUSTED:
+    only quota errors lower the key's round-robin weight.
     """
     with _lock:
         now = time.time()
         if key:
             _cooldowns[key] = now + cooldown
+            if quota:
+                _recent_failures.setdefault(key, deque()).append(now)
             logger.warning("[key_pool] key %s cooled for %.0fs", _mask(key), cooldown)
         return _acquire_key_locked()
 
@@ -182,13 +268,15 @@ def report_success(key: str) -> None:
 
 
 def reset_key(key: str) -> None:
-    """Manually clear a key's cooldown (e.g. from Settings UI)."""
+    """Manually clear a key's cooldown and 429 penalty (e.g. from Settings UI)."""
     with _lock:
         _cooldowns.pop(key, None)
+        _recent_failures.pop(key, None)
 
 
 def reset_all() -> None:
     """Clear all cooldowns — used by admin/reset endpoints."""
     with _lock:
         _cooldowns.clear()
-        _cursor.clear()
+        _recent_failures.clear()
+        _current.clear()
@@ -385,11 +385,19 @@ async def list_providers():
 
 
 @router.get("/providers/health")
-async def providers_health():
+def providers_health():
+    """Cached per-provider health; probes run concurrently under a deadline (threadpool route)."""
     from providers.router import health_all
     return health_all()
 
 
+@router.get("/providers/http-pool")
+async def providers_http_pool():
+    """Shared outbound HTTP pools: requests, in-flight and connections opened per host."""
+    from providers.http_pool import stats
+    return stats()
+
+
 @router.post("/providers/send")
 async def send_with_context(req: SendRequest, request: Request):
     """
@@ -476,43 +484,33 @@ async def knowledge_os_status():
     Arkadia Knowledge OS health summary — extended with canonical ontology stats.
     Backwards-compatible: all original keys are preserved.
     """
-    from knowledge.db import execute_one, execute
+    from knowledge.db import execute_one
     from knowledge.node_types import NODE_TYPES
     from knowledge.relationship_types import RELATIONSHIP_TYPES
     try:
-        # ── Core counts ──────────────────────────────────────────────────────
-        note_count    = execute_one("SELECT COUNT(*) as n FROM notes")
-        project_count = execute_one("SELECT COUNT(*) as n FROM projects")
-        timeline_count= execute_one("SELECT COUNT(*) as n FROM timeline")
-        edge_count    = execute_one("SELECT COUNT(*) as n FROM graph_edges")
-        chunk_count   = execute_one("SELECT COUNT(*) as n FROM chunks")
-        embed_count   = execute_one("SELECT COUNT(*) as n FROM embeddings")
-        pending_embed = execute_one("SELECT COUNT(*) as n FROM notes WHERE embedding_status = 'pending'")
-        partial_embed = execute_one("SELECT COUNT(*) as n FROM notes WHERE embedding_status = 'partial'")
-        failed_embed  = execute_one("SELECT COUNT(*) as n FROM notes WHERE embedding_status = 'failed'")
-
-        total_notes = note_count["n"] if note_count else 0
-        total_edges = edge_count["n"] if edge_count else 0
+        # ── Core counts (trigger-maintained — knowledge/graph_stats.py) ─────
+        from knowledge import graph_stats
+        counts = graph_stats.counters()
+        total_notes    = counts.get("notes", 0)
+        total_edges    = counts.get("edges", 0)
+        embed_complete = counts.get("embeddings", 0)
+        pending_embed  = counts.get("notes.embed:pending", 0)
 
         # ── Nodes grouped by canonical node type ─────────────────────────────
-        type_rows = execute(
-            "SELECT note_type, COUNT(*) as cnt FROM notes GROUP BY note_type ORDER BY cnt DESC"
-        )
-        nodes_by_type = {row["note_type"]: row["cnt"] for row in type_rows}
+        nodes_by_type = dict(sorted(graph_stats.grouped(counts, "notes.type:").items(),
+                                    key=lambda kv: kv[1], reverse=True))
 
         # ── Relationships grouped by canonical relationship type ──────────────
-        rel_rows = execute(
-            "SELECT relationship, COUNT(*) as cnt FROM graph_edges GROUP BY relationship ORDER BY cnt DESC"
-        )
-        relationships_by_type = {row["relationship"]: row["cnt"] for row in rel_rows}
+        relationships_by_type = dict(sorted(graph_stats.grouped(counts, "edges.rel:").items(),
+                                            key=lambda kv: kv[1], reverse=True))
 
         # ── Graph density (edges / max possible edges) ────────────────────────
         max_edges = total_notes * (total_notes - 1) if total_notes > 1 else 1
         graph_density = round(total_edges / max_edges, 6) if max_edges else 0.0
 
-        # ── Graph health quick summary ────────────────────────────────────────
+        # ── Graph health quick summary (never blocks on a connectivity scan) ──
         from knowledge.graph_health import evaluate_graph_health
-        health = evaluate_graph_health()
+        health = evaluate_graph_health(wait=False)
 
         # ── Last ingestion timestamp ──────────────────────────────────────────
         last_ingestion_row = execute_one(
@@ -526,21 +524,24 @@ async def knowledge_os_status():
         week_ago = (now_utc - timedelta(days=7)).isoformat()
         day_ago  = (now_utc - timedelta(days=1)).isoformat()
 
-        notes_last_7d  = execute_one("SELECT COUNT(*) as n FROM notes WHERE created_at >= ?", (week_ago,))
-        edges_last_7d  = execute_one("SELECT COUNT(*) as n FROM graph_edges WHERE created_at >= ?", (week_ago,))
-        notes_today    = execute_one("SELECT COUNT(*) as n FROM notes WHERE created_at >= ?", (day_ago,))
-        edges_today    = execute_one("SELECT COUNT(*) as n FROM graph_edges WHERE created_at >= ?", (day_ago,))
+        notes_last_7d  = graph_stats.created_since("notes", week_ago)
+        edges_last_7d  = graph_stats.created_since("edges", week_ago)
+        notes_today    = graph_stats.created_since("notes", day_ago)
+        edges_today    = graph_stats.created_since("edges", day_ago)
 
         # ── Average degree ────────────────────────────────────────────────────
         avg_degree = round((2 * total_edges) / total_notes, 3) if total_notes else 0.0
 
         # ── Embedding coverage ────────────────────────────────────────────────
-        embed_complete = embed_count["n"] if embed_count else 0
         embed_coverage = round(embed_complete / total_notes, 4) if total_notes else 0.0
 
+        # ── Query embedding cache (knowledge/embedding_cache.py) ──────────────
+        from knowledge import embedding_cache
+
         # ── Semantic link count (enrichment-created edges) ────────────────────
-        semantic_edges = execute_one(
-            "SELECT COUNT(*) as n FROM graph_edges WHERE relationship IN ('relates_to','references','connected_to','mentions','derived_from')"
+        semantic_edges = sum(
+            relationships_by_type.get(rel, 0)
+            for rel in ("relates_to", "references", "connected_to", "mentions", "derived_from")
         )
 
         return {
@@ -548,16 +549,16 @@ async def knowledge_os_status():
             "status": "operational",
             "vault": {
                 "notes": total_notes,
-                "projects": project_count["n"] if project_count else 0,
-                "chunks": chunk_count["n"] if chunk_count else 0,
+                "projects": counts.get("projects", 0),
+                "chunks": counts.get("chunks", 0),
                 "embeddings": embed_complete,
-                "pending_embeddings": pending_embed["n"] if pending_embed else 0,
+                "pending_embeddings": pending_embed,
             },
             "graph": {
                 "edges": total_edges,
             },
             "timeline": {
-                "events": timeline_count["n"] if timeline_count else 0,
+                "events": counts.get("timeline", 0),
             },
             # ── Extended block (K3-B) ─────────────────────────────────────────
             "ontology": {
@@ -572,22 +573,23 @@ async def knowledge_os_status():
             "graph_health": health["overall"],
             "indexing_status": {
                 "complete": embed_complete,
-                "pending": pending_embed["n"] if pending_embed else 0,
-                "partial": partial_embed["n"] if partial_embed else 0,
-                "failed": failed_embed["n"] if failed_embed else 0,
+                "pending": pending_embed,
+                "partial": counts.get("notes.embed:partial", 0),
+                "failed": counts.get("notes.embed:failed", 0),
                 "coverage": embed_coverage,
             },
             "last_ingestion": last_ingestion,
             # ── Extended block (K3-C) ─────────────────────────────────────────
             "growth": {
-                "notes_last_7d":   notes_last_7d["n"] if notes_last_7d else 0,
-                "edges_last_7d":   edges_last_7d["n"] if edges_last_7d else 0,
-                "notes_today":     notes_today["n"]   if notes_today   else 0,
-                "edges_today":     edges_today["n"]   if edges_today   else 0,
+                "notes_last_7d":   notes_last_7d,
+                "edges_last_7d":   edges_last_7d,
+                "notes_today":     notes_today,
+                "edges_today":     edges_today,
                 "avg_node_degree": avg_degree,
-                "semantic_links":  semantic_edges["n"] if semantic_edges else 0,
+                "semantic_links":  semantic_edges,
                 "embed_coverage":  embed_coverage,
             },
+            "query_embedding_cache": embedding_cache.stats(),
         }
     except Exception as e:
         return {"status": "error", "detail": str(e)}
@@ -790,6 +792,13 @@ async def graph_path(
 # Semantic Enrichment  (K3-C Task 2)
 # ─────────────────────────────────────────────────────────────────────────────
 
+@router.get("/enrich/status")
+async def enrichment_status():
+    """Background enrichment pool: queue depth, counters, edges written per second."""
+    from knowledge.enrichment import enrichment_stats
+    return enrichment_stats()
+
+
 @router.post("/enrich/{note_id}")
 async def enrich_note(note_id: int):
     """
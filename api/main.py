@@ -7,7 +7,6 @@ import json
 import base64
 import hashlib
 import hmac
-import httpx
 import threading
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
@@ -15,6 +14,11 @@ from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
+from api.oracle_stream import oracle_stream_response, wants_stream
+from api.scroll_sync import SyncResult, sync_corpus
+from api import direct_scrolls, scroll_index
+from api.upload_stream import parse_upload
+from providers import http_pool
 import os as _os
 
 # ── Arkadia auth + node registry ─────────────────────────────────────────────
@@ -203,6 +207,10 @@ async def lifespan(app: FastAPI):
         from knowledge.enrichment import schedule_orphan_enrichment
         schedule_embedding_pass(); schedule_orphan_enrichment()
     except Exception as _kce: logger.warning(f"[K3-C] Startup pass skipped: {_kce}")
+    # ── FTS5 backfill for notes that predate notes_fts (background) ──────
+    try:
+        from knowledge.fts_migration import schedule_fts_backfill; schedule_fts_backfill()
+    except Exception as _fte: logger.warning(f"[FTS] Backfill could not be scheduled: {_fte}")
 
     yield
 
@@ -214,6 +222,7 @@ async def lifespan(app: FastAPI):
         _worker.stop_workers(timeout=3.0)
     except Exception:
         pass
+    await http_pool.aclose()
 
 
 # ── App — created here so lifespan is already defined ────────────────────────
@@ -332,27 +341,6 @@ else:
 _cache: dict = {"scrolls": None, "at": 0.0}
 CACHE_TTL = 60   # 60-second in-memory TTL for near-real-time GitHub awareness
 
-# ── Direct-upload scroll store ────────────────────────────────────────────────
-DIRECT_SCROLLS_FILE = "data/direct_scrolls.json"
-
-
-def _load_direct_scrolls() -> list[dict]:
-    try:
-        with open(DIRECT_SCROLLS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f).get("scrolls", [])
-    except FileNotFoundError:
-        return []
-    except Exception as e:
-        logger.warning(f"direct scrolls load error: {e}")
-        return []
-
-
-def _save_direct_scrolls(scrolls: list[dict]) -> None:
-    os.makedirs("data", exist_ok=True)
-    with open(DIRECT_SCROLLS_FILE, "w", encoding="utf-8") as f:
-        json.dump({"scrolls": scrolls}, f, ensure_ascii=False, indent=2)
-
-
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
@@ -423,52 +411,15 @@ def GH_HEADERS() -> dict:
     return h
 
 
-async def _fetch_github_tree() -> list[dict]:
-    url = f"https://api.github.com/repos/{GITHUB_REPO}/git/trees/{GITHUB_BRANCH}?recursive=1"
-    async with httpx.AsyncClient(timeout=15) as client:
-        resp = await client.get(url, headers=GH_HEADERS())
-        resp.raise_for_status()
-    return [
-        item for item in resp.json().get("tree", [])
-        if item.get("type") == "blob" and _is_corpus_file(item.get("path", ""))
-    ]
-
-
-async def _fetch_raw(path: str) -> tuple[str, str | None]:
-    headers = {"Authorization": f"Bearer {GITHUB_TOKEN}"} if GITHUB_TOKEN else {}
-    url = f"https://raw.githubusercontent.com/{GITHUB_REPO}/{GITHUB_BRANCH}/{path}"
-    async with httpx.AsyncClient(timeout=12) as client:
-        try:
-            resp = await client.get(url, headers=headers)
-            resp.raise_for_status()
-            return resp.text, None
-        except Exception as e:
-            return "", str(e)
-
-
-async def _build_scrolls(tree_items: list[dict]) -> dict:
+def _build_scrolls(sync: SyncResult) -> dict:
     scrolls: dict = {}
-    fetched_at = _now_iso()
-
-    for item in tree_items:
+    for item in sync.items:
         path     = item["path"]
         category, priority = _infer_category(path)
-        readable = _is_readable(path)
-
-        if readable:
-            content, error = await _fetch_raw(path)
-            chars   = len(content) if content else 0
-            preview = content[:320] if content else ""
-        else:
-            # Binary file (docx, pdf) — show metadata only
-            content = ""
-            preview = ""
-            chars   = 0
-            error   = None
-
+        f        = sync.files.get(path) or {"content": "", "error": None, "fetched_at": None}
+        content  = f["content"]
         # Stable dedup key
         key = re.sub(r"[^a-zA-Z0-9]", "_", path)
-
         scrolls[key] = {
             "id":          key,
             "source":      "github",
@@ -476,14 +427,14 @@ async def _build_scrolls(tree_items: list[dict]) -> dict:
             "priority":    priority,
             "label":       _make_label(path),
             "description": path,
-            "chars":       chars,
-            "preview":     preview,
+            "chars":       len(content),
+            "preview":     content[:320],
             "content":     content,
-            "fetched_at":  fetched_at if readable and not error else None,
-            "error":       error,
+            "fetched_at":  datetime.fromtimestamp(f["fetched_at"], timezone.utc).isoformat()
+                           if f["fetched_at"] else None,
+            "error":       f["error"],
             "github_url":  f"https://github.com/{GITHUB_REPO}/blob/{GITHUB_BRANCH}/{path}",
         }
-
     return scrolls
 
 
@@ -604,12 +555,13 @@ async def _get_scrolls(force: bool = False) -> dict:
     if not force and _cache["scrolls"] is not None and (now - _cache["at"]) < CACHE_TTL:
         # Still merge in latest direct scrolls even from cache
         scrolls = dict(_cache["scrolls"])
-        for ds in _load_direct_scrolls():
+        for ds in direct_scrolls.scrolls():
             scrolls[ds["id"]] = ds
         return scrolls
     try:
-        tree    = await _fetch_github_tree()
-        scrolls = await _build_scrolls(tree)
+        sync    = await sync_corpus(GITHUB_REPO, GITHUB_BRANCH, GITHUB_TOKEN,
+                                    is_corpus_file=_is_corpus_file, is_readable=_is_readable)
+        scrolls = _build_scrolls(sync)
         if not scrolls:
             raise ValueError("GitHub returned empty tree — using local docs fallback")
         _cache["scrolls"] = scrolls
@@ -621,8 +573,10 @@ async def _get_scrolls(force: bool = False) -> dict:
         if scrolls:
             _cache["scrolls"] = scrolls
             _cache["at"]      = now
-    # Merge direct uploads (always fresh — they live on disk)
-    for ds in _load_direct_scrolls():
+    if scrolls:
+        await scroll_index.refresh(scrolls)         # off-loop rebuild, atomic swap
+    # Merge direct uploads (served from memory; re-read only after a mutation)
+    for ds in direct_scrolls.scrolls():
         scrolls[ds["id"]] = ds
     return scrolls
 
@@ -638,9 +592,8 @@ async def _push_image_to_github(image_b64: str, filename: str) -> str:
         "content": image_b64,
         "branch":  GITHUB_BRANCH,
     }
-    async with httpx.AsyncClient(timeout=30) as client:
-        resp = await client.put(url, headers=GH_HEADERS(), json=payload)
-        resp.raise_for_status()
+    resp = await http_pool.async_client().put(url, headers=GH_HEADERS(), json=payload, timeout=30)
+    resp.raise_for_status()
     return f"https://raw.githubusercontent.com/{GITHUB_REPO}/{GITHUB_BRANCH}/{path}"
 
 
@@ -684,41 +637,43 @@ async def _gemini_chat(messages: list[dict], system: str, api_key: str | None =
     }
 
     last_err = None
-    async with httpx.AsyncClient(timeout=90) as client:
-        # Try the (model × key) grid: on a quota/rate failure, rotate the KEY
-        # (cooled via the pool) before exhausting every model on a dead key.
-        current_key = api_key
-        key_attempts = 0
-        max_key_attempts = 8  # hard ceiling so we never loop forever
-        while current_key and key_attempts < max_key_attempts:
-            for model in GEMINI_MODELS:
-                url = (
-                    f"https://generativelanguage.googleapis.com/v1beta/models/"
-                    f"{model}:generateContent?key={current_key}"
-                )
-                try:
-                    resp = await client.post(url, json=payload)
-                    if resp.status_code == 429 or resp.status_code == 403:
-                        last_err = resp.text
-                        logger.warning(f"[gemini] {model} quota/access on key {current_key[:4]}… — rotate key")
-                        # Break the model loop and rotate to a fresh key.
-                        break
-                    resp.raise_for_status()
-                    data = resp.json()
-                    report_success(current_key)
-                    return data["candidates"][0]["content"]["parts"][0]["text"]
-                except Exception as e:
-                    last_err = str(e)
-                    logger.warning(f"[gemini] {model} failed: {e}")
-                    continue
-            # Got here from a 429/403 break or all models failed on this key.
-            report_failure(current_key)
-            tried_keys.add(current_key)
-            next_key = acquire_key()
-            if not next_key or next_key in tried_keys:
-                break
-            current_key = next_key
-            key_attempts += 1
+    client = http_pool.async_client()
+    # Try the (model × key) grid: on a quota/rate failure, rotate the KEY
+    # (cooled via the pool) before exhausting every model on a dead key.
+    current_key = api_key
+    key_attempts = 0
+    max_key_attempts = 8  # hard ceiling so we never loop forever
+    while current_key and key_attempts < max_key_attempts:
+        quota_hit = False
+        for model in GEMINI_MODELS:
+            url = (
+                f"https://generativelanguage.googleapis.com/v1beta/models/"
+                f"{model}:generateContent?key={current_key}"
+            )
+            try:
+                resp = await client.post(url, json=payload, timeout=90)
+                if resp.status_code == 429 or resp.status_code == 403:
+                    last_err = resp.text
+                    quota_hit = True
+                    logger.warning(f"[gemini] {model} quota/access on key {current_key[:4]}… — rotate key")
+                    # Break the model loop and rotate to a fresh key.
+                    break
+                resp.raise_for_status()
+                data = resp.json()
+                report_success(current_key)
+                return data["candidates"][0]["content"]["parts"][0]["text"]
+            except Exception as e:
+                last_err = str(e)
+                logger.warning(f"[gemini] {model} failed: {e}")
+                continue
+        # Got here from a 429/403 break or all models failed on this key.
+        report_failure(current_key, quota=quota_hit)
+        tried_keys.add(current_key)
+        next_key = acquire_key()
+        if not next_key or next_key in tried_keys:
+            break
+        current_key = next_key
+        key_attempts += 1
 
     if last_err:
         raise Exception(f"All Gemini models failed. Last error: {last_err}")
@@ -872,9 +827,7 @@ async def create_scroll(body: dict):
         "error":      None,
         "created_at": now,
     }
-    existing = _load_direct_scrolls()
-    existing.insert(0, scroll)
-    _save_direct_scrolls(existing)
+    direct_scrolls.add(scroll)
     # Bust the main cache so the new scroll shows up immediately
     _cache["at"] = 0.0
     logger.info(f"[DIRECT-SCROLL] Added: {label!r} ({len(content)} chars, {category})")
@@ -890,11 +843,8 @@ async def create_scroll(body: dict):
 @app.delete("/api/scrolls/{scroll_id}")
 async def delete_scroll(scroll_id: str):
     """Remove a directly-uploaded scroll from the corpus."""
-    existing = _load_direct_scrolls()
-    updated  = [s for s in existing if s["id"] != scroll_id]
-    if len(updated) == len(existing):
+    if not direct_scrolls.remove(scroll_id):
         raise HTTPException(status_code=404, detail="Scroll not found.")
-    _save_direct_scrolls(updated)
     _cache["at"] = 0.0
     return {"status": "removed", "id": scroll_id}
 
@@ -902,42 +852,19 @@ async def delete_scroll(scroll_id: str):
 @app.get("/api/scrolls")
 async def list_direct_scrolls():
     """List only the directly-uploaded scrolls."""
-    return {"scrolls": _load_direct_scrolls()}
+    return {"scrolls": direct_scrolls.scrolls()}
 
 
 def _rag_context(query: str, scrolls: dict, max_chars: int = 3000, top_n: int = 5) -> tuple[str, list[dict]]:
-    """Score scrolls by keyword relevance to query, return context block + matched refs."""
-    if not scrolls:
-        return "", []
-
-    words = set(re.findall(r"\w{3,}", query.lower()))
-    if not words:
-        return "", []
-
-    scored: list[tuple[float, dict]] = []
-    for s in scrolls.values():
-        if not s.get("content") and not s.get("preview"):
-            continue
-        haystack = (
-            s.get("label", "") + " " +
-            s.get("description", "") + " " +
-            s.get("preview", "") + " " +
-            s.get("content", "")
-        ).lower()
-        hits = sum(1 for w in words if w in haystack)
-        if hits:
-            scored.append((hits, s))
-
-    scored.sort(key=lambda x: -x[0])
-    top = scored[:top_n]
-
+    """Rank scrolls against query via the corpus index, return context block + matched refs."""
+    top = scroll_index.search(query, scrolls, top_n)
     if not top:
         return "", []
 
     blocks: list[str] = []
     refs: list[dict] = []
     used = 0
-    for _, s in top:
+    for s in top:
         body = s.get("content") or s.get("preview") or ""
         snippet = body[:800]
         block = f"[{s['label']}]\n{snippet}"
@@ -1004,8 +931,7 @@ async def commune_resonance(request: Request):
         return JSONResponse(status_code=400, content={"error": "No message."})
 
     # ── Key resolution: user key → provider_key_store → env var ─────────────
-    active_key = None
-    user_id_pre = None
+    active_key = user_id_pre = node_user_pre = None
     try:
         node_user_pre = await _get_current_user(request)
         user_id_pre = node_user_pre.get("uid") if node_user_pre else None
@@ -1054,11 +980,12 @@ async def commune_resonance(request: Request):
     # ── Knowledge OS: retrieved conversational memory (the spine) ──────────────
     # Personal longitudinal memory via assemble_context, scoped to the
     # session_id thread. Empty block when nothing retrieved — never fabricate.
+    # Off the event loop; a slow embedding degrades to keyword context.
     memory_block, memory_meta = "", {}
     spine_user_id = user_id_pre
     try:
-        from api.oracle_spine import build_memory_block
-        memory_block, memory_meta = build_memory_block(
+        from api.oracle_spine import build_memory_block_async
+        memory_block, memory_meta = await build_memory_block_async(
             message, session_id, user_id=spine_user_id or "",
         )
     except Exception as _mce:
@@ -1067,7 +994,7 @@ async def commune_resonance(request: Request):
     # ── Personal Node Context (authenticated users only) ───────────────────────
     personal_block = ""
     try:
-        node_user = await _get_current_user(request)
+        node_user = node_user_pre             # resolved once, above
         if node_user and node_user.get("node_key"):
             codex = _get_personal_codex(node_user["node_key"])
             if codex:
@@ -1177,6 +1104,18 @@ async def commune_resonance(request: Request):
     )
 
     msgs = list(history[-10:]) + [{"role": "user", "content": message}]
+    extra = {
+        "patterns":  [],
+        "rag_refs":  rag_refs,
+        "rag_hits":  len(rag_refs),
+        "memory": {"session_id": session_id or None, "thread_id": memory_meta.get("thread_id"),
+                   "user_id": spine_user_id or None,
+                   "notes_retrieved": memory_meta.get("notes_retrieved", 0),
+                   "source": memory_meta.get("source", "knowledge_os"), "injected": bool(memory_block)},
+    }
+    if wants_stream(body, request.headers):
+        return oracle_stream_response(msgs, system, active_key, GEMINI_MODELS, message=message,
+                                      session_id=session_id, user_id=spine_user_id or "", extra=extra)
 
     try:
         reply     = await _gemini_chat(msgs, system, api_key=active_key)
@@ -1187,17 +1126,7 @@ async def commune_resonance(request: Request):
             daemon=True,
         ).start()
         resonance = round(0.7 + (len(reply) % 30) / 100, 3)
-        return {
-            "reply":     reply,
-            "resonance": resonance,
-            "patterns":  [],
-            "rag_refs":  rag_refs,
-            "rag_hits":  len(rag_refs),
-            "memory": {"session_id": session_id or None, "thread_id": memory_meta.get("thread_id"),
-                       "user_id": spine_user_id or None,
-                       "notes_retrieved": memory_meta.get("notes_retrieved", 0),
-                       "source": memory_meta.get("source", "knowledge_os"), "injected": bool(memory_block)},
-        }
+        return {"reply": reply, "resonance": resonance, **extra}
     except Exception as e:
         logger.error(f"Gemini error: {e}")
         return JSONResponse(
@@ -1279,12 +1208,11 @@ async def _generate_image(prompt: str) -> str | None:
             f"https://image.pollinations.ai/prompt/{encoded}"
             f"?width=1024&height=1024&nologo=true&model=flux&seed={abs(hash(prompt)) % 99999}"
         )
-        async with httpx.AsyncClient(timeout=90, follow_redirects=True) as client:
-            resp = await client.get(poll_url)
-            if resp.status_code == 200 and resp.headers.get("content-type", "").startswith("image/"):
-                logger.info(f"Pollinations image generated: {len(resp.content)} bytes")
-                return base64.b64encode(resp.content).decode()
-            logger.warning(f"Pollinations returned {resp.status_code} / {resp.headers.get('content-type')}")
+        resp = await http_pool.async_client().get(poll_url, timeout=90, follow_redirects=True)
+        if resp.status_code == 200 and resp.headers.get("content-type", "").startswith("image/"):
+            logger.info(f"Pollinations image generated: {len(resp.content)} bytes")
+            return base64.b64encode(resp.content).decode()
+        logger.warning(f"Pollinations returned {resp.status_code} / {resp.headers.get('content-type')}")
     except Exception as e:
         logger.warning(f"Pollinations error: {e}")
 
@@ -1304,27 +1232,27 @@ async def _generate_image(prompt: str) -> str | None:
     except Exception:
         _img_key = GOOGLE_API_KEY
     if _img_key:
-        async with httpx.AsyncClient(timeout=60) as client:
-            for model in GEMINI_IMAGE_MODELS:
-                url = (
-                    f"https://generativelanguage.googleapis.com/v1beta/models/"
-                    f"{model}:generateContent?key={_img_key}"
-                )
-                try:
-                    resp = await client.post(url, json=payload)
-                    if resp.status_code in (404, 429, 403):
-                        last_err = f"{model}: HTTP {resp.status_code}"
-                        logger.warning(f"Gemini image {model}: {resp.status_code}")
-                        continue
-                    resp.raise_for_status()
-                    data = resp.json()
-                    for part in data.get("candidates", [{}])[0].get("content", {}).get("parts", []):
-                        if "inlineData" in part:
-                            return part["inlineData"]["data"]
-                    last_err = f"{model}: no inlineData"
-                except Exception as e:
-                    last_err = f"{model}: {e}"
-                    logger.warning(f"Gemini image {model} error: {e}")
+        client = http_pool.async_client()
+        for model in GEMINI_IMAGE_MODELS:
+            url = (
+                f"https://generativelanguage.googleapis.com/v1beta/models/"
+                f"{model}:generateContent?key={_img_key}"
+            )
+            try:
+                resp = await client.post(url, json=payload, timeout=60)
+                if resp.status_code in (404, 429, 403):
+                    last_err = f"{model}: HTTP {resp.status_code}"
+                    logger.warning(f"Gemini image {model}: {resp.status_code}")
+                    continue
+                resp.raise_for_status()
+                data = resp.json()
+                for part in data.get("candidates", [{}])[0].get("content", {}).get("parts", []):
+                    if "inlineData" in part:
+                        return part["inlineData"]["data"]
+                last_err = f"{model}: no inlineData"
+            except Exception as e:
+                last_err = f"{model}: {e}"
+                logger.warning(f"Gemini image {model} error: {e}")
 
     raise Exception(f"All image providers failed. Last Gemini error: {last_err}")
 
@@ -1343,7 +1271,7 @@ async def dashboard_loops(sovereign_token: str = ""):
     import time as _time
     from kernel import oracle_store as _os
 
-    data = _os._read()
+    data = _os.snapshot(limit=None)
     raw_loops = data.get("open_loops", [])
 
     CATEGORY_MAP = {
@@ -1586,9 +1514,14 @@ async def github_webhook(request: Request):
 
 @app.get("/api/codex/github-tree")
 async def github_tree():
+    """Corpus file list ({path, sha}) from the incremental sync's stored tree.
+
+    One conditional tree request; a 304 is answered from corpus_sync_state.
+    """
     try:
-        tree = await _fetch_github_tree()
-        return {"total": len(tree), "files": tree}
+        sync = await sync_corpus(GITHUB_REPO, GITHUB_BRANCH, GITHUB_TOKEN,
+                                 is_corpus_file=_is_corpus_file, is_readable=_is_readable)
+        return {"total": len(sync.items), "files": sync.items}
     except Exception as e:
         return JSONResponse(status_code=502, content={"error": str(e)})
 
@@ -1602,59 +1535,17 @@ async def upload_file(request: Request):
     The file content is extracted and stored as a direct scroll,
     making it immediately available to Arkana for RAG context.
     """
-    import cgi
-    import io
-    import urllib.parse
-
-    content_type = request.headers.get("content-type", "")
-    if not content_type.startswith("multipart/form-data"):
-        raise HTTPException(status_code=400, detail="Expected multipart/form-data")
-
-    body = await request.body()
-    
-    # Parse multipart form data manually
-    boundary = content_type.split("boundary=")[-1].strip('"')
-    parts = body.split(("--" + boundary).encode())
-    
-    uploaded_file = None
-    file_name = "upload"
-    category = "COLLECTIVE"
-    description = ""
-    
-    for part in parts:
-        if b'Content-Disposition' not in part:
-            continue
-        
-        # Parse headers
-        header_end = part.find(b'\r\n\r\n')
-        if header_end == -1:
-            continue
-            
-        headers = part[:header_end].decode('utf-8', errors='ignore')
-        content = part[header_end + 4:]
-        
-        # Remove trailing \r\n before boundary
-        if content.endswith(b'\r\n'):
-            content = content[:-2]
-        
-        # Extract field name and filename
-        if 'filename=' in headers:
-            # File field
-            fname_match = re.search(r'filename="([^"]+)"', headers)
-            if fname_match:
-                file_name = urllib.parse.unquote(fname_match.group(1))
-            uploaded_file = content
-        elif 'name="category"' in headers:
-            category = content.decode('utf-8', errors='ignore').strip().upper() or "COLLECTIVE"
-        elif 'name="description"' in headers:
-            description = content.decode('utf-8', errors='ignore').strip()
-    
-    if not uploaded_file:
-        raise HTTPException(status_code=400, detail="No file provided")
-    
-    # Extract text content based on file type (shared with personal + solspire uploads)
-    from kernel.doc_extract import extract_text, make_label
-    extracted_text, _mime = extract_text(file_name, uploaded_file)
+    async with parse_upload(request) as form:
+        upload = form.files.get("file") or next(iter(form.files.values()), None)
+        if not upload or not upload.size:
+            raise HTTPException(status_code=400, detail="No file provided")
+        file_name   = upload.filename
+        file_size   = upload.size
+        category    = form.fields.get("category", "").upper() or "COLLECTIVE"
+        description = form.fields.get("description", "")
+        # Extract text content based on file type (shared with personal + solspire uploads)
+        from kernel.doc_extract import extract_text
+        extracted_text, _mime = await asyncio.to_thread(extract_text, file_name, upload.source)
 
     # Store as a direct scroll (PUBLIC Spiral Codex corpus)
     now = _now_iso()
@@ -1674,12 +1565,10 @@ async def upload_file(request: Request):
         "error":       None,
         "created_at":  now,
         "filename":    file_name,
-        "file_size":   len(uploaded_file),
+        "file_size":   file_size,
     }
     
-    existing = _load_direct_scrolls()
-    existing.insert(0, scroll)
-    _save_direct_scrolls(existing)
+    direct_scrolls.add(scroll)
     
     # Bust cache
     _cache["at"] = 0.0
@@ -1701,34 +1590,6 @@ async def upload_file(request: Request):
 
 # ── Personal Document Ingest (Knowledge OS vault — NOT public corpus) ─────────
 
-def _parse_multipart(body: bytes, content_type: str) -> dict:
-    """Tiny multipart/form-data parser returning {fieldname: {value, filename}}."""
-    import urllib.parse
-    boundary = content_type.split("boundary=")[-1].strip('"')
-    out: dict = {}
-    for part in body.split(("--" + boundary).encode()):
-        if b"Content-Disposition" not in part:
-            continue
-        hdr_end = part.find(b"\r\n\r\n")
-        if hdr_end == -1:
-            continue
-        headers = part[:hdr_end].decode("utf-8", errors="ignore")
-        content = part[hdr_end + 4:]
-        if content.endswith(b"\r\n"):
-            content = content[:-2]
-        if 'filename="' in headers:
-            fm = re.search(r'filename="([^"]+)"', headers)
-            nm = re.search(r'name="([^"]+)"', headers)
-            out[nm.group(1) if nm else "file"] = {
-                "value": content, "filename": urllib.parse.unquote(fm.group(1)) if fm else "upload",
-            }
-        else:
-            nm = re.search(r'name="([^"]+)"', headers)
-            if nm:
-                out[nm.group(1)] = {"value": content.decode("utf-8", errors="ignore").strip()}
-    return out
-
-
 @app.post("/api/personal/ingest-file")
 async def personal_ingest_file(request: Request):
     """Upload a document to the PERSONAL Knowledge OS vault.
@@ -1744,23 +1605,17 @@ async def personal_ingest_file(request: Request):
     if not user_id:
         raise HTTPException(status_code=401, detail="Authentication required for personal vault ingest.")
 
-    content_type = request.headers.get("content-type", "")
-    if not content_type.startswith("multipart/form-data"):
-        raise HTTPException(status_code=400, detail="Expected multipart/form-data")
-    body = await request.body()
-    fields = _parse_multipart(body, content_type)
-
-    file_field = fields.get("file")
-    if not file_field or not file_field.get("value"):
-        raise HTTPException(status_code=400, detail="No file provided")
-    raw = file_field["value"]
-    file_name = file_field.get("filename", "upload")
-    note_type = (fields.get("note_type", {}).get("value", "") or "document").strip() or "document"
-    tags_raw = fields.get("tags", {}).get("value", "")
-    tags = [t.strip() for t in tags_raw.split(",") if t.strip()] if tags_raw else ["personal", "upload"]
-
-    from kernel.doc_extract import extract_text, make_label
-    extracted_text, _mime = extract_text(file_name, raw)
+    async with parse_upload(request) as form:
+        upload = form.files.get("file")
+        if not upload or not upload.size:
+            raise HTTPException(status_code=400, detail="No file provided")
+        file_name = upload.filename
+        note_type = form.fields.get("note_type", "") or "document"
+        tags_raw = form.fields.get("tags", "")
+        tags = [t.strip() for t in tags_raw.split(",") if t.strip()] if tags_raw else ["personal", "upload"]
+
+        from kernel.doc_extract import extract_text, make_label
+        extracted_text, _mime = await asyncio.to_thread(extract_text, file_name, upload.source)
     if not extracted_text.strip():
         raise HTTPException(status_code=400, detail="Could not extract any text from the uploaded file.")
 
@@ -2075,17 +1930,10 @@ async def text_to_speech(request: Request):
             el_key = ""
 
     try:
-        import asyncio
-        from concurrent.futures import ThreadPoolExecutor
-        from kernel.tts import synthesize
-
-        loop     = asyncio.get_event_loop()
-        executor = ThreadPoolExecutor(max_workers=2)
-        audio_bytes, media_type, engine_used = await loop.run_in_executor(
-            executor,
-            lambda: synthesize(text, voice_key, speed, elevenlabs_key=el_key),
+        from kernel.tts import synthesize_async
+        audio_bytes, media_type, engine_used = await synthesize_async(
+            text, voice_key, speed, elevenlabs_key=el_key,
         )
-        executor.shutdown(wait=False)
 
         logger.info(f"[TTS] engine={engine_used} voice={voice_key} {speed}× → {len(audio_bytes)} bytes")
 
@@ -2119,6 +1967,7 @@ async def tts_status():
     """
     import os as _os
     from kernel.tts import VOICES
+    from kernel.tts_cache import get_audio_cache
 
     el_key = _os.environ.get("ELEVENLABS_API_KEY", "").strip()
     pool = {"total": 0, "available": 0, "quota_hit": 0}
@@ -2152,6 +2001,7 @@ async def tts_status():
         "elevenlabs_voices":  elevenlabs_active,
         "key_pool":           pool,
         "preferred_engine":   "elevenlabs" if elevenlabs_active else "edge_tts",
+        "cache":              get_audio_cache().stats(),
     }
 
 
@@ -2759,17 +2609,16 @@ Always speak directly, intelligently and sovereignly. You remember context from
 
     full_prompt = f"{system_prompt}\n\n{conv_context}\nHuman: {message}\nArkana:"
 
-    import httpx, re, json as _json
+    import re, json as _json
 
     model = "gemini-2.0-flash-exp"
     url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={active_key}"
 
     try:
-        async with httpx.AsyncClient(timeout=45) as client:
-            resp = await client.post(url, json={
-                "contents": [{"role": "user", "parts": [{"text": full_prompt}]}],
-                "generationConfig": {"temperature": 0.75, "maxOutputTokens": 2048},
-            })
+        resp = await http_pool.async_client().post(url, json={
+            "contents": [{"role": "user", "parts": [{"text": full_prompt}]}],
+            "generationConfig": {"temperature": 0.75, "maxOutputTokens": 2048},
+        }, timeout=45)
 
         if resp.status_code == 429:
             # Rotate the appropriate key store
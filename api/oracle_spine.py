@@ -12,12 +12,21 @@ surface (Oracle Chat, ReasoMate, NovaNet). This module exists so that:
      longitudinal rather than per-surface.
   3. api/main.py stays within its line budget — the spine logic lives here.
 
+Async chat handlers use build_memory_block_async(): the SQLite work runs on a
+small dedicated executor (ARKADIA_SPINE_WORKERS), and the query embedding on
+its own one with a deadline (ARKADIA_SPINE_EMBED_DEADLINE_S). A late
+embedding degrades retrieval to BM25 keyword ranking instead of stalling the
+reply; the event loop never blocks on either.
+
 ONE INTELLIGENCE SPINE. MANY INTERFACES.
 LAW IV: Oracle retrieves knowledge. Providers generate language.
 """
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 logger = logging.getLogger("arkadia.oracle_spine")
@@ -25,6 +34,14 @@ logger = logging.getLogger("arkadia.oracle_spine")
 ORACLE_PROVIDER = "gemini"
 ARKANA_PERSONA = "arkana"
 
+SPINE_WORKERS = int(os.environ.get("ARKADIA_SPINE_WORKERS", "4"))
+EMBED_DEADLINE_S = float(os.environ.get("ARKADIA_SPINE_EMBED_DEADLINE_S", "1.5"))
+
+# Separate pools: an embedding call stuck past its deadline keeps its thread
+# until the HTTP timeout, and must not hold up the DB reads of other chats.
+_DB_EXECUTOR = ThreadPoolExecutor(max_workers=SPINE_WORKERS, thread_name_prefix="spine-db")
+_EMBED_EXECUTOR = ThreadPoolExecutor(max_workers=SPINE_WORKERS, thread_name_prefix="spine-embed")
+
 
 def resolve_thread_id(session_id: str, user_id: str = "") -> Optional[int]:
     """Map an external session_id onto a Knowledge OS thread id (read-only).
@@ -46,8 +63,14 @@ def resolve_thread_id(session_id: str, user_id: str = "") -> Optional[int]:
 
 def retrieve_arkana_context(message: str, session_id: str = "",
                             token_budget: int = 2000,
-                            user_id: str = "") -> tuple[str, dict]:
-    """Retrieve relevant Knowledge OS context for an incoming Oracle turn."""
+                            user_id: str = "",
+                            query_vec: Optional[list[float]] = None,
+                            embed_query: bool = True) -> tuple[str, dict]:
+    """Retrieve relevant Knowledge OS context for an incoming Oracle turn.
+
+    query_vec / embed_query pass through to assemble_context (a precomputed
+    embedding, or keyword-only retrieval).
+    """
     meta: dict = {
         "session_id": session_id or None,
         "thread_id": None,
@@ -64,6 +87,8 @@ def retrieve_arkana_context(message: str, session_id: str = "",
             thread_id=thread_id,
             token_budget=token_budget,
             user_id=user_id or None,
+            query_vec=query_vec,
+            embed_query=embed_query,
         )
         block = format_context_for_provider(package)
         meta["notes_retrieved"] = len(package.get("relevant_notes", []))
@@ -85,6 +110,12 @@ _MEMORY_HEADER = (
 _MEMORY_FOOTER = "\n== END RETRIEVED MEMORY =="
 
 
+def _wrap_memory(text: str) -> str:
+    if not text or not text.strip():
+        return ""
+    return _MEMORY_HEADER + text + _MEMORY_FOOTER
+
+
 def build_memory_block(message: str, session_id: str = "",
                        token_budget: int = 2000,
                        user_id: str = "") -> tuple[str, dict]:
@@ -92,9 +123,45 @@ def build_memory_block(message: str, session_id: str = "",
     text, meta = retrieve_arkana_context(
         message, session_id, token_budget, user_id=user_id,
     )
-    if not text or not text.strip():
-        return "", meta
-    return _MEMORY_HEADER + text + _MEMORY_FOOTER, meta
+    return _wrap_memory(text), meta
+
+
+def _embed_query(message: str) -> Optional[list[float]]:
+    from knowledge.embeddings import embed_text
+    return embed_text(message, task_type="RETRIEVAL_QUERY")
+
+
+async def build_memory_block_async(message: str, session_id: str = "",
+                                   token_budget: int = 2000,
+                                   user_id: str = "",
+                                   embed_deadline: float = EMBED_DEADLINE_S) -> tuple[str, dict]:
+    """Non-blocking build_memory_block for async handlers.
+
+    The embedding gets *embed_deadline* seconds; after that retrieval runs on
+    keyword ranking and meta["degraded"] is "embedding_timeout".
+    """
+    loop = asyncio.get_running_loop()
+    embed_future = loop.run_in_executor(_EMBED_EXECUTOR, _embed_query, message)
+    degraded = None
+    try:
+        query_vec = await asyncio.wait_for(asyncio.shield(embed_future), embed_deadline)
+    except asyncio.TimeoutError:
+        query_vec, degraded = None, "embedding_timeout"
+        logger.info(f"[SPINE] query embedding exceeded {embed_deadline:g}s — keyword context")
+    except Exception as e:
+        query_vec, degraded = None, "embedding_error"
+        logger.debug(f"[SPINE] query embedding failed: {e}")
+
+    text, meta = await loop.run_in_executor(
+        _DB_EXECUTOR,
+        lambda: retrieve_arkana_context(
+            message, session_id, token_budget, user_id=user_id,
+            query_vec=query_vec, embed_query=False,
+        ),
+    )
+    if degraded:
+        meta["degraded"] = degraded
+    return _wrap_memory(text), meta
 
 
 def archive_oracle_turn(user_input: str, response: str,
@@ -125,6 +192,8 @@ def archive_oracle_turn(user_input: str, response: str,
 __all__ = [
     "resolve_thread_id",
     "retrieve_arkana_context",
+    "build_memory_block",
+    "build_memory_block_async",
     "archive_oracle_turn",
     "ORACLE_PROVIDER",
     "ARKANA_PERSONA",
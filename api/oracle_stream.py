@@ -0,0 +1,157 @@
+"""
+Arkadia Prism — Oracle token streaming
+======================================
+Streaming mode for /api/commune/resonance. The blocking path waits for the
+whole Gemini completion, so time-to-first-byte equals generation time; here
+tokens are forwarded as Server-Sent Events as soon as the provider emits them.
+
+  1. gemini_stream() walks the same (model × key) grid as _gemini_chat, via
+     BaseProvider.stream. Fallback to the next model/key is only possible
+     BEFORE the first token — once text has reached the client the attempt
+     is committed and a failure ends the stream with an ``error`` event.
+  2. oracle_sse() frames chunks as ``delta`` events, finishes with a ``done``
+     event carrying the same metadata as the JSON reply, and archives the
+     full text through archive_oracle_turn after the stream ends.
+
+Requested with ``{"stream": true}`` or ``Accept: text/event-stream``.
+LAW IV: Oracle retrieves knowledge. Providers generate language.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from typing import AsyncIterator, Callable, Iterable
+
+import httpx
+from fastapi.responses import StreamingResponse
+
+from providers.base import BaseProvider, ProviderMessage
+from providers.gemini import GeminiProvider
+
+logger = logging.getLogger("arkadia.oracle_stream")
+
+_MAX_KEY_ATTEMPTS = 8   # same ceiling as _gemini_chat
+
+
+def wants_stream(body: dict, headers) -> bool:
+    return bool(body.get("stream")) or "text/event-stream" in (headers.get("accept") or "")
+
+
+def _is_quota_error(e: Exception) -> bool:
+    return isinstance(e, httpx.HTTPStatusError) and e.response.status_code in (403, 429)
+
+
+async def gemini_stream(
+    messages: list[dict],
+    system: str,
+    api_key: str | None,
+    models: Iterable[str],
+    *,
+    provider_factory: Callable[..., BaseProvider] = GeminiProvider,
+) -> AsyncIterator[str]:
+    """Yield reply chunks, falling back across (model × key) until one starts.
+
+    A quota/access error (429/403) cools the key in api.key_pool and rotates
+    to a fresh one; any other error moves to the next model. Raises when no
+    attempt produced a first token.
+    """
+    from api.key_pool import acquire_key, report_failure, report_success
+
+    pmsgs = [
+        ProviderMessage("assistant" if m.get("role") in ("oracle", "assistant") else "user", m["content"])
+        for m in messages
+    ]
+    models = list(models)
+    tried_keys: set[str] = set()
+    current_key = api_key or acquire_key()
+    last_err = "no Gemini key available"
+    key_attempts = 0
+    while current_key and key_attempts < _MAX_KEY_ATTEMPTS:
+        quota_hit = False
+        for model in models:
+            provider = provider_factory(model=model, api_key=current_key)
+            chunks = provider.stream(pmsgs, system_prompt=system, temperature=0.88, max_tokens=16384)
+            try:
+                first = await chunks.__anext__()
+            except StopAsyncIteration:
+                last_err = f"{model} returned an empty stream"
+                continue
+            except Exception as e:
+                last_err = str(e)
+                if _is_quota_error(e):
+                    quota_hit = True
+                    logger.warning(f"[gemini-stream] {model} quota/access on key {current_key[:4]}… — rotate key")
+                    break
+                logger.warning(f"[gemini-stream] {model} failed before first token: {e}")
+                continue
+            # First token received — committed to this attempt.
+            try:
+                yield first
+                async for chunk in chunks:
+                    yield chunk
+            finally:
+                await chunks.aclose()
+            report_success(current_key)
+            return
+        report_failure(current_key, quota=quota_hit)
+        tried_keys.add(current_key)
+        next_key = acquire_key()
+        if not next_key or next_key in tried_keys:
+            break
+        current_key = next_key
+        key_attempts += 1
+    raise Exception(f"All Gemini models failed. Last error: {last_err}")
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def oracle_sse(
+    chunks: AsyncIterator[str],
+    message: str,
+    session_id: str,
+    user_id: str,
+    extra: dict,
+) -> AsyncIterator[str]:
+    """Frame *chunks* as SSE and archive the completed reply."""
+    parts: list[str] = []
+    try:
+        async for chunk in chunks:
+            parts.append(chunk)
+            yield _sse("delta", {"text": chunk})
+    except Exception as e:
+        logger.error(f"Gemini stream error: {e}")
+        yield _sse("error", {"error": "Oracle field disruption.", "detail": str(e),
+                             "partial": bool(parts)})
+        return
+    reply = "".join(parts)
+    from api.oracle_spine import archive_oracle_turn
+    threading.Thread(
+        target=archive_oracle_turn,
+        args=(message, reply, session_id, user_id),
+        daemon=True,
+    ).start()
+    yield _sse("done", {"resonance": round(0.7 + (len(reply) % 30) / 100, 3), **extra})
+
+
+def oracle_stream_response(
+    messages: list[dict],
+    system: str,
+    api_key: str | None,
+    models: Iterable[str],
+    *,
+    message: str,
+    session_id: str,
+    user_id: str,
+    extra: dict,
+) -> StreamingResponse:
+    return StreamingResponse(
+        oracle_sse(gemini_stream(messages, system, api_key, models), message, session_id, user_id, extra),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+__all__ = ["gemini_stream", "oracle_sse", "oracle_stream_response", "wants_stream"]
@@ -10,17 +10,30 @@ Keying:
   - Anonymous: client IP (X-Forwarded-For first hop, else client host)
 
 Returns 429 + Retry-After when exceeded.
+
+Each key is a token bucket: capacity max_requests, refilled continuously at
+max_requests/window. That allows the same bursts as the old sliding window
+but keeps O(1) state per key. Backends (ARKADIA_RL_BACKEND):
+  - memory (default): buckets split across lock shards by key hash, each
+    shard an LRU. A bucket idle for a full window is full again, so it is
+    evicted; ARKADIA_RL_MAX_KEYS caps tracked keys (least recently seen go
+    first).
+  - sqlite: one shared bucket table (ARKADIA_RL_DB) so several uvicorn
+    workers enforce a single limit; each check is one atomic UPSERT.
 """
 from __future__ import annotations
 
 import base64
 import json
 import logging
+import math
 import os
+import sqlite3
 import threading
 import time
-from collections import defaultdict, deque
-from typing import Callable, Deque, Optional
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional
 
 try:
     from starlette.middleware.base import BaseHTTPMiddleware
@@ -56,11 +69,6 @@ EXEMPT_PREFIXES = (
     "/favicon",
 )
 
-_lock = threading.Lock()
-# key → deque of request timestamps
-_buckets: dict[str, Deque[float]] = defaultdict(deque)
-
-
 def _env_int(name: str, default: int) -> int:
     try:
         return int(os.environ.get(name, str(default)).strip())
@@ -139,25 +147,204 @@ def _is_exempt(path: str) -> bool:
     return any(path.startswith(p) for p in EXEMPT_PREFIXES)
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Backends
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _retry_after(tokens: float, rate: float) -> int:
+    return max(int(math.ceil((1.0 - tokens) / rate)), 1)
+
+
+class _Shard:
+    __slots__ = ("lock", "buckets")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        # key → [tokens, updated_at, window]; least recently seen first
+        self.buckets: "OrderedDict[str, list]" = OrderedDict()
+
+
+class MemoryBackend:
+    """Per-process token buckets behind sharded locks, with eviction."""
+
+    name = "memory"
+
+    def __init__(self, max_keys: int = 100_000, shards: int = 32) -> None:
+        self.max_keys = max(max_keys, shards)
+        self.per_shard = self.max_keys // shards
+        self._shards = [_Shard() for _ in range(shards)]
+        self.evicted_idle = 0
+        self.evicted_cap = 0
+
+    def check(self, key: str, max_requests: int, window: int) -> tuple[bool, int]:
+        now = time.time()
+        rate = max_requests / window
+        shard = self._shards[hash(key) % len(self._shards)]
+        with shard.lock:
+            buckets = shard.buckets
+            bucket = buckets.get(key)
+            if bucket is None:
+                self._make_room(buckets, now)
+                buckets[key] = [max_requests - 1.0, now, window]
+                return True, 0
+            buckets.move_to_end(key)
+            tokens = min(float(max_requests), bucket[0] + (now - bucket[1]) * rate)
+            bucket[1], bucket[2] = now, window
+            if tokens >= 1.0:
+                bucket[0] = tokens - 1.0
+                return True, 0
+            bucket[0] = tokens
+            return False, _retry_after(tokens, rate)
+
+    def _make_room(self, buckets: OrderedDict, now: float) -> None:
+        # Oldest first: a bucket untouched for its whole window has refilled
+        # and is indistinguishable from a missing one.
+        while buckets:
+            _, (_, updated, window) = next(iter(buckets.items()))
+            if now - updated < window:
+                break
+            buckets.popitem(last=False)
+            self.evicted_idle += 1
+        while len(buckets) >= self.per_shard:
+            buckets.popitem(last=False)
+            self.evicted_cap += 1
+
+    def reset(self) -> None:
+        for shard in self._shards:
+            with shard.lock:
+                shard.buckets.clear()
+        self.evicted_idle = self.evicted_cap = 0
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.name,
+            "tracked_keys": sum(len(s.buckets) for s in self._shards),
+            "max_keys": self.max_keys,
+            "evicted_idle": self.evicted_idle,
+            "evicted_cap": self.evicted_cap,
+        }
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rl_buckets (
+    key     TEXT PRIMARY KEY,
+    tokens  REAL NOT NULL,
+    updated REAL NOT NULL,
+    ok      INTEGER NOT NULL,
+    full_at REAL NOT NULL          -- when the bucket is full again (evictable)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_rl_buckets_full_at ON rl_buckets(full_at);
+"""
+
+# :r is the refilled token count, spelled out because SET expressions all see
+# the old row. One statement, so concurrent workers serialise on SQLite's
+# write lock instead of racing a read-modify-write.
+_REFILLED = "MIN(:cap, tokens + MAX(0.0, :now - updated) * :rate)"
+_SQLITE_CHECK = f"""
+INSERT INTO rl_buckets (key, tokens, updated, ok, full_at)
+VALUES (:key, :cap - 1.0, :now, 1, :now + 1.0 / :rate)
+ON CONFLICT(key) DO UPDATE SET
+    tokens  = {_REFILLED} - ({_REFILLED} >= 1.0),
+    updated = MAX(updated, :now),
+    ok      = ({_REFILLED} >= 1.0),
+    full_at = :now + (:cap - ({_REFILLED} - ({_REFILLED} >= 1.0))) / :rate
+RETURNING tokens, ok
+"""
+
+
+class SQLiteBackend:
+    """Token buckets in a SQLite file shared by every worker process."""
+
+    name = "sqlite"
+    SWEEP_INTERVAL_S = 30.0
+
+    def __init__(self, path: str, max_keys: int = 100_000) -> None:
+        if sqlite3.sqlite_version_info < (3, 35):
+            raise sqlite3.NotSupportedError(f"UPSERT ... RETURNING needs SQLite 3.35+, have {sqlite3.sqlite_version}")
+        self.path = path
+        self.max_keys = max_keys
+        self._local = threading.local()
+        self._next_sweep = 0.0
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn().executescript(_SQLITE_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def check(self, key: str, max_requests: int, window: int) -> tuple[bool, int]:
+        now = time.time()
+        rate = max_requests / window
+        conn = self._conn()
+        tokens, ok = conn.execute(
+            _SQLITE_CHECK, {"key": key, "cap": float(max_requests), "now": now, "rate": rate}
+        ).fetchone()
+        if now >= self._next_sweep:
+            self._next_sweep = now + self.SWEEP_INTERVAL_S
+            self._sweep(conn, now)
+        return (True, 0) if ok else (False, _retry_after(tokens, rate))
+
+    def _sweep(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM rl_buckets WHERE full_at <= ?", (now,))
+        excess = conn.execute("SELECT COUNT(*) FROM rl_buckets").fetchone()[0] - self.max_keys
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM rl_buckets WHERE key IN "
+                "(SELECT key FROM rl_buckets ORDER BY full_at LIMIT ?)", (excess,)
+            )
+
+    def reset(self) -> None:
+        self._conn().execute("DELETE FROM rl_buckets")
+
+    def stats(self) -> dict:
+        n = self._conn().execute("SELECT COUNT(*) FROM rl_buckets").fetchone()[0]
+        return {"backend": self.name, "tracked_keys": n, "max_keys": self.max_keys, "path": self.path}
+
+
+def _make_backend():
+    kind = os.environ.get("ARKADIA_RL_BACKEND", "memory").strip().lower()
+    max_keys = _env_int("ARKADIA_RL_MAX_KEYS", 100_000)
+    if kind == "sqlite":
+        default = Path(os.environ.get("SOLSPIRE_DATA_DIR", "data")) / "rate_limit.db"
+        path = os.environ.get("ARKADIA_RL_DB", "").strip() or str(default)
+        try:
+            return SQLiteBackend(path, max_keys=max_keys)
+        except sqlite3.Error as e:
+            logger.warning("[RL] sqlite backend unavailable (%s) — using memory", e)
+    elif kind != "memory":
+        logger.warning("[RL] unknown ARKADIA_RL_BACKEND=%s — using memory", kind)
+    return MemoryBackend(max_keys=max_keys)
+
+
+_backend = _make_backend()
+
+
+def set_backend(backend) -> None:
+    """Swap the process-wide backend (tests, or an app factory wiring its own)."""
+    global _backend
+    _backend = backend
+
+
 def check_rate_limit(key: str, max_requests: int, window: int) -> tuple[bool, int]:
     """Return (allowed, retry_after_seconds)."""
-    now = time.time()
-    with _lock:
-        bucket = _buckets[key]
-        cutoff = now - window
-        while bucket and bucket[0] < cutoff:
-            bucket.popleft()
-        if len(bucket) >= max_requests:
-            retry = int(window - (now - bucket[0])) + 1
-            return False, max(retry, 1)
-        bucket.append(now)
-        return True, 0
+    if max_requests <= 0:
+        return False, max(int(window), 1)
+    return _backend.check(key, max_requests, window)
+
+
+def rate_limit_stats() -> dict:
+    """Tracked keys and evictions for the active backend."""
+    return _backend.stats()
 
 
 def reset_rate_limit_state() -> None:
     """Test helper — clear all buckets."""
-    with _lock:
-        _buckets.clear()
+    _backend.reset()
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
@@ -0,0 +1,190 @@
+"""
+Arkadia — Corpus Scroll Index
+=============================
+Inverted index behind the Oracle's corpus RAG (api/main.py::_rag_context), so a
+chat request ranks scrolls from postings instead of substring-scanning every
+scroll's full text.
+
+    refresh(scrolls)        — after a corpus refresh: rebuild off the event loop
+                              and swap the live index in one assignment
+    search(query, scrolls)  — top scrolls for a query, read from *scrolls*
+
+Each scroll's label, description, preview and content are tokenised into
+lowercase words of 3+ characters (the query-word rule _rag_context always
+used). A query word matches the vocabulary terms it is a prefix of
+("resonan" → "resonance", "resonant"). This is narrower than the old substring
+test: mid-word matches are gone ("sonance" no longer finds "resonance"). A
+word with many expansions keeps the exact term plus the most widespread
+longer terms (by document frequency), up to MAX_PREFIX_EXPANSIONS. Ranking:
+most query words matched first, then Okapi BM25.
+
+A refresh with unchanged scroll text (the common case: the 60s cache TTL
+re-lists an unchanged repository) reuses the current index. When text does
+change, unchanged scrolls reuse their cached term counts and only the changed
+ones are re-tokenised. Scrolls the index has not seen yet (direct uploads, or
+a refresh still building) are scored on the fly with the same formula.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import math
+import re
+import time
+from collections import Counter
+from typing import Optional
+
+logger = logging.getLogger("arkadia.scroll_index")
+
+K1 = 1.5
+B = 0.75
+MAX_PREFIX_EXPANSIONS = 64
+
+_WORD = re.compile(r"\w{3,}")
+
+
+def _fingerprint(s: dict) -> int:
+    return hash((s.get("label", ""), s.get("description", ""), s.get("preview", ""), s.get("content", "")))
+
+
+def _terms(s: dict) -> Counter:
+    haystack = (
+        s.get("label", "") + " " +
+        s.get("description", "") + " " +
+        s.get("preview", "") + " " +
+        s.get("content", "")
+    ).lower()
+    return Counter(_WORD.findall(haystack))
+
+
+def _eligible(s: dict) -> bool:
+    return bool(s.get("content") or s.get("preview"))
+
+
+class ScrollIndex:
+    """Immutable once built; refresh() replaces it wholesale."""
+
+    def __init__(self, scrolls: list[dict], previous: Optional["ScrollIndex"] = None) -> None:
+        reuse = previous.doc_terms if previous else {}
+        reuse_fp = previous.fingerprints if previous else {}
+        self.fingerprints: dict[str, int] = {}
+        self.doc_terms: dict[str, Counter] = {}
+        self.lengths: dict[str, int] = {}
+        self.postings: dict[str, dict[str, int]] = {}
+        retokenised = 0
+        for s in scrolls:
+            if not _eligible(s):
+                continue
+            sid = s["id"]
+            fp = _fingerprint(s)
+            terms = reuse.get(sid) if reuse_fp.get(sid) == fp else None
+            if terms is None:
+                terms = _terms(s)
+                retokenised += 1
+            self.fingerprints[sid] = fp
+            self.doc_terms[sid] = terms
+            self.lengths[sid] = sum(terms.values())
+            for term, tf in terms.items():
+                self.postings.setdefault(term, {})[sid] = tf
+        self.vocab = sorted(self.postings)
+        self.n_docs = len(self.lengths)
+        self.avg_len = max(sum(self.lengths.values()) / self.n_docs, 1.0) if self.n_docs else 1.0
+        self.retokenised = retokenised
+
+    def same_text(self, fingerprints: dict[str, int]) -> bool:
+        return fingerprints == self.fingerprints
+
+    def expand(self, word: str) -> list[str]:
+        """Vocabulary terms starting with *word*: the exact term, then the
+        longer terms found in the most scrolls, MAX_PREFIX_EXPANSIONS in all."""
+        exact = [word] if word in self.postings else []
+        i = bisect.bisect_left(self.vocab, word) + len(exact)
+        j = bisect.bisect_left(self.vocab, word + "\U0010ffff", i)
+        longer = self.vocab[i:j]
+        room = MAX_PREFIX_EXPANSIONS - len(exact)
+        if len(longer) > room:
+            longer = sorted(longer, key=lambda t: -len(self.postings[t]))[:room]
+        return exact + longer
+
+    def idf(self, term: str) -> float:
+        df = len(self.postings.get(term, ()))
+        return math.log(1 + (self.n_docs - df + 0.5) / (df + 0.5))
+
+    def bm25(self, tf: int, length: int) -> float:
+        return tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / self.avg_len))
+
+
+_EMPTY = ScrollIndex([])
+_index: ScrollIndex = _EMPTY
+
+
+def _rebuild(scrolls: list[dict]) -> ScrollIndex:
+    global _index
+    current = _index
+    fingerprints = {s["id"]: _fingerprint(s) for s in scrolls if _eligible(s)}
+    if current.n_docs and current.same_text(fingerprints):
+        return current
+    t0 = time.perf_counter()
+    fresh = ScrollIndex(scrolls, previous=current)
+    _index = fresh                                  # atomic swap
+    logger.info(
+        f"[SCROLL-INDEX] {fresh.n_docs} scrolls, {len(fresh.vocab)} terms "
+        f"({fresh.retokenised} re-tokenised) in {(time.perf_counter() - t0) * 1000:.0f} ms"
+    )
+    return fresh
+
+
+async def refresh(scrolls: dict) -> None:
+    """Re-index after a corpus refresh without blocking the event loop."""
+    await asyncio.to_thread(_rebuild, list(scrolls.values()))
+
+
+def search(query: str, scrolls: dict, top_n: int = 5) -> list[dict]:
+    """Best-matching scrolls from *scrolls* for *query*, best first."""
+    words = set(_WORD.findall(query.lower()))
+    if not words or not scrolls:
+        return []
+    index = _index
+
+    coverage: Counter = Counter()
+    scores: dict[str, float] = {}
+    for word in words:
+        matched: set[str] = set()
+        for term in index.expand(word):
+            idf = index.idf(term)
+            for sid, tf in index.postings[term].items():
+                scores[sid] = scores.get(sid, 0.0) + idf * index.bm25(tf, index.lengths[sid])
+                matched.add(sid)
+        coverage.update(matched)
+
+    # Scrolls the index has not seen: same scoring, tokenised on the fly.
+    for sid in scrolls.keys() - index.lengths.keys():
+        s = scrolls[sid]
+        if not _eligible(s):
+            continue
+        terms = _terms(s)
+        length = sum(terms.values())
+        for word in words:
+            hits = [(t, tf) for t, tf in terms.items() if t.startswith(word)]
+            if hits:
+                coverage[sid] += 1
+                scores[sid] = scores.get(sid, 0.0) + sum(index.idf(t) * index.bm25(tf, length) for t, tf in hits)
+
+    ranked = sorted(coverage, key=lambda sid: (-coverage[sid], -scores[sid]))
+    out = []
+    for sid in ranked:
+        s = scrolls.get(sid)
+        if s is not None and _eligible(s):
+            out.append(s)
+            if len(out) >= top_n:
+                break
+    return out
+
+
+def stats() -> dict:
+    index = _index
+    return {"scrolls": index.n_docs, "terms": len(index.vocab), "avg_length": round(index.avg_len, 1)}
+
+
+__all__ = ["ScrollIndex", "refresh", "search", "stats"]
@@ -0,0 +1,201 @@
+"""
+Arkadia — Incremental GitHub scroll sync
+========================================
+Fetches the corpus tree and the raw scroll files behind /api/scrolls.
+
+Requests share the process-wide pool (providers/http_pool.py), so keep-alive
+connections to api.github.com and raw.githubusercontent.com outlive a sync.
+At most _FETCH_CONCURRENCY raw downloads in flight. Change detection,
+cheapest first:
+
+  1. Tree request carries If-None-Match (stored tree ETag) → 304 means the
+     whole corpus is unchanged and is served from corpus_file_state.
+  2. Same tree SHA as last time → unchanged, no file requests.
+  3. Per file: blob SHA equal to the stored one → skipped. Otherwise the raw
+     file is fetched with If-None-Match (stored raw ETag); 304 reuses the body.
+
+Validators and bodies persist in data/runtime.db (kernel/storage/
+corpus_sync_store.py), so a restart does not trigger a full re-download.
+A no-change sync costs exactly one tree request.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+import httpx
+
+from kernel.storage.corpus_sync_store import CorpusSyncStore
+from providers import http_pool
+
+logger = logging.getLogger("arkadia.scroll_sync")
+
+_FETCH_CONCURRENCY = 8
+_TREE_TIMEOUT = 15
+_RAW_TIMEOUT = 12
+
+_store: CorpusSyncStore | None = None
+
+
+def _get_store() -> CorpusSyncStore:
+    global _store
+    if _store is None:
+        _store = CorpusSyncStore()
+    return _store
+
+
+@dataclass
+class SyncResult:
+    """Outcome of one sync. ``files`` maps path → {content, error, fetched_at}."""
+    items:        list[dict] = field(default_factory=list)   # corpus blobs {path, sha}
+    files:        dict[str, dict] = field(default_factory=dict)
+    unchanged:    bool = False
+    fetched:      int = 0    # raw 200 responses
+    not_modified: int = 0    # raw 304 responses
+    errors:       int = 0
+
+
+def _from_store(known: dict[str, dict], paths: list[str] | None = None) -> SyncResult:
+    paths = sorted(known) if paths is None else paths
+    return SyncResult(
+        items=[{"path": p, "sha": known[p]["file_sha"]} for p in paths],
+        files={
+            p: {"content": known[p]["content"] or "", "error": None,
+                "fetched_at": known[p]["ingested_at"] if known[p]["content"] is not None else None}
+            for p in paths
+        },
+        unchanged=True,
+    )
+
+
+async def _fetch_raw(
+    client: httpx.AsyncClient,
+    sem: asyncio.Semaphore,
+    url: str,
+    headers: dict,
+    prior: dict | None,
+) -> tuple[int, str, str | None, str | None]:
+    """Conditional GET of one raw file → (status, body, etag, error)."""
+    req_headers = dict(headers)
+    if prior and prior.get("etag") and prior.get("content") is not None:
+        req_headers["If-None-Match"] = prior["etag"]
+    async with sem:
+        try:
+            resp = await client.get(url, headers=req_headers, timeout=_RAW_TIMEOUT)
+            if resp.status_code == 304 and prior:
+                return 304, prior["content"], prior["etag"], None
+            resp.raise_for_status()
+            return 200, resp.text, resp.headers.get("ETag"), None
+        except Exception as e:
+            return 0, "", None, str(e)
+
+
+async def sync_corpus(
+    repo: str,
+    branch: str,
+    token: str,
+    *,
+    is_corpus_file: Callable[[str], bool],
+    is_readable: Callable[[str], bool],
+    client: httpx.AsyncClient | None = None,
+    store: CorpusSyncStore | None = None,
+    concurrency: int = _FETCH_CONCURRENCY,
+) -> SyncResult:
+    """Bring the corpus up to date with as few GitHub requests as possible.
+
+    Raises on tree-request failure so callers can fall back to local docs.
+    Per-file failures are reported in ``files[path]["error"]`` and retried
+    on the next sync.
+    """
+    store = store or _get_store()
+    repo_key = f"{repo}:{branch}"
+    state = store.tree_state(repo_key)
+    known = store.files(repo_key)
+
+    api_headers = {"Accept": "application/vnd.github.v3+json"}
+    raw_headers: dict = {}
+    if token:
+        api_headers["Authorization"] = raw_headers["Authorization"] = f"Bearer {token}"
+
+    client = client or http_pool.async_client()
+    tree_headers = dict(api_headers)
+    if state and state.get("etag") and known:
+        tree_headers["If-None-Match"] = state["etag"]
+    resp = await client.get(
+        f"https://api.github.com/repos/{repo}/git/trees/{branch}?recursive=1",
+        headers=tree_headers,
+        timeout=_TREE_TIMEOUT,
+    )
+    if resp.status_code == 304:
+        store.touch_tree(repo_key)
+        return _from_store(known)
+    resp.raise_for_status()
+    body = resp.json()
+    tree_sha = body.get("sha") or ""
+    etag = resp.headers.get("ETag")
+    items = [
+        {"path": it["path"], "sha": it.get("sha", "")}
+        for it in body.get("tree", [])
+        if it.get("type") == "blob" and is_corpus_file(it.get("path", ""))
+    ]
+    paths = [it["path"] for it in items]
+
+    if state and tree_sha and tree_sha == state["tree_sha"] and all(p in known for p in paths):
+        store.save_tree(repo_key, tree_sha, etag, len(items))
+        return _from_store(known, paths)
+
+    result = SyncResult(items=items)
+    rows: list[dict] = []
+    todo: list[dict] = []
+    now = time.time()
+    for it in items:
+        prior = known.get(it["path"])
+        if prior and prior["file_sha"] == it["sha"]:
+            result.files[it["path"]] = {
+                "content": prior["content"] or "", "error": None,
+                "fetched_at": prior["ingested_at"] if prior["content"] is not None else None,
+            }
+        elif not is_readable(it["path"]):
+            # Binary file (docx, pdf) — metadata only, nothing to download
+            result.files[it["path"]] = {"content": "", "error": None, "fetched_at": None}
+            rows.append({"path": it["path"], "file_sha": it["sha"], "etag": None, "content": None})
+        else:
+            todo.append(it)
+
+    sem = asyncio.Semaphore(concurrency)
+    fetched = await asyncio.gather(*(
+        _fetch_raw(
+            client, sem,
+            f"https://raw.githubusercontent.com/{repo}/{branch}/{it['path']}",
+            raw_headers, known.get(it["path"]),
+        )
+        for it in todo
+    ))
+    for it, (status, content, raw_etag, error) in zip(todo, fetched):
+        if error:
+            result.errors += 1
+            result.files[it["path"]] = {"content": "", "error": error, "fetched_at": None}
+            continue
+        if status == 304:
+            result.not_modified += 1
+        else:
+            result.fetched += 1
+        result.files[it["path"]] = {"content": content, "error": None, "fetched_at": now}
+        rows.append({"path": it["path"], "file_sha": it["sha"], "etag": raw_etag, "content": content})
+
+    store.save_files(repo_key, rows, keep_paths=set(paths))
+    if not result.errors:
+        # Only a complete sync may short-circuit the next one on tree SHA/ETag
+        store.save_tree(repo_key, tree_sha, etag, len(items))
+    logger.info(
+        f"[SCROLL-SYNC] {len(items)} files: {result.fetched} fetched, "
+        f"{result.not_modified} not modified, {result.errors} errors, "
+        f"{len(items) - len(todo)} skipped by SHA"
+    )
+    return result
+
+
+__all__ = ["SyncResult", "sync_corpus"]
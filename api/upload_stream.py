@@ -0,0 +1,197 @@
+"""
+Arkadia — Streaming Multipart Uploads
+=====================================
+Parses multipart/form-data request bodies as they arrive instead of buffering
+the whole body with `await request.body()` and splitting it by hand.
+
+    async with parse_upload(request) as form:
+        upload = form.files.get("file")        # UploadedFile | None
+        form.fields.get("category", "")         # decoded, stripped text
+        extract_text(upload.filename, upload.source)
+
+Each file part is kept in memory up to SPOOL_BYTES, then rolled to a
+temporary file; `UploadedFile.source` is the bytes or that file's path, which
+kernel.doc_extract accepts either way. Temporary files are removed when the
+`async with` block exits.
+
+Limits are enforced while reading, so an oversized upload is refused before
+it is stored: a declared Content-Length above MAX_UPLOAD_BYTES fails
+immediately, and the running byte count stops the stream at the cap either
+way (413). Text fields are capped at MAX_FIELD_BYTES, parts at MAX_PARTS.
+
+Configuration (environment):
+    ARKADIA_UPLOAD_MAX_BYTES     whole request body        (268435456 = 256 MB)
+    ARKADIA_UPLOAD_SPOOL_BYTES   in-memory size per file   (1048576 = 1 MB)
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+import urllib.parse
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Union
+
+from fastapi import HTTPException, Request
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+MAX_UPLOAD_BYTES = int(os.getenv("ARKADIA_UPLOAD_MAX_BYTES", str(256 << 20)))
+SPOOL_BYTES = int(os.getenv("ARKADIA_UPLOAD_SPOOL_BYTES", str(1 << 20)))
+MAX_FIELD_BYTES = 64 << 10
+MAX_PARTS = 32
+
+
+class UploadedFile:
+    """One file part: in memory while small, a temporary file past SPOOL_BYTES."""
+
+    def __init__(self, field: str, filename: str) -> None:
+        self.field = field
+        self.filename = filename
+        self.size = 0
+        self._buffer: Optional[bytearray] = bytearray()
+        self._file = None
+        self.path: Optional[str] = None
+
+    def write(self, data: bytes) -> None:
+        self.size += len(data)
+        if self._buffer is not None and len(self._buffer) + len(data) <= SPOOL_BYTES:
+            self._buffer += data
+            return
+        if self._file is None:
+            self._file = tempfile.NamedTemporaryFile(prefix="arkadia-upload-", delete=False)
+            self.path = self._file.name
+            self._file.write(self._buffer)
+            self._buffer = None
+        self._file.write(data)
+
+    def finish(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+    @property
+    def source(self) -> Union[bytes, str]:
+        """The file's bytes, or the path of its spooled copy."""
+        return bytes(self._buffer) if self._buffer is not None else self.path
+
+    def cleanup(self) -> None:
+        self.finish()
+        if self.path:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+
+class UploadForm:
+    def __init__(self) -> None:
+        self.fields: dict[str, str] = {}
+        self.files: dict[str, UploadedFile] = {}
+
+    def cleanup(self) -> None:
+        for f in self.files.values():
+            f.cleanup()
+
+
+def _too_large(limit: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"Upload exceeds {limit} bytes.")
+
+
+class _Collector:
+    """python-multipart callbacks that route each part into an UploadForm."""
+
+    def __init__(self, form: UploadForm) -> None:
+        self.form = form
+        self.parts = 0
+        self._header_field = bytearray()
+        self._header_value = bytearray()
+        self._disposition = b""
+        self._name = ""
+        self._file: Optional[UploadedFile] = None
+        self._value: Optional[bytearray] = None
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": lambda d, s, e: self._header_field.extend(d[s:e]),
+            "on_header_value": lambda d, s, e: self._header_value.extend(d[s:e]),
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def on_part_begin(self) -> None:
+        self.parts += 1
+        if self.parts > MAX_PARTS:
+            raise HTTPException(status_code=413, detail=f"More than {MAX_PARTS} form parts.")
+        self._disposition, self._file, self._value = b"", None, None
+
+    def on_header_end(self) -> None:
+        if bytes(self._header_field).lower() == b"content-disposition":
+            self._disposition = bytes(self._header_value)
+        self._header_field.clear()
+        self._header_value.clear()
+
+    def on_headers_finished(self) -> None:
+        _, params = parse_options_header(self._disposition)
+        self._name = params.get(b"name", b"").decode("utf-8", errors="ignore")
+        if b"filename" in params:
+            filename = urllib.parse.unquote(params[b"filename"].decode("utf-8", errors="ignore")) or "upload"
+            self._file = UploadedFile(self._name or "file", filename)
+            old = self.form.files.pop(self._file.field, None)
+            if old is not None:
+                old.cleanup()
+            self.form.files[self._file.field] = self._file
+        else:
+            self._value = bytearray()
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._file is not None:
+            self._file.write(data[start:end])
+        elif self._value is not None:
+            if len(self._value) + end - start > MAX_FIELD_BYTES:
+                raise HTTPException(status_code=413, detail=f"Form field exceeds {MAX_FIELD_BYTES} bytes.")
+            self._value += data[start:end]
+
+    def on_part_end(self) -> None:
+        if self._file is not None:
+            self._file.finish()
+        elif self._value is not None and self._name:
+            self.form.fields[self._name] = self._value.decode("utf-8", errors="ignore").strip()
+
+
+@asynccontextmanager
+async def parse_upload(request: Request, max_bytes: Optional[int] = None) -> AsyncIterator[UploadForm]:
+    """Stream *request*'s multipart body into an UploadForm; temp files live for the block."""
+    limit = MAX_UPLOAD_BYTES if max_bytes is None else max_bytes
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=400, detail="Expected multipart/form-data")
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > limit:
+        raise _too_large(limit)
+
+    form = UploadForm()
+    try:
+        parser = MultipartParser(boundary, _Collector(form).callbacks())
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > limit:
+                raise _too_large(limit)
+            parser.write(chunk)
+        parser.finalize()
+    except MultipartParseError as e:
+        form.cleanup()
+        raise HTTPException(status_code=400, detail=f"Malformed multipart body: {e}")
+    except BaseException:
+        form.cleanup()
+        raise
+    try:
+        yield form
+    finally:
+        form.cleanup()
+
+
+__all__ = ["MAX_UPLOAD_BYTES", "SPOOL_BYTES", "UploadForm", "UploadedFile", "parse_upload"]
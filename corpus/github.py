@@ -32,7 +32,8 @@ Optional manifest:
 """
 
 import os
-import requests
+
+from providers import http_pool
 from .base import BaseCorpusSource, CorpusDoc
 
 try:
@@ -94,7 +95,7 @@ class GitHubSource(BaseCorpusSource):
     def _load_manifest(self):
         try:
             url = f"{self._raw_base}/corpus-manifest.json"
-            r = requests.get(url, headers=self._headers(), timeout=10)
+            r = http_pool.sync_client().get(url, headers=self._headers(), timeout=10, follow_redirects=True)
             if r.status_code == 200:
                 self._manifest = r.json()
                 print(f"[GitHub] Manifest loaded — {len(self._manifest)} entries.")
@@ -133,7 +134,7 @@ class GitHubSource(BaseCorpusSource):
 
         try:
             url = f"{self._api_base}/git/trees/{self.branch}?recursive=1"
-            r = requests.get(url, headers=self._headers(), timeout=15)
+            r = http_pool.sync_client().get(url, headers=self._headers(), timeout=15, follow_redirects=True)
             r.raise_for_status()
             tree = r.json().get("tree", [])
         except Exception as e:
@@ -170,6 +171,6 @@ class GitHubSource(BaseCorpusSource):
     def fetch_content(self, doc: CorpusDoc) -> str:
         path = doc.meta.get("path", doc.id)
         url = f"{self._raw_base}/{path}"
-        r = requests.get(url, headers=self._headers(), timeout=12)
+        r = http_pool.sync_client().get(url, headers=self._headers(), timeout=12, follow_redirects=True)
         r.raise_for_status()
         return r.text
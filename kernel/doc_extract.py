@@ -5,53 +5,77 @@ extraction logic serves both the public Spiral Codex upload and personal
 Knowledge OS / SolSpire project file ingestion. Returns plain text; binary
 formats that cannot be parsed fall back to a placeholder marker so the
 upload still succeeds and the file is indexed.
+
+``raw`` is either the file's bytes or a path to it. Uploads large enough to
+be spooled to disk (api/upload_stream.py) are passed as a path, so PyPDF2 and
+python-docx read the file themselves instead of from a second in-memory copy.
 """
 from __future__ import annotations
 
 import io
-from typing import Tuple
+import os
+from typing import BinaryIO, Tuple, Union
+
+Source = Union[bytes, str, os.PathLike]
+
+
+def _size(raw: Source) -> int:
+    return len(raw) if isinstance(raw, (bytes, bytearray)) else os.path.getsize(raw)
+
+
+def _open(raw: Source) -> BinaryIO:
+    return io.BytesIO(raw) if isinstance(raw, (bytes, bytearray)) else open(raw, "rb")
+
+
+def _decode(raw: Source) -> str:
+    if isinstance(raw, (bytes, bytearray)):
+        return raw.decode("utf-8", errors="ignore")
+    with open(raw, "r", encoding="utf-8", errors="ignore") as f:
+        return f.read()
 
 
-def extract_text(file_name: str, raw: bytes) -> Tuple[str, str]:
-    """Return (extracted_text, mime_type) for an uploaded file."""
+def extract_text(file_name: str, raw: Source) -> Tuple[str, str]:
+    """Return (extracted_text, mime_type) for an uploaded file (bytes or path)."""
     name = (file_name or "").lower()
     if name.endswith(".md"):
-        return raw.decode("utf-8", errors="ignore"), "text/markdown"
+        return _decode(raw), "text/markdown"
     if name.endswith(".txt"):
-        return raw.decode("utf-8", errors="ignore"), "text/plain"
+        return _decode(raw), "text/plain"
 
     if name.endswith(".docx"):
         try:
             from docx import Document
-            doc = Document(io.BytesIO(raw))
+            with _open(raw) as f:
+                doc = Document(f)
             text = "\n\n".join(p.text for p in doc.paragraphs if p.text.strip())
             if text:
                 return text, "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
         except Exception:
             pass
-        return (f"[DOCX FILE: {file_name} - {len(raw)} bytes]\n[Install python-docx for full text extraction.]",
+        return (f"[DOCX FILE: {file_name} - {_size(raw)} bytes]\n[Install python-docx for full text extraction.]",
                 "application/vnd.openxmlformats-officedocument.wordprocessingml.document")
 
     if name.endswith(".pdf"):
         try:
             import PyPDF2
-            reader = PyPDF2.PdfReader(io.BytesIO(raw))
-            text = "\n\n".join((page.extract_text() or "") for page in reader.pages)
+            with _open(raw) as f:
+                reader = PyPDF2.PdfReader(f)
+                text = "\n\n".join((page.extract_text() or "") for page in reader.pages)
             if text:
                 return text, "application/pdf"
         except Exception:
             pass
-        return (f"[PDF FILE: {file_name} - {len(raw)} bytes]\n[Install PyPDF2 for full text extraction.]",
+        return (f"[PDF FILE: {file_name} - {_size(raw)} bytes]\n[Install PyPDF2 for full text extraction.]",
                 "application/pdf")
 
     if name.endswith(".html") or name.endswith(".htm"):
-        return raw.decode("utf-8", errors="ignore"), "text/html"
+        return _decode(raw), "text/html"
 
     if name.endswith(".json"):
-        return raw.decode("utf-8", errors="ignore"), "application/json"
+        return _decode(raw), "application/json"
 
     # Last resort: try as plain text.
-    return raw.decode("utf-8", errors="ignore"), "application/octet-stream"
+    return _decode(raw), "application/octet-stream"
 
 
 def make_label(file_name: str) -> str:
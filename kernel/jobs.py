@@ -18,8 +18,10 @@ Phase 5 wraps that kernel call in a job:
           user polls /api/job/{id} or gets notified
 
 This file owns:
+  • get_store() — the process-wide store. SQLite (kernel/storage/
+    sqlite_job_store.py) by default; SOLSPIRE_JOB_STORE=json selects the
+    legacy in-memory JobStore for rollback
   • The in-memory JobStore (thread-safe, with optional JSON snapshots)
-  • The pending-job queue
   • The Job dict shape
 
 The worker loop itself lives in kernel/worker.py so this module stays
@@ -33,7 +35,10 @@ import queue
 import threading
 import time
 import uuid
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from kernel.storage.sqlite_job_store import SQLiteJobStore
 
 # ── Job lifecycle states ────────────────────────────────────────────────────
 PENDING   = "pending"
@@ -237,16 +242,35 @@ class JobStore:
 
 
 # ── module-level singleton ──────────────────────────────────────────────────
-_store: JobStore | None = None
+_store: JobStore | SQLiteJobStore | None = None
 _store_lock = threading.Lock()
 
 
-def get_store() -> JobStore:
+def _open_sqlite_store() -> SQLiteJobStore:
+    """SQLite store; the first open imports any legacy JSON snapshot."""
+    from kernel.storage.sqlite_job_store import SQLiteJobStore
+    store = SQLiteJobStore()
+    if os.path.exists(_SNAPSHOT_PATH) and store.stats()["total"] == 0:
+        imported = store.import_json_snapshot(_SNAPSHOT_PATH)
+        if imported:
+            import logging
+            logging.getLogger("arkadia.jobs").info(
+                "[JOBS] Imported %d jobs from %s", imported, _SNAPSHOT_PATH
+            )
+    return store
+
+
+def get_store() -> JobStore | SQLiteJobStore:
+    """Return the process-wide job store (``SQLiteJobStore`` unless
+    SOLSPIRE_JOB_STORE=json). Both expose the same public API."""
     global _store
     if _store is None:
         with _store_lock:
             if _store is None:
-                _store = JobStore()
+                if os.environ.get("SOLSPIRE_JOB_STORE", "sqlite").lower() == "json":
+                    _store = JobStore()
+                else:
+                    _store = _open_sqlite_store()
     return _store
 
 
@@ -79,32 +79,36 @@ def retrieve_context(user_input: str, *, max_items: int = MAX_ITEMS) -> dict[str
     semantic = _semantic_context(user_input)
 
     # ── 2. Oracle store (always included for backward compat) ─────────────────
+    # Bounded read: only the newest rows are materialised, and the keyword
+    # scan streams the event log newest-first until it has enough hits.
     try:
-        snap = oracle_store.snapshot()
+        snap = oracle_store.snapshot(limit=max_items)
     except Exception:
         snap = {}
 
     txns   = snap.get("transactions") or []
     loops  = snap.get("open_loops") or []
-    events = snap.get("events") or []
 
     recent_txns = list(reversed(txns[-max_items:])) if txns else []
     open_loops  = [l for l in loops if (l.get("status") or "open") == "open"][-max_items:]
 
     kws = _keywords(user_input)
     relevant_events: list[dict[str, Any]] = []
-    if kws and events:
-        for evt in reversed(events):
-            haystack = " ".join(
-                str(v) for v in (
-                    (evt.get("payload") or {}).get("kind"),
-                    (evt.get("payload") or {}).get("payload"),
-                ) if v is not None
-            ).lower()
-            if any(kw in haystack for kw in kws):
-                relevant_events.append(_summarize_event(evt))
-                if len(relevant_events) >= MAX_KEYWORD_EVENTS:
-                    break
+    if kws:
+        try:
+            for evt in oracle_store.iter_events():
+                haystack = " ".join(
+                    str(v) for v in (
+                        (evt.get("payload") or {}).get("kind"),
+                        (evt.get("payload") or {}).get("payload"),
+                    ) if v is not None
+                ).lower()
+                if any(kw in haystack for kw in kws):
+                    relevant_events.append(_summarize_event(evt))
+                    if len(relevant_events) >= MAX_KEYWORD_EVENTS:
+                        break
+        except Exception:
+            pass
 
     result: dict[str, Any] = {
         "balance":             snap.get("balance") or {},
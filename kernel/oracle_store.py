@@ -1,77 +1,59 @@
 """SolSpire Phase 4 — Oracle Mutation Layer (real persistence).
 
-Phase 3's oracle was an in-memory dict. Phase 4 makes it a JSON-file
-store so that:
+Phase 3's oracle was an in-memory dict. Phase 4 made it a JSON-file store;
+it is now backed by SQLite tables in the runtime DB
+(kernel/storage/sqlite_oracle_store.py) so that:
   • Transactions, open loops, and asset metadata survive restarts
-  • A single thread-safe write path exists for the kernel
-  • The next phase can swap this for Supabase/Postgres without
-    changing the kernel's call sites
+  • Every mutation writes one row instead of rewriting the whole store
+  • The event log is append-only with count-based retention
+    (SOLSPIRE_ORACLE_EVENT_RETENTION, default 10000)
+  • The kernel's call sites are unchanged
 
-Schema (one JSON file at data/oracle_store.json):
+snapshot() keeps the old document shape, but transactions / assets / events
+are bounded to the newest ``limit`` rows:
 
     {
-      "transactions": [ {id, ts, amount, currency, party, note, ...} ],
+      "transactions": [ {id, ts, amount, currency, party, note} ],
       "open_loops":   [ {id, ts, loop, status, updated_at} ],
       "assets":       [ {id, ts, kind, count, prompt, refs} ],
       "balance":      { "<currency>": <number>, ... },
-      "events":       [ {ts, kind, payload} ]
+      "events":       [ {id, ts, payload} ]
     }
+
+A legacy data/oracle_store.json is imported on first open when the tables
+are empty.
 """
 from __future__ import annotations
 
-import json
+import logging
 import os
 import threading
-import time
-import uuid
-from typing import Any
+from typing import Any, Iterator
+
+from kernel.storage.sqlite_oracle_store import SNAPSHOT_LIMIT, SQLiteOracleStore
 
 _DATA_DIR = os.environ.get("SOLSPIRE_DATA_DIR", "data")
 _STORE_PATH = os.path.join(_DATA_DIR, "oracle_store.json")
 _LOCK = threading.Lock()
 
-_DEFAULT: dict[str, Any] = {
-    "transactions": [],
-    "open_loops":   [],
-    "assets":       [],
-    "balance":      {},
-    "events":       [],
-}
-
-
-def _ensure_dir() -> None:
-    os.makedirs(_DATA_DIR, exist_ok=True)
-
-
-def _read() -> dict[str, Any]:
-    _ensure_dir()
-    if not os.path.exists(_STORE_PATH):
-        return json.loads(json.dumps(_DEFAULT))  # deep copy
-    try:
-        with open(_STORE_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except (json.JSONDecodeError, OSError):
-        return json.loads(json.dumps(_DEFAULT))
-    # Backfill any missing top-level keys
-    for k, v in _DEFAULT.items():
-        data.setdefault(k, json.loads(json.dumps(v)))
-    return data
-
+_store: SQLiteOracleStore | None = None
 
-def _write(data: dict[str, Any]) -> None:
-    _ensure_dir()
-    tmp = _STORE_PATH + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-    os.replace(tmp, _STORE_PATH)
 
-
-def _new_id(prefix: str) -> str:
-    return f"{prefix}_{uuid.uuid4().hex[:10]}"
-
-
-def _now() -> float:
-    return time.time()
+def _get_store() -> SQLiteOracleStore:
+    """Process-wide store; the first open imports any legacy JSON document."""
+    global _store
+    if _store is None:
+        with _LOCK:
+            if _store is None:
+                store = SQLiteOracleStore()
+                if os.path.exists(_STORE_PATH) and not any(store.stats().values()):
+                    imported = store.import_json_snapshot(_STORE_PATH)
+                    if imported:
+                        logging.getLogger("arkadia.oracle_store").info(
+                            "[ORACLE] Imported %d rows from %s", imported, _STORE_PATH
+                        )
+                _store = store
+    return _store
 
 
 # ── Public mutators ─────────────────────────────────────────────────────────
@@ -80,15 +62,7 @@ def write_to_oracle(data: dict[str, Any]) -> dict[str, Any]:
     """Append a generic event row. Spec section 4. Always returns
     {status: 'written', ...} so verify() can confirm success.
     """
-    with _LOCK:
-        store = _read()
-        event = {
-            "id":      _new_id("evt"),
-            "ts":      _now(),
-            "payload": data if isinstance(data, dict) else {"value": data},
-        }
-        store["events"].append(event)
-        _write(store)
+    event = _get_store().append_event(data if isinstance(data, dict) else {"value": data})
     return {"status": "written", "event_id": event["id"], "data": data}
 
 
@@ -99,38 +73,15 @@ def write_transaction(payload: dict[str, Any]) -> dict[str, Any]:
     except (TypeError, ValueError):
         amount_n = 0.0
     currency = (payload.get("currency") or "USD").upper()
-    txn = {
-        "id":       _new_id("txn"),
-        "ts":       _now(),
-        "amount":   amount_n,
-        "currency": currency,
-        "party":    payload.get("party"),
-        "note":     payload.get("note"),
-    }
-    with _LOCK:
-        store = _read()
-        store["transactions"].append(txn)
-        store["events"].append({
-            "id": _new_id("evt"), "ts": _now(),
-            "payload": {"kind": "transaction", "transaction_id": txn["id"]},
-        })
-        _write(store)
+    txn = _get_store().add_transaction(amount_n, currency, payload.get("party"), payload.get("note"))
     return {"status": "written", "transaction": txn}
 
 
 def update_balance(payload: dict[str, Any]) -> dict[str, Any]:
-    """Re-derive balance from the recorded transaction list per currency.
+    """Re-derive balance from the recorded transactions per currency.
     Idempotent: calling repeatedly gives the same result for the same data.
     """
-    with _LOCK:
-        store = _read()
-        balances: dict[str, float] = {}
-        for t in store["transactions"]:
-            cur = (t.get("currency") or "USD").upper()
-            balances[cur] = round(balances.get(cur, 0.0) + float(t.get("amount", 0.0)), 4)
-        store["balance"] = balances
-        _write(store)
-    return {"status": "success", "balance": balances}
+    return {"status": "success", "balance": _get_store().recompute_balance()}
 
 
 def update_open_loops(payload: dict[str, Any]) -> dict[str, Any]:
@@ -138,40 +89,18 @@ def update_open_loops(payload: dict[str, Any]) -> dict[str, Any]:
     if not loop_text:
         return {"status": "skipped", "reason": "empty loop text"}
     new_status = (payload.get("status") or "open").lower()
-    with _LOCK:
-        store = _read()
-        # Update existing entry if loop text matches; else append new.
-        match = next((l for l in store["open_loops"] if l.get("loop") == loop_text), None)
-        if match:
-            match["status"]     = new_status
-            match["updated_at"] = _now()
-            row = match
-        else:
-            row = {
-                "id":         _new_id("loop"),
-                "ts":         _now(),
-                "loop":       loop_text,
-                "status":     new_status,
-                "updated_at": _now(),
-            }
-            store["open_loops"].append(row)
-        _write(store)
+    # Update existing entry if loop text matches; else append new.
+    row = _get_store().upsert_open_loop(loop_text, new_status)
     return {"status": "written", "loop": row}
 
 
 def store_asset(payload: dict[str, Any], refs: list[Any] | None = None) -> dict[str, Any]:
-    asset = {
-        "id":     _new_id("asset"),
-        "ts":     _now(),
-        "kind":   payload.get("kind", "image"),
-        "count":  int(payload.get("count", 1) or 1),
-        "prompt": payload.get("prompt"),
-        "refs":   list(refs or []),
-    }
-    with _LOCK:
-        store = _read()
-        store["assets"].append(asset)
-        _write(store)
+    asset = _get_store().add_asset(
+        payload.get("kind", "image"),
+        int(payload.get("count", 1) or 1),
+        payload.get("prompt"),
+        list(refs or []),
+    )
     return {"status": "written", "asset": asset}
 
 
@@ -181,18 +110,24 @@ def log_event(kind: str, payload: dict[str, Any]) -> dict[str, Any]:
 
 # ── Read helpers ────────────────────────────────────────────────────────────
 
-def snapshot() -> dict[str, Any]:
-    return _read()
+def snapshot(limit: int | None = SNAPSHOT_LIMIT) -> dict[str, Any]:
+    """Balance and open loops, plus the newest *limit* transactions, assets
+    and events (oldest first). ``limit=None`` returns full history."""
+    return _get_store().snapshot(limit=limit)
+
+
+def iter_events() -> Iterator[dict[str, Any]]:
+    """Stream events newest-first without loading the whole log."""
+    return _get_store().iter_events()
 
 
 def reset() -> None:
-    """Test-only: clear the store file."""
-    with _LOCK:
-        _write(json.loads(json.dumps(_DEFAULT)))
+    """Test-only: clear every oracle table."""
+    _get_store().reset()
 
 
 __all__ = [
     "write_to_oracle", "write_transaction", "update_balance",
     "update_open_loops", "store_asset", "log_event",
-    "snapshot", "reset",
+    "snapshot", "iter_events", "reset",
 ]
@@ -36,9 +36,8 @@ import re
 import time
 from typing import Any
 
-import httpx
-
 from kernel.tools import TOOL_REGISTRY, list_tools
+from providers import http_pool
 
 logger = logging.getLogger("arkadia.planner")
 
@@ -146,32 +145,32 @@ def _gemini_plan(user_input: str, system_prompt: str) -> str | None:
     }
 
     last_err: str | None = None
-    with httpx.Client(timeout=PLANNER_TIMEOUT_S) as client:
-        for model in PLANNER_MODELS:
-            url = (
-                f"https://generativelanguage.googleapis.com/v1beta/models/"
-                f"{model}:generateContent?key={api_key}"
-            )
-            try:
-                resp = client.post(url, json=payload)
-                if resp.status_code in (429, 403):
-                    last_err = f"{model}: HTTP {resp.status_code}"
-                    continue
-                resp.raise_for_status()
-                data = resp.json()
-                cands = data.get("candidates") or []
-                if not cands:
-                    last_err = f"{model}: no candidates"
-                    continue
-                parts = (cands[0].get("content") or {}).get("parts") or []
-                texts = [p.get("text", "") for p in parts if p.get("text")]
-                if not texts:
-                    last_err = f"{model}: empty"
-                    continue
-                return "".join(texts)
-            except Exception as e:  # noqa: BLE001
-                last_err = f"{model}: {e}"
+    client = http_pool.sync_client()
+    for model in PLANNER_MODELS:
+        url = (
+            f"https://generativelanguage.googleapis.com/v1beta/models/"
+            f"{model}:generateContent?key={api_key}"
+        )
+        try:
+            resp = client.post(url, json=payload, timeout=PLANNER_TIMEOUT_S)
+            if resp.status_code in (429, 403):
+                last_err = f"{model}: HTTP {resp.status_code}"
+                continue
+            resp.raise_for_status()
+            data = resp.json()
+            cands = data.get("candidates") or []
+            if not cands:
+                last_err = f"{model}: no candidates"
+                continue
+            parts = (cands[0].get("content") or {}).get("parts") or []
+            texts = [p.get("text", "") for p in parts if p.get("text")]
+            if not texts:
+                last_err = f"{model}: empty"
                 continue
+            return "".join(texts)
+        except Exception as e:  # noqa: BLE001
+            last_err = f"{model}: {e}"
+            continue
 
     logger.warning("planner gemini failed: %s", last_err)
     return None
@@ -0,0 +1,120 @@
+"""CorpusSyncStore — persistent validators for the incremental corpus sync.
+
+Backs ``corpus_sync_state`` (one row per ``repo:branch``: tree SHA + tree
+ETag) and ``corpus_file_state`` (one row per corpus file: blob SHA, raw
+ETag and last fetched body).  See docs/phase1/CORPUS_SYNC_DESIGN.md.
+
+The stored body lets a restarted process serve an unchanged corpus from a
+single conditional tree request instead of re-downloading every file.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from kernel.storage.schema import create_tables
+
+
+class CorpusSyncStore:
+    """Thread-safe accessor for the corpus sync tables.
+
+    Parameters
+    ----------
+    db_path:
+        Path to the SQLite file.  Passed to ``create_tables()``.
+    """
+
+    def __init__(self, db_path: str | None = None) -> None:
+        self._db_path: str = create_tables(db_path=db_path)
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        if not getattr(self._local, "conn", None):
+            conn = sqlite3.connect(self._db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode = WAL")
+            self._local.conn = conn
+        return self._local.conn
+
+    # ── tree ─────────────────────────────────────────────────────────────────
+
+    def tree_state(self, repo_key: str) -> dict[str, Any] | None:
+        row = self._conn().execute(
+            "SELECT tree_sha, etag, synced_at, file_count FROM corpus_sync_state WHERE key = ?",
+            (repo_key,),
+        ).fetchone()
+        return dict(row) if row else None
+
+    def save_tree(self, repo_key: str, tree_sha: str, etag: str | None,
+                  file_count: int) -> None:
+        conn = self._conn()
+        conn.execute(
+            """
+            INSERT INTO corpus_sync_state (key, tree_sha, synced_at, file_count, etag)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                tree_sha = excluded.tree_sha, synced_at = excluded.synced_at,
+                file_count = excluded.file_count, etag = excluded.etag
+            """,
+            (repo_key, tree_sha, time.time(), file_count, etag),
+        )
+        conn.commit()
+
+    def touch_tree(self, repo_key: str) -> None:
+        """Record a successful no-change sync."""
+        conn = self._conn()
+        conn.execute(
+            "UPDATE corpus_sync_state SET synced_at = ? WHERE key = ?",
+            (time.time(), repo_key),
+        )
+        conn.commit()
+
+    # ── files ────────────────────────────────────────────────────────────────
+
+    def files(self, repo_key: str) -> dict[str, dict[str, Any]]:
+        """Return ``{path: {file_sha, etag, content, ingested_at}}``."""
+        rows = self._conn().execute(
+            "SELECT path, file_sha, etag, content, ingested_at FROM corpus_file_state "
+            "WHERE repo_key = ?",
+            (repo_key,),
+        ).fetchall()
+        return {r["path"]: dict(r) for r in rows}
+
+    def files_paths(self, repo_key: str) -> list[str]:
+        return [r[0] for r in self._conn().execute(
+            "SELECT path FROM corpus_file_state WHERE repo_key = ?", (repo_key,)
+        )]
+
+    def save_files(self, repo_key: str, rows: list[dict[str, Any]],
+                   keep_paths: set[str] | None = None) -> None:
+        """Upsert ``{path, file_sha, etag, content}`` rows in one transaction.
+
+        When *keep_paths* is given, rows for any other path are deleted
+        (files removed from the repository).
+        """
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                """
+                INSERT INTO corpus_file_state
+                    (repo_key, path, file_sha, ingested_at, etag, content)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(repo_key, path) DO UPDATE SET
+                    file_sha = excluded.file_sha, ingested_at = excluded.ingested_at,
+                    etag = excluded.etag, content = excluded.content
+                """,
+                [(repo_key, r["path"], r["file_sha"], now, r.get("etag"), r.get("content"))
+                 for r in rows],
+            )
+            if keep_paths is not None:
+                stale = set(self.files_paths(repo_key)) - keep_paths
+                conn.executemany(
+                    "DELETE FROM corpus_file_state WHERE repo_key = ? AND path = ?",
+                    [(repo_key, p) for p in stale],
+                )
+
+
+__all__ = ["CorpusSyncStore"]
@@ -0,0 +1,99 @@
+"""DirectScrollStore — durable backend for directly-uploaded corpus scrolls.
+
+Replaces ``data/direct_scrolls.json``, which was re-read and parsed on every
+``_get_scrolls()`` call (cache hits included) and rewritten in full on every
+add or delete.
+
+Layout (runtime DB, see ``kernel.storage.schema._DIRECT_SCROLLS_DDL``): one
+``direct_scrolls`` row per scroll, keyed by ``scroll_id``; ``seq`` orders
+them newest first.  Adding or removing a scroll touches one row.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from typing import Any
+
+from kernel.storage.schema import create_tables
+
+
+class DirectScrollStore:
+    """Thread-safe accessor for the ``direct_scrolls`` table.
+
+    Parameters
+    ----------
+    db_path:
+        Path to the SQLite file.  Passed to ``create_tables()``.
+    """
+
+    def __init__(self, db_path: str | None = None) -> None:
+        self._db_path: str = create_tables(db_path=db_path)
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        if not getattr(self._local, "conn", None):
+            conn = sqlite3.connect(self._db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode = WAL")
+            self._local.conn = conn
+        return self._local.conn
+
+    # ── reads ────────────────────────────────────────────────────────────────
+
+    def all(self) -> list[dict[str, Any]]:
+        """Every scroll, newest first."""
+        rows = self._conn().execute("SELECT payload FROM direct_scrolls ORDER BY seq DESC")
+        return [json.loads(row["payload"]) for row in rows]
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM direct_scrolls").fetchone()[0]
+
+    # ── writes ───────────────────────────────────────────────────────────────
+
+    def add(self, scroll: dict[str, Any]) -> None:
+        """Insert *scroll* as the newest entry (replacing one with the same id)."""
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM direct_scrolls WHERE scroll_id = ?", (scroll["id"],))
+            conn.execute(
+                "INSERT INTO direct_scrolls (scroll_id, created_at, payload) VALUES (?, ?, ?)",
+                (scroll["id"], scroll.get("created_at"), json.dumps(scroll, ensure_ascii=False)),
+            )
+
+    def remove(self, scroll_id: str) -> bool:
+        conn = self._conn()
+        with conn:
+            cur = conn.execute("DELETE FROM direct_scrolls WHERE scroll_id = ?", (scroll_id,))
+        return cur.rowcount > 0
+
+    def import_json(self, path: str) -> int:
+        """Copy a legacy ``data/direct_scrolls.json`` document (newest first).
+
+        Existing rows win (``INSERT OR IGNORE``).  Returns the number imported.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return 0
+        scrolls = [s for s in (data.get("scrolls") or []) if isinstance(s, dict) and s.get("id")] \
+            if isinstance(data, dict) else []
+        conn = self._conn()
+        before = conn.total_changes
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO direct_scrolls (scroll_id, created_at, payload) VALUES (?, ?, ?)",
+                [(s["id"], s.get("created_at"), json.dumps(s, ensure_ascii=False)) for s in reversed(scrolls)],
+            )
+        return conn.total_changes - before
+
+    # ── maintenance ──────────────────────────────────────────────────────────
+
+    def reset(self) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM direct_scrolls")
+
+
+__all__ = ["DirectScrollStore"]
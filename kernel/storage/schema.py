@@ -2,7 +2,9 @@
 
 Single responsibility: define DDL and expose ``create_tables()``.
 Nothing in this module touches kernel/jobs.py, kernel/goals.py, or
-the API layer.  Corpus sync tables added in C1.1.
+the API layer.  Corpus sync tables added in C1.1; oracle tables replace
+data/oracle_store.json (kernel/storage/sqlite_oracle_store.py); direct_scrolls
+replaces data/direct_scrolls.json (kernel/storage/direct_scroll_store.py).
 
 Usage::
 
@@ -52,6 +54,7 @@ CREATE TABLE IF NOT EXISTS jobs (
 CREATE INDEX IF NOT EXISTS idx_jobs_status     ON jobs (status);
 CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs (created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_jobs_source     ON jobs (source);
+CREATE INDEX IF NOT EXISTS idx_jobs_claim      ON jobs (status, created_at);
 """
 
 _GOALS_DDL = """
@@ -82,7 +85,8 @@ CREATE TABLE IF NOT EXISTS corpus_sync_state (
     key        TEXT PRIMARY KEY,
     tree_sha   TEXT NOT NULL,
     synced_at  REAL NOT NULL,
-    file_count INTEGER NOT NULL DEFAULT 0
+    file_count INTEGER NOT NULL DEFAULT 0,
+    etag       TEXT                        -- tree response ETag (If-None-Match)
 );
 
 CREATE TABLE IF NOT EXISTS corpus_file_state (
@@ -90,6 +94,8 @@ CREATE TABLE IF NOT EXISTS corpus_file_state (
     path        TEXT NOT NULL,
     file_sha    TEXT NOT NULL,
     ingested_at REAL NOT NULL,
+    etag        TEXT,                      -- raw file ETag (If-None-Match)
+    content     TEXT,                      -- last fetched body; NULL for binary files
     PRIMARY KEY (repo_key, path)
 );
 
@@ -98,6 +104,71 @@ CREATE INDEX IF NOT EXISTS idx_corpus_file_state_repo_key
 """
 
 
+# Oracle mutation layer — current state as tables, history as an append-only
+# event log with count-based retention (kernel/storage/sqlite_oracle_store.py).
+_ORACLE_DDL = """
+CREATE TABLE IF NOT EXISTS oracle_events (
+    seq      INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id TEXT NOT NULL,
+    ts       REAL NOT NULL,
+    payload  TEXT NOT NULL DEFAULT '{}'
+);
+
+CREATE TABLE IF NOT EXISTS oracle_transactions (
+    seq      INTEGER PRIMARY KEY AUTOINCREMENT,
+    txn_id   TEXT NOT NULL UNIQUE,
+    ts       REAL NOT NULL,
+    amount   REAL NOT NULL DEFAULT 0,
+    currency TEXT NOT NULL DEFAULT 'USD',
+    party    TEXT,
+    note     TEXT
+);
+
+CREATE TABLE IF NOT EXISTS oracle_open_loops (
+    seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+    loop_id    TEXT NOT NULL UNIQUE,
+    ts         REAL NOT NULL,
+    loop       TEXT NOT NULL UNIQUE,
+    status     TEXT NOT NULL DEFAULT 'open',
+    updated_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS oracle_assets (
+    seq      INTEGER PRIMARY KEY AUTOINCREMENT,
+    asset_id TEXT NOT NULL UNIQUE,
+    ts       REAL NOT NULL,
+    kind     TEXT NOT NULL DEFAULT 'image',
+    count    INTEGER NOT NULL DEFAULT 1,
+    prompt   TEXT,
+    refs     TEXT NOT NULL DEFAULT '[]'
+);
+
+CREATE TABLE IF NOT EXISTS oracle_balance (
+    currency TEXT PRIMARY KEY,
+    amount   REAL NOT NULL
+);
+"""
+
+# Direct-upload scrolls (POST /api/scrolls, /api/codex/upload) — one row per
+# scroll, replacing data/direct_scrolls.json (kernel/storage/direct_scroll_store.py).
+_DIRECT_SCROLLS_DDL = """
+CREATE TABLE IF NOT EXISTS direct_scrolls (
+    seq        INTEGER PRIMARY KEY AUTOINCREMENT,   -- newest scroll = highest seq
+    scroll_id  TEXT NOT NULL UNIQUE,
+    created_at TEXT,
+    payload    TEXT NOT NULL                        -- full scroll dict as JSON
+);
+"""
+
+# Additive column migrations for databases created before the column existed
+# (CREATE TABLE IF NOT EXISTS does not alter existing tables).
+_ADDITIVE_COLUMNS = (
+    "ALTER TABLE corpus_sync_state ADD COLUMN etag TEXT",
+    "ALTER TABLE corpus_file_state ADD COLUMN etag TEXT",
+    "ALTER TABLE corpus_file_state ADD COLUMN content TEXT",
+)
+
+
 # ── Public API ───────────────────────────────────────────────────────────────
 
 def create_tables(db_path: str | None = None) -> str:
@@ -126,6 +197,13 @@ def create_tables(db_path: str | None = None) -> str:
         conn.executescript(_JOBS_DDL)
         conn.executescript(_GOALS_DDL)
         conn.executescript(_CORPUS_SYNC_DDL)
+        conn.executescript(_ORACLE_DDL)
+        conn.executescript(_DIRECT_SCROLLS_DDL)
+        for alter in _ADDITIVE_COLUMNS:
+            try:
+                conn.execute(alter)
+            except sqlite3.OperationalError:
+                pass  # column already present
         conn.commit()
     finally:
         conn.close()
@@ -5,18 +5,22 @@ identical; callers require zero changes.
 
 Design decisions (see DECISION_CACHE.md and SQLITE_JOB_QUEUE_DESIGN.md):
 - WAL mode: set by ``create_tables()``; no separate pragma needed here.
-- Atomic claim: ``BEGIN IMMEDIATE`` acquires a write-lock before the
-  SELECT so two workers cannot claim the same job.
+- Atomic claim: a single ``UPDATE … WHERE job_id = (SELECT …) RETURNING``
+  statement, so two workers cannot claim the same job.
 - Crash recovery: any job left in ``running`` status on startup is reset
   to ``pending`` and re-queued.
-- ``next_job_id(timeout)`` polls the database instead of blocking on a
-  ``queue.Queue``; semantics are identical from the caller's perspective.
+- ``next_job_id(timeout)`` blocks on a per-database ``threading.Condition``
+  that ``create`` and ``requeue_for_retry`` signal, so an in-process
+  enqueue wakes a waiting worker immediately.  The wait is capped at
+  ``_RECHECK_INTERVAL`` so jobs inserted by another process are still seen.
+- Writes return the row via ``RETURNING``; no follow-up ``SELECT``.
 - All JSON blobs (intent, result, trace) are stored as TEXT; ``None``
   serialises to SQL NULL.
 """
 from __future__ import annotations
 
 import json
+import os
 import sqlite3
 import time
 import threading
@@ -34,7 +38,36 @@ FAILED    = "failed"
 VALID_STATUSES = {PENDING, RUNNING, COMPLETED, FAILED}
 MAX_RETRIES    = 3
 
-_POLL_INTERVAL = 0.5   # seconds between empty-queue polls
+# Longest an idle waiter sleeps before re-checking the table.  In-process
+# enqueues wake waiters immediately; this only bounds the delay for jobs
+# written by another process.
+_RECHECK_INTERVAL = 0.5
+
+# One wake-up signal per database file, shared by every store instance in
+# this process.  ``_generation`` counts enqueues so a waiter can tell whether
+# a job arrived between its empty claim and its wait.
+_signals: dict[str, "_QueueSignal"] = {}
+_signals_lock = threading.Lock()
+
+
+class _QueueSignal:
+    def __init__(self) -> None:
+        self.cond = threading.Condition()
+        self.generation = 0
+
+    def notify(self) -> None:
+        with self.cond:
+            self.generation += 1
+            self.cond.notify()
+
+
+def _signal_for(db_path: str) -> _QueueSignal:
+    key = os.path.abspath(db_path)
+    with _signals_lock:
+        sig = _signals.get(key)
+        if sig is None:
+            sig = _signals[key] = _QueueSignal()
+        return sig
 
 
 # ── helpers ──────────────────────────────────────────────────────────────────
@@ -88,6 +121,7 @@ class SQLiteJobStore:
     def __init__(self, db_path: str | None = None) -> None:
         self._db_path: str = create_tables(db_path=db_path)
         self._local   = threading.local()   # per-thread connection
+        self._signal  = _signal_for(self._db_path)
         self._recover_running_jobs()
 
     # ── connection management ────────────────────────────────────────────────
@@ -119,6 +153,7 @@ class SQLiteJobStore:
     def create(self, intent: dict[str, Any], *, source: str = "api") -> dict[str, Any]:
         job_id = f"job_{uuid.uuid4().hex[:12]}"
         now = time.time()
+        intent = intent if isinstance(intent, dict) else {}
         conn = self._conn()
         conn.execute(
             """
@@ -127,11 +162,24 @@ class SQLiteJobStore:
                  retries, source, created_at, updated_at, started_at, ended_at)
             VALUES (?, ?, ?, NULL, NULL, NULL, 0, ?, ?, ?, NULL, NULL)
             """,
-            (job_id, PENDING, _encode(intent if isinstance(intent, dict) else {}),
-             source, now, now),
+            (job_id, PENDING, _encode(intent), source, now, now),
         )
         conn.commit()
-        return self.get(job_id)  # type: ignore[return-value]
+        self._signal.notify()
+        return {
+            "job_id":     job_id,
+            "status":     PENDING,
+            "intent":     intent,
+            "result":     None,
+            "error":      None,
+            "trace":      None,
+            "retries":    0,
+            "source":     source,
+            "created_at": now,
+            "updated_at": now,
+            "started_at": None,
+            "ended_at":   None,
+        }
 
     def get(self, job_id: str) -> dict[str, Any] | None:
         row = self._conn().execute(
@@ -162,13 +210,17 @@ class SQLiteJobStore:
                 fields[col] = _encode(fields[col])
         set_clause = ", ".join(f"{k} = ?" for k in fields)
         values = list(fields.values()) + [now, job_id]
-        conn = self._conn()
-        conn.execute(
-            f"UPDATE jobs SET {set_clause}, updated_at = ? WHERE job_id = ?",
+        return self._write_returning(
+            f"UPDATE jobs SET {set_clause}, updated_at = ? WHERE job_id = ? RETURNING *",
             values,
         )
+
+    def _write_returning(self, sql: str, params: Any) -> dict[str, Any] | None:
+        """Run a single-row ``… RETURNING *`` write and commit it."""
+        conn = self._conn()
+        row = conn.execute(sql, params).fetchone()
         conn.commit()
-        return self.get(job_id)
+        return _row_to_job(row) if row else None
 
     def mark_running(self, job_id: str) -> dict[str, Any] | None:
         return self.update(job_id, status=RUNNING, started_at=time.time())
@@ -187,9 +239,7 @@ class SQLiteJobStore:
     def requeue_for_retry(self, job_id: str,
                           error: str) -> dict[str, Any] | None:
         """Bump retry count, reset to pending.  Caller must check MAX_RETRIES."""
-        conn = self._conn()
-        now = time.time()
-        conn.execute(
+        job = self._write_returning(
             """
             UPDATE jobs
                SET status     = ?,
@@ -197,58 +247,59 @@ class SQLiteJobStore:
                    error      = ?,
                    updated_at = ?
              WHERE job_id = ?
+            RETURNING *
             """,
-            (PENDING, error, now, job_id),
+            (PENDING, error, time.time(), job_id),
         )
-        conn.commit()
-        return self.get(job_id)
+        if job is not None:
+            self._signal.notify()
+        return job
 
     # ── queue accessors (used by kernel/worker.py) ───────────────────────────
 
     def next_job_id(self, timeout: float = 1.0) -> str | None:
-        """Block until a pending job is available or *timeout* expires.
+        """Claim the oldest pending job, waiting up to *timeout* for one.
 
-        Uses ``BEGIN IMMEDIATE`` to atomically claim the job so two
-        workers cannot race on the same row.
+        The claimed job is already ``running`` when returned.  Idle waiters
+        sleep on the queue signal rather than polling.
         """
         deadline = time.monotonic() + timeout
-        while time.monotonic() < deadline:
+        sig = self._signal
+        while True:
+            with sig.cond:
+                seen = sig.generation
             job_id = self._claim_one()
             if job_id:
                 return job_id
             remaining = deadline - time.monotonic()
             if remaining <= 0:
-                break
-            time.sleep(min(_POLL_INTERVAL, remaining))
-        return None
+                return None
+            with sig.cond:
+                if sig.generation == seen:
+                    sig.cond.wait(min(_RECHECK_INTERVAL, remaining))
 
     def _claim_one(self) -> str | None:
         """Atomically claim the oldest pending job. Returns job_id or None."""
         conn = self._conn()
+        now = time.time()
         try:
-            conn.execute("BEGIN IMMEDIATE")
             row = conn.execute(
-                "SELECT job_id FROM jobs WHERE status = ? ORDER BY created_at ASC LIMIT 1",
-                (PENDING,),
+                """
+                UPDATE jobs SET status = ?, started_at = ?, updated_at = ?
+                 WHERE job_id = (
+                       SELECT job_id FROM jobs WHERE status = ?
+                        ORDER BY created_at ASC LIMIT 1)
+                   AND status = ?
+                RETURNING job_id
+                """,
+                (RUNNING, now, now, PENDING, PENDING),
             ).fetchone()
-            if row is None:
-                conn.execute("ROLLBACK")
-                return None
-            job_id = row["job_id"]
-            now = time.time()
-            conn.execute(
-                "UPDATE jobs SET status = ?, started_at = ?, updated_at = ? WHERE job_id = ?",
-                (RUNNING, now, now, job_id),
-            )
-            conn.execute("COMMIT")
-            return job_id
+            conn.commit()
         except sqlite3.OperationalError:
-            # Another writer holds the lock; back off and retry
-            try:
-                conn.execute("ROLLBACK")
-            except Exception:
-                pass
+            # Another writer held the lock past the busy timeout; retry later
+            conn.rollback()
             return None
+        return row["job_id"] if row else None
 
     def task_done(self) -> None:
         """No-op: SQLite has no queue to acknowledge. Preserved for API parity."""
@@ -266,6 +317,51 @@ class SQLiteJobStore:
         counts["queue_depth"] = counts[PENDING]
         return counts
 
+    def import_json_snapshot(self, path: str) -> int:
+        """Copy jobs from a legacy ``JobStore`` JSON snapshot.
+
+        Existing rows win (``INSERT OR IGNORE``); running jobs come back as
+        pending.  Returns the number of jobs imported.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return 0
+        if not isinstance(data, dict):
+            return 0
+        rows = []
+        for job_id, job in data.items():
+            if not isinstance(job, dict) or job.get("job_id") != job_id:
+                continue
+            status = job.get("status")
+            if status not in VALID_STATUSES or status == RUNNING:
+                status = PENDING
+            created = job.get("created_at") or time.time()
+            rows.append((
+                job_id, status, _encode(job.get("intent") or {}),
+                _encode(job.get("result")), job.get("error"), _encode(job.get("trace")),
+                int(job.get("retries") or 0), job.get("source") or "api",
+                created, job.get("updated_at") or created,
+                job.get("started_at"), job.get("ended_at"),
+            ))
+        conn = self._conn()
+        before = conn.total_changes
+        conn.executemany(
+            """
+            INSERT OR IGNORE INTO jobs
+                (job_id, status, intent, result, error, trace,
+                 retries, source, created_at, updated_at, started_at, ended_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+        conn.commit()
+        imported = conn.total_changes - before
+        if imported:
+            self._signal.notify()
+        return imported
+
     def reset(self) -> None:
         """Test-only: delete all jobs."""
         conn = self._conn()
@@ -0,0 +1,291 @@
+"""SQLiteOracleStore — durable backend for ``kernel.oracle_store``.
+
+Replaces the single ``data/oracle_store.json`` document, which was re-read
+and rewritten in full (under one global lock) on every mutation, so each
+write cost O(total history) and ``events`` grew without bound.
+
+Layout (runtime DB, see ``kernel.storage.schema._ORACLE_DDL``):
+
+* current state — ``oracle_transactions``, ``oracle_open_loops``,
+  ``oracle_assets``, ``oracle_balance``: every mutation touches one row.
+* history — ``oracle_events``: append-only; compacted every
+  ``COMPACT_EVERY`` appends down to the newest ``retention`` events.
+
+``snapshot()`` returns the same dict shape as the JSON store but reads only
+the newest ``limit`` rows of each history-like table, so its cost is
+independent of how much history has accumulated.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Iterator
+
+from kernel.storage.schema import create_tables
+
+DEFAULT_RETENTION = int(os.environ.get("SOLSPIRE_ORACLE_EVENT_RETENTION", "10000"))
+COMPACT_EVERY = 256
+SNAPSHOT_LIMIT = 200
+
+
+def _new_id(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:10]}"
+
+
+def _decode(text: str | None, default: Any) -> Any:
+    if not text:
+        return default
+    try:
+        return json.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        return default
+
+
+def _event(row: sqlite3.Row) -> dict[str, Any]:
+    return {"id": row["event_id"], "ts": row["ts"], "payload": _decode(row["payload"], {})}
+
+
+def _transaction(row: sqlite3.Row) -> dict[str, Any]:
+    return {"id": row["txn_id"], "ts": row["ts"], "amount": row["amount"],
+            "currency": row["currency"], "party": row["party"], "note": row["note"]}
+
+
+def _loop(row: sqlite3.Row) -> dict[str, Any]:
+    return {"id": row["loop_id"], "ts": row["ts"], "loop": row["loop"],
+            "status": row["status"], "updated_at": row["updated_at"]}
+
+
+def _asset(row: sqlite3.Row) -> dict[str, Any]:
+    return {"id": row["asset_id"], "ts": row["ts"], "kind": row["kind"], "count": row["count"],
+            "prompt": row["prompt"], "refs": _decode(row["refs"], [])}
+
+
+class SQLiteOracleStore:
+    """Thread-safe oracle state + append-only event log.
+
+    Parameters
+    ----------
+    db_path:
+        Path to the SQLite file.  Passed to ``create_tables()``.
+    retention:
+        Number of newest events kept by compaction.
+    """
+
+    def __init__(self, db_path: str | None = None, *, retention: int = DEFAULT_RETENTION) -> None:
+        self._db_path: str = create_tables(db_path=db_path)
+        self._local = threading.local()
+        self.retention = max(1, int(retention))
+        self._appends = 0
+        self._appends_lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        if not getattr(self._local, "conn", None):
+            conn = sqlite3.connect(self._db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode = WAL")
+            self._local.conn = conn
+        return self._local.conn
+
+    # ── event log ────────────────────────────────────────────────────────────
+
+    def _insert_event(self, conn: sqlite3.Connection, payload: dict[str, Any]) -> dict[str, Any]:
+        event = {"id": _new_id("evt"), "ts": time.time(), "payload": payload}
+        conn.execute(
+            "INSERT INTO oracle_events (event_id, ts, payload) VALUES (?, ?, ?)",
+            (event["id"], event["ts"], json.dumps(payload, default=str, ensure_ascii=False)),
+        )
+        return event
+
+    def _after_append(self) -> None:
+        with self._appends_lock:
+            self._appends += 1
+            due = self._appends % COMPACT_EVERY == 0
+        if due:
+            self.compact()
+
+    def append_event(self, payload: dict[str, Any]) -> dict[str, Any]:
+        conn = self._conn()
+        with conn:
+            event = self._insert_event(conn, payload)
+        self._after_append()
+        return event
+
+    def iter_events(self, *, newest_first: bool = True) -> Iterator[dict[str, Any]]:
+        """Stream events without materialising the log."""
+        order = "DESC" if newest_first else "ASC"
+        for row in self._conn().execute(f"SELECT * FROM oracle_events ORDER BY seq {order}"):
+            yield _event(row)
+
+    def compact(self, retention: int | None = None) -> int:
+        """Drop all but the newest *retention* events. Returns rows deleted."""
+        keep = max(1, int(retention or self.retention))
+        conn = self._conn()
+        with conn:
+            cur = conn.execute(
+                "DELETE FROM oracle_events WHERE seq <= (SELECT MAX(seq) FROM oracle_events) - ?",
+                (keep,),
+            )
+        return cur.rowcount
+
+    # ── state mutations ──────────────────────────────────────────────────────
+
+    def add_transaction(self, amount: float, currency: str, party: Any, note: Any) -> dict[str, Any]:
+        txn = {"id": _new_id("txn"), "ts": time.time(), "amount": amount,
+               "currency": currency, "party": party, "note": note}
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT INTO oracle_transactions (txn_id, ts, amount, currency, party, note) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (txn["id"], txn["ts"], amount, currency, party, note),
+            )
+            self._insert_event(conn, {"kind": "transaction", "transaction_id": txn["id"]})
+        self._after_append()
+        return txn
+
+    def recompute_balance(self) -> dict[str, float]:
+        """Re-derive per-currency balances from the transaction table."""
+        conn = self._conn()
+        with conn:
+            rows = conn.execute(
+                "SELECT UPPER(currency) AS currency, SUM(amount) AS total "
+                "FROM oracle_transactions GROUP BY UPPER(currency)"
+            ).fetchall()
+            balances = {r["currency"]: round(r["total"], 4) for r in rows}
+            conn.execute("DELETE FROM oracle_balance")
+            conn.executemany(
+                "INSERT INTO oracle_balance (currency, amount) VALUES (?, ?)",
+                list(balances.items()),
+            )
+        return balances
+
+    def upsert_open_loop(self, loop_text: str, status: str) -> dict[str, Any]:
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                """
+                INSERT INTO oracle_open_loops (loop_id, ts, loop, status, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(loop) DO UPDATE SET
+                    status = excluded.status, updated_at = excluded.updated_at
+                """,
+                (_new_id("loop"), now, loop_text, status, now),
+            )
+            row = conn.execute("SELECT * FROM oracle_open_loops WHERE loop = ?", (loop_text,)).fetchone()
+        return _loop(row)
+
+    def add_asset(self, kind: str, count: int, prompt: Any, refs: list[Any]) -> dict[str, Any]:
+        asset = {"id": _new_id("asset"), "ts": time.time(), "kind": kind,
+                 "count": count, "prompt": prompt, "refs": refs}
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT INTO oracle_assets (asset_id, ts, kind, count, prompt, refs) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (asset["id"], asset["ts"], kind, count, prompt, json.dumps(refs, default=str)),
+            )
+        return asset
+
+    # ── reads ────────────────────────────────────────────────────────────────
+
+    def _newest(self, table: str, limit: int | None) -> list[sqlite3.Row]:
+        """Newest *limit* rows of *table*, returned oldest-first (list order of the JSON store)."""
+        if limit is None:
+            return self._conn().execute(f"SELECT * FROM {table} ORDER BY seq").fetchall()
+        rows = self._conn().execute(
+            f"SELECT * FROM {table} ORDER BY seq DESC LIMIT ?", (int(limit),)
+        ).fetchall()
+        return rows[::-1]
+
+    def snapshot(self, limit: int | None = SNAPSHOT_LIMIT) -> dict[str, Any]:
+        """Current state plus the newest *limit* transactions, assets and events.
+
+        ``limit=None`` returns full history (export / migration only).
+        """
+        conn = self._conn()
+        return {
+            "transactions": [_transaction(r) for r in self._newest("oracle_transactions", limit)],
+            "open_loops":   [_loop(r) for r in conn.execute("SELECT * FROM oracle_open_loops ORDER BY seq")],
+            "assets":       [_asset(r) for r in self._newest("oracle_assets", limit)],
+            "balance":      {r["currency"]: r["amount"] for r in conn.execute("SELECT * FROM oracle_balance")},
+            "events":       [_event(r) for r in self._newest("oracle_events", limit)],
+        }
+
+    def stats(self) -> dict[str, int]:
+        conn = self._conn()
+        return {
+            table.removeprefix("oracle_"): conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("oracle_events", "oracle_transactions", "oracle_open_loops", "oracle_assets")
+        }
+
+    # ── maintenance ──────────────────────────────────────────────────────────
+
+    def reset(self) -> None:
+        conn = self._conn()
+        with conn:
+            for table in ("oracle_events", "oracle_transactions", "oracle_open_loops",
+                          "oracle_assets", "oracle_balance"):
+                conn.execute(f"DELETE FROM {table}")
+
+    def import_json_snapshot(self, path: str) -> int:
+        """Copy a legacy ``data/oracle_store.json`` document.
+
+        Existing rows win (``INSERT OR IGNORE``).  Only the newest
+        ``retention`` events are kept.  Returns the number of rows imported.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return 0
+        if not isinstance(data, dict):
+            return 0
+
+        def items(key: str) -> list[dict]:
+            return [x for x in data.get(key) or [] if isinstance(x, dict)]
+
+        now = time.time()
+        conn = self._conn()
+        before = conn.total_changes
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO oracle_transactions (txn_id, ts, amount, currency, party, note) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(t.get("id") or _new_id("txn"), t.get("ts") or now, float(t.get("amount") or 0.0),
+                  (t.get("currency") or "USD").upper(), t.get("party"), t.get("note"))
+                 for t in items("transactions")],
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO oracle_open_loops (loop_id, ts, loop, status, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(l.get("id") or _new_id("loop"), l.get("ts") or now, l["loop"],
+                  l.get("status") or "open", l.get("updated_at") or now)
+                 for l in items("open_loops") if l.get("loop")],
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO oracle_assets (asset_id, ts, kind, count, prompt, refs) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(a.get("id") or _new_id("asset"), a.get("ts") or now, a.get("kind") or "image",
+                  int(a.get("count") or 1), a.get("prompt"), json.dumps(a.get("refs") or [], default=str))
+                 for a in items("assets")],
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO oracle_balance (currency, amount) VALUES (?, ?)",
+                [(str(c).upper(), float(v)) for c, v in (data.get("balance") or {}).items()
+                 if isinstance(v, (int, float))],
+            )
+            conn.executemany(
+                "INSERT INTO oracle_events (event_id, ts, payload) VALUES (?, ?, ?)",
+                [(e.get("id") or _new_id("evt"), e.get("ts") or now,
+                  json.dumps(e.get("payload") or {}, default=str, ensure_ascii=False))
+                 for e in items("events")[-self.retention:]],
+            )
+        return conn.total_changes - before
+
+
+__all__ = ["SQLiteOracleStore", "DEFAULT_RETENTION", "COMPACT_EVERY", "SNAPSHOT_LIMIT"]
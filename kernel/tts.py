@@ -8,13 +8,22 @@ Priority chain:
 
 Cycle 17 addition: SSML emotion layer — intelligent pauses, emphasis on
 Arkadia-domain terms, prosody shaping for Oracle delivery quality.
+
+Every engine result is stored in the on-disk audio cache (kernel/tts_cache.py)
+keyed by (engine, voice, rate, normalized text); repeated phrases are served
+from disk. Engine coroutines run on one long-lived background event loop and
+async callers go through a shared executor (synthesize_async).
 """
 import asyncio
 import logging
 import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
+from kernel.tts_cache import get_audio_cache
+
 logger = logging.getLogger("arkadia.tts")
 
 # ── ElevenLabs voice map ───────────────────────────────────────────────────────
@@ -142,7 +151,7 @@ async def _synthesize_elevenlabs(text: str, voice_key: str, api_key: str) -> byt
         RuntimeError("ELEVENLABS_401") on bad/expired key
         RuntimeError(...)              on any other failure
     """
-    import httpx
+    from providers import http_pool
 
     el_voice_id = ELEVENLABS_VOICE_MAP.get(voice_key, ELEVENLABS_VOICE_MAP["aria"])
     url = f"https://api.elevenlabs.io/v1/text-to-speech/{el_voice_id}"
@@ -158,8 +167,7 @@ async def _synthesize_elevenlabs(text: str, voice_key: str, api_key: str) -> byt
         "Accept": "audio/mpeg",
     }
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        resp = await client.post(url, json=payload, headers=headers)
+    resp = await http_pool.async_client().post(url, json=payload, headers=headers, timeout=30.0)
 
     if resp.status_code == 429:
         raise RuntimeError("ELEVENLABS_429")
@@ -282,6 +290,25 @@ async def _synthesize_edge(plain: str, voice_id: str, rate: str) -> bytes:
     return b"".join(chunks)
 
 
+# ── Long-lived runtime ──────────────────────────────────────────────────────
+# One background event loop runs every engine coroutine (instead of a fresh
+# loop per call); one executor serves every async caller (instead of a pool
+# per request).
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tts")
+
+
+def _run(coro):
+    """Run *coro* on the shared TTS loop and block for its result."""
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="tts-loop", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
+
 def synthesize(
     text: str,
     voice_key: str = DEFAULT_VOICE,
@@ -295,6 +322,7 @@ def synthesize(
       2. Edge TTS    — Microsoft Neural, free, no key required
       3. Piper       — local fallback
 
+    Each engine consults the audio cache before synthesizing.
     The third return value is a short engine label: 'elevenlabs', 'edge_tts', 'piper'.
     """
     text = text.strip()[:5000]
@@ -309,20 +337,22 @@ def synthesize(
     if not plain:
         raise ValueError("text is empty after cleaning")
 
+    cache = get_audio_cache()
+
     # ── 1. ElevenLabs ─────────────────────────────────────────────────────
     el_key = elevenlabs_key or _get_elevenlabs_key()
     if el_key:
+        ck = cache.key("elevenlabs", voice_key, plain)
+        hit = cache.get(ck)
+        if hit:
+            logger.info(f"[TTS] cache ✓ elevenlabs voice={voice_key} → {len(hit[0])} bytes")
+            return hit[0], hit[1], "elevenlabs"
         try:
-            loop = asyncio.new_event_loop()
-            try:
-                audio = loop.run_until_complete(
-                    _synthesize_elevenlabs(plain, voice_key, el_key)
-                )
-            finally:
-                loop.close()
+            audio = _run(_synthesize_elevenlabs(plain, voice_key, el_key))
             logger.info(
                 f"[TTS] ElevenLabs ✓ voice={voice_key} chars={len(plain)} → {len(audio)} bytes MP3"
             )
+            cache.put(ck, audio, "audio/mpeg")
             return audio, "audio/mpeg", "elevenlabs"
 
         except RuntimeError as e:
@@ -337,14 +367,9 @@ def synthesize(
                     pass
                 if rotated and rotated != el_key:
                     try:
-                        loop2 = asyncio.new_event_loop()
-                        try:
-                            audio = loop2.run_until_complete(
-                                _synthesize_elevenlabs(plain, voice_key, rotated)
-                            )
-                        finally:
-                            loop2.close()
+                        audio = _run(_synthesize_elevenlabs(plain, voice_key, rotated))
                         logger.info(f"[TTS] ElevenLabs ✓ (rotated key) → {len(audio)} bytes")
+                        cache.put(ck, audio, "audio/mpeg")
                         return audio, "audio/mpeg", "elevenlabs"
                     except Exception:
                         pass
@@ -360,33 +385,53 @@ def synthesize(
         logger.debug("[TTS] No ElevenLabs key configured — using Edge TTS directly")
 
     # ── 2. Edge TTS ───────────────────────────────────────────────────────
+    ck = cache.key("edge_tts", voice_id, plain, rate)
+    hit = cache.get(ck)
+    if hit:
+        logger.info(f"[TTS] cache ✓ edge_tts voice={voice_key} → {len(hit[0])} bytes")
+        return hit[0], hit[1], "edge_tts"
     edge_exc: Exception | None = None
     try:
-        loop = asyncio.new_event_loop()
-        try:
-            audio = loop.run_until_complete(_synthesize_edge(plain, voice_id, rate))
-        finally:
-            loop.close()
+        audio = _run(_synthesize_edge(plain, voice_id, rate))
         logger.info(
             f"[TTS] Edge TTS ✓ voice={voice_key} ({voice_id}) "
             f"speed={speed} chars={len(plain)} → {len(audio)} bytes MP3"
         )
+        cache.put(ck, audio, "audio/mpeg")
         return audio, "audio/mpeg", "edge_tts"
     except Exception as e:
         edge_exc = e
         logger.warning(f"[TTS] Edge TTS failed ({e}) — trying Piper fallback…")
 
     # ── 3. Piper ──────────────────────────────────────────────────────────
+    ck = cache.key("piper", "", plain, rate)
+    hit = cache.get(ck)
+    if hit:
+        return hit[0], hit[1], "piper"
     try:
         from kernel._piper_fallback import piper_synthesize
         audio = piper_synthesize(plain, speed)
         logger.info(f"[TTS] Piper ✓ {len(audio)} bytes WAV")
+        cache.put(ck, audio, "audio/wav")
         return audio, "audio/wav", "piper"
     except Exception as e2:
         logger.error(f"[TTS] All TTS engines failed. Edge: {edge_exc}. Piper: {e2}")
         raise RuntimeError(f"All TTS engines failed. Edge: {edge_exc}. Piper: {e2}")
 
 
+async def synthesize_async(
+    text: str,
+    voice_key: str = DEFAULT_VOICE,
+    speed: float = 1.0,
+    elevenlabs_key: str = "",
+) -> tuple[bytes, str, str]:
+    """synthesize() on the shared TTS executor — for use from request handlers."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _EXECUTOR, lambda: synthesize(text, voice_key, speed, elevenlabs_key=elevenlabs_key)
+    )
+
+
 # ── Backward-compat shims (used by main.py) ───────────────────────────────────
 
 class _FakePiper:
@@ -0,0 +1,194 @@
+"""
+Arkadia TTS audio cache
+
+Content-addressed, on-disk LRU for kernel.tts.synthesize. Oracle replies and
+UI phrases repeat constantly; re-synthesizing them through ElevenLabs / Edge
+TTS costs seconds (and ElevenLabs quota) per call, a disk hit costs
+milliseconds.
+
+  key    = sha256(engine, voice, rate, normalized text)
+  file   = <root>/<key>.mp3|.wav      (written atomically via os.replace)
+  LRU    = file mtime, refreshed on every hit, so recency survives restarts
+  budget = total bytes; least-recently-used files are evicted past it
+
+Config:
+  ARKADIA_TTS_CACHE_DIR   default <SOLSPIRE_DATA_DIR|data>/tts_cache
+  ARKADIA_TTS_CACHE_MB    default 256 (0 disables the cache)
+
+Thread-safe. Counters are in-process (see stats()).
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+logger = logging.getLogger("arkadia.tts_cache")
+
+_DATA_DIR = os.environ.get("SOLSPIRE_DATA_DIR", "data")
+_DEFAULT_DIR = os.path.join(_DATA_DIR, "tts_cache")
+_DEFAULT_MB = 256
+
+_EXT_TO_MEDIA = {".mp3": "audio/mpeg", ".wav": "audio/wav"}
+_MEDIA_TO_EXT = {v: k for k, v in _EXT_TO_MEDIA.items()}
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class AudioCache:
+    """Byte-budgeted LRU of synthesized audio, one file per entry."""
+
+    def __init__(self, root: str, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple[str, int]]" = OrderedDict()  # key → (path, size)
+        self._bytes = 0
+        self._counters = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        if self.enabled:
+            os.makedirs(root, exist_ok=True)
+            self._load()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def key(engine: str, voice: str, text: str, rate: str = "") -> str:
+        raw = "\x1f".join((engine, voice, rate, _normalize(text)))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _load(self) -> None:
+        """Rebuild the index from disk, oldest mtime first."""
+        found: list[tuple[float, str, str, int]] = []
+        for name in os.listdir(self.root):
+            stem, ext = os.path.splitext(name)
+            if ext not in _EXT_TO_MEDIA:
+                continue   # also skips *.tmp leftovers
+            path = os.path.join(self.root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            found.append((st.st_mtime, stem, path, st.st_size))
+        for _, stem, path, size in sorted(found):
+            self._entries[stem] = (path, size)
+            self._bytes += size
+        self._evict_locked()
+
+    def get(self, key: str) -> Optional[tuple[bytes, str]]:
+        """Return ``(audio, media_type)`` or None."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+        path, _ = entry
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                if self._entries.pop(key, None):
+                    self._bytes -= entry[1]
+                self._counters["misses"] += 1
+            return None
+        with self._lock:
+            self._counters["hits"] += 1
+        return audio, _EXT_TO_MEDIA[os.path.splitext(path)[1]]
+
+    def put(self, key: str, audio: bytes, media_type: str) -> None:
+        if not self.enabled or not audio or len(audio) > self.max_bytes:
+            return
+        path = os.path.join(self.root, key + _MEDIA_TO_EXT.get(media_type, ".mp3"))
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(audio)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"[TTS-CACHE] write failed ({e})")
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self._bytes -= old[1]
+            self._entries[key] = (path, len(audio))
+            self._bytes += len(audio)
+            self._counters["writes"] += 1
+            self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        while self._bytes > self.max_bytes and self._entries:
+            _, (path, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self._counters["evictions"] += 1
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate":  round(self._counters["hits"] / lookups, 4) if lookups else None,
+                "entries":   len(self._entries),
+                "bytes":     self._bytes,
+                "max_bytes": self.max_bytes,
+                "ts":        time.time(),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            for path, _ in self._entries.values():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._bytes = 0
+            for k in self._counters:
+                self._counters[k] = 0
+
+
+_cache: Optional[AudioCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_audio_cache() -> AudioCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            mb = float(os.environ.get("ARKADIA_TTS_CACHE_MB", _DEFAULT_MB))
+            _cache = AudioCache(
+                os.environ.get("ARKADIA_TTS_CACHE_DIR", _DEFAULT_DIR),
+                int(mb * 1024 * 1024),
+            )
+        return _cache
+
+
+def reset_audio_cache() -> None:
+    """Test-only: drop the singleton so env vars are re-read."""
+    global _cache
+    with _cache_lock:
+        _cache = None
+
+
+__all__ = ["AudioCache", "get_audio_cache", "reset_audio_cache"]
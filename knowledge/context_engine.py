@@ -17,14 +17,17 @@ from typing import Optional
 
 from knowledge.db import execute
 from knowledge.embeddings import (
-    embed_text, cosine_similarity, all_chunk_embeddings, all_chunks, bm25_score, _tokenise
+    embed_text, cosine_similarity, all_chunk_embeddings, nearest_chunks,
 )
 from knowledge.graph import traverse
+from knowledge.term_stats import bm25_search
 
 # Approximate token budget for the context package sent to a provider.
 # 4 chars ≈ 1 token (conservative estimate)
 DEFAULT_TOKEN_BUDGET = 3000  # tokens
 CHARS_PER_TOKEN = 4
+# Minimum chunks pulled from the vector index before budget/per-note trimming
+_MIN_SEMANTIC_CANDIDATES = 200
 
 
 def _approx_tokens(text: str) -> int:
@@ -42,10 +45,16 @@ def assemble_context(
     timeline_limit: int = 10,
     token_budget: int = DEFAULT_TOKEN_BUDGET,
     user_id: Optional[str] = None,
+    query_vec: Optional[list[float]] = None,
+    embed_query: bool = True,
 ) -> dict:
     """
     Build a context package for a provider call.
 
+    query_vec supplies an already-computed query embedding. embed_query=False
+    skips embedding altogether (e.g. the caller's embedding deadline passed),
+    which ranks by BM25 like an unavailable embedder does.
+
     Pipeline:
       1. Embed query
       2. Semantic search → top relevant chunks (filtered by thread if provided)
@@ -70,24 +79,18 @@ def assemble_context(
     budget_used = 0
 
     # ── Step 1+2: Semantic search ──────────────────────────────────────────
-    query_vec = embed_text(query, task_type="RETRIEVAL_QUERY")
-    # Local-first (LAW II): when the query embedding is unavailable (Gemini
-    # offline/unconfigured), score raw chunks by BM25 instead of cosine.
-    # all_chunk_embeddings() JOINs chunks→embeddings and returns [] when 0
-    # embeddings exist, which would otherwise make the BM25 fallback dead.
-    if query_vec is not None:
-        all_chunks_local = all_chunk_embeddings()
-    else:
-        all_chunks_local = all_chunks()
+    if query_vec is None and embed_query:
+        query_vec = embed_text(query, task_type="RETRIEVAL_QUERY")
 
     # Apply thread_id filter if provided — only retrieve chunks from that thread's notes
+    allowed_ids: Optional[set[int]] = None
     if thread_id is not None:
         thread_note_ids = {
             row["id"]
             for row in execute("SELECT id FROM notes WHERE thread_id = ?", (thread_id,))
         }
         if thread_note_ids:
-            all_chunks_local = [c for c in all_chunks_local if c["note_id"] in thread_note_ids]
+            allowed_ids = thread_note_ids
 
     # Private boundary: when user_id is bound, only surface notes owned by that
     # user (or legacy NULL-owner public/shared notes).
@@ -99,26 +102,32 @@ def assemble_context(
                 (user_id,),
             )
         }
-        all_chunks_local = [c for c in all_chunks_local if c["note_id"] in owned_ids]
+        allowed_ids = owned_ids if allowed_ids is None else allowed_ids & owned_ids
 
-    scored: list[dict] = []
-    if query_vec and all_chunks_local:
-        for chunk in all_chunks_local:
-            try:
-                chunk_vec = json.loads(chunk["vector"])
-                score = cosine_similarity(query_vec, chunk_vec)
-                scored.append({**chunk, "score": score})
-            except (TypeError, json.JSONDecodeError, ValueError):
-                continue
-        scored.sort(key=lambda x: x["score"], reverse=True)
-    elif all_chunks_local:
-        q_tokens = _tokenise(query)
-        for chunk in all_chunks_local:
-            doc_tokens = _tokenise(chunk["content"])
-            score = bm25_score(q_tokens, doc_tokens)
-            if score > 0:
-                scored.append({**chunk, "score": score})
-        scored.sort(key=lambda x: x["score"], reverse=True)
+    # Vector index first: ranks on the mmap'd matrix without reparsing the corpus.
+    # Over-fetch so per-note chunk caps below still leave max_notes candidates.
+    candidates = max(_MIN_SEMANTIC_CANDIDATES, max_notes * max_chunks_per_note * 8)
+    scored: Optional[list[dict]] = None
+    if query_vec:
+        scored = nearest_chunks(query_vec, top_k=candidates, note_ids=allowed_ids)
+        if scored is None:
+            scored = []
+            for chunk in all_chunk_embeddings():
+                if allowed_ids is not None and chunk["note_id"] not in allowed_ids:
+                    continue
+                try:
+                    chunk_vec = json.loads(chunk["vector"])
+                    score = cosine_similarity(query_vec, chunk_vec)
+                    scored.append({**chunk, "score": score})
+                except (TypeError, json.JSONDecodeError, ValueError):
+                    continue
+            scored.sort(key=lambda x: x["score"], reverse=True)
+    else:
+        # Local-first (LAW II): when the query embedding is unavailable (Gemini
+        # offline/unconfigured), rank raw chunks by BM25 from the term statistics.
+        # These cover every chunk, embedded or not, so retrieval still works with
+        # zero embedding rows.
+        scored = bm25_search(query, top_k=candidates, note_ids=allowed_ids)
 
     # ── Step 3: Resolve unique notes, respect token budget ─────────────────
     seen_note_ids: list[int] = []
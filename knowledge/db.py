@@ -3,13 +3,17 @@ Arkadia Knowledge OS — SQLite Database Layer
 ============================================
 Thread-safe per-thread connection pool via threading.local().
 Each OS thread gets its own SQLite connection — no shared-state race conditions.
+execute() auto-commits DML; inside a transaction() block it defers to a single
+commit at the end of the outermost block.
 LAW I: One capability. One implementation. One canonical home.
 """
 
 import sqlite3
 import threading
 import os
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterator
 
 _DB_PATH = Path(os.environ.get("ARKADIA_DB_PATH", "knowledge/arkadia.db"))
 _SCHEMA_PATH = Path(__file__).parent / "schema.sql"
@@ -35,10 +39,23 @@ def get_connection() -> sqlite3.Connection:
     return _local.conn
 
 
+def _split_statements(script: str) -> list[str]:
+    """Split a SQL script into statements. Trigger bodies keep their inner semicolons."""
+    statements: list[str] = []
+    current = ""
+    for line in script.splitlines(keepends=True):
+        current += line
+        if sqlite3.complete_statement(current):
+            if current.strip():
+                statements.append(current.strip())
+            current = ""
+    if current.strip():
+        statements.append(current.strip())
+    return statements
+
+
 def _apply_schema(conn: sqlite3.Connection) -> None:
-    schema = _SCHEMA_PATH.read_text()
-    statements = [s.strip() for s in schema.split(";") if s.strip()]
-    for stmt in statements:
+    for stmt in _split_statements(_SCHEMA_PATH.read_text()):
         try:
             conn.execute(stmt)
         except sqlite3.OperationalError:
@@ -53,6 +70,11 @@ def _apply_schema(conn: sqlite3.Connection) -> None:
         "CREATE INDEX IF NOT EXISTS idx_threads_user ON threads(user_id)",
         "CREATE INDEX IF NOT EXISTS idx_projects_user ON projects(user_id)",
         "CREATE INDEX IF NOT EXISTS idx_timeline_user ON timeline(user_id)",
+        # idx_note_tags_tag_note (tag_id, note_id) covers every tag_id-prefix lookup
+        "DROP INDEX IF EXISTS idx_note_tags_tag",
+        # schema.sql's version of this trigger fails on DBs that predate notes.user_id
+        "CREATE TRIGGER IF NOT EXISTS trg_notes_graph_version_owner AFTER UPDATE OF user_id ON notes "
+        "BEGIN UPDATE graph_version SET notes_version = notes_version + 1 WHERE id = 1; END",
     ):
         try:
             conn.execute(alter)
@@ -61,16 +83,47 @@ def _apply_schema(conn: sqlite3.Connection) -> None:
     conn.commit()
 
 
+def in_transaction() -> bool:
+    """True while this thread is inside a transaction() block."""
+    return getattr(_local, "tx_depth", 0) > 0
+
+
+@contextmanager
+def transaction() -> Iterator[sqlite3.Connection]:
+    """
+    Unit of work on this thread's connection: every write inside the block
+    commits once, at the end of the outermost block, or rolls back together
+    if it raises. Nested blocks join the enclosing transaction.
+    """
+    conn = get_connection()
+    depth = getattr(_local, "tx_depth", 0)
+    _local.tx_depth = depth + 1
+    try:
+        yield conn
+    except BaseException:
+        if depth == 0:
+            conn.rollback()
+        raise
+    else:
+        if depth == 0:
+            conn.commit()
+    finally:
+        _local.tx_depth = depth
+
+
 def execute(sql: str, params: tuple = ()) -> list[dict]:
     """
     Execute a query on this thread's connection and return rows as dicts.
-    Commits automatically for DML statements (INSERT/UPDATE/DELETE).
+    Commits automatically for DML statements (INSERT/UPDATE/DELETE) unless
+    a transaction() block is open on this thread.
     """
     conn = get_connection()
     cur = conn.execute(sql, params)
     # Only commit for write operations
     sql_upper = sql.strip().upper()
-    if any(sql_upper.startswith(kw) for kw in ("INSERT", "UPDATE", "DELETE", "REPLACE")):
+    if not in_transaction() and any(
+        sql_upper.startswith(kw) for kw in ("INSERT", "UPDATE", "DELETE", "REPLACE")
+    ):
         conn.commit()
     if cur.description:
         cols = [d[0] for d in cur.description]
@@ -0,0 +1,192 @@
+"""
+Arkadia Knowledge OS — Query Embedding Cache
+============================================
+Repeated prompts should not pay an embedding round trip each time.
+embed_text() consults this cache before calling the backend, so semantic
+search, context assembly and the Oracle memory block all share it.
+
+Two tiers, keyed on sha256(model, task_type, normalised text):
+    memory  — OrderedDict LRU of MEMORY_ENTRIES vectors in this process
+    sqlite  — query_embedding_cache table, shared across workers and restarts
+
+Normalisation is NFKC + casefold + collapsed whitespace, so prompts that
+differ only in case or spacing share a vector. Entries expire TTL_S after they
+were embedded; the table is trimmed back to MAX_ENTRIES (least recently used
+first) every TRIM_EVERY stores. Failed embeddings (None) are never cached.
+A disk hit rewrites last_used only when it is more than TOUCH_INTERVAL_S
+stale, so a read stays a read and LRU order is kept to within that interval.
+
+Configuration (environment):
+    ARKADIA_QUERY_EMBED_CACHE_SIZE    persistent entries          (5000)
+    ARKADIA_QUERY_EMBED_CACHE_TTL     seconds                     (604800)
+    ARKADIA_QUERY_EMBED_CACHE         0 disables the cache
+
+LAW II: Local First. A miss embeds exactly as before; the cache can only
+remove remote round trips, never add one.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from knowledge.db import execute, execute_one
+
+logger = logging.getLogger("arkadia.embedding_cache")
+
+MAX_ENTRIES = int(os.getenv("ARKADIA_QUERY_EMBED_CACHE_SIZE", "5000"))
+TTL_S = float(os.getenv("ARKADIA_QUERY_EMBED_CACHE_TTL", str(7 * 86400)))
+MEMORY_ENTRIES = min(MAX_ENTRIES, 512)
+TRIM_EVERY = 100
+TOUCH_INTERVAL_S = 3600.0
+
+_WS = re.compile(r"\s+")
+_lock = threading.Lock()
+_memory: "OrderedDict[str, tuple[float, list[float]]]" = OrderedDict()
+_stats = {"lookups": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0, "expired": 0, "stores": 0}
+_stores_since_trim = 0
+
+
+def enabled() -> bool:
+    return os.getenv("ARKADIA_QUERY_EMBED_CACHE", "1").strip() != "0" and MAX_ENTRIES > 0
+
+
+def normalise(text: str) -> str:
+    return _WS.sub(" ", unicodedata.normalize("NFKC", text).casefold()).strip()
+
+
+def cache_key(text: str, model: str, task_type: str) -> str:
+    return hashlib.sha256(f"{model}\x1f{task_type}\x1f{normalise(text)}".encode()).hexdigest()
+
+
+def _count(name: str) -> None:
+    with _lock:
+        _stats[name] += 1
+
+
+def _lookup(key: str, now: float) -> Optional[list[float]]:
+    with _lock:
+        hit = _memory.get(key)
+        if hit is not None and now - hit[0] < TTL_S:
+            _memory.move_to_end(key)
+            _stats["memory_hits"] += 1
+            return list(hit[1])                 # callers may mutate their copy
+    row = execute_one(
+        "SELECT vector, created_at, last_used FROM query_embedding_cache WHERE cache_key = ?", (key,)
+    )
+    if row is None:
+        return None
+    if now - row["created_at"] >= TTL_S:
+        execute("DELETE FROM query_embedding_cache WHERE cache_key = ?", (key,))
+        _count("expired")
+        return None
+    if now - row["last_used"] >= TOUCH_INTERVAL_S:
+        execute("UPDATE query_embedding_cache SET last_used = ? WHERE cache_key = ?", (now, key))
+    vector = array("d", row["vector"]).tolist()
+    _remember(key, row["created_at"], vector)
+    _count("disk_hits")
+    return vector
+
+
+def _remember(key: str, created_at: float, vector: list[float]) -> None:
+    with _lock:
+        _memory[key] = (created_at, vector)
+        _memory.move_to_end(key)
+        while len(_memory) > MEMORY_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def _store(key: str, model: str, vector: list[float], now: float) -> None:
+    global _stores_since_trim
+    execute(
+        "INSERT OR REPLACE INTO query_embedding_cache (cache_key, model, vector, created_at, last_used) "
+        "VALUES (?, ?, ?, ?, ?)",
+        (key, model, array("d", vector).tobytes(), now, now),
+    )
+    _remember(key, now, vector)
+    with _lock:
+        _stats["stores"] += 1
+        _stores_since_trim += 1
+        due = _stores_since_trim >= TRIM_EVERY
+        if due:
+            _stores_since_trim = 0
+    if due:
+        trim(now)
+
+
+def trim(now: Optional[float] = None) -> None:
+    """Drop expired rows, then the least recently used beyond MAX_ENTRIES."""
+    now = time.time() if now is None else now
+    execute("DELETE FROM query_embedding_cache WHERE created_at <= ?", (now - TTL_S,))
+    execute(
+        "DELETE FROM query_embedding_cache WHERE cache_key IN ("
+        "SELECT cache_key FROM query_embedding_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+        (MAX_ENTRIES,),
+    )
+
+
+def get_or_embed(
+    text: str,
+    model: str,
+    task_type: str,
+    embed: Callable[[], Optional[list[float]]],
+) -> Optional[list[float]]:
+    """Cached vector for (text, model, task_type), else embed() and remember it."""
+    if not enabled():
+        return embed()
+    now = time.time()
+    key = cache_key(text, model, task_type)
+    _count("lookups")
+    try:
+        vector = _lookup(key, now)
+    except Exception as exc:                    # cache trouble must never block retrieval
+        logger.warning(f"[EMBED-CACHE] lookup failed: {exc}")
+        vector = None
+    if vector is not None:
+        return vector
+    _count("misses")
+    vector = embed()
+    if vector:
+        try:
+            _store(key, model, vector, now)
+        except Exception as exc:
+            logger.warning(f"[EMBED-CACHE] store failed: {exc}")
+    return vector
+
+
+def stats() -> dict:
+    """Hit rate and embedding round trips saved since process start."""
+    with _lock:
+        s = dict(_stats)
+        memory_entries = len(_memory)
+    hits = s["memory_hits"] + s["disk_hits"]
+    return {
+        **s,
+        "hits": hits,
+        "hit_rate": round(hits / s["lookups"], 4) if s["lookups"] else 0.0,
+        "saved_round_trips": hits,
+        "memory_entries": memory_entries,
+        "max_entries": MAX_ENTRIES,
+        "ttl_s": TTL_S,
+        "enabled": enabled(),
+    }
+
+
+def clear() -> None:
+    """Empty both tiers and reset the counters (tests, model changes)."""
+    execute("DELETE FROM query_embedding_cache")
+    with _lock:
+        _memory.clear()
+        for k in _stats:
+            _stats[k] = 0
+
+
+__all__ = ["cache_key", "clear", "get_or_embed", "normalise", "stats", "trim"]
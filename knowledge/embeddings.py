@@ -2,34 +2,84 @@
 Arkadia Knowledge OS — Embeddings Layer
 ========================================
 Generates and stores 768-dim vectors via Gemini text-embedding-004.
+embed_texts() batches through batchEmbedContents with bounded concurrency;
+ARKADIA_EMBEDDER=fake swaps in a deterministic local embedder for offline
+tests and throughput benchmarks.
 Falls back to BM25-style keyword scoring when offline or unconfigured.
 LAW II: Local First. Cloud sync is additive. Never required.
 LAW IV: Oracle retrieves knowledge. Providers generate language.
 """
 
+import hashlib
 import json
+import logging
 import math
 import os
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
-from knowledge.db import execute, execute_one, last_insert_id
+from knowledge.db import execute, execute_one, last_insert_id, transaction
+from knowledge import embedding_cache, vector_index
+
+logger = logging.getLogger("arkadia.embeddings")
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Embedding generation
 # ─────────────────────────────────────────────────────────────────────────────
 
-def _gemini_embed(text: str, task_type: str = "RETRIEVAL_DOCUMENT") -> Optional[list[float]]:
-    """Call Gemini text-embedding-004. Returns None when API unavailable."""
+GEMINI_MODEL = "text-embedding-004"
+FAKE_MODEL = "fake-hash-768"
+EMBED_DIM = 768
+
+# Gemini batchEmbedContents accepts at most 100 texts per request
+_BATCH_SIZE = 100
+# Concurrent batch requests in flight per embed_texts() call
+_MAX_CONCURRENCY = 4
+
+_configured_key: Optional[str] = None
+_configure_lock = threading.Lock()
+
+
+def _embedder() -> str:
+    """Active backend: ARKADIA_EMBEDDER=fake selects the offline hash embedder."""
+    return os.environ.get("ARKADIA_EMBEDDER", "gemini").strip().lower()
+
+
+def active_model() -> str:
+    """Model name recorded alongside vectors produced by the active backend."""
+    return FAKE_MODEL if _embedder() == "fake" else GEMINI_MODEL
+
+
+def _gemini_client():
+    """Return the configured genai module, or None when unconfigured. Configures once per key."""
+    global _configured_key
     api_key = os.environ.get("GEMINI_API_KEY", "")
     if not api_key:
         return None
     try:
         import google.generativeai as genai
-        genai.configure(api_key=api_key)
+    except ImportError:
+        return None
+    if _configured_key != api_key:
+        with _configure_lock:
+            if _configured_key != api_key:
+                genai.configure(api_key=api_key)
+                _configured_key = api_key
+    return genai
+
+
+def _gemini_embed(text: str, task_type: str = "RETRIEVAL_DOCUMENT") -> Optional[list[float]]:
+    """Call Gemini text-embedding-004. Returns None when API unavailable."""
+    genai = _gemini_client()
+    if genai is None:
+        return None
+    try:
         result = genai.embed_content(
-            model="models/text-embedding-004",
+            model=f"models/{GEMINI_MODEL}",
             content=text,
             task_type=task_type,
         )
@@ -38,12 +88,91 @@ def _gemini_embed(text: str, task_type: str = "RETRIEVAL_DOCUMENT") -> Optional[
         return None
 
 
+def _gemini_embed_batch(texts: list[str], task_type: str) -> list[Optional[list[float]]]:
+    """
+    One batchEmbedContents round trip for up to _BATCH_SIZE texts.
+    If the batch call fails, each text is retried on its own so one bad
+    item only costs its own slot.
+    """
+    genai = _gemini_client()
+    if genai is None:
+        return [None] * len(texts)
+    try:
+        result = genai.embed_content(
+            model=f"models/{GEMINI_MODEL}",
+            content=texts,
+            task_type=task_type,
+        )
+        vectors = result["embedding"]
+        if len(vectors) == len(texts):
+            return [v or None for v in vectors]
+    except Exception as exc:
+        logger.warning(f"[EMBED] Batch of {len(texts)} failed, retrying per item: {exc}")
+    return [_gemini_embed(t, task_type) for t in texts]
+
+
+def _fake_embed(text: str) -> list[float]:
+    """
+    Deterministic offline embedder: hashed bag-of-words, L2-normalised.
+    Overlapping texts get non-zero cosine similarity. For tests and benchmarks.
+    """
+    vec = [0.0] * EMBED_DIM
+    for tok in re.findall(r"\w+", text.lower()):
+        h = int.from_bytes(hashlib.blake2b(tok.encode(), digest_size=8).digest(), "little")
+        vec[h % EMBED_DIM] += 1.0
+    mag = math.sqrt(sum(v * v for v in vec))
+    return [v / mag for v in vec] if mag else vec
+
+
+def _fake_embed_batch(texts: list[str]) -> list[Optional[list[float]]]:
+    # Simulated round-trip latency so concurrency shows up in offline benchmarks
+    latency_ms = float(os.environ.get("ARKADIA_FAKE_EMBED_LATENCY_MS", "0") or 0)
+    if latency_ms > 0:
+        time.sleep(latency_ms / 1000)
+    return [_fake_embed(t) for t in texts]
+
+
 def embed_text(text: str, task_type: str = "RETRIEVAL_DOCUMENT") -> Optional[list[float]]:
     """
     Embed a single piece of text. Returns a float vector or None on failure.
     task_type: RETRIEVAL_DOCUMENT | RETRIEVAL_QUERY | SEMANTIC_SIMILARITY
+    Served from knowledge/embedding_cache.py when the same normalised text was
+    embedded recently by the same model.
+    """
+    if _embedder() == "fake":
+        embed = lambda: _fake_embed(text)  # noqa: E731
+    else:
+        embed = lambda: _gemini_embed(text, task_type)  # noqa: E731
+    return embedding_cache.get_or_embed(text, active_model(), task_type, embed)
+
+
+def embed_texts(
+    texts: list[str],
+    task_type: str = "RETRIEVAL_DOCUMENT",
+    batch_size: int = _BATCH_SIZE,
+    max_concurrency: int = _MAX_CONCURRENCY,
+) -> list[Optional[list[float]]]:
+    """
+    Embed many texts via the provider batch endpoint.
+    Batches run concurrently (at most max_concurrency in flight). The result
+    is aligned with texts; failed items are None.
     """
-    return _gemini_embed(text, task_type)
+    if not texts:
+        return []
+    if _embedder() == "fake":
+        run_batch = _fake_embed_batch
+    else:
+        if _gemini_client() is None:
+            return [None] * len(texts)
+        run_batch = lambda batch: _gemini_embed_batch(batch, task_type)  # noqa: E731
+
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    if len(batches) == 1 or max_concurrency <= 1:
+        results = [run_batch(b) for b in batches]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(batches))) as pool:
+            results = list(pool.map(run_batch, batches))
+    return [v for batch in results for v in batch]
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -59,34 +188,11 @@ def cosine_similarity(a: list[float], b: list[float]) -> float:
     return dot / (mag_a * mag_b)
 
 
-# ─────────────────────────────────────────────────────────────────────────────
-# BM25-style fallback (local-first, no API needed)
-# ─────────────────────────────────────────────────────────────────────────────
-
-def _tokenise(text: str) -> list[str]:
-    return re.findall(r"\b[a-z]{3,}\b", text.lower())
-
-
-def bm25_score(query_tokens: list[str], doc_tokens: list[str], k1: float = 1.5, b: float = 0.75, avg_dl: int = 200) -> float:
-    freq: dict[str, int] = {}
-    for t in doc_tokens:
-        freq[t] = freq.get(t, 0) + 1
-    score = 0.0
-    dl = len(doc_tokens)
-    for qt in query_tokens:
-        tf = freq.get(qt, 0)
-        if tf == 0:
-            continue
-        idf = math.log(1 + 1 / (tf + 0.5))
-        score += idf * (tf * (k1 + 1)) / (tf + k1 * (1 - b + b * dl / avg_dl))
-    return score
-
-
 # ─────────────────────────────────────────────────────────────────────────────
 # SQLite storage
 # ─────────────────────────────────────────────────────────────────────────────
 
-def store_chunk_embedding(chunk_id: int, vector: list[float], model: str = "text-embedding-004") -> int:
+def store_chunk_embedding(chunk_id: int, vector: list[float], model: str = GEMINI_MODEL) -> int:
     execute(
         "INSERT INTO embeddings (chunk_id, vector, model) VALUES (?, ?, ?)",
         (chunk_id, json.dumps(vector), model),
@@ -94,6 +200,18 @@ def store_chunk_embedding(chunk_id: int, vector: list[float], model: str = "text
     return last_insert_id()
 
 
+def store_chunk_embeddings(rows: list[tuple[int, list[float]]], model: str = GEMINI_MODEL) -> int:
+    """Insert (chunk_id, vector) rows in a single transaction. Returns rows written."""
+    if not rows:
+        return 0
+    with transaction() as conn:
+        conn.executemany(
+            "INSERT INTO embeddings (chunk_id, vector, model) VALUES (?, ?, ?)",
+            [(chunk_id, json.dumps(vector), model) for chunk_id, vector in rows],
+        )
+    return len(rows)
+
+
 def get_chunk_embedding(chunk_id: int) -> Optional[list[float]]:
     row = execute_one("SELECT vector FROM embeddings WHERE chunk_id = ? ORDER BY id DESC LIMIT 1", (chunk_id,))
     if row:
@@ -113,18 +231,27 @@ def all_chunk_embeddings() -> list[dict]:
     )
 
 
-def all_chunks() -> list[dict]:
-    """Return all chunks WITHOUT requiring an embedding row.
-
-    Used by the local-first BM25 fallback when no embeddings are stored
-    (Gemini offline/unconfigured). all_chunk_embeddings() JOINs chunks to
-    embeddings and returns [] when 0 embeddings exist, which would make the
-    BM25 fallback unreachable. This helper keeps LAW II ("Local First") honest.
+def nearest_chunks(
+    query_vec: list[float],
+    top_k: int = 10,
+    note_ids: Optional[set[int]] = None,
+) -> Optional[list[dict]]:
     """
-    return execute(
-        """
-        SELECT id AS chunk_id, note_id, content
-        FROM chunks
-        ORDER BY id DESC
-        """
-    )
+    Top-k chunks by cosine similarity, served from the memory-mapped vector index.
+    Returns {chunk_id, note_id, content, score} dicts ranked best-first, or None
+    when the index is unavailable (numpy missing) — callers then fall back to
+    scoring all_chunk_embeddings() in Python.
+    """
+    index = vector_index.get_index()
+    if index is None:
+        return None
+    hits = index.search(query_vec, top_k=top_k, note_ids=note_ids)
+    if not hits:
+        return []
+    ids = [h["chunk_id"] for h in hits]
+    phs = ",".join("?" * len(ids))
+    content = {
+        r["id"]: r["content"]
+        for r in execute(f"SELECT id, content FROM chunks WHERE id IN ({phs})", tuple(ids))
+    }
+    return [{**h, "content": content[h["chunk_id"]]} for h in hits if h["chunk_id"] in content]
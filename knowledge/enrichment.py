@@ -16,19 +16,33 @@ This engine:
 Entry points:
     enrich_note(note_id)          — enrich one note
     enrich_batch(note_ids)        — enrich multiple notes
-    schedule_enrichment(note_id)  — launch in background thread
+    schedule_enrichment(note_id)  — queue for the background worker pool
+    enrichment_stats()            — queue depth, throughput, edges/s
+
+Background enrichment runs on a bounded pool (ARKADIA_ENRICH_WORKERS, default
+2) fed by a queue deduplicated by note id: a bulk import of N notes costs N
+queue entries and a fixed number of threads, and a note queued twice before
+it is picked up is enriched once. Each note's edges are written in one
+batched upsert.
+
+Scorers generate candidates from indexes only (note_tags by tag, notes by
+project / provider / thread, knowledge.title_keys for chapter numbers and
+title words) and are capped at MAX_CANDIDATES_PER_SCORER, so the work per
+note stays flat as the corpus grows.
 """
 
 from __future__ import annotations
 
 import json
 import logging
-import re
+import os
 import threading
+import time
+from collections import Counter, OrderedDict, deque
 from typing import Optional
 
-from knowledge.db import execute, execute_one
-from knowledge.graph import add_edge
+from knowledge import title_keys
+from knowledge.db import execute, execute_one, transaction
 from knowledge.relationship_types import RELATIONSHIP_TYPES_SET
 
 logger = logging.getLogger("arkadia.enrichment")
@@ -43,6 +57,12 @@ MIN_CONFIDENCE   = 0.25
 # Above this threshold, use a stronger relationship type where appropriate.
 HIGH_CONFIDENCE  = 0.65
 
+# Candidate generation is bounded per note: each scorer proposes at most
+# MAX_CANDIDATES_PER_SCORER targets, and tag / title-word lookups read at most
+# _POSTINGS_PER_KEY of the newest notes per key, whatever the corpus size.
+MAX_CANDIDATES_PER_SCORER = 30
+_POSTINGS_PER_KEY = 200
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Evidence scorers
@@ -53,6 +73,10 @@ def _shared_tag_links(note: dict) -> list[tuple[int, str, float, str]]:
     """
     Discover notes that share tags with this note.
     → `relates_to` (low confidence) or `references` (high shared-tag ratio).
+
+    Reads at most _POSTINGS_PER_KEY of the newest postings per tag through
+    idx_note_tags_tag_note, so a corpus-wide tag costs the same at 1k or
+    100k notes; only the best-ranked candidates have their tags loaded.
     """
     try:
         tags = json.loads(note.get("tags") or "[]")
@@ -63,30 +87,31 @@ def _shared_tag_links(note: dict) -> list[tuple[int, str, float, str]]:
 
     note_id = note["id"]
     placeholders = ",".join("?" * len(tags))
-    candidates = execute(
-        f"""
-        SELECT n.id, n.note_type, n.tags,
-               COUNT(t.name) as shared_count
-        FROM notes n
-        JOIN note_tags nt ON nt.note_id = n.id
-        JOIN tags t ON t.id = nt.tag_id
-        WHERE t.name IN ({placeholders})
-          AND n.id != ?
-        GROUP BY n.id
-        ORDER BY shared_count DESC
-        LIMIT 30
-        """,
-        tuple(tags) + (note_id,),
-    )
+    tag_ids = [r["id"] for r in execute(
+        f"SELECT id FROM tags WHERE name IN ({placeholders})", tuple(tags)
+    )]
+    shared_counts: Counter[int] = Counter()
+    for tag_id in tag_ids:
+        shared_counts.update(r["note_id"] for r in execute(
+            "SELECT note_id FROM note_tags WHERE tag_id = ? AND note_id != ? "
+            "ORDER BY note_id DESC LIMIT ?",
+            (tag_id, note_id, _POSTINGS_PER_KEY),
+        ))
+    top = shared_counts.most_common(MAX_CANDIDATES_PER_SCORER)
+    if not top:
+        return []
+    placeholders = ",".join("?" * len(top))
+    candidate_tags = {r["id"]: r["tags"] for r in execute(
+        f"SELECT id, tags FROM notes WHERE id IN ({placeholders})", tuple(c for c, _ in top)
+    )}
 
     results = []
     own_tag_count = len(tags)
-    for c in candidates:
+    for c_id, shared in top:
         try:
-            c_tags = json.loads(c.get("tags") or "[]")
+            c_tags = json.loads(candidate_tags.get(c_id) or "[]")
         except (json.JSONDecodeError, TypeError):
             c_tags = []
-        shared = c["shared_count"]
         union  = max(len(set(tags) | set(c_tags)), 1)
         confidence = shared / union
 
@@ -94,7 +119,7 @@ def _shared_tag_links(note: dict) -> list[tuple[int, str, float, str]]:
             continue
 
         rel = "references" if confidence >= HIGH_CONFIDENCE else "relates_to"
-        results.append((c["id"], rel, round(confidence, 3), f"Shared tags: {shared}/{union}"))
+        results.append((c_id, rel, round(confidence, 3), f"Shared tags: {shared}/{union}"))
 
     return results
 
@@ -114,9 +139,10 @@ def _shared_project_links(note: dict) -> list[tuple[int, str, float, str]]:
         """
         SELECT id FROM notes
         WHERE project_id = ? AND id != ?
-        LIMIT 20
+        ORDER BY id DESC
+        LIMIT ?
         """,
-        (project_id, note_id),
+        (project_id, note_id, MAX_CANDIDATES_PER_SCORER),
     )
     return [
         (s["id"], "relates_to", 0.4, "Same project")
@@ -169,36 +195,39 @@ def _type_affinity_links(note: dict) -> list[tuple[int, str, float, str]]:
 
     if note_type == "chapter":
         # Link to encyclopaedia chapters that share numeric sequence hints
-        num_match = re.search(r"\b(\d+)\b", title)
-        if num_match:
-            num = int(num_match.group(1))
-            # Find chapter with num-1 in its title
-            all_chapters = execute(
-                "SELECT id, title FROM notes WHERE note_type = 'chapter' AND id != ?",
-                (note_id,),
-            )
-            for ch in all_chapters:
-                prev_match = re.search(r"\b(\d+)\b", ch["title"] or "")
-                if prev_match and int(prev_match.group(1)) == num - 1:
-                    results.append((ch["id"], "follows", 0.7, f"Chapter sequence: {num-1} → {num}"))
+        num = title_keys.chapter_number(title)
+        if num is not None:
+            # Find chapters with num-1 in their title
+            for prev_id in title_keys.notes_with_key(
+                "chapter", str(num - 1), note_id, MAX_CANDIDATES_PER_SCORER
+            ):
+                results.append((prev_id, "follows", 0.7, f"Chapter sequence: {num-1} → {num}"))
 
     if note_type in ("document", "scroll"):
         # Title word overlap with other documents/scrolls
-        title_words = set(re.findall(r"\b[a-zA-Z]{5,}\b", title.lower()))
-        if len(title_words) >= 2:
-            peers = execute(
-                "SELECT id, title FROM notes WHERE note_type IN ('document', 'scroll') AND id != ? LIMIT 50",
-                (note_id,),
-            )
-            for peer in peers:
-                peer_words = set(re.findall(r"\b[a-zA-Z]{5,}\b", (peer["title"] or "").lower()))
-                if not peer_words:
-                    continue
-                overlap = len(title_words & peer_words)
-                conf = overlap / max(len(title_words | peer_words), 1)
-                if conf >= MIN_CONFIDENCE:
-                    results.append((peer["id"], "references", round(conf, 3),
-                                    f"Title word overlap: {overlap} words"))
+        words = title_keys.title_words(title)
+        if len(words) >= 2:
+            overlap_counts: Counter[int] = Counter()
+            for word in words:
+                overlap_counts.update(
+                    title_keys.notes_with_key("word", word, note_id, _POSTINGS_PER_KEY)
+                )
+            top = overlap_counts.most_common(MAX_CANDIDATES_PER_SCORER)
+            if top:
+                placeholders = ",".join("?" * len(top))
+                peers = execute(
+                    f"SELECT id, title FROM notes WHERE id IN ({placeholders})",
+                    tuple(p for p, _ in top),
+                )
+                for peer in peers:
+                    peer_words = title_keys.title_words(peer["title"])
+                    if not peer_words:
+                        continue
+                    overlap = len(words & peer_words)
+                    conf = overlap / max(len(words | peer_words), 1)
+                    if conf >= MIN_CONFIDENCE:
+                        results.append((peer["id"], "references", round(conf, 3),
+                                        f"Title word overlap: {overlap} words"))
 
     return results
 
@@ -232,34 +261,53 @@ def _source_provider_links(note: dict) -> list[tuple[int, str, float, str]]:
 
 def _write_edges(note_id: int, candidates: list[tuple[int, str, float, str]]) -> int:
     """
-    Deduplicate candidates and write edges above the confidence threshold.
-    Returns count of edges actually written.
+    Deduplicate candidates and write edges above the confidence threshold
+    as one batched upsert. Edges already stored with the same weight are
+    left untouched. Returns count of edges inserted or re-weighted.
     """
-    written = 0
     # Deduplicate by (target_id, relationship) — keep highest confidence
     best: dict[tuple[int, str], tuple[float, str]] = {}
     for target_id, rel, conf, reason in candidates:
-        key = (target_id, rel)
-        if key not in best or conf > best[key][0]:
-            best[key] = (conf, reason)
-
-    for (target_id, rel), (conf, reason) in best.items():
-        if conf < MIN_CONFIDENCE:
+        if conf < MIN_CONFIDENCE or target_id == note_id:
             continue
         if rel not in RELATIONSHIP_TYPES_SET:
+            logger.warning(f"[ENRICHMENT] Skipped invalid edge: unknown relationship {rel!r}")
             continue
-        if target_id == note_id:
-            continue
-        try:
-            add_edge(note_id, target_id, rel, weight=conf)
-            written += 1
-            logger.debug(f"[ENRICHMENT] {note_id}→{target_id} via '{rel}' (conf={conf:.2f}) — {reason}")
-        except ValueError as exc:
-            logger.warning(f"[ENRICHMENT] Skipped invalid edge: {exc}")
-        except Exception:
-            pass  # UNIQUE constraint violations are expected and safe to ignore
-
-    return written
+        key = (target_id, rel)
+        if key not in best or conf > best[key][0]:
+            best[key] = (conf, reason)
+    if not best:
+        return 0
+
+    with transaction() as conn:
+        existing = {
+            (r[0], r[1]): r[2]
+            for r in conn.execute(
+                "SELECT target_note_id, relationship, weight FROM graph_edges WHERE source_note_id = ?",
+                (note_id,),
+            )
+        }
+        rows = [
+            (note_id, target_id, rel, conf)
+            for (target_id, rel), (conf, _) in best.items()
+            if existing.get((target_id, rel)) != conf
+        ]
+        if not rows:
+            return 0
+        cur = conn.executemany(
+            """
+            INSERT INTO graph_edges (source_note_id, target_note_id, relationship, weight)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(source_note_id, target_note_id, relationship)
+            DO UPDATE SET weight = excluded.weight
+            """,
+            rows,
+        )
+    if logger.isEnabledFor(logging.DEBUG):
+        for _, target_id, rel, conf in rows:
+            logger.debug(f"[ENRICHMENT] {note_id}→{target_id} via '{rel}' (conf={conf:.2f}) — "
+                         f"{best[(target_id, rel)][1]}")
+    return max(cur.rowcount, 0)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -276,6 +324,7 @@ def enrich_note(note_id: int) -> dict:
     note = execute_one("SELECT * FROM notes WHERE id = ?", (note_id,))
     if not note:
         return {"note_id": note_id, "edges_created": 0, "error": "Note not found"}
+    title_keys.sync()
 
     all_candidates: list[tuple[int, str, float, str]] = []
 
@@ -324,12 +373,8 @@ def enrich_batch(note_ids: list[int]) -> dict:
     }
 
 
-def enrich_all_orphans(limit: int = 500) -> dict:
-    """
-    Find notes with no outbound edges and enrich them.
-    Safe to call repeatedly — idempotent.
-    """
-    orphan_ids = execute(
+def _orphan_ids(limit: int) -> list[int]:
+    rows = execute(
         """
         SELECT id FROM notes
         WHERE id NOT IN (SELECT source_note_id FROM graph_edges)
@@ -338,35 +383,155 @@ def enrich_all_orphans(limit: int = 500) -> dict:
         """,
         (limit,),
     )
-    ids = [r["id"] for r in orphan_ids]
+    return [r["id"] for r in rows]
+
+
+def enrich_all_orphans(limit: int = 500) -> dict:
+    """
+    Find notes with no outbound edges and enrich them.
+    Safe to call repeatedly — idempotent.
+    """
+    ids = _orphan_ids(limit)
     result = enrich_batch(ids)
     result["orphans_found"] = len(ids)
     return result
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Background worker pool
+# ─────────────────────────────────────────────────────────────────────────────
+
+_WORKERS = max(1, int(os.environ.get("ARKADIA_ENRICH_WORKERS", "2")))
+_RATE_WINDOW_S = 60.0
+
+
+class EnrichmentQueue:
+    """
+    Bounded worker pool over a FIFO of note ids, deduplicated by id.
+    A note is never enriched by two workers at once; re-queuing a note that
+    is already running schedules exactly one more pass after it finishes.
+    Workers are daemon threads started on first submit.
+    """
+
+    def __init__(self, workers: int = _WORKERS) -> None:
+        self.workers = max(1, workers)
+        self._cond = threading.Condition()
+        self._pending: "OrderedDict[int, None]" = OrderedDict()
+        self._running: set[int] = set()
+        self._threads: list[threading.Thread] = []
+        self._recent: deque[tuple[float, int]] = deque()   # (finished_at, edges) within the rate window
+        self._counts = {"enqueued": 0, "deduplicated": 0, "processed": 0, "failed": 0, "edges_written": 0}
+
+    def submit(self, note_id: int) -> bool:
+        """Queue *note_id*. Returns False when it was already waiting."""
+        with self._cond:
+            if note_id in self._pending:
+                self._counts["deduplicated"] += 1
+                return False
+            self._pending[note_id] = None
+            self._counts["enqueued"] += 1
+            if len(self._threads) < self.workers:
+                self._start_worker()
+            self._cond.notify()
+            return True
+
+    def _start_worker(self) -> None:
+        t = threading.Thread(target=self._work, name=f"enrich-worker-{len(self._threads)}", daemon=True)
+        self._threads.append(t)
+        t.start()
+
+    def _next(self) -> int:
+        with self._cond:
+            while True:
+                note_id = next((n for n in self._pending if n not in self._running), None)
+                if note_id is not None:
+                    del self._pending[note_id]
+                    self._running.add(note_id)
+                    return note_id
+                self._cond.wait()
+
+    def _work(self) -> None:
+        while True:
+            note_id = self._next()
+            edges, failed = 0, False
+            try:
+                edges = enrich_note(note_id).get("edges_created", 0)
+            except Exception as exc:
+                failed = True
+                logger.error(f"[ENRICHMENT] Background enrichment failed for note {note_id}: {exc}")
+            with self._cond:
+                self._running.discard(note_id)
+                self._counts["failed" if failed else "processed"] += 1
+                self._counts["edges_written"] += edges
+                now = time.monotonic()
+                self._recent.append((now, edges))
+                self._trim_recent(now)
+                self._cond.notify_all()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until nothing is queued or running. Returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._running, timeout)
+
+    def _trim_recent(self, now: float) -> None:
+        """Drop completions older than the rate window. Caller holds the lock."""
+        while self._recent and now - self._recent[0][0] > _RATE_WINDOW_S:
+            self._recent.popleft()
+
+    def stats(self) -> dict:
+        with self._cond:
+            now = time.monotonic()
+            self._trim_recent(now)
+            window = min(_RATE_WINDOW_S, now - self._recent[0][0]) if self._recent else 0.0
+            edges = sum(n for _, n in self._recent)
+            return {
+                "workers":          self.workers,
+                "threads":          len(self._threads),
+                "queue_depth":      len(self._pending),
+                "running":          len(self._running),
+                **self._counts,
+                "notes_per_second": round(len(self._recent) / window, 2) if window else 0.0,
+                "edges_per_second": round(edges / window, 2) if window else 0.0,
+            }
+
+
+_queue: Optional[EnrichmentQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_enrichment_queue() -> EnrichmentQueue:
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = EnrichmentQueue()
+    return _queue
+
+
 def schedule_enrichment(note_id: int) -> None:
     """
-    Enrich a note in a background daemon thread.
+    Queue a note for background enrichment.
     Non-blocking — startup and ingest latency unaffected.
     """
-    def _run() -> None:
-        try:
-            enrich_note(note_id)
-        except Exception as exc:
-            logger.error(f"[ENRICHMENT] Background enrichment failed for note {note_id}: {exc}")
+    get_enrichment_queue().submit(note_id)
 
-    t = threading.Thread(target=_run, name=f"enrich-{note_id}", daemon=True)
-    t.start()
+
+def enrichment_stats() -> dict:
+    """Worker pool metrics: queue depth, counters, notes/s and edges/s over the last minute."""
+    return get_enrichment_queue().stats()
 
 
-def schedule_orphan_enrichment() -> None:
+def schedule_orphan_enrichment(limit: int = 500) -> None:
     """
-    Enrich all orphan notes in a background daemon thread.
+    Queue all orphan notes (no outbound edges) for background enrichment.
     """
     def _run() -> None:
         try:
-            result = enrich_all_orphans()
-            logger.info(f"[ENRICHMENT] Orphan pass complete: {result}")
+            orphan_ids = _orphan_ids(limit)
+            queue = get_enrichment_queue()
+            for note_id in orphan_ids:
+                queue.submit(note_id)
+            logger.info(f"[ENRICHMENT] Orphan pass queued {len(orphan_ids)} notes")
         except Exception as exc:
             logger.error(f"[ENRICHMENT] Orphan enrichment failed: {exc}")
 
@@ -0,0 +1,126 @@
+"""
+Arkadia Knowledge OS — Full-Text Index Backfill
+================================================
+Copies notes that predate the notes_fts virtual table into it, in place.
+
+LAW I: One capability. One implementation. One canonical home.
+
+schema.sql installs the FTS5 table and its triggers, and records the highest
+note id present at that moment (fts_backfill.high_water). From then on every
+insert/update/delete is indexed by the triggers; this module only has to copy
+ids (watermark, high_water]. Each batch is one short transaction that
+delete-then-inserts its id range, so it is idempotent, races safely with the
+triggers, and never holds the write lock long enough to stall the API.
+Until the backfill completes, knowledge.search keeps answering via LIKE.
+
+Entry points:
+    fts_ready()               — True once notes_fts covers every note
+    backfill_notes_fts(n)     — run the backfill synchronously
+    schedule_fts_backfill()   — run it in a background daemon thread
+
+Run as a module:
+    python3 -m knowledge.fts_migration
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from knowledge.db import execute_one, get_connection
+
+logger = logging.getLogger("arkadia.fts_migration")
+
+_BATCH_SIZE = 500
+# Pause between batches so foreground writers get the lock
+_BATCH_PAUSE_S = 0.01
+
+_ready = False
+
+
+def fts_ready() -> bool:
+    """True once notes_fts has been backfilled. Cached — it never regresses."""
+    global _ready
+    if _ready:
+        return True
+    try:
+        row = execute_one(
+            "SELECT watermark, high_water FROM fts_backfill WHERE name = 'notes_fts'"
+        )
+    except Exception:
+        return False
+    _ready = bool(row) and row["watermark"] >= row["high_water"]
+    return _ready
+
+
+def backfill_notes_fts(batch_size: int = _BATCH_SIZE) -> dict:
+    """
+    Copy pre-existing notes into notes_fts in id-ordered batches.
+    Safe to call repeatedly and concurrently with normal traffic.
+    """
+    conn = get_connection()
+    state = execute_one(
+        "SELECT watermark, high_water FROM fts_backfill WHERE name = 'notes_fts'"
+    )
+    if not state:
+        return {"batches": 0, "indexed": 0, "complete": False, "error": "notes_fts unavailable"}
+
+    watermark, high_water = state["watermark"], state["high_water"]
+    batches = 0
+    indexed = 0
+    while watermark < high_water:
+        # Batch by row count, not id span — AUTOINCREMENT ids can be sparse.
+        nth = execute_one(
+            "SELECT id FROM notes WHERE id > ? AND id <= ? ORDER BY id LIMIT 1 OFFSET ?",
+            (watermark, high_water, batch_size - 1),
+        )
+        upper = nth["id"] if nth else high_water
+        with conn:
+            conn.execute(
+                "DELETE FROM notes_fts WHERE rowid > ? AND rowid <= ?", (watermark, upper)
+            )
+            cur = conn.execute(
+                "INSERT INTO notes_fts (rowid, title, content) "
+                "SELECT id, title, content FROM notes WHERE id > ? AND id <= ?",
+                (watermark, upper),
+            )
+            conn.execute(
+                "UPDATE fts_backfill SET watermark = ?, "
+                "completed_at = CASE WHEN ? >= high_water THEN datetime('now') END "
+                "WHERE name = 'notes_fts'",
+                (upper, upper),
+            )
+        indexed += max(cur.rowcount, 0)
+        batches += 1
+        watermark = upper
+        time.sleep(_BATCH_PAUSE_S)
+
+    summary = {"batches": batches, "indexed": indexed, "complete": fts_ready()}
+    if batches:
+        logger.info(f"[FTS] notes_fts backfill — {summary}")
+    return summary
+
+
+def schedule_fts_backfill() -> None:
+    """
+    Run the backfill in a background daemon thread.
+    Non-blocking; searches fall back to LIKE until it finishes.
+    """
+    if fts_ready():
+        return
+
+    def _run() -> None:
+        try:
+            backfill_notes_fts()
+        except Exception as exc:
+            logger.error(f"[FTS] Backfill failed: {exc}", exc_info=True)
+
+    t = threading.Thread(target=_run, name="fts-backfill", daemon=True)
+    t.start()
+    logger.info("[FTS] notes_fts backfill thread launched")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(backfill_notes_fts())
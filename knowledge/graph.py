@@ -3,13 +3,15 @@ Arkadia Knowledge OS — Knowledge Graph
 =======================================
 Every note becomes a graph node.
 Relationships are typed, directional, and weighted.
-Graph traversal is BFS with configurable depth.
+Graph traversal is BFS with configurable depth, run over the in-process
+adjacency index (knowledge/graph_index.py) — no SQL per node or per level.
 """
 
 import json
 from typing import Optional
 
 from knowledge.db import execute, execute_one
+from knowledge.graph_index import get_graph_index
 from knowledge.relationship_types import RELATIONSHIP_TYPES, RELATIONSHIP_TYPES_SET
 
 def accessible_note_ids(user_id: Optional[str] = None) -> set[int]:
@@ -41,9 +43,11 @@ def add_edge(source_id: int, target_id: int, relationship: str, weight: float =
         raise ValueError(f"Unknown relationship: {relationship}. Valid: {RELATIONSHIP_TYPES}")
     execute(
         """
-        INSERT OR REPLACE INTO graph_edges
+        INSERT INTO graph_edges
             (source_note_id, target_note_id, relationship, weight)
         VALUES (?, ?, ?, ?)
+        ON CONFLICT(source_note_id, target_note_id, relationship)
+        DO UPDATE SET weight = excluded.weight
         """,
         (source_id, target_id, relationship, weight),
     )
@@ -73,6 +77,19 @@ def get_edges(note_id: int, direction: str = "both") -> list[dict]:
 # Graph traversal
 # ─────────────────────────────────────────────────────────────────────────────
 
+_ID_BATCH = 500  # ids per IN (...) when hydrating rows
+
+
+def _rows_by_ids(sql: str, ids: list[int]) -> list[dict]:
+    """Run ``sql`` (ending in ``IN``) over *ids* in batches, preserving *ids* order."""
+    by_id: dict[int, dict] = {}
+    for i in range(0, len(ids), _ID_BATCH):
+        batch = ids[i:i + _ID_BATCH]
+        for row in execute(f"{sql} ({','.join('?' * len(batch))})", tuple(batch)):
+            by_id[row["id"]] = row
+    return [by_id[i] for i in ids if i in by_id]
+
+
 def traverse(
     start_id: int,
     max_depth: int = 2,
@@ -80,44 +97,42 @@ def traverse(
     user_id: Optional[str] = None,
 ) -> dict:
     """BFS over the accessible subgraph only. Edges require both endpoints accessible."""
-    allowed = accessible_note_ids(user_id)
+    index = get_graph_index()
+    allowed = index.access(user_id)
     if start_id not in allowed:
         return {"nodes": [], "edges": []}
 
-    visited: set[int] = {start_id}
+    rel_code = index.rel_code(relationship_filter) if relationship_filter else None
+    rel_codes, edge_ids = index.rel_codes, index.edge_ids
+    visited: dict[int, None] = {start_id: None}   # insertion-ordered set
+    seen_edges: set[int] = set()
+    edge_order: list[int] = []
     frontier: list[int] = [start_id]
-    all_edges: list[dict] = []
 
     for _ in range(max_depth):
         if not frontier:
             break
-        placeholders = ",".join("?" * len(frontier))
-        conditions = f"(source_note_id IN ({placeholders}) OR target_note_id IN ({placeholders}))"
-        params = tuple(frontier + frontier)
-        if relationship_filter:
-            conditions += " AND relationship = ?"
-            params = params + (relationship_filter,)
-        edges = execute(f"SELECT * FROM graph_edges WHERE {conditions}", params)
         next_frontier: list[int] = []
-        for edge in edges:
-            src, tgt = edge["source_note_id"], edge["target_note_id"]
-            if src not in allowed or tgt not in allowed:
-                continue
-            all_edges.append(edge)
-            for nid in (src, tgt):
-                if nid not in visited and nid in allowed:
-                    visited.add(nid)
-                    next_frontier.append(nid)
+        for nid in frontier:
+            for pos, other in index.incident(nid):
+                if pos in seen_edges or (rel_code is not None and rel_codes[pos] != rel_code):
+                    continue
+                if other not in allowed:
+                    continue
+                seen_edges.add(pos)
+                edge_order.append(edge_ids[pos])
+                if other not in visited:
+                    visited[other] = None
+                    next_frontier.append(other)
         frontier = next_frontier
 
-    all_nodes: list[dict] = []
-    if visited:
-        phs = ",".join("?" * len(visited))
-        all_nodes = execute(
-            f"SELECT id, uuid, title, note_type, created_at, user_id FROM notes WHERE id IN ({phs})",
-            tuple(visited),
-        )
-    return {"nodes": all_nodes, "edges": all_edges}
+    return {
+        "nodes": _rows_by_ids(
+            "SELECT id, uuid, title, note_type, created_at, user_id FROM notes WHERE id IN",
+            list(visited),
+        ),
+        "edges": _rows_by_ids("SELECT * FROM graph_edges WHERE id IN", edge_order),
+    }
 
 
 def find_path(
@@ -126,36 +141,62 @@ def find_path(
     max_depth: int = 4,
     user_id: Optional[str] = None,
 ) -> list[int]:
-    """Shortest path over accessible subgraph only."""
-    from collections import deque
-    allowed = accessible_note_ids(user_id)
+    """Shortest path over accessible subgraph only (at most max_depth + 1 hops).
+
+    Bidirectional BFS: each step expands the smaller frontier by one full
+    level, so the explored ball is ~2·deg^(d/2) nodes instead of deg^d.
+    """
+    index = get_graph_index()
+    allowed = index.access(user_id)
     if start_id not in allowed or end_id not in allowed:
         return []
-    queue: deque[list[int]] = deque([[start_id]])
-    visited: set[int] = {start_id}
-    while queue:
-        path = queue.popleft()
-        if len(path) > max_depth + 1:
-            break
-        current = path[-1]
-        edges = execute(
-            "SELECT target_note_id AS neighbor FROM graph_edges WHERE source_note_id = ? "
-            "UNION "
-            "SELECT source_note_id AS neighbor FROM graph_edges WHERE target_note_id = ?",
-            (current, current),
-        )
-        for row in edges:
-            neighbor = row["neighbor"]
-            if neighbor not in allowed:
-                continue
-            if neighbor == end_id:
-                return path + [neighbor]
-            if neighbor not in visited:
-                visited.add(neighbor)
-                queue.append(path + [neighbor])
+    if start_id == end_id:
+        return [start_id]
+    max_hops = max_depth + 1
+    # node → (parent, depth) for the forward and backward search trees
+    fwd: dict[int, tuple[int, int]] = {start_id: (start_id, 0)}
+    bwd: dict[int, tuple[int, int]] = {end_id: (end_id, 0)}
+    fwd_frontier, bwd_frontier = [start_id], [end_id]
+    hops = 0
+    while fwd_frontier and bwd_frontier and hops < max_hops:
+        forward = len(fwd_frontier) <= len(bwd_frontier)
+        tree, other = (fwd, bwd) if forward else (bwd, fwd)
+        frontier = fwd_frontier if forward else bwd_frontier
+        best: Optional[tuple[int, int]] = None   # (total hops, meeting node)
+        next_frontier: list[int] = []
+        for current in frontier:
+            depth = tree[current][1] + 1
+            for _, neighbor in index.incident(current):
+                if neighbor in tree or neighbor not in allowed:
+                    continue
+                tree[neighbor] = (current, depth)
+                next_frontier.append(neighbor)
+                if neighbor in other:
+                    total = depth + other[neighbor][1]
+                    if best is None or total < best[0]:
+                        best = (total, neighbor)
+        if best is not None:
+            return _join_paths(fwd, bwd, best[1], start_id, end_id)
+        if forward:
+            fwd_frontier = next_frontier
+        else:
+            bwd_frontier = next_frontier
+        hops += 1
     return []
 
 
+def _join_paths(fwd: dict, bwd: dict, meet: int, start_id: int, end_id: int) -> list[int]:
+    head = [meet]
+    while head[-1] != start_id:
+        head.append(fwd[head[-1]][0])
+    tail = []
+    node = meet
+    while node != end_id:
+        node = bwd[node][0]
+        tail.append(node)
+    return head[::-1] + tail
+
+
 def full_graph_export(user_id: Optional[str] = None) -> dict:
     """Export accessible graph only."""
     allowed = accessible_note_ids(user_id)
@@ -7,40 +7,28 @@ LAW I: One capability. One implementation. One canonical home.
 
 This module is the single source of truth for graph health evaluation.
 It will eventually power SolSpire diagnostics and any monitoring pipeline.
-It does NOT modify any data — it is strictly read-only.
+It does NOT modify knowledge data — it reads derived counters and the
+connectivity snapshot maintained by knowledge/graph_stats.py.
 """
 
 from __future__ import annotations
 
-from knowledge.db import execute, execute_one
+from typing import Optional
 
-
-# ─────────────────────────────────────────────────────────────────────────────
-# Internal helpers
-# ─────────────────────────────────────────────────────────────────────────────
-
-def _count(sql: str, params: tuple = ()) -> int:
-    row = execute_one(sql, params)
-    if row is None:
-        return 0
-    # execute_one returns a sqlite3.Row; first value is the count
-    return list(row)[0]
+from knowledge import graph_stats
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Individual checks
+# Counts come from trigger-maintained counters and connectivity from the
+# incremental snapshot in knowledge/graph_stats.py, so no check scans a table.
 # ─────────────────────────────────────────────────────────────────────────────
 
-def _check_orphan_nodes() -> dict:
+def _check_orphan_nodes(counts: Optional[dict] = None) -> dict:
     """Nodes with no edges (no outbound AND no inbound)."""
-    total_nodes = _count("SELECT COUNT(*) FROM notes")
-    orphan_count = _count(
-        """
-        SELECT COUNT(*) FROM notes n
-        WHERE n.id NOT IN (SELECT source_note_id FROM graph_edges)
-          AND n.id NOT IN (SELECT target_note_id FROM graph_edges)
-        """
-    )
+    counts = counts if counts is not None else graph_stats.counters()
+    total_nodes = counts.get("notes", 0)
+    orphan_count = max(total_nodes - counts.get("notes.linked", 0), 0)
     return {
         "total_nodes": total_nodes,
         "orphan_nodes": orphan_count,
@@ -49,49 +37,37 @@ def _check_orphan_nodes() -> dict:
     }
 
 
-def _check_duplicate_nodes() -> dict:
+def _check_duplicate_nodes(counts: Optional[dict] = None) -> dict:
     """Notes with identical checksums (content duplicates)."""
-    dup_count = _count(
-        """
-        SELECT COUNT(*) FROM (
-            SELECT checksum FROM notes
-            WHERE checksum IS NOT NULL
-            GROUP BY checksum HAVING COUNT(*) > 1
-        )
-        """
-    )
+    counts = counts if counts is not None else graph_stats.counters()
+    dup_count = counts.get("notes.dup_groups", 0)
     return {
         "duplicate_groups": dup_count,
         "status": "warn" if dup_count > 0 else "ok",
     }
 
 
-def _check_invalid_references() -> dict:
+def _check_invalid_references(connectivity: Optional[dict] = None) -> dict:
     """Edges referencing notes that no longer exist."""
-    dangling = _count(
-        """
-        SELECT COUNT(*) FROM graph_edges e
-        WHERE e.source_note_id NOT IN (SELECT id FROM notes)
-           OR e.target_note_id  NOT IN (SELECT id FROM notes)
-        """
-    )
+    connectivity = connectivity or graph_stats.connectivity()
+    dangling = connectivity["dangling_edges"]
     return {
         "dangling_edges": dangling,
         "status": "error" if dangling > 0 else "ok",
     }
 
 
-def _check_ontology_violations() -> dict:
+def _check_ontology_violations(counts: Optional[dict] = None) -> dict:
     """
     Edges whose relationship type is NOT in the canonical registry.
     These were written before the ontology was frozen, or via a bug.
     """
     from knowledge.relationship_types import RELATIONSHIP_TYPES_SET
-    all_rel_rows = execute("SELECT DISTINCT relationship FROM graph_edges")
+    counts = counts if counts is not None else graph_stats.counters()
     violations: list[str] = [
-        row["relationship"]
-        for row in all_rel_rows
-        if row["relationship"] not in RELATIONSHIP_TYPES_SET
+        rel
+        for rel in graph_stats.grouped(counts, "edges.rel:")
+        if rel not in RELATIONSHIP_TYPES_SET
     ]
     return {
         "unknown_relationship_types": violations,
@@ -100,13 +76,14 @@ def _check_ontology_violations() -> dict:
     }
 
 
-def _check_embedding_completeness() -> dict:
+def _check_embedding_completeness(counts: Optional[dict] = None) -> dict:
     """Notes whose embedding pipeline has not completed."""
-    total = _count("SELECT COUNT(*) FROM notes")
-    pending = _count("SELECT COUNT(*) FROM notes WHERE embedding_status = 'pending'")
-    partial = _count("SELECT COUNT(*) FROM notes WHERE embedding_status = 'partial'")
-    complete = _count("SELECT COUNT(*) FROM notes WHERE embedding_status = 'complete'")
-    failed  = _count("SELECT COUNT(*) FROM notes WHERE embedding_status = 'failed'")
+    counts = counts if counts is not None else graph_stats.counters()
+    total = counts.get("notes", 0)
+    pending = counts.get("notes.embed:pending", 0)
+    partial = counts.get("notes.embed:partial", 0)
+    complete = counts.get("notes.embed:complete", 0)
+    failed  = counts.get("notes.embed:failed", 0)
     return {
         "total": total,
         "complete": complete,
@@ -120,42 +97,18 @@ def _check_embedding_completeness() -> dict:
     }
 
 
-def _check_graph_connectivity() -> dict:
+def _check_graph_connectivity(connectivity: Optional[dict] = None) -> dict:
     """
-    Counts distinct connected components via a simple union-find on edges.
+    Distinct connected components among notes that have edges.
     Returns component count — a fully connected graph has 1.
     """
-    all_edges = execute(
-        "SELECT source_note_id, target_note_id FROM graph_edges"
-    )
-    parent: dict[int, int] = {}
-
-    def find(x: int) -> int:
-        while parent.get(x, x) != x:
-            parent[x] = parent.get(parent.get(x, x), x)
-            x = parent.get(x, x)
-        return x
-
-    def union(a: int, b: int) -> None:
-        ra, rb = find(a), find(b)
-        if ra != rb:
-            parent[ra] = rb
-
-    for edge in all_edges:
-        s, t = edge["source_note_id"], edge["target_note_id"]
-        if s not in parent:
-            parent[s] = s
-        if t not in parent:
-            parent[t] = t
-        union(s, t)
-
-    if not parent:
+    connectivity = connectivity or graph_stats.connectivity()
+    components = connectivity["components"]
+    if not components:
         return {"components": 0, "status": "ok"}
-
-    roots = {find(n) for n in parent}
     return {
-        "components": len(roots),
-        "status": "ok" if len(roots) <= 5 else "warn",
+        "components": components,
+        "status": "ok" if components <= 5 else "warn",
     }
 
 
@@ -163,10 +116,13 @@ def _check_graph_connectivity() -> dict:
 # Public API
 # ─────────────────────────────────────────────────────────────────────────────
 
-def evaluate_graph_health() -> dict:
+def evaluate_graph_health(wait: bool = True) -> dict:
     """
     Run all health checks and return a structured health summary.
 
+    wait=False lets connectivity answer from a slightly stale snapshot (see
+    graph_stats.connectivity) so the call never scans the edge table.
+
     Returns:
         {
             "overall": "ok" | "warn" | "error",
@@ -181,13 +137,15 @@ def evaluate_graph_health() -> dict:
         }
     """
     try:
+        counts = graph_stats.counters()
+        connectivity = graph_stats.connectivity(wait=wait)
         checks = {
-            "orphan_nodes":           _check_orphan_nodes(),
-            "duplicate_nodes":        _check_duplicate_nodes(),
-            "invalid_references":     _check_invalid_references(),
-            "ontology_violations":    _check_ontology_violations(),
-            "embedding_completeness": _check_embedding_completeness(),
-            "graph_connectivity":     _check_graph_connectivity(),
+            "orphan_nodes":           _check_orphan_nodes(counts),
+            "duplicate_nodes":        _check_duplicate_nodes(counts),
+            "invalid_references":     _check_invalid_references(connectivity),
+            "ontology_violations":    _check_ontology_violations(counts),
+            "embedding_completeness": _check_embedding_completeness(counts),
+            "graph_connectivity":     _check_graph_connectivity(connectivity),
         }
     except Exception as exc:
         return {
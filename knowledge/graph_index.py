@@ -0,0 +1,196 @@
+"""
+Arkadia Knowledge OS — Graph Adjacency Index
+=============================================
+In-process adjacency over graph_edges so multi-hop traversal and shortest-path
+search run in memory instead of issuing SQL per BFS level / per popped node.
+
+SQLite stays canonical; the index is a derived, immutable snapshot:
+    edges      — parallel arrays (edge id, source, target, relationship code)
+    adjacency  — note id → array of edge positions touching it (both directions)
+    public     — ids of notes with user_id IS NULL
+    owned      — user_id → ids of that user's notes
+
+Invalidation is version-based. schema.sql triggers bump graph_version on every
+graph_edges write and on note insert / delete / owner change, so any write path
+(graph.add_edge, edge migration, vault deletes, ON DELETE CASCADE) is seen by
+the next reader for the price of a one-row read. Edge and ownership halves are
+refreshed independently: a new note reloads the owner sets only, and when edges
+were only inserted (edges_removed unchanged) the rows above the last seen edge
+id are appended instead of rebuilding — a full reload happens only after an
+edge is deleted, updated or replaced.
+
+LAW II: Local First. Traversal never leaves the process; the index is a
+throwaway copy of local rows and is rebuilt from them after a restart.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from array import array
+from typing import Iterator, Optional
+
+from knowledge.db import get_connection
+
+logger = logging.getLogger("arkadia.graph_index")
+
+_EMPTY: frozenset[int] = frozenset()
+
+
+class Access:
+    """Membership test for the notes a caller may see — no set materialised."""
+
+    __slots__ = ("_public", "_owned")
+
+    def __init__(self, public: set[int], owned: set[int] | frozenset[int]):
+        self._public = public
+        self._owned = owned
+
+    def __contains__(self, note_id: int) -> bool:
+        return note_id in self._public or note_id in self._owned
+
+
+class GraphIndex:
+    """Immutable adjacency snapshot. Obtain through get_graph_index()."""
+
+    __slots__ = ("edges_version", "edges_removed", "notes_version", "max_edge_id", "edge_ids",
+                 "sources", "targets", "rel_codes", "rel_names", "adjacency", "public", "owned")
+
+    def __init__(self) -> None:
+        self.edges_version = -1
+        self.edges_removed = -1
+        self.notes_version = -1
+        self.max_edge_id = 0
+        self.edge_ids = array("q")
+        self.sources = array("q")
+        self.targets = array("q")
+        self.rel_codes = array("H")
+        self.rel_names: list[str] = []
+        self.adjacency: dict[int, array] = {}
+        self.public: set[int] = set()
+        self.owned: dict[str, set[int]] = {}
+
+    def access(self, user_id: Optional[str] = None) -> Access:
+        return Access(self.public, self.owned.get(user_id, _EMPTY) if user_id else _EMPTY)
+
+    def rel_code(self, relationship: str) -> int:
+        """Code for *relationship*, or -1 when no edge carries it."""
+        try:
+            return self.rel_names.index(relationship)
+        except ValueError:
+            return -1
+
+    def incident(self, note_id: int) -> Iterator[tuple[int, int]]:
+        """Yield (edge position, other endpoint) for every edge touching *note_id*."""
+        sources, targets = self.sources, self.targets
+        for pos in self.adjacency.get(note_id, ()):
+            src = sources[pos]
+            yield pos, (targets[pos] if src == note_id else src)
+
+    def edge_count(self) -> int:
+        return len(self.edge_ids)
+
+
+_EDGE_FIELDS = ("max_edge_id", "edge_ids", "sources", "targets", "rel_codes", "rel_names", "adjacency")
+
+
+def _add_edges(index: GraphIndex, rows, adjacency: dict[int, list[int]]) -> None:
+    """Append edge rows to *index*'s arrays, collecting new positions per node."""
+    codes = {name: code for code, name in enumerate(index.rel_names)}
+    pos = len(index.edge_ids)
+    for eid, src, tgt, rel in rows:
+        code = codes.get(rel)
+        if code is None:
+            code = codes[rel] = len(codes)
+            index.rel_names.append(rel)
+        index.edge_ids.append(eid)
+        index.sources.append(src)
+        index.targets.append(tgt)
+        index.rel_codes.append(code)
+        adjacency.setdefault(src, []).append(pos)
+        if tgt != src:
+            adjacency.setdefault(tgt, []).append(pos)
+        index.max_edge_id = eid
+        pos += 1
+
+
+def _load_edges(index: GraphIndex, conn) -> None:
+    adjacency: dict[int, list[int]] = {}
+    _add_edges(index, conn.execute(
+        "SELECT id, source_note_id, target_note_id, relationship FROM graph_edges ORDER BY id"
+    ), adjacency)
+    index.adjacency = {nid: array("l", positions) for nid, positions in adjacency.items()}
+
+
+def _append_edges(index: GraphIndex, prev: GraphIndex, conn) -> None:
+    """Insert-only change: copy *prev* and append edges above its watermark."""
+    index.max_edge_id = prev.max_edge_id
+    for attr in ("edge_ids", "sources", "targets", "rel_codes"):
+        setattr(index, attr, array(getattr(prev, attr).typecode, getattr(prev, attr)))
+    index.rel_names = list(prev.rel_names)
+    added: dict[int, list[int]] = {}
+    _add_edges(index, conn.execute(
+        "SELECT id, source_note_id, target_note_id, relationship FROM graph_edges "
+        "WHERE id > ? ORDER BY id",
+        (prev.max_edge_id,),
+    ), added)
+    adjacency = dict(prev.adjacency)
+    for nid, positions in added.items():
+        merged = array("l", adjacency.get(nid, ()))
+        merged.extend(positions)
+        adjacency[nid] = merged
+    index.adjacency = adjacency
+
+
+def _load_owners(index: GraphIndex, conn) -> None:
+    public: set[int] = set()
+    owned: dict[str, set[int]] = {}
+    for nid, uid in conn.execute("SELECT id, user_id FROM notes"):
+        if uid is None:
+            public.add(nid)
+        else:
+            owned.setdefault(uid, set()).add(nid)
+    index.public, index.owned = public, owned
+
+
+_current = GraphIndex()
+_lock = threading.Lock()
+
+
+def get_graph_index() -> GraphIndex:
+    """Return a snapshot at least as new as the current graph_version row."""
+    global _current
+    conn = get_connection()
+    row = conn.execute(
+        "SELECT edges_version, edges_removed, notes_version FROM graph_version WHERE id = 1"
+    ).fetchone()
+    versions = tuple(row) if row else (0, 0, 0)
+    snap = _current
+    if (snap.edges_version, snap.edges_removed, snap.notes_version) == versions:
+        return snap
+    with _lock:
+        snap = _current
+        if (snap.edges_version, snap.edges_removed, snap.notes_version) == versions:
+            return snap
+        edges_v, removed_v, notes_v = versions
+        fresh = GraphIndex()
+        # Versions are read before the data, so a concurrent write can only make
+        # the snapshot newer than its label — the next call then refreshes again.
+        if snap.edges_version == edges_v:
+            for attr in _EDGE_FIELDS:
+                setattr(fresh, attr, getattr(snap, attr))
+        elif snap.edges_removed == removed_v:
+            _append_edges(fresh, snap, conn)
+        else:
+            _load_edges(fresh, conn)
+        if snap.notes_version == notes_v:
+            fresh.public, fresh.owned = snap.public, snap.owned
+        else:
+            _load_owners(fresh, conn)
+        fresh.edges_version, fresh.edges_removed, fresh.notes_version = versions
+        _current = fresh
+        logger.debug(f"[GRAPH-INDEX] refreshed: {fresh.edge_count()} edges (v{edges_v}/{removed_v}/{notes_v})")
+        return fresh
+
+
+__all__ = ["Access", "GraphIndex", "get_graph_index"]
@@ -0,0 +1,261 @@
+"""
+Arkadia Knowledge OS — Graph Statistics
+=======================================
+Constant-time counts and connectivity for /api/knowledge/status and the graph
+health checks, instead of COUNT(*) scans and a union-find over every edge per
+request.
+
+Two derived sources, both rebuilt from SQLite on demand:
+    counters      — graph_counters rows kept current by schema.sql triggers on
+                    notes, graph_edges, chunks, embeddings, projects, timeline
+                    (totals, per type / status / relationship / created day,
+                    linked notes, duplicate checksum groups); seeded from full
+                    counts once
+    connectivity  — connected components and dangling edges, held in process
+                    and keyed on graph_version like knowledge/graph_index.py:
+                    edges appended since the last refresh are unioned in,
+                    anything else (delete, update, replace) rebuilds
+
+connectivity(wait=False) does not scan on the caller's thread: a stale read
+returns the last result and wakes a background refresher. Only a snapshot that
+has stayed stale for MAX_STALENESS_S (refresher behind or failing) is
+refreshed inline, which bounds how old an answer can be.
+
+LAW II: Local First. Counters sit in the same local database as the rows
+they count and are maintained by its own triggers.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+from knowledge.db import get_connection, transaction
+
+logger = logging.getLogger("arkadia.graph_stats")
+
+MAX_STALENESS_S = float(os.getenv("ARKADIA_GRAPH_STATS_MAX_STALENESS", "30"))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Counters
+# ─────────────────────────────────────────────────────────────────────────────
+
+_SEED_SQL = (
+    "INSERT INTO graph_counters (key, n) SELECT 'notes', COUNT(*) FROM notes",
+    "INSERT INTO graph_counters (key, n) SELECT 'edges', COUNT(*) FROM graph_edges",
+    "INSERT INTO graph_counters (key, n) SELECT 'chunks', COUNT(*) FROM chunks",
+    "INSERT INTO graph_counters (key, n) SELECT 'embeddings', COUNT(*) FROM embeddings",
+    "INSERT INTO graph_counters (key, n) SELECT 'projects', COUNT(*) FROM projects",
+    "INSERT INTO graph_counters (key, n) SELECT 'timeline', COUNT(*) FROM timeline",
+    "INSERT INTO graph_counters (key, n) "
+    "SELECT 'notes.type:' || note_type, COUNT(*) FROM notes GROUP BY note_type",
+    "INSERT INTO graph_counters (key, n) "
+    "SELECT 'notes.embed:' || embedding_status, COUNT(*) FROM notes GROUP BY embedding_status",
+    "INSERT INTO graph_counters (key, n) "
+    "SELECT 'edges.rel:' || relationship, COUNT(*) FROM graph_edges GROUP BY relationship",
+    "INSERT INTO graph_counters (key, n) "
+    "SELECT 'notes.day:' || substr(created_at, 1, 10), COUNT(*) FROM notes GROUP BY 1",
+    "INSERT INTO graph_counters (key, n) "
+    "SELECT 'edges.day:' || substr(created_at, 1, 10), COUNT(*) FROM graph_edges GROUP BY 1",
+    "INSERT INTO graph_counters (key, n) SELECT 'notes.linked', COUNT(*) FROM "
+    "(SELECT source_note_id FROM graph_edges UNION SELECT target_note_id FROM graph_edges)",
+    "INSERT INTO graph_counters (key, n) SELECT 'notes.dup_groups', COUNT(*) FROM "
+    "(SELECT checksum FROM notes WHERE checksum IS NOT NULL GROUP BY checksum HAVING COUNT(*) > 1)",
+)
+
+_seeded = False
+
+
+def recount() -> None:
+    """Rebuild every counter from full counts (first use, or after out-of-band writes)."""
+    global _seeded
+    with transaction() as conn:
+        # The DELETE takes the write lock first, so no trigger can fire between
+        # the counts below and the flag that hands maintenance back to them.
+        conn.execute("DELETE FROM graph_counters")
+        for sql in _SEED_SQL:
+            conn.execute(sql)
+        conn.execute("UPDATE graph_counters_state SET seeded = 1 WHERE id = 1")
+    _seeded = True
+    logger.info("[GRAPH-STATS] counters rebuilt")
+
+
+def _ensure_seeded(conn) -> None:
+    if not _seeded:
+        row = conn.execute("SELECT seeded FROM graph_counters_state WHERE id = 1").fetchone()
+        if not (row and row[0]):
+            recount()
+
+
+def counters() -> dict[str, int]:
+    """All counters except the per-day buckets as {key: n}. A few dozen rows."""
+    conn = get_connection()
+    _ensure_seeded(conn)
+    return {k: n for k, n in conn.execute(
+        "SELECT key, n FROM graph_counters WHERE key NOT LIKE '%.day:%'"
+    )}
+
+
+_CREATED_TABLES = {"notes": "notes", "edges": "graph_edges"}
+
+
+def created_since(kind: str, cutoff: str) -> int:
+    """
+    Rows of *kind* ('notes' | 'edges') with created_at >= cutoff, as a string
+    comparison. Days after the cutoff's date come from the per-day counters;
+    only the cutoff's own day is counted from the table, through its
+    created_at index.
+    """
+    conn = get_connection()
+    _ensure_seeded(conn)
+    day = cutoff[:10]
+    later = conn.execute(
+        "SELECT COALESCE(SUM(n), 0) FROM graph_counters WHERE key > ? AND key < ?",
+        (f"{kind}.day:{day}\uffff", f"{kind}.day;"),
+    ).fetchone()[0]
+    same_day = conn.execute(
+        f"SELECT COUNT(*) FROM {_CREATED_TABLES[kind]} WHERE created_at >= ? AND created_at < ?",
+        (cutoff, f"{day}\uffff"),
+    ).fetchone()[0]
+    return later + same_day
+
+
+def grouped(values: dict[str, int], prefix: str) -> dict[str, int]:
+    """Counters under *prefix* (e.g. 'edges.rel:') with the prefix stripped, zeros dropped."""
+    return {k[len(prefix):]: n for k, n in values.items() if k.startswith(prefix) and n}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Connectivity
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _UnionFind:
+    """Components over edge endpoints, grown edge by edge."""
+
+    __slots__ = ("parent", "components")
+
+    def __init__(self) -> None:
+        self.parent: dict[int, int] = {}
+        self.components = 0
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def add(self, a: int, b: int) -> None:
+        for node in (a, b):
+            if node not in self.parent:
+                self.parent[node] = node
+                self.components += 1
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[ra] = rb
+            self.components -= 1
+
+
+_DANGLING_SQL = """
+    SELECT COUNT(*) FROM graph_edges e
+    WHERE e.id > ? AND e.id <= ?
+      AND (NOT EXISTS (SELECT 1 FROM notes WHERE id = e.source_note_id)
+           OR NOT EXISTS (SELECT 1 FROM notes WHERE id = e.target_note_id))
+"""
+
+_uf = _UnionFind()
+_state = {"edges_version": -1, "edges_removed": -1, "max_edge_id": 0, "dangling": 0}
+_latest: Optional[dict] = None
+_stale_since: Optional[float] = None
+_refresh_lock = threading.Lock()
+_worker_lock = threading.Lock()
+_wake = threading.Event()
+_worker: Optional[threading.Thread] = None
+
+
+def _versions(conn) -> tuple[int, int]:
+    row = conn.execute("SELECT edges_version, edges_removed FROM graph_version WHERE id = 1").fetchone()
+    return (row[0], row[1]) if row else (0, 0)
+
+
+def _refresh() -> dict:
+    """Bring the snapshot up to the current graph_version and publish it."""
+    global _uf, _latest, _stale_since
+    with _refresh_lock:
+        conn = get_connection()
+        edges_v, removed_v = _versions(conn)
+        if _latest is not None and (_state["edges_version"], _state["edges_removed"]) == (edges_v, removed_v):
+            return _latest
+        # Versions are read before the edges, so a concurrent write can only make
+        # the snapshot newer than its label — the next read refreshes again.
+        if _state["edges_removed"] != removed_v:
+            _uf, _state["max_edge_id"], _state["dangling"] = _UnionFind(), 0, 0
+        since = _state["max_edge_id"]
+        for eid, src, tgt in conn.execute(
+            "SELECT id, source_note_id, target_note_id FROM graph_edges WHERE id > ? ORDER BY id",
+            (since,),
+        ):
+            _uf.add(src, tgt)
+            _state["max_edge_id"] = eid
+        _state["dangling"] += conn.execute(_DANGLING_SQL, (since, _state["max_edge_id"])).fetchone()[0]
+        _state["edges_version"], _state["edges_removed"] = edges_v, removed_v
+        _latest = {
+            "components": _uf.components,
+            "dangling_edges": _state["dangling"],
+            "refreshed_at": time.time(),
+            "edges_version": edges_v,
+            "edges_removed": removed_v,
+        }
+        _stale_since = None
+        return _latest
+
+
+def _run_worker() -> None:
+    while True:
+        _wake.wait()
+        _wake.clear()
+        try:
+            _refresh()
+        except Exception as exc:
+            logger.warning(f"[GRAPH-STATS] background refresh failed: {exc}")
+
+
+def _schedule_refresh() -> None:
+    global _worker
+    if _worker is None or not _worker.is_alive():
+        with _worker_lock:
+            if _worker is None or not _worker.is_alive():
+                _worker = threading.Thread(target=_run_worker, name="graph-stats", daemon=True)
+                _worker.start()
+    _wake.set()
+
+
+def connectivity(wait: bool = True) -> dict:
+    """
+    Connected components and dangling-edge count.
+
+    wait=True refreshes inline (incrementally when edges were only added).
+    wait=False answers from the last snapshot and refreshes in the background,
+    unless it has been known stale for more than MAX_STALENESS_S.
+    Adds "stale": True when the answer predates the latest edge write.
+    """
+    global _stale_since
+    latest = _latest
+    if wait or latest is None:
+        return {**_refresh(), "stale": False}
+    if (latest["edges_version"], latest["edges_removed"]) == _versions(get_connection()):
+        return {**latest, "stale": False}
+    now = time.time()
+    if _stale_since is None:
+        _stale_since = now
+    elif now - _stale_since > MAX_STALENESS_S:
+        return {**_refresh(), "stale": False}
+    _schedule_refresh()
+    return {**latest, "stale": True}
+
+
+__all__ = ["MAX_STALENESS_S", "connectivity", "counters", "created_since", "grouped", "recount"]
@@ -16,10 +16,11 @@ import re
 from typing import Optional
 
 from knowledge import db
-from knowledge.db import execute, execute_one, last_insert_id
+from knowledge.db import execute, execute_one
 from knowledge.vault import create_note, update_note, get_note, add_graph_edge
 from knowledge.relationship_types import RELATIONSHIP_TYPES
-from knowledge.embeddings import embed_text, store_chunk_embedding
+from knowledge.embeddings import active_model, embed_texts, store_chunk_embeddings
+from knowledge.term_stats import index_chunks
 from knowledge import timeline as tl
 from knowledge import graph as kg
 
@@ -70,15 +71,22 @@ def chunk_text(text: str, max_tokens: int = 512, overlap: int = 64) -> list[str]
 
 
 def store_chunks(note_id: int, chunks: list[str]) -> list[int]:
-    """Insert chunks for a note, return list of chunk IDs."""
-    chunk_ids: list[int] = []
-    for i, chunk_text in enumerate(chunks):
-        word_count = len(chunk_text.split())
-        execute(
+    """Insert chunks for a note and add them to the BM25 term statistics. Returns chunk IDs."""
+    if not chunks:
+        return []
+    with db.transaction() as conn:
+        conn.executemany(
             "INSERT INTO chunks (note_id, content, position, token_count) VALUES (?, ?, ?, ?)",
-            (note_id, chunk_text, i, word_count),
+            [(note_id, text, i, len(text.split())) for i, text in enumerate(chunks)],
         )
-        chunk_ids.append(last_insert_id())
+        # The write lock is held until commit, so the newest rows for this note are ours
+        chunk_ids = [
+            r[0] for r in conn.execute(
+                "SELECT id FROM chunks WHERE note_id = ? ORDER BY id DESC LIMIT ?",
+                (note_id, len(chunks)),
+            )
+        ][::-1]
+        index_chunks([(cid, note_id, text) for cid, text in zip(chunk_ids, chunks)])
     return chunk_ids
 
 
@@ -86,42 +94,52 @@ def store_chunks(note_id: int, chunks: list[str]) -> list[int]:
 # Embedding pipeline step
 # ─────────────────────────────────────────────────────────────────────────────
 
+def _record_embeddings(
+    note_id: int, total: int, todo_ids: list[int], vectors: list[Optional[list[float]]]
+) -> bool:
+    """
+    Write vectors for *todo_ids* and the resulting note.embedding_status in one
+    transaction. *total* counts every chunk of the note, embedded or not.
+    """
+    rows = [(cid, v) for cid, v in zip(todo_ids, vectors) if v]
+    success_count = total - len(todo_ids) + len(rows)
+    status = "complete" if success_count == total else (
+        "partial" if success_count > 0 else "pending"
+    )
+    with db.transaction():
+        store_chunk_embeddings(rows, model=active_model())
+        execute("UPDATE notes SET embedding_status = ? WHERE id = ?", (status, note_id))
+        tl.record(
+            "embed_complete",
+            {"note_id": note_id, "chunks": total, "embedded": success_count, "status": status},
+            note_id=note_id,
+        )
+    return status == "complete"
+
+
 def embed_note_chunks(note_id: int) -> bool:
     """
-    Embed all unemedded chunks for a note.
-    Updates note.embedding_status → 'complete' or 'failed'.
+    Embed all unembedded chunks for a note in provider batches.
+    Vectors are written in one transaction; chunks whose embedding failed
+    stay unembedded and are retried on the next pass.
+    Updates note.embedding_status → 'complete', 'partial' or 'pending'.
     Returns True if all embeddings succeeded.
     """
-    chunks = execute("SELECT * FROM chunks WHERE note_id = ?", (note_id,))
+    chunks = execute(
+        """
+        SELECT c.id, c.content,
+               EXISTS (SELECT 1 FROM embeddings e WHERE e.chunk_id = c.id) AS embedded
+        FROM chunks c WHERE c.note_id = ?
+        ORDER BY c.position, c.id
+        """,
+        (note_id,),
+    )
     if not chunks:
         return False
 
-    success_count = 0
-    for chunk in chunks:
-        # Skip if already embedded
-        existing = execute_one(
-            "SELECT id FROM embeddings WHERE chunk_id = ?", (chunk["id"],)
-        )
-        if existing:
-            success_count += 1
-            continue
-
-        vector = embed_text(chunk["content"])
-        if vector:
-            store_chunk_embedding(chunk["id"], vector)
-            success_count += 1
-
-    status = "complete" if success_count == len(chunks) else (
-        "partial" if success_count > 0 else "pending"
-    )
-    execute("UPDATE notes SET embedding_status = ? WHERE id = ?", (status, note_id))
-
-    tl.record(
-        "embed_complete",
-        {"note_id": note_id, "chunks": len(chunks), "embedded": success_count, "status": status},
-        note_id=note_id,
-    )
-    return status == "complete"
+    todo = [c for c in chunks if not c["embedded"]]
+    vectors = embed_texts([c["content"] for c in todo])
+    return _record_embeddings(note_id, len(chunks), [c["id"] for c in todo], vectors)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -129,17 +147,15 @@ def embed_note_chunks(note_id: int) -> bool:
 # ─────────────────────────────────────────────────────────────────────────────
 
 def upsert_tags(note_id: int, tags: list[str]) -> None:
-    for tag_name in tags:
-        tag_name = tag_name.lower().strip()
-        if not tag_name:
-            continue
-        execute("INSERT OR IGNORE INTO tags (name) VALUES (?)", (tag_name,))
-        tag_row = execute_one("SELECT id FROM tags WHERE name = ?", (tag_name,))
-        if tag_row:
-            execute(
-                "INSERT OR IGNORE INTO note_tags (note_id, tag_id) VALUES (?, ?)",
-                (note_id, tag_row["id"]),
-            )
+    names = list(dict.fromkeys(t.lower().strip() for t in tags if t and t.strip()))
+    if not names:
+        return
+    with db.transaction() as conn:
+        conn.executemany("INSERT OR IGNORE INTO tags (name) VALUES (?)", [(n,) for n in names])
+        conn.executemany(
+            "INSERT OR IGNORE INTO note_tags (note_id, tag_id) SELECT ?, id FROM tags WHERE name = ?",
+            [(note_id, n) for n in names],
+        )
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -194,6 +210,7 @@ def ingest(
     auto_tag: bool = True,
     auto_embed: bool = True,
     auto_link: bool = True,
+    chunks: Optional[list[str]] = None,
 ) -> dict:
     """
     Full knowledge pipeline:
@@ -204,6 +221,10 @@ def ingest(
     5. Embed chunks
     6. Auto-link to related notes
     7. Timeline record
+    Steps 2–7 commit as one transaction; the embedding provider is called
+    before it opens so no write lock is held across the network.
+    *chunks* may carry chunk_text(content) computed ahead of time (static
+    ingestion chunks on worker threads).
     Returns the created note dict.
     """
 
@@ -220,33 +241,50 @@ def ingest(
             if t not in final_tags:
                 final_tags.append(t)
 
-    # ── 3. Create note ───────────────────────────────────────────────────────
-    note = create_note(
-        title=title,
-        content=content,
-        note_type=note_type,
-        project_id=project_id,
-        thread_id=thread_id,
-        participants=participants,
-        tags=final_tags,
-        links=links,
-        source_provider=source_provider,
-        user_id=user_id,
-    )
-    note_id = note["id"]
-
-    # ── 4. Persist tags ──────────────────────────────────────────────────────
-    upsert_tags(note_id, final_tags)
-
-    # ── 5. Chunk ─────────────────────────────────────────────────────────────
-    chunks = chunk_text(content)
-    store_chunks(note_id, chunks)
-
-    # ── 6. Embed (async-friendly: runs inline, caller can also queue async) ──
-    if auto_embed:
-        embed_note_chunks(note_id)
+    # ── 3. Chunk + embed (outside the write transaction) ─────────────────────
+    if chunks is None:
+        chunks = chunk_text(content)
+    vectors = embed_texts(chunks) if auto_embed and chunks else None
+
+    with db.transaction():
+        # ── 4. Create note ───────────────────────────────────────────────────
+        note = create_note(
+            title=title,
+            content=content,
+            note_type=note_type,
+            project_id=project_id,
+            thread_id=thread_id,
+            participants=participants,
+            tags=final_tags,
+            links=links,
+            source_provider=source_provider,
+            user_id=user_id,
+        )
+        note_id = note["id"]
+
+        # ── 5. Persist tags + chunks + vectors ───────────────────────────────
+        upsert_tags(note_id, final_tags)
+        chunk_ids = store_chunks(note_id, chunks)
+        if vectors is not None:
+            _record_embeddings(note_id, len(chunk_ids), chunk_ids, vectors)
+
+        # ── 6. Timeline record ───────────────────────────────────────────────
+        tl.record(
+            "knowledge_created",
+            {
+                "note_id": note_id,
+                "note_uuid": note["uuid"],
+                "title": title,
+                "type": note_type,
+                "chunks": len(chunks),
+                "tags": final_tags,
+            },
+            note_id=note_id,
+            project_id=project_id,
+            provider=source_provider,
+        )
 
-    # ── 7. Semantic enrichment (replaces simple tag-only auto-link) ──────────
+    # ── 7. Semantic enrichment (after commit: runs on another connection) ────
     if auto_link and note_id:
         try:
             from knowledge.enrichment import schedule_enrichment
@@ -266,22 +304,6 @@ def ingest(
                 except Exception:
                     pass
 
-    # ── 8. Timeline record ───────────────────────────────────────────────────
-    tl.record(
-        "knowledge_created",
-        {
-            "note_id": note_id,
-            "note_uuid": note["uuid"],
-            "title": title,
-            "type": note_type,
-            "chunks": len(chunks),
-            "tags": final_tags,
-        },
-        note_id=note_id,
-        project_id=project_id,
-        provider=source_provider,
-    )
-
     return {**note, "chunks_created": len(chunks), "tags_applied": final_tags}
 
 
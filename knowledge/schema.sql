@@ -80,6 +80,79 @@ CREATE TABLE IF NOT EXISTS embeddings (
     created_at TEXT NOT NULL DEFAULT (datetime('now'))
 );
 
+-- ─────────────────────────────────────────────────────────────
+-- EMBEDDING CHANGES  (delete/update log consumed by knowledge/vector_index.py)
+-- ─────────────────────────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS embedding_changes (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    chunk_id   INTEGER NOT NULL,
+    created_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_embeddings_delete AFTER DELETE ON embeddings
+BEGIN
+    INSERT INTO embedding_changes (chunk_id) VALUES (old.chunk_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_embeddings_update AFTER UPDATE OF vector ON embeddings
+BEGIN
+    INSERT INTO embedding_changes (chunk_id) VALUES (new.chunk_id);
+END;
+
+-- ─────────────────────────────────────────────────────────────
+-- QUERY EMBEDDING CACHE  (knowledge/embedding_cache.py)
+-- ─────────────────────────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS query_embedding_cache (
+    cache_key  TEXT PRIMARY KEY,  -- sha256(model, task_type, normalised text)
+    model      TEXT NOT NULL,
+    vector     BLOB NOT NULL,     -- packed float64 (array 'd')
+    created_at REAL NOT NULL,     -- epoch seconds; TTL measured from here
+    last_used  REAL NOT NULL      -- LRU eviction order
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_query_embedding_cache_used ON query_embedding_cache(last_used);
+
+-- ─────────────────────────────────────────────────────────────
+-- BM25 TERM STATISTICS  (keyword fallback — knowledge/term_stats.py)
+-- ─────────────────────────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS chunk_terms (
+    term     TEXT    NOT NULL,
+    chunk_id INTEGER NOT NULL,
+    tf       INTEGER NOT NULL,
+    PRIMARY KEY (term, chunk_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS chunk_lengths (
+    chunk_id INTEGER PRIMARY KEY,
+    note_id  INTEGER NOT NULL,
+    length   INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS term_stats (
+    term TEXT PRIMARY KEY,
+    df   INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS bm25_corpus (
+    id           INTEGER PRIMARY KEY CHECK (id = 1),
+    doc_count    INTEGER NOT NULL DEFAULT 0,
+    total_length INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO bm25_corpus (id, doc_count, total_length) VALUES (1, 0, 0);
+
+-- Chunk deletion (direct or cascaded from notes) unwinds its statistics.
+CREATE TRIGGER IF NOT EXISTS trg_chunks_term_stats_delete AFTER DELETE ON chunks
+BEGIN
+    UPDATE term_stats SET df = df - 1
+        WHERE term IN (SELECT term FROM chunk_terms WHERE chunk_id = old.id);
+    DELETE FROM chunk_terms WHERE chunk_id = old.id;
+    UPDATE bm25_corpus SET
+        doc_count    = doc_count - 1,
+        total_length = total_length - (SELECT length FROM chunk_lengths WHERE chunk_id = old.id)
+        WHERE id = 1 AND EXISTS (SELECT 1 FROM chunk_lengths WHERE chunk_id = old.id);
+    DELETE FROM chunk_lengths WHERE chunk_id = old.id;
+END;
+
 -- ─────────────────────────────────────────────────────────────
 -- TAGS
 -- ─────────────────────────────────────────────────────────────
@@ -108,6 +181,60 @@ CREATE TABLE IF NOT EXISTS graph_edges (
     UNIQUE(source_note_id, target_note_id, relationship)
 );
 
+-- Change counters for the in-process adjacency index (knowledge/graph_index.py).
+-- Bumped by triggers so every write path — including ON DELETE CASCADE from
+-- notes — is seen by readers for the price of a one-row read. edges_version
+-- counts every edge write; edges_removed only those that remove or rewrite an
+-- existing edge (plain inserts are applied to the index incrementally by id).
+CREATE TABLE IF NOT EXISTS graph_version (
+    id            INTEGER PRIMARY KEY CHECK (id = 1),
+    edges_version INTEGER NOT NULL DEFAULT 0,
+    edges_removed INTEGER NOT NULL DEFAULT 0,
+    notes_version INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO graph_version (id) VALUES (1);
+
+-- INSERT OR REPLACE deletes the old row without firing DELETE triggers.
+CREATE TRIGGER IF NOT EXISTS trg_graph_edges_version_replace BEFORE INSERT ON graph_edges
+WHEN EXISTS (SELECT 1 FROM graph_edges WHERE source_note_id = new.source_note_id
+             AND target_note_id = new.target_note_id AND relationship = new.relationship)
+BEGIN
+    UPDATE graph_version SET edges_removed = edges_removed + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_graph_edges_version_insert AFTER INSERT ON graph_edges
+BEGIN
+    UPDATE graph_version SET edges_version = edges_version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_graph_edges_version_update AFTER UPDATE ON graph_edges
+BEGIN
+    UPDATE graph_version SET edges_version = edges_version + 1,
+                             edges_removed = edges_removed + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_graph_edges_version_delete AFTER DELETE ON graph_edges
+BEGIN
+    UPDATE graph_version SET edges_version = edges_version + 1,
+                             edges_removed = edges_removed + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_notes_graph_version_insert AFTER INSERT ON notes
+BEGIN
+    UPDATE graph_version SET notes_version = notes_version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_notes_graph_version_owner AFTER UPDATE OF user_id ON notes
+BEGIN
+    UPDATE graph_version SET notes_version = notes_version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_notes_graph_version_delete AFTER DELETE ON notes
+BEGIN
+    UPDATE graph_version SET notes_version = notes_version + 1 WHERE id = 1;
+END;
+
 -- ─────────────────────────────────────────────────────────────
 -- TIMELINE  (immutable event log — append only)
 -- ─────────────────────────────────────────────────────────────
@@ -178,6 +305,254 @@ CREATE TABLE IF NOT EXISTS personas (
     updated_at  TEXT NOT NULL DEFAULT (datetime('now'))
 );
 
+-- ─────────────────────────────────────────────────────────────
+-- FULL-TEXT INDEX  (FTS5 over notes — title + content, bm25 ranked)
+-- Regular (not external-content) table so trigger deletes of rows that the
+-- backfill has not reached yet are harmless no-ops.
+-- ─────────────────────────────────────────────────────────────
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+    title,
+    content,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_notes_fts_insert AFTER INSERT ON notes
+BEGIN
+    INSERT INTO notes_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_notes_fts_update AFTER UPDATE OF title, content ON notes
+BEGIN
+    DELETE FROM notes_fts WHERE rowid = old.id;
+    INSERT INTO notes_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_notes_fts_delete AFTER DELETE ON notes
+BEGIN
+    DELETE FROM notes_fts WHERE rowid = old.id;
+END;
+
+-- Backfill progress for databases that predate notes_fts (knowledge/fts_migration.py).
+-- high_water is captured once, when the triggers above first exist: rows above it
+-- are trigger-maintained, rows up to it are copied in batches. Fresh DBs start complete.
+CREATE TABLE IF NOT EXISTS fts_backfill (
+    name         TEXT PRIMARY KEY,
+    watermark    INTEGER NOT NULL DEFAULT 0,
+    high_water   INTEGER NOT NULL DEFAULT 0,
+    completed_at TEXT
+);
+
+INSERT OR IGNORE INTO fts_backfill (name, watermark, high_water)
+    SELECT 'notes_fts', 0, COALESCE(MAX(id), 0) FROM notes;
+
+-- ─────────────────────────────────────────────────────────────
+-- TITLE KEYS  (inverted index for enrichment candidates, knowledge/title_keys.py)
+-- kind 'chapter' → first number in a chapter title; kind 'word' → title
+-- words of 5+ letters for documents and scrolls. Notes are queued by trigger on
+-- insert / title or type change and indexed in batches before each lookup.
+-- ─────────────────────────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS title_keys (
+    kind     TEXT NOT NULL,
+    key      TEXT NOT NULL,
+    note_id  INTEGER NOT NULL REFERENCES notes(id) ON DELETE CASCADE,
+    PRIMARY KEY (kind, key, note_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_title_keys_note ON title_keys(note_id);
+
+CREATE TABLE IF NOT EXISTS title_key_queue (
+    note_id  INTEGER PRIMARY KEY
+);
+
+-- seeded = 0 until notes that predate this table have been queued once
+CREATE TABLE IF NOT EXISTS title_key_state (
+    id       INTEGER PRIMARY KEY CHECK (id = 1),
+    seeded   INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO title_key_state (id) VALUES (1);
+
+CREATE TRIGGER IF NOT EXISTS trg_notes_title_keys_insert AFTER INSERT ON notes
+BEGIN
+    INSERT OR IGNORE INTO title_key_queue (note_id) VALUES (new.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_notes_title_keys_update AFTER UPDATE OF title, note_type ON notes
+BEGIN
+    INSERT OR IGNORE INTO title_key_queue (note_id) VALUES (new.id);
+END;
+
+-- ─────────────────────────────────────────────────────────────
+-- GRAPH COUNTERS  (knowledge/graph_stats.py — O(1) status and health)
+-- Row counts kept current by triggers, keyed as:
+--   notes | edges | chunks | embeddings | projects | timeline
+--   notes.type:<note_type> | notes.embed:<embedding_status> | edges.rel:<relationship>
+--   notes.day:<YYYY-MM-DD> | edges.day:<YYYY-MM-DD>  (rows by created_at date)
+--   notes.linked     — notes touching at least one edge (orphans = notes - linked)
+--   notes.dup_groups — checksums shared by 2+ notes
+-- Seeded from full counts once (graph_counters_state.seeded). INSERT OR REPLACE
+-- deletes are invisible to triggers, so edges are upserted, never replaced.
+-- ─────────────────────────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS graph_counters (
+    key  TEXT PRIMARY KEY,
+    n    INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS graph_counters_state (
+    id       INTEGER PRIMARY KEY CHECK (id = 1),
+    seeded   INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO graph_counters_state (id) VALUES (1);
+
+CREATE TRIGGER IF NOT EXISTS trg_notes_counters_insert AFTER INSERT ON notes
+BEGIN
+    INSERT INTO graph_counters (key, n) VALUES
+        ('notes', 1), ('notes.type:' || new.note_type, 1), ('notes.embed:' || new.embedding_status, 1),
+        ('notes.day:' || substr(new.created_at, 1, 10), 1)
+        ON CONFLICT(key) DO UPDATE SET n = n + excluded.n;
+    INSERT INTO graph_counters (key, n) SELECT 'notes.dup_groups', 1
+        WHERE new.checksum IS NOT NULL
+          AND (SELECT COUNT(*) FROM (SELECT 1 FROM notes WHERE checksum = new.checksum LIMIT 3)) = 2
+        ON CONFLICT(key) DO UPDATE SET n = n + excluded.n;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_notes_counters_delete AFTER DELETE ON notes
+BEGIN
+    INSERT INTO graph_counters (key, n) VALUES
+        ('notes', -1), ('notes.type:' || old.note_type, -1), ('notes.embed:' || old.embedding_status, -1),
+        ('notes.day:' || substr(old.created_at, 1, 10), -1)
+        ON CONFLICT(key) DO UPDATE SET n = n + excluded.n;
+    INSERT INTO graph_counters (key, n) SELECT 'notes.dup_groups', -1
+        WHERE old.checksum IS NOT NULL
+          AND (SELECT COUNT(*) FROM (SELECT 1 FROM notes WHERE checksum = old.checksum LIMIT 2)) = 1
+        ON CONFLICT(key) DO UPDATE SET n = n + excluded.n;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_notes_counters_type AFTER UPDATE OF note_type ON notes
+WHEN old.note_type IS NOT new.note_type
+BEGIN
+    INSERT INTO graph_counters (key, n) VALUES
+        ('notes.type:' || old.note_type, -1), ('notes.type:' || new.note_type, 1)
+        ON CONFLICT(key) DO UPDATE SET n = n + excluded.n;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_notes_counters_embed AFTER UPDATE OF embedding_status ON notes
+WHEN old.embedding_status IS NOT new.embedding_status
+BEGIN
+    INSERT INTO graph_counters (key, n) VALUES
+        ('notes.embed:' || old.embedding_status, -1), ('notes.embed:' || new.embedding_status, 1)
+        ON CONFLICT(key) DO UPDATE SET n = n + excluded.n;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_notes_counters_checksum AFTER UPDATE OF checksum ON notes
+WHEN old.checksum IS NOT new.checksum
+BEGIN
+    INSERT INTO graph_counters (key, n) SELECT 'notes.dup_groups', -1
+        WHERE old.checksum IS NOT NULL
+          AND (SELECT COUNT(*) FROM (SELECT 1 FROM notes WHERE checksum = old.checksum LIMIT 2)) = 1
+        ON CONFLICT(key) DO UPDATE SET n = n + excluded.n;
+    INSERT INTO graph_counters (key, n) SELECT 'notes.dup_groups', 1
+        WHERE new.checksum IS NOT NULL
+          AND (SELECT COUNT(*) FROM (SELECT 1 FROM notes WHERE checksum = new.checksum LIMIT 3)) = 2
+        ON CONFLICT(key) DO UPDATE SET n = n + excluded.n;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_graph_edges_counters_insert AFTER INSERT ON graph_edges
+BEGIN
+    INSERT INTO graph_counters (key, n) VALUES
+        ('edges', 1), ('edges.rel:' || new.relationship, 1), ('edges.day:' || substr(new.created_at, 1, 10), 1)
+        ON CONFLICT(key) DO UPDATE SET n = n + excluded.n;
+    INSERT INTO graph_counters (key, n) SELECT 'notes.linked', 1
+        WHERE NOT EXISTS (SELECT 1 FROM graph_edges WHERE source_note_id = new.source_note_id AND id != new.id)
+          AND NOT EXISTS (SELECT 1 FROM graph_edges WHERE target_note_id = new.source_note_id AND id != new.id)
+        ON CONFLICT(key) DO UPDATE SET n = n + excluded.n;
+    INSERT INTO graph_counters (key, n) SELECT 'notes.linked', 1
+        WHERE new.target_note_id != new.source_note_id
+          AND NOT EXISTS (SELECT 1 FROM graph_edges WHERE source_note_id = new.target_note_id AND id != new.id)
+          AND NOT EXISTS (SELECT 1 FROM graph_edges WHERE target_note_id = new.target_note_id AND id != new.id)
+        ON CONFLICT(key) DO UPDATE SET n = n + excluded.n;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_graph_edges_counters_delete AFTER DELETE ON graph_edges
+BEGIN
+    INSERT INTO graph_counters (key, n) VALUES
+        ('edges', -1), ('edges.rel:' || old.relationship, -1), ('edges.day:' || substr(old.created_at, 1, 10), -1)
+        ON CONFLICT(key) DO UPDATE SET n = n + excluded.n;
+    INSERT INTO graph_counters (key, n) SELECT 'notes.linked', -1
+        WHERE NOT EXISTS (SELECT 1 FROM graph_edges WHERE source_note_id = old.source_note_id)
+          AND NOT EXISTS (SELECT 1 FROM graph_edges WHERE target_note_id = old.source_note_id)
+        ON CONFLICT(key) DO UPDATE SET n = n + excluded.n;
+    INSERT INTO graph_counters (key, n) SELECT 'notes.linked', -1
+        WHERE old.target_note_id != old.source_note_id
+          AND NOT EXISTS (SELECT 1 FROM graph_edges WHERE source_note_id = old.target_note_id)
+          AND NOT EXISTS (SELECT 1 FROM graph_edges WHERE target_note_id = old.target_note_id)
+        ON CONFLICT(key) DO UPDATE SET n = n + excluded.n;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_graph_edges_counters_rel AFTER UPDATE OF relationship ON graph_edges
+WHEN old.relationship IS NOT new.relationship
+BEGIN
+    INSERT INTO graph_counters (key, n) VALUES
+        ('edges.rel:' || old.relationship, -1), ('edges.rel:' || new.relationship, 1)
+        ON CONFLICT(key) DO UPDATE SET n = n + excluded.n;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_chunks_counters_insert AFTER INSERT ON chunks
+BEGIN
+    INSERT INTO graph_counters (key, n) VALUES ('chunks', 1) ON CONFLICT(key) DO UPDATE SET n = n + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_chunks_counters_delete AFTER DELETE ON chunks
+BEGIN
+    INSERT INTO graph_counters (key, n) VALUES ('chunks', -1) ON CONFLICT(key) DO UPDATE SET n = n - 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_embeddings_counters_insert AFTER INSERT ON embeddings
+BEGIN
+    INSERT INTO graph_counters (key, n) VALUES ('embeddings', 1) ON CONFLICT(key) DO UPDATE SET n = n + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_embeddings_counters_delete AFTER DELETE ON embeddings
+BEGIN
+    INSERT INTO graph_counters (key, n) VALUES ('embeddings', -1) ON CONFLICT(key) DO UPDATE SET n = n - 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_projects_counters_insert AFTER INSERT ON projects
+BEGIN
+    INSERT INTO graph_counters (key, n) VALUES ('projects', 1) ON CONFLICT(key) DO UPDATE SET n = n + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_projects_counters_delete AFTER DELETE ON projects
+BEGIN
+    INSERT INTO graph_counters (key, n) VALUES ('projects', -1) ON CONFLICT(key) DO UPDATE SET n = n - 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_timeline_counters_insert AFTER INSERT ON timeline
+BEGIN
+    INSERT INTO graph_counters (key, n) VALUES ('timeline', 1) ON CONFLICT(key) DO UPDATE SET n = n + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_timeline_counters_delete AFTER DELETE ON timeline
+BEGIN
+    INSERT INTO graph_counters (key, n) VALUES ('timeline', -1) ON CONFLICT(key) DO UPDATE SET n = n - 1;
+END;
+
+-- ─────────────────────────────────────────────────────────────
+-- STATIC MANIFEST  (knowledge/static_ingestion.py change detection)
+-- One row per static corpus file already processed. A file whose mtime and
+-- size still match is skipped at boot without being read.
+-- ─────────────────────────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS static_manifest (
+    path        TEXT PRIMARY KEY,                 -- relative to the repo root
+    mtime_ns    INTEGER NOT NULL,
+    size        INTEGER NOT NULL,
+    checksum    TEXT,                             -- SHA-256 of ingested content; NULL = below size floor
+    note_id     INTEGER REFERENCES notes(id) ON DELETE SET NULL,
+    updated_at  TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
 -- ─────────────────────────────────────────────────────────────
 -- INDEXES for query performance
 -- ─────────────────────────────────────────────────────────────
@@ -186,19 +561,24 @@ CREATE INDEX IF NOT EXISTS idx_notes_thread     ON notes(thread_id);
 CREATE INDEX IF NOT EXISTS idx_notes_type       ON notes(note_type);
 CREATE INDEX IF NOT EXISTS idx_notes_created    ON notes(created_at);
 CREATE INDEX IF NOT EXISTS idx_notes_user       ON notes(user_id);
+CREATE INDEX IF NOT EXISTS idx_notes_checksum   ON notes(checksum);     -- ingest duplicate check
+CREATE INDEX IF NOT EXISTS idx_notes_provider   ON notes(source_provider, created_at);
+CREATE INDEX IF NOT EXISTS idx_notes_thread_created ON notes(thread_id, created_at);
 CREATE INDEX IF NOT EXISTS idx_projects_user    ON projects(user_id);
 CREATE INDEX IF NOT EXISTS idx_timeline_user    ON timeline(user_id);
 CREATE INDEX IF NOT EXISTS idx_threads_user     ON threads(user_id);
 CREATE INDEX IF NOT EXISTS idx_chunks_note      ON chunks(note_id);
 CREATE INDEX IF NOT EXISTS idx_embeddings_chunk ON embeddings(chunk_id);
+CREATE INDEX IF NOT EXISTS idx_chunk_terms_chunk ON chunk_terms(chunk_id);
 CREATE INDEX IF NOT EXISTS idx_graph_source     ON graph_edges(source_note_id);
 CREATE INDEX IF NOT EXISTS idx_graph_target     ON graph_edges(target_note_id);
 CREATE INDEX IF NOT EXISTS idx_graph_rel        ON graph_edges(relationship);
+CREATE INDEX IF NOT EXISTS idx_graph_created    ON graph_edges(created_at);   -- status growth window
 CREATE INDEX IF NOT EXISTS idx_timeline_type    ON timeline(event_type);
 CREATE INDEX IF NOT EXISTS idx_timeline_project ON timeline(project_id);
 CREATE INDEX IF NOT EXISTS idx_timeline_created ON timeline(created_at);
 CREATE INDEX IF NOT EXISTS idx_note_tags_note   ON note_tags(note_id);
-CREATE INDEX IF NOT EXISTS idx_note_tags_tag    ON note_tags(tag_id);
+CREATE INDEX IF NOT EXISTS idx_note_tags_tag_note ON note_tags(tag_id, note_id);  -- newest-first postings per tag
 
 -- ─────────────────────────────────────────────────────────────
 -- SEED: default providers
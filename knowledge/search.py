@@ -23,21 +23,76 @@ def _notes_owner_sql(user_id: Optional[str], table_alias: str = "") -> tuple[str
 
 
 from knowledge.db import execute
+from knowledge.fts_migration import fts_ready
 from knowledge.embeddings import (
-    embed_text, cosine_similarity, bm25_score, _tokenise, all_chunk_embeddings, all_chunks
+    embed_text, cosine_similarity, all_chunk_embeddings,
+    nearest_chunks,
 )
+from knowledge.term_stats import bm25_search
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# Full-text search (SQLite LIKE across title + content)
+# Full-text search (FTS5 bm25 over title + content; LIKE until backfilled)
 # ─────────────────────────────────────────────────────────────────────────────
 
+# bm25() column weights for notes_fts(title, content) — a title hit outranks a body hit
+_FTS_WEIGHTS = (10.0, 1.0)
+_SNIPPET_TOKENS = 16
+
+
+def _fts_match(query: str) -> str:
+    """Build an FTS5 MATCH expression: every term must appear, each as a prefix."""
+    tokens = [t for t in re.findall(r"\w+", query.lower()) if len(t) >= 2]
+    return " AND ".join(f'"{t}"*' for t in tokens)
+
+
 def fulltext_search(
     query: str,
     note_type: Optional[str] = None,
     limit: int = 20,
     user_id: Optional[str] = None,
 ) -> list[dict]:
+    """
+    Ranked full-text search over note titles and bodies.
+    Each hit carries `score` (higher is better) and a highlighted `snippet`.
+    """
+    if not fts_ready():
+        return _like_search(query, note_type=note_type, limit=limit, user_id=user_id)
+
+    match = _fts_match(query)
+    if not match:
+        return []
+
+    conditions = ["notes_fts MATCH ?"]
+    params: list = [match]
+    if note_type:
+        conditions.append("n.note_type = ?")
+        params.append(note_type)
+    owner_sql, owner_params = _notes_owner_sql(user_id, table_alias="n")
+    conditions.append(owner_sql)
+    params.extend(owner_params)
+    params.append(limit)
+
+    rows = execute(
+        f"SELECT n.id, n.uuid, n.title, n.note_type, n.created_at, n.vault_path, n.tags, "
+        f"snippet(notes_fts, 1, '<mark>', '</mark>', '…', {_SNIPPET_TOKENS}) AS snippet, "
+        f"bm25(notes_fts, {_FTS_WEIGHTS[0]}, {_FTS_WEIGHTS[1]}) AS rank "
+        f"FROM notes_fts JOIN notes n ON n.id = notes_fts.rowid "
+        f"WHERE {' AND '.join(conditions)} ORDER BY rank LIMIT ?",
+        tuple(params),
+    )
+    for r in rows:
+        r["score"] = -r.pop("rank")  # bm25() is lower-is-better
+    return rows
+
+
+def _like_search(
+    query: str,
+    note_type: Optional[str] = None,
+    limit: int = 20,
+    user_id: Optional[str] = None,
+) -> list[dict]:
+    """Unranked LIKE scan — only used while notes_fts is still being backfilled."""
     terms = [t.strip() for t in query.split() if len(t.strip()) >= 2]
     if not terms:
         return []
@@ -69,6 +124,28 @@ def fulltext_search(
 # Semantic search (embedding cosine similarity with BM25 fallback)
 # ─────────────────────────────────────────────────────────────────────────────
 
+def _scan_chunks(query_vec: list[float], owned: set[int]) -> list[dict]:
+    """Cosine-score every stored chunk in Python. Used when the vector index is unavailable."""
+    scored: list[dict] = []
+    for chunk in all_chunk_embeddings():
+        if chunk.get("note_id") not in owned:
+            continue
+        try:
+            chunk_vec = json.loads(chunk["vector"])
+            score = cosine_similarity(query_vec, chunk_vec)
+            scored.append({
+                "score": score,
+                "chunk_id": chunk["chunk_id"],
+                "note_id": chunk["note_id"],
+                "content": chunk["content"],
+            })
+        except (TypeError, json.JSONDecodeError, ValueError):
+            continue
+
+    scored.sort(key=lambda x: x["score"], reverse=True)
+    return scored
+
+
 def semantic_search(
     query: str,
     top_k: int = 10,
@@ -76,55 +153,26 @@ def semantic_search(
 ) -> list[dict]:
     """
     1. Embed the query via Gemini.
-    2. Score all stored chunk embeddings by cosine similarity.
-    3. If embedding unavailable, fall back to BM25.
+    2. Rank chunks by cosine similarity via the vector index (JSON scan without numpy).
+    3. If embedding unavailable, fall back to BM25 over the persisted term statistics.
     Returns ranked list of {note_id, chunk_id, score, content, title}.
     """
     query_vec = embed_text(query, task_type="RETRIEVAL_QUERY")
-    chunks = all_chunk_embeddings() if query_vec is not None else all_chunks()
-
-    if not chunks:
-        return []
 
     owner_sql, owner_params = _notes_owner_sql(user_id)
     owned = {
         row["id"]
         for row in execute(f"SELECT id FROM notes WHERE {owner_sql}", owner_params)
     }
-    chunks = [c for c in chunks if c.get("note_id") in owned]
-    if not chunks:
+    if not owned:
         return []
 
-    scored: list[dict] = []
-
-    if query_vec:
-        for chunk in chunks:
-            try:
-                chunk_vec = json.loads(chunk["vector"])
-                score = cosine_similarity(query_vec, chunk_vec)
-                scored.append({
-                    "score": score,
-                    "chunk_id": chunk["chunk_id"],
-                    "note_id": chunk["note_id"],
-                    "content": chunk["content"],
-                })
-            except (TypeError, json.JSONDecodeError, ValueError):
-                continue
+    if not query_vec:
+        top = bm25_search(query, top_k=top_k, note_ids=owned)
     else:
-        q_tokens = _tokenise(query)
-        for chunk in chunks:
-            doc_tokens = _tokenise(chunk["content"])
-            score = bm25_score(q_tokens, doc_tokens)
-            if score > 0:
-                scored.append({
-                    "score": score,
-                    "chunk_id": chunk["chunk_id"],
-                    "note_id": chunk["note_id"],
-                    "content": chunk["content"],
-                })
-
-    scored.sort(key=lambda x: x["score"], reverse=True)
-    top = scored[:top_k]
+        top = nearest_chunks(query_vec, top_k=top_k, note_ids=owned)
+        if top is None:
+            top = _scan_chunks(query_vec, owned)[:top_k]
 
     if top:
         note_ids = list({r["note_id"] for r in top})
@@ -262,6 +310,11 @@ def people_search(
     limit: int = 20,
     user_id: Optional[str] = None,
 ) -> list[dict]:
+    if fts_ready():
+        return [
+            {k: r[k] for k in ("id", "uuid", "title", "created_at", "snippet", "score")}
+            for r in fulltext_search(query, note_type="person", limit=limit, user_id=user_id)
+        ]
     owner_sql, owner_params = _notes_owner_sql(user_id)
     return execute(
         f"SELECT id, uuid, title, created_at FROM notes "
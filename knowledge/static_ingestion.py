@@ -9,13 +9,26 @@ LAW I: One pipeline. Ingest always calls pipeline.ingest().
 
 Called from api/main.py lifespan() — runs once at startup in a background thread.
 Never duplicates existing objects (checksum-based deduplication).
+
+Change detection: the static_manifest table records (path, mtime, size,
+checksum) for every processed file. A file whose mtime and size match its
+manifest row is skipped from a stat() alone — an unchanged tree is never read.
+Changed files are read, hashed, parsed and chunked on a bounded worker pool;
+the calling thread is the single writer that runs pipeline.ingest() and the
+manifest upsert, one transaction per file.
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import os
 import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
+from typing import Optional
 
 logger = logging.getLogger("arkadia.static_ingestion")
 
@@ -78,6 +91,9 @@ _SKIP_FILENAMES: frozenset[str] = frozenset({
 # Minimum content length to be worth ingesting (bytes)
 _MIN_CONTENT_BYTES = 64
 
+# Parse/chunk workers. Writes stay on the calling thread.
+_MAX_WORKERS = min(8, os.cpu_count() or 2)
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Core logic
@@ -105,67 +121,153 @@ def _title_from_path(path: Path) -> str:
     return " ".join(w.capitalize() for w in stem.split())
 
 
-def run_static_ingestion() -> dict:
-    """
-    Scan all configured static sources and ingest any file not already
-    present in the Knowledge OS (idempotent via checksum deduplication).
-
-    Returns a summary dict for logging.
-    """
-    from knowledge.pipeline import ingest as _ingest
+def _manifest_key(path: Path) -> str:
+    try:
+        return path.relative_to(_REPO_ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
 
-    ingested = 0
-    skipped  = 0
-    errors   = 0
 
+def _scan() -> list[tuple[Path, dict, os.stat_result]]:
+    """Every candidate file with its source and stat(). No file is opened."""
+    found: list[tuple[Path, dict, os.stat_result]] = []
+    seen: set[Path] = set()
     for source in _SOURCES:
         root: Path = source["root"]
         if not root.exists():
             logger.debug(f"[K5] Source root missing, skipping: {root}")
             continue
-
         for path in sorted(root.glob(source["glob"])):
-            if not path.is_file():
+            if path.name in _SKIP_FILENAMES or path in seen:
                 continue
-            if path.name in _SKIP_FILENAMES:
+            if not path.is_file():
                 continue
-
             try:
-                raw = path.read_text(encoding="utf-8", errors="replace")
-            except Exception as exc:
-                logger.warning(f"[K5] Cannot read {path}: {exc}")
-                errors += 1
+                st = path.stat()
+            except OSError:
                 continue
+            seen.add(path)
+            found.append((path, source, st))
+    return found
 
-            if len(raw.encode()) < _MIN_CONTENT_BYTES:
-                skipped += 1
-                continue
 
-            title_from_fm, body = _strip_frontmatter(raw)
-            content = body if body else raw
-            title   = title_from_fm or _title_from_path(path)
+def _prepare(path: Path) -> Optional[dict]:
+    """Worker: read, parse and chunk one file. None when below the size floor."""
+    from knowledge.pipeline import chunk_text
 
-            try:
-                result = _ingest(
-                    title=title,
-                    content=content,
-                    note_type=source["note_type"],
-                    tags=source["tags"],
-                    source_provider=source["source_provider"],
-                    auto_tag=True,
-                    auto_embed=False,   # embeddings done lazily to keep startup fast
-                    auto_link=False,    # links built lazily
-                )
-                if result.get("duplicate"):
+    raw = path.read_text(encoding="utf-8", errors="replace")
+    if len(raw.encode()) < _MIN_CONTENT_BYTES:
+        return None
+    title_from_fm, body = _strip_frontmatter(raw)
+    content = body if body else raw
+    return {
+        "title": title_from_fm or _title_from_path(path),
+        "content": content,
+        "checksum": hashlib.sha256(content.encode()).hexdigest(),
+        "chunks": chunk_text(content),
+    }
+
+
+def _record(key: str, st: os.stat_result, checksum: Optional[str], note_id: Optional[int]) -> None:
+    from knowledge.db import execute
+
+    execute(
+        """
+        INSERT INTO static_manifest (path, mtime_ns, size, checksum, note_id, updated_at)
+        VALUES (?, ?, ?, ?, ?, datetime('now'))
+        ON CONFLICT(path) DO UPDATE SET
+            mtime_ns = excluded.mtime_ns, size = excluded.size, checksum = excluded.checksum,
+            note_id = COALESCE(excluded.note_id, static_manifest.note_id),
+            updated_at = excluded.updated_at
+        """,
+        (key, st.st_mtime_ns, st.st_size, checksum, note_id),
+    )
+
+
+def run_static_ingestion(max_workers: int = _MAX_WORKERS) -> dict:
+    """
+    Scan all configured static sources and ingest any file not already
+    present in the Knowledge OS (idempotent via checksum deduplication).
+    Files unchanged since the last run (manifest mtime + size) are not read.
+
+    Returns a summary dict for logging.
+    """
+    from knowledge.db import execute, transaction
+    from knowledge.pipeline import ingest as _ingest
+
+    ingested  = 0
+    skipped   = 0
+    unchanged = 0
+    errors    = 0
+
+    manifest = {
+        row["path"]: row
+        for row in execute("SELECT path, mtime_ns, size, checksum FROM static_manifest")
+    }
+    pending: list[tuple[Path, dict, os.stat_result, str]] = []
+    for path, source, st in _scan():
+        key = _manifest_key(path)
+        row = manifest.get(key)
+        if row and row["mtime_ns"] == st.st_mtime_ns and row["size"] == st.st_size:
+            unchanged += 1
+            continue
+        pending.append((path, source, st, key))
+
+    if pending:
+        workers = max(1, max_workers)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="k5-parse") as pool:
+            # Sliding window: workers stay ahead of the writer, parsed documents
+            # in memory stay bounded, and files are written in scan order.
+            window: deque = deque()
+            queue = iter(pending)
+            for item in islice(queue, workers * 4):
+                window.append((pool.submit(_prepare, item[0]), item))
+            while window:
+                future, (path, source, st, key) = window.popleft()
+                for item in islice(queue, 1):
+                    window.append((pool.submit(_prepare, item[0]), item))
+                try:
+                    doc = future.result()
+                except Exception as exc:
+                    logger.warning(f"[K5] Cannot read {path}: {exc}")
+                    errors += 1
+                    continue
+
+                if doc is None:
+                    _record(key, st, None, None)
+                    skipped += 1
+                    continue
+                previous = manifest.get(key)
+                if previous and previous["checksum"] == doc["checksum"]:
+                    _record(key, st, doc["checksum"], None)   # touched, not edited
                     skipped += 1
-                else:
-                    ingested += 1
-                    logger.debug(f"[K5] Ingested: {title[:60]}")
-            except Exception as exc:
-                logger.warning(f"[K5] Ingest failed for {path}: {exc}")
-                errors += 1
-
-    summary = {"ingested": ingested, "skipped": skipped, "errors": errors}
+                    continue
+
+                try:
+                    with transaction():
+                        result = _ingest(
+                            title=doc["title"],
+                            content=doc["content"],
+                            note_type=source["note_type"],
+                            tags=source["tags"],
+                            source_provider=source["source_provider"],
+                            auto_tag=True,
+                            auto_embed=False,   # embeddings done lazily to keep startup fast
+                            auto_link=False,    # links built lazily
+                            chunks=doc["chunks"],
+                        )
+                        note = result.get("existing") if result.get("duplicate") else result
+                        _record(key, st, doc["checksum"], (note or {}).get("id"))
+                    if result.get("duplicate"):
+                        skipped += 1
+                    else:
+                        ingested += 1
+                        logger.debug(f"[K5] Ingested: {doc['title'][:60]}")
+                except Exception as exc:
+                    logger.warning(f"[K5] Ingest failed for {path}: {exc}")
+                    errors += 1
+
+    summary = {"ingested": ingested, "skipped": skipped, "unchanged": unchanged, "errors": errors}
     logger.info(f"[K5] Static ingestion complete — {summary}")
     return summary
 
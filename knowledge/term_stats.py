@@ -0,0 +1,171 @@
+"""
+Arkadia Knowledge OS — BM25 Term Statistics
+============================================
+Persistent inverted index behind the local-first keyword fallback.
+
+LAW II: Local First. This is the ranking that still answers when no embedder
+is configured or reachable: statistics and postings live in the local
+database and a query never leaves it.
+
+Tables (schema.sql):
+    chunk_terms    — postings: (term, chunk_id) → tf, clustered by term
+    chunk_lengths  — per-chunk document length + note_id for access filtering
+    term_stats     — document frequency per term
+    bm25_corpus    — single row: chunk count and total length (avgdl = total / count)
+
+store_chunks() indexes new chunks here; the chunks DELETE trigger in schema.sql
+unwinds postings, df and corpus totals, so note deletion (direct or cascading)
+keeps the statistics exact. A query costs one df lookup, one corpus-row read and
+one postings range scan per query term — chunk text is never re-tokenised.
+
+Entry points:
+    tokenise(text)                         — the term rule shared by indexing and queries
+    index_chunks(rows)                     — add (chunk_id, note_id, content) rows
+    bm25_search(query, top_k, note_ids)    — ranked chunk hits
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from typing import Optional
+
+from knowledge.db import execute, execute_one, transaction
+
+logger = logging.getLogger("arkadia.term_stats")
+
+# Okapi BM25 parameters
+K1 = 1.5
+B = 0.75
+
+_backfilled = False
+_backfill_lock = threading.Lock()
+
+
+def tokenise(text: str) -> list[str]:
+    """Lowercase alphabetic words of 3+ letters."""
+    return re.findall(r"\b[a-z]{3,}\b", text.lower())
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Index maintenance
+# ─────────────────────────────────────────────────────────────────────────────
+
+def index_chunks(rows: list[tuple[int, int, str]]) -> int:
+    """
+    Add (chunk_id, note_id, content) rows to the term statistics.
+    Idempotent per chunk — already-indexed chunks are skipped.
+    Returns the number of chunks indexed.
+    """
+    indexed = 0
+    with transaction() as conn:
+        for chunk_id, note_id, content in rows:
+            tf = Counter(tokenise(content or ""))
+            length = sum(tf.values())
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO chunk_lengths (chunk_id, note_id, length) VALUES (?, ?, ?)",
+                (chunk_id, note_id, length),
+            )
+            if cur.rowcount == 0:
+                continue
+            conn.executemany(
+                "INSERT INTO chunk_terms (term, chunk_id, tf) VALUES (?, ?, ?)",
+                [(term, chunk_id, n) for term, n in tf.items()],
+            )
+            conn.executemany(
+                "INSERT INTO term_stats (term, df) VALUES (?, 1) "
+                "ON CONFLICT(term) DO UPDATE SET df = df + 1",
+                [(term,) for term in tf],
+            )
+            conn.execute(
+                "UPDATE bm25_corpus SET doc_count = doc_count + 1, "
+                "total_length = total_length + ? WHERE id = 1",
+                (length,),
+            )
+            indexed += 1
+    return indexed
+
+
+def _ensure_backfilled() -> None:
+    """Index chunks written before term statistics existed. Once per process."""
+    global _backfilled
+    if _backfilled:
+        return
+    with _backfill_lock:
+        if _backfilled:
+            return
+        missing = execute(
+            "SELECT c.id, c.note_id, c.content FROM chunks c "
+            "LEFT JOIN chunk_lengths l ON l.chunk_id = c.id WHERE l.chunk_id IS NULL"
+        )
+        if missing:
+            n = index_chunks([(r["id"], r["note_id"], r["content"]) for r in missing])
+            logger.info(f"[BM25] Backfilled term statistics for {n} chunks")
+        _backfilled = True
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Ranking
+# ─────────────────────────────────────────────────────────────────────────────
+
+def bm25_search(
+    query: str,
+    top_k: int = 10,
+    note_ids: Optional[set[int]] = None,
+) -> list[dict]:
+    """
+    Okapi BM25 over all chunks using corpus-accurate df, document length and N.
+    note_ids restricts results to those notes.
+    Returns {chunk_id, note_id, content, score} dicts ranked best-first.
+    """
+    _ensure_backfilled()
+    terms = list(dict.fromkeys(tokenise(query)))
+    if not terms or top_k <= 0 or (note_ids is not None and not note_ids):
+        return []
+
+    corpus = execute_one("SELECT doc_count, total_length FROM bm25_corpus WHERE id = 1")
+    n_docs = corpus["doc_count"] if corpus else 0
+    if n_docs <= 0:
+        return []
+    avg_dl = max(corpus["total_length"] / n_docs, 1.0)
+
+    phs = ",".join("?" * len(terms))
+    df = {
+        r["term"]: r["df"]
+        for r in execute(f"SELECT term, df FROM term_stats WHERE term IN ({phs}) AND df > 0", tuple(terms))
+    }
+
+    scores: dict[int, float] = {}
+    owner: dict[int, int] = {}
+    for term, term_df in df.items():
+        idf = math.log(1 + (n_docs - term_df + 0.5) / (term_df + 0.5))
+        postings = execute(
+            "SELECT ct.chunk_id, ct.tf, cl.length, cl.note_id FROM chunk_terms ct "
+            "JOIN chunk_lengths cl ON cl.chunk_id = ct.chunk_id WHERE ct.term = ?",
+            (term,),
+        )
+        for p in postings:
+            if note_ids is not None and p["note_id"] not in note_ids:
+                continue
+            tf = p["tf"]
+            norm = K1 * (1 - B + B * p["length"] / avg_dl)
+            scores[p["chunk_id"]] = scores.get(p["chunk_id"], 0.0) + idf * tf * (K1 + 1) / (tf + norm)
+            owner[p["chunk_id"]] = p["note_id"]
+
+    if not scores:
+        return []
+    ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:top_k]
+    ids = [cid for cid, _ in ranked]
+    phs = ",".join("?" * len(ids))
+    content = {
+        r["id"]: r["content"]
+        for r in execute(f"SELECT id, content FROM chunks WHERE id IN ({phs})", tuple(ids))
+    }
+    return [
+        {"chunk_id": cid, "note_id": owner[cid], "content": content[cid], "score": score}
+        for cid, score in ranked
+        if cid in content
+    ]
@@ -0,0 +1,102 @@
+"""
+Arkadia Knowledge OS — Title Key Index
+======================================
+Inverted index over note titles for the enrichment scorers, so finding "the
+previous chapter" or "documents whose titles share words" is a primary-key
+range read instead of a regex pass over every note of that type.
+
+Tables (schema.sql):
+    title_keys       — (kind, key, note_id), clustered by kind + key
+    title_key_queue  — notes whose keys must be (re)computed; filled by triggers
+                       on note insert and on title / note_type updates
+    title_key_state  — one row; seeded = 1 once pre-existing notes were queued
+
+Keys:
+    chapter  — first number in the title of a 'chapter' note
+    word     — lower-cased title words of 5+ letters for 'document' / 'scroll'
+
+ON DELETE CASCADE drops the keys of deleted notes. sync() drains the queue in
+batches and is cheap when it is empty (one indexed read).
+
+Entry points:
+    sync()                                      — apply queued note changes
+    notes_with_key(kind, key, exclude, limit)   — newest matching note ids
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from typing import Optional
+
+from knowledge.db import execute, transaction
+
+logger = logging.getLogger("arkadia.title_keys")
+
+_SYNC_BATCH = 1000
+_NUMBER_RE = re.compile(r"\b(\d+)\b")
+_WORD_RE = re.compile(r"\b[a-zA-Z]{5,}\b")
+_sync_lock = threading.Lock()
+
+
+def chapter_number(title: str) -> Optional[int]:
+    match = _NUMBER_RE.search(title or "")
+    return int(match.group(1)) if match else None
+
+
+def title_words(title: str) -> set[str]:
+    return set(_WORD_RE.findall((title or "").lower()))
+
+
+def _keys(note_type: str, title: str) -> list[tuple[str, str]]:
+    if note_type == "chapter":
+        num = chapter_number(title)
+        return [("chapter", str(num))] if num is not None else []
+    if note_type in ("document", "scroll"):
+        return [("word", w) for w in title_words(title)]
+    return []
+
+
+def sync() -> int:
+    """Index every queued note. Returns the number of notes processed."""
+    processed = 0
+    with _sync_lock:
+        with transaction() as conn:
+            if not conn.execute("SELECT seeded FROM title_key_state WHERE id = 1").fetchone()[0]:
+                conn.execute("INSERT OR IGNORE INTO title_key_queue (note_id) SELECT id FROM notes")
+                conn.execute("UPDATE title_key_state SET seeded = 1 WHERE id = 1")
+        while True:
+            with transaction() as conn:
+                ids = [r[0] for r in conn.execute(
+                    "SELECT note_id FROM title_key_queue ORDER BY note_id LIMIT ?", (_SYNC_BATCH,)
+                )]
+                if not ids:
+                    break
+                phs = ",".join("?" * len(ids))
+                rows = conn.execute(
+                    f"SELECT id, note_type, title FROM notes WHERE id IN ({phs})", ids
+                ).fetchall()
+                conn.execute(f"DELETE FROM title_keys WHERE note_id IN ({phs})", ids)
+                conn.executemany(
+                    "INSERT OR IGNORE INTO title_keys (kind, key, note_id) VALUES (?, ?, ?)",
+                    [(kind, key, r[0]) for r in rows for kind, key in _keys(r[1], r[2])],
+                )
+                conn.execute(f"DELETE FROM title_key_queue WHERE note_id IN ({phs})", ids)
+            processed += len(ids)
+    if processed > _SYNC_BATCH:
+        logger.info(f"[TITLE-KEYS] Indexed {processed} notes")
+    return processed
+
+
+def notes_with_key(kind: str, key: str, exclude: int, limit: int) -> list[int]:
+    """Up to *limit* note ids carrying (kind, key), newest first, without *exclude*."""
+    rows = execute(
+        "SELECT note_id FROM title_keys WHERE kind = ? AND key = ? AND note_id != ? "
+        "ORDER BY note_id DESC LIMIT ?",
+        (kind, key, exclude, limit),
+    )
+    return [r["note_id"] for r in rows]
+
+
+__all__ = ["sync", "notes_with_key", "chapter_number", "title_words"]
@@ -0,0 +1,402 @@
+"""
+Arkadia Knowledge OS — Vector Index
+====================================
+Persistent, memory-mapped float32 index over the latest embedding of every chunk.
+SQLite stays canonical (embeddings.vector); this index is a derived cache that
+can always be rebuilt from it.
+
+On-disk layout (directory next to the database, ARKADIA_VECTOR_INDEX_PATH overrides):
+    vectors.f32  — row-major float32 matrix, unit-normalised, capacity × dim
+    rows.i64     — (chunk_id, note_id) per row; chunk_id = -1 marks a dead row
+    meta.json    — dim, count, capacity and the two sync watermarks
+
+Sync is pull-based and incremental. New embeddings are read by id above the
+embedding watermark; deletes and vector updates arrive through the
+embedding_changes log that schema.sql triggers maintain. Any write path —
+pipeline, cascading note deletes, direct SQL — is reflected on the next search
+at the cost of two indexed range queries, never a corpus reparse. Applied
+change rows are deleted, so the log holds only what is still pending.
+
+LAW II: Local First. numpy is optional — without it get_index() returns None
+and callers fall back to scanning all_chunk_embeddings().
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover — exercised only on minimal installs
+    np = None
+
+from knowledge import db
+from knowledge.db import execute, execute_one
+
+logger = logging.getLogger("arkadia.vector_index")
+
+_MIN_CAPACITY = 1024
+# Rows read per SQLite round trip while syncing / rebuilding
+_SYNC_BATCH = 2000
+# Compact once dead rows exceed both thresholds
+_COMPACT_MIN_DEAD = 1024
+_COMPACT_DEAD_RATIO = 0.25
+
+
+class VectorIndex:
+    """Memory-mapped cosine index keyed by chunk_id. Thread-safe."""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._dim: Optional[int] = None
+        self._count = 0
+        self._capacity = 0
+        self._dead = 0
+        self._emb_wm = 0       # highest embeddings.id applied
+        self._change_wm = 0    # highest embedding_changes.id applied
+        self._vectors = None   # np.memmap (capacity, dim) float32
+        self._rows = None      # np.memmap (capacity, 2) int64
+        self._row_of: dict[int, int] = {}
+        self._loaded = False
+
+    # ── persistence ──────────────────────────────────────────────────────────
+
+    @property
+    def _meta_path(self) -> Path:
+        return self.path / "meta.json"
+
+    @property
+    def _vec_path(self) -> Path:
+        return self.path / "vectors.f32"
+
+    @property
+    def _rows_path(self) -> Path:
+        return self.path / "rows.i64"
+
+    def _open_maps(self) -> None:
+        if self._capacity == 0 or self._dim is None:
+            self._vectors = None
+            self._rows = None
+            return
+        self._vectors = np.memmap(self._vec_path, dtype=np.float32, mode="r+",
+                                  shape=(self._capacity, self._dim))
+        self._rows = np.memmap(self._rows_path, dtype=np.int64, mode="r+",
+                               shape=(self._capacity, 2))
+
+    def _write_meta(self) -> None:
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._rows.flush()
+        meta = {
+            "dim": self._dim,
+            "count": self._count,
+            "capacity": self._capacity,
+            "dead": self._dead,
+            "embedding_watermark": self._emb_wm,
+            "change_watermark": self._change_wm,
+        }
+        tmp = str(self._meta_path) + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._meta_path)
+
+    def _load(self) -> None:
+        """Open the on-disk index, or rebuild it when missing or inconsistent with SQLite."""
+        self._loaded = True
+        self.path.mkdir(parents=True, exist_ok=True)
+        try:
+            meta = json.loads(self._meta_path.read_text())
+            self._dim = meta["dim"]
+            self._count = int(meta["count"])
+            self._capacity = int(meta["capacity"])
+            self._dead = int(meta.get("dead", 0))
+            self._emb_wm = int(meta["embedding_watermark"])
+            self._change_wm = int(meta["change_watermark"])
+            self._open_maps()
+        except (OSError, ValueError, KeyError, TypeError):
+            self._reset()
+            return
+
+        # A recreated database restarts AUTOINCREMENT ids below our watermarks.
+        max_emb = execute_one("SELECT MAX(id) AS m FROM embeddings")["m"] or 0
+        max_change = execute_one("SELECT MAX(id) AS m FROM embedding_changes")["m"] or 0
+        if max_emb < self._emb_wm or max_change < self._change_wm:
+            logger.info("[VECTOR-INDEX] Watermarks ahead of database — rebuilding")
+            self._reset()
+            return
+
+        self._row_of = {}
+        if self._rows is not None and self._count:
+            chunk_ids = self._rows[: self._count, 0]
+            for row in np.nonzero(chunk_ids >= 0)[0]:
+                self._row_of[int(chunk_ids[row])] = int(row)
+
+    def _drop_storage(self) -> None:
+        """Discard all rows and their files. Watermarks are left to the caller."""
+        self._dim = None
+        self._count = 0
+        self._capacity = 0
+        self._dead = 0
+        self._vectors = None
+        self._rows = None
+        self._row_of = {}
+        for p in (self._vec_path, self._rows_path):
+            try:
+                p.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _reset(self) -> None:
+        """Drop all rows; the next sync repopulates from SQLite."""
+        self._drop_storage()
+        self._emb_wm = 0
+        # Changes logged before the rebuild are already reflected in the table.
+        self._change_wm = execute_one("SELECT MAX(id) AS m FROM embedding_changes")["m"] or 0
+        self._write_meta()
+        self._prune_changes()
+
+    def _prune_changes(self) -> None:
+        """Delete change rows below the watermark. The watermark row itself is
+        kept so other readers can tell whether rows they still need are gone."""
+        execute("DELETE FROM embedding_changes WHERE id < ?", (self._change_wm,))
+
+    def _ensure_capacity(self, needed: int) -> None:
+        if needed <= self._capacity:
+            return
+        capacity = max(_MIN_CAPACITY, self._capacity * 2)
+        while capacity < needed:
+            capacity *= 2
+        for p, width in ((self._vec_path, self._dim * 4), (self._rows_path, 16)):
+            with open(p, "ab") as f:
+                f.truncate(capacity * width)
+        self._capacity = capacity
+        self._open_maps()
+
+    # ── mutation (caller holds the lock) ─────────────────────────────────────
+
+    def _kill(self, chunk_id: int) -> None:
+        row = self._row_of.pop(chunk_id, None)
+        if row is not None:
+            self._rows[row] = (-1, -1)
+            self._dead += 1
+
+    def _append(self, batch: list[tuple[int, int, str]]) -> None:
+        """Append (chunk_id, note_id, vector_json) rows; a chunk keeps only its newest vector."""
+        parsed: list[tuple[int, int, list[float]]] = []
+        for chunk_id, note_id, raw in batch:
+            try:
+                vec = json.loads(raw)
+            except (TypeError, ValueError):
+                continue
+            if not isinstance(vec, list) or not vec:
+                continue
+            if self._dim is None:
+                self._dim = len(vec)
+            elif len(vec) != self._dim:
+                if self._row_of or parsed:
+                    continue  # mixed models — keep the established dimension
+                self._drop_storage()
+                self._dim = len(vec)
+            parsed.append((chunk_id, note_id, vec))
+        if not parsed:
+            return
+
+        mat = np.asarray([v for _, _, v in parsed], dtype=np.float32)
+        norms = np.linalg.norm(mat, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        mat /= norms
+
+        self._ensure_capacity(self._count + len(parsed))
+        start = self._count
+        self._vectors[start : start + len(parsed)] = mat
+        for offset, (chunk_id, note_id, _) in enumerate(parsed):
+            self._kill(chunk_id)
+            self._rows[start + offset] = (chunk_id, note_id)
+            self._row_of[chunk_id] = start + offset
+        self._count += len(parsed)
+
+    def _compact(self) -> None:
+        """Rewrite live rows into fresh files so in-flight searches keep valid maps."""
+        live_total = self._count - self._dead
+        capacity = max(_MIN_CAPACITY, live_total * 2)
+        vec_tmp = self.path / "vectors.f32.tmp"
+        rows_tmp = self.path / "rows.i64.tmp"
+        for p, width in ((vec_tmp, self._dim * 4), (rows_tmp, 16)):
+            with open(p, "wb") as f:
+                f.truncate(capacity * width)
+        new_vecs = np.memmap(vec_tmp, dtype=np.float32, mode="r+", shape=(capacity, self._dim))
+        new_rows = np.memmap(rows_tmp, dtype=np.int64, mode="r+", shape=(capacity, 2))
+        w = 0
+        for start in range(0, self._count, _SYNC_BATCH):
+            end = min(start + _SYNC_BATCH, self._count)
+            sel = np.nonzero(self._rows[start:end, 0] >= 0)[0] + start
+            k = len(sel)
+            new_vecs[w : w + k] = self._vectors[sel]
+            new_rows[w : w + k] = self._rows[sel]
+            w += k
+        new_vecs.flush()
+        new_rows.flush()
+        del new_vecs, new_rows
+        os.replace(vec_tmp, self._vec_path)
+        os.replace(rows_tmp, self._rows_path)
+        self._capacity = capacity
+        self._count = w
+        self._dead = 0
+        self._open_maps()
+        self._row_of = {int(self._rows[i, 0]): i for i in range(w)}
+        logger.info(f"[VECTOR-INDEX] Compacted to {w} live rows")
+
+    def _sync(self) -> None:
+        if not self._loaded:
+            self._load()
+        changed = False
+
+        # 1. Deletes / vector updates recorded by the embedding_changes triggers.
+        #    Rows are pruned once applied; if another reader pruned past our
+        #    watermark, the deletes we missed are unrecoverable — rebuild.
+        floor = execute_one("SELECT MIN(id) AS m FROM embedding_changes")["m"]
+        if floor is not None and floor > self._change_wm + 1:
+            logger.info("[VECTOR-INDEX] Change log pruned past watermark — rebuilding")
+            self._reset()
+        changes = execute(
+            "SELECT id, chunk_id FROM embedding_changes WHERE id > ? ORDER BY id",
+            (self._change_wm,),
+        )
+        if changes:
+            touched = {c["chunk_id"] for c in changes}
+            for chunk_id in touched:
+                self._kill(chunk_id)
+            self._change_wm = changes[-1]["id"]
+            self._prune_changes()
+            # Re-add surviving vectors that were already below the watermark (updates).
+            ids = list(touched)
+            for i in range(0, len(ids), 500):
+                part = ids[i : i + 500]
+                phs = ",".join("?" * len(part))
+                rows = execute(
+                    f"SELECT e.chunk_id, c.note_id, e.vector FROM embeddings e "
+                    f"JOIN chunks c ON c.id = e.chunk_id "
+                    f"WHERE e.chunk_id IN ({phs}) AND e.id <= ? ORDER BY e.id",
+                    tuple(part) + (self._emb_wm,),
+                )
+                self._append([(r["chunk_id"], r["note_id"], r["vector"]) for r in rows])
+            changed = True
+
+        # 2. New embeddings above the watermark.
+        while True:
+            rows = execute(
+                "SELECT e.id, e.chunk_id, c.note_id, e.vector FROM embeddings e "
+                "LEFT JOIN chunks c ON c.id = e.chunk_id "
+                "WHERE e.id > ? ORDER BY e.id LIMIT ?",
+                (self._emb_wm, _SYNC_BATCH),
+            )
+            if not rows:
+                break
+            self._append([
+                (r["chunk_id"], r["note_id"], r["vector"])
+                for r in rows if r["note_id"] is not None
+            ])
+            self._emb_wm = rows[-1]["id"]
+            changed = True
+            if len(rows) < _SYNC_BATCH:
+                break
+
+        if self._dead >= _COMPACT_MIN_DEAD and self._dead > self._count * _COMPACT_DEAD_RATIO:
+            self._compact()
+            changed = True
+        if changed:
+            self._write_meta()
+
+    # ── public API ───────────────────────────────────────────────────────────
+
+    def sync(self) -> None:
+        """Apply pending SQLite changes to the index."""
+        with self._lock:
+            self._sync()
+
+    def search(
+        self,
+        query_vec: list[float],
+        top_k: int = 10,
+        note_ids: Optional[set[int]] = None,
+    ) -> list[dict]:
+        """
+        Return up to top_k {chunk_id, note_id, score} dicts ranked by cosine similarity.
+        note_ids restricts results to those notes (e.g. the caller's accessible set).
+        """
+        with self._lock:
+            self._sync()
+            n = self._count
+            if n == 0 or self._vectors is None or len(query_vec) != self._dim:
+                return []
+            # Views stay valid after the lock is released: appends write past n,
+            # compaction swaps in new files instead of rewriting these pages.
+            vectors = self._vectors[:n]
+            rows = self._rows[:n]
+
+        if top_k <= 0 or (note_ids is not None and not note_ids):
+            return []
+        q = np.asarray(query_vec, dtype=np.float32)
+        norm = float(np.linalg.norm(q))
+        if norm == 0:
+            return []
+        scores = vectors @ (q / norm)
+        live = rows[:, 0] >= 0
+        if note_ids is not None:
+            allowed = np.fromiter(note_ids, dtype=np.int64, count=len(note_ids))
+            live &= np.isin(rows[:, 1], allowed)
+        scores = np.where(live, scores, -np.inf)
+
+        k = min(top_k, n)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            {"chunk_id": int(rows[i, 0]), "note_id": int(rows[i, 1]), "score": float(scores[i])}
+            for i in top
+            if np.isfinite(scores[i])
+        ]
+
+    def stats(self) -> dict:
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            return {
+                "path": str(self.path),
+                "dim": self._dim,
+                "rows": self._count - self._dead,
+                "dead_rows": self._dead,
+                "capacity": self._capacity,
+                "embedding_watermark": self._emb_wm,
+                "change_watermark": self._change_wm,
+            }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Process-wide instance
+# ─────────────────────────────────────────────────────────────────────────────
+
+_index: Optional[VectorIndex] = None
+_index_lock = threading.Lock()
+
+
+def index_path() -> Path:
+    override = os.environ.get("ARKADIA_VECTOR_INDEX_PATH")
+    return Path(override) if override else db._DB_PATH.with_suffix(".vecindex")
+
+
+def get_index() -> Optional[VectorIndex]:
+    """Return the shared index, or None when numpy is unavailable."""
+    global _index
+    if np is None:
+        return None
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = VectorIndex(index_path())
+    return _index
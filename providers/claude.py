@@ -9,6 +9,7 @@ import os
 import time
 from typing import AsyncIterator, Optional
 
+from providers import http_pool
 from providers.base import BaseProvider, ProviderMessage, ProviderResponse
 
 
@@ -31,7 +32,7 @@ class ClaudeProvider(BaseProvider):
         key = self._get_key()
         if not key:
             raise RuntimeError("ANTHROPIC_API_KEY not configured")
-        return anthropic.Anthropic(api_key=key)
+        return anthropic.Anthropic(api_key=key, http_client=http_pool.sync_client())
 
     def authenticate(self) -> bool:
         return bool(self._get_key())
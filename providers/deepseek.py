@@ -10,6 +10,7 @@ import os
 import time
 from typing import AsyncIterator, Optional
 
+from providers import http_pool
 from providers.base import BaseProvider, ProviderMessage, ProviderResponse
 
 DEEPSEEK_BASE_URL = "https://api.deepseek.com/v1"
@@ -34,7 +35,7 @@ class DeepSeekProvider(BaseProvider):
         key = self._get_key()
         if not key:
             raise RuntimeError("DEEPSEEK_API_KEY not configured")
-        return OpenAI(api_key=key, base_url=DEEPSEEK_BASE_URL)
+        return OpenAI(api_key=key, base_url=DEEPSEEK_BASE_URL, http_client=http_pool.sync_client())
 
     def authenticate(self) -> bool:
         return bool(self._get_key())
@@ -6,10 +6,14 @@ Resolves API key per-call (supports key rotation via api/key_manager.py).
 Business logic lives in Oracle/Kernel, NOT here.
 """
 
+import json
 import os
 import time
 from typing import AsyncIterator, Optional
 
+import httpx
+
+from providers import http_pool
 from providers.base import BaseProvider, ProviderMessage, ProviderResponse
 
 
@@ -17,11 +21,14 @@ class GeminiProvider(BaseProvider):
     name = "gemini"
     display_name = "Google Gemini"
 
-    def __init__(self, model: str = "gemini-2.0-flash"):
+    def __init__(self, model: str = "gemini-2.0-flash", api_key: Optional[str] = None):
         self.model = model
+        self._api_key = api_key   # pinned key (caller-managed rotation, e.g. key_pool)
 
     def _get_key(self) -> Optional[str]:
-        """Resolve API key: provider_key_store → key_manager rotation → env vars."""
+        """Resolve API key: pinned → provider_key_store → key_manager rotation → env vars."""
+        if self._api_key:
+            return self._api_key
         # 1. Multi-provider store (set via Settings → AI Provider Keys)
         try:
             from api.provider_key_store import get_key
@@ -108,17 +115,48 @@ class GeminiProvider(BaseProvider):
         temperature: float = 0.7,
         **kwargs,
     ) -> AsyncIterator[str]:
-        genai = self._configured_genai()
-        model = genai.GenerativeModel(
-            model_name=self.model,
-            system_instruction=system_prompt or None,
-            generation_config={"temperature": temperature},
+        """Stream via the REST ``streamGenerateContent`` SSE endpoint.
+
+        Non-blocking (httpx) and sends the full history. HTTP errors raise
+        ``httpx.HTTPStatusError`` before the first chunk, so callers can
+        rotate model or key.
+        """
+        key = self._get_key()
+        if not key:
+            raise RuntimeError("No GEMINI_API_KEY configured")
+        payload: dict = {
+            "contents": [
+                {"role": "model" if m.role == "assistant" else "user", "parts": [{"text": m.content}]}
+                for m in messages
+            ],
+            "generationConfig": {"temperature": temperature},
+        }
+        if system_prompt:
+            payload["system_instruction"] = {"parts": [{"text": system_prompt}]}
+        if kwargs.get("max_tokens"):
+            payload["generationConfig"]["maxOutputTokens"] = kwargs["max_tokens"]
+        url = (
+            f"https://generativelanguage.googleapis.com/v1beta/models/"
+            f"{self.model}:streamGenerateContent?alt=sse&key={key}"
         )
-        last_content = messages[-1].content if messages else ""
-        response = model.generate_content(last_content, stream=True)
-        for chunk in response:
-            if hasattr(chunk, "text") and chunk.text:
-                yield chunk.text
+
+        client = kwargs.get("client")
+        default_timeout = httpx.USE_CLIENT_DEFAULT if client else 90.0
+        client = client or http_pool.async_client()
+        timeout = kwargs.get("timeout", default_timeout)
+        async with client.stream("POST", url, json=payload, timeout=timeout) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                try:
+                    chunk = json.loads(line[5:])
+                except json.JSONDecodeError:
+                    continue
+                for cand in chunk.get("candidates", [])[:1]:
+                    for part in cand.get("content", {}).get("parts", []):
+                        if part.get("text"):
+                            yield part["text"]
 
     def models(self) -> list[str]:
         return [
@@ -0,0 +1,321 @@
+"""
+Arkadia — Shared HTTP Client Pools
+==================================
+One keep-alive connection pool per process for outbound provider and corpus
+calls, so a Gemini request or GitHub fetch reuses an open TLS connection
+instead of paying a fresh handshake every time.
+
+    sync_client()   — process-wide httpx.Client (thread-safe)
+    async_client()  — httpx.AsyncClient for the running event loop
+    stats()         — requests, in-flight and connections opened, per host
+    aclose()        — lifespan shutdown: close every pooled client
+
+Callers must NOT close these clients or use them as context managers. Pass
+per-request timeouts (timeout=...) where a call needs a different budget.
+
+Configuration (environment):
+    ARKADIA_HTTP_TIMEOUT            default request timeout, s        (30)
+    ARKADIA_HTTP_CONNECT_TIMEOUT    connect timeout, s                (5)
+    ARKADIA_HTTP_MAX_CONNECTIONS    pool-wide connection cap          (100)
+    ARKADIA_HTTP_MAX_PER_HOST       concurrent requests per host      (20)
+    ARKADIA_HTTP_KEEPALIVE_S        idle keep-alive expiry, s         (30)
+    ARKADIA_HTTP2                   0 disables HTTP/2 (used when h2 is installed)
+
+httpx only caps connections pool-wide, so the per-host cap is enforced by a
+transport wrapper that holds a slot from request start until the response
+body is closed. A request that cannot get a slot within the pool timeout
+raises httpx.PoolTimeout, like an exhausted pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import os
+import threading
+import weakref
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger("arkadia.http_pool")
+
+DEFAULT_TIMEOUT  = float(os.environ.get("ARKADIA_HTTP_TIMEOUT", "30"))
+CONNECT_TIMEOUT  = float(os.environ.get("ARKADIA_HTTP_CONNECT_TIMEOUT", "5"))
+MAX_CONNECTIONS  = int(os.environ.get("ARKADIA_HTTP_MAX_CONNECTIONS", "100"))
+MAX_PER_HOST     = int(os.environ.get("ARKADIA_HTTP_MAX_PER_HOST", "20"))
+KEEPALIVE_EXPIRY = float(os.environ.get("ARKADIA_HTTP_KEEPALIVE_S", "30"))
+HTTP2 = os.environ.get("ARKADIA_HTTP2", "1") != "0" and importlib.util.find_spec("h2") is not None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Utilisation metrics
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _HostStats:
+    __slots__ = ("requests", "in_flight", "peak_in_flight", "connections_opened", "waited")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.connections_opened = 0
+        self.waited = 0          # requests that queued for a per-host slot
+
+
+class _Metrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._hosts: dict[str, _HostStats] = {}
+
+    def _host(self, host: str) -> _HostStats:
+        stats = self._hosts.get(host)
+        if stats is None:
+            stats = self._hosts[host] = _HostStats()
+        return stats
+
+    def started(self, host: str, waited: bool) -> None:
+        with self._lock:
+            s = self._host(host)
+            s.requests += 1
+            s.in_flight += 1
+            s.peak_in_flight = max(s.peak_in_flight, s.in_flight)
+            s.waited += waited
+
+    def finished(self, host: str) -> None:
+        with self._lock:
+            self._host(host).in_flight -= 1
+
+    def connected(self, host: str) -> None:
+        with self._lock:
+            self._host(host).connections_opened += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            hosts = {h: {k: getattr(s, k) for k in _HostStats.__slots__} for h, s in self._hosts.items()}
+        totals = {k: sum(h[k] for h in hosts.values()) for k in ("requests", "in_flight", "connections_opened", "waited")}
+        return {**totals, "hosts": hosts}
+
+
+_metrics = {"sync": _Metrics(), "async": _Metrics()}
+
+
+def _host_key(request: httpx.Request) -> str:
+    url = request.url
+    return f"{url.host}:{url.port}" if url.port else url.host
+
+
+def _pool_timeout(request: httpx.Request) -> Optional[float]:
+    return (request.extensions.get("timeout") or {}).get("pool")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Per-host limiting transports
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _ReleasingStream(httpx.SyncByteStream):
+    def __init__(self, stream, release) -> None:
+        self._stream, self._release = stream, release
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            release, self._release = self._release, None
+            if release:
+                release()
+
+
+class _AsyncReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, stream, release) -> None:
+        self._stream, self._release = stream, release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            release, self._release = self._release, None
+            if release:
+                release()
+
+
+class _HostLimitedTransport(httpx.BaseTransport):
+    def __init__(self, inner: httpx.HTTPTransport, per_host: int) -> None:
+        self._inner = inner
+        self._per_host = per_host
+        self._slots: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+        self._metrics = _metrics["sync"]
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        host = _host_key(request)
+        with self._lock:
+            slot = self._slots.get(host)
+            if slot is None:
+                slot = self._slots[host] = threading.BoundedSemaphore(self._per_host)
+        waited = not slot.acquire(blocking=False)
+        if waited:
+            timeout = _pool_timeout(request)
+            if not slot.acquire(timeout=-1 if timeout is None else timeout):
+                raise httpx.PoolTimeout(f"No free connection slot for {host}", request=request)
+        self._metrics.started(host, waited)
+
+        def release() -> None:
+            self._metrics.finished(host)
+            slot.release()
+
+        def trace(event: str, info: dict) -> None:
+            if event == "connection.connect_tcp.complete":
+                self._metrics.connected(host)
+            if upstream:
+                upstream(event, info)
+
+        upstream = request.extensions.get("trace")
+        request.extensions = {**request.extensions, "trace": trace}
+        try:
+            response = self._inner.handle_request(request)
+        except BaseException:
+            release()
+            raise
+        response.stream = _ReleasingStream(response.stream, release)
+        return response
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+class _AsyncHostLimitedTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncHTTPTransport, per_host: int) -> None:
+        self._inner = inner
+        self._per_host = per_host
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._metrics = _metrics["async"]
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = _host_key(request)
+        slot = self._slots.get(host)
+        if slot is None:
+            slot = self._slots[host] = asyncio.Semaphore(self._per_host)
+        waited = slot.locked()
+        if waited:
+            try:
+                await asyncio.wait_for(slot.acquire(), _pool_timeout(request))
+            except asyncio.TimeoutError:
+                raise httpx.PoolTimeout(f"No free connection slot for {host}", request=request) from None
+        else:
+            await slot.acquire()        # free slot: returns without suspending
+        self._metrics.started(host, waited)
+
+        def release() -> None:
+            self._metrics.finished(host)
+            slot.release()
+
+        async def trace(event: str, info: dict) -> None:
+            if event == "connection.connect_tcp.complete":
+                self._metrics.connected(host)
+            if upstream:
+                await upstream(event, info)
+
+        upstream = request.extensions.get("trace")
+        request.extensions = {**request.extensions, "trace": trace}
+        try:
+            response = await self._inner.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+        response.stream = _AsyncReleasingStream(response.stream, release)
+        return response
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Pooled clients
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _client_options() -> dict:
+    return {
+        "timeout": httpx.Timeout(DEFAULT_TIMEOUT, connect=CONNECT_TIMEOUT),
+        "http2": HTTP2,
+        "limits": httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+    }
+
+
+_sync: Optional[httpx.Client] = None
+_async: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def sync_client() -> httpx.Client:
+    """The process-wide pooled client for blocking code (worker threads, CLIs)."""
+    global _sync
+    client = _sync
+    if client is None or client.is_closed:
+        with _lock:
+            client = _sync
+            if client is None or client.is_closed:
+                opts = _client_options()
+                inner = httpx.HTTPTransport(http2=opts.pop("http2"), limits=opts.pop("limits"))
+                client = _sync = httpx.Client(transport=_HostLimitedTransport(inner, MAX_PER_HOST), **opts)
+    return client
+
+
+def async_client() -> httpx.AsyncClient:
+    """The pooled client for the running event loop (connections are loop-bound)."""
+    loop = asyncio.get_running_loop()
+    client = _async.get(loop)
+    if client is None or client.is_closed:
+        opts = _client_options()
+        inner = httpx.AsyncHTTPTransport(http2=opts.pop("http2"), limits=opts.pop("limits"))
+        client = httpx.AsyncClient(transport=_AsyncHostLimitedTransport(inner, MAX_PER_HOST), **opts)
+        _async[loop] = client
+    return client
+
+
+def stats() -> dict:
+    """Pool utilisation: totals and per-host counters for the sync and async pools."""
+    return {
+        "sync": _metrics["sync"].snapshot(),
+        "async": _metrics["async"].snapshot(),
+        "limits": {
+            "max_connections": MAX_CONNECTIONS,
+            "max_per_host": MAX_PER_HOST,
+            "keepalive_expiry_s": KEEPALIVE_EXPIRY,
+            "timeout_s": DEFAULT_TIMEOUT,
+            "connect_timeout_s": CONNECT_TIMEOUT,
+        },
+        "http2": HTTP2,
+    }
+
+
+def close() -> None:
+    """Close the sync pool. The next sync_client() call opens a fresh one."""
+    global _sync
+    with _lock:
+        client, _sync = _sync, None
+    if client is not None:
+        client.close()
+
+
+async def aclose() -> None:
+    """Close the running loop's async pool and the sync pool (lifespan shutdown)."""
+    client = _async.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+    close()
+
+
+__all__ = ["async_client", "sync_client", "stats", "close", "aclose"]
@@ -11,8 +11,7 @@ import time
 import json
 from typing import AsyncIterator, Optional
 
-import httpx
-
+from providers import http_pool
 from providers.base import BaseProvider, ProviderMessage, ProviderResponse
 
 OLLAMA_BASE = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434")
@@ -27,7 +26,7 @@ class LocalLLMProvider(BaseProvider):
 
     def _ollama_running(self) -> bool:
         try:
-            r = httpx.get(f"{OLLAMA_BASE}/api/tags", timeout=2.0)
+            r = http_pool.sync_client().get(f"{OLLAMA_BASE}/api/tags", timeout=2.0)
             return r.status_code == 200
         except Exception:
             return False
@@ -59,7 +58,7 @@ class LocalLLMProvider(BaseProvider):
             payload["messages"].append({"role": msg.role, "content": msg.content})
 
         t0 = time.time()
-        r = httpx.post(f"{OLLAMA_BASE}/api/chat", json=payload, timeout=120.0)
+        r = http_pool.sync_client().post(f"{OLLAMA_BASE}/api/chat", json=payload, timeout=120.0)
         r.raise_for_status()
         latency_ms = int((time.time() - t0) * 1000)
 
@@ -92,21 +91,21 @@ class LocalLLMProvider(BaseProvider):
         for msg in messages:
             payload["messages"].append({"role": msg.role, "content": msg.content})
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            async with client.stream("POST", f"{OLLAMA_BASE}/api/chat", json=payload) as response:
-                async for line in response.aiter_lines():
-                    if line:
-                        try:
-                            chunk = json.loads(line)
-                            text = chunk.get("message", {}).get("content", "")
-                            if text:
-                                yield text
-                        except json.JSONDecodeError:
-                            continue
+        client = http_pool.async_client()
+        async with client.stream("POST", f"{OLLAMA_BASE}/api/chat", json=payload, timeout=120.0) as response:
+            async for line in response.aiter_lines():
+                if line:
+                    try:
+                        chunk = json.loads(line)
+                        text = chunk.get("message", {}).get("content", "")
+                        if text:
+                            yield text
+                    except json.JSONDecodeError:
+                        continue
 
     def models(self) -> list[str]:
         try:
-            r = httpx.get(f"{OLLAMA_BASE}/api/tags", timeout=3.0)
+            r = http_pool.sync_client().get(f"{OLLAMA_BASE}/api/tags", timeout=3.0)
             data = r.json()
             return [m["name"] for m in data.get("models", [])]
         except Exception:
@@ -5,9 +5,32 @@ Selects and dispatches to the correct provider adapter.
 Business logic NEVER leaks into provider adapters.
 The rest of Arkadia never depends on provider-specific behaviour.
 Adding a new provider = implement BaseProvider + register here. That's all.
+
+Selection never touches the network. Each provider carries in-memory state:
+    auth     — authenticate() result, re-checked in the background once older
+               than AUTH_TTL_S (LocalLLMProvider probes Ollama over HTTP)
+    circuit  — closed → open after BREAKER_FAILURES consecutive send/health
+               failures; after BREAKER_COOLDOWN_S one trial call is let
+               through (half_open), and its outcome closes or re-opens it
+    health   — last health() result, reused for HEALTH_TTL_S
+
+health_all() probes every provider concurrently and answers within
+HEALTH_DEADLINE_S; a probe still running at the deadline reports an error and
+keeps going, filling the cache when it finishes.
+
+Configuration (environment):
+    ARKADIA_PROVIDER_AUTH_TTL           s     (60)
+    ARKADIA_PROVIDER_HEALTH_TTL         s     (60)
+    ARKADIA_PROVIDER_HEALTH_DEADLINE    s     (10)
+    ARKADIA_PROVIDER_BREAKER_FAILURES         (3)
+    ARKADIA_PROVIDER_BREAKER_COOLDOWN   s     (30)
 """
 
+import logging
 import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from typing import Optional
 
 from providers.base import BaseProvider, ProviderMessage, ProviderResponse
@@ -17,6 +40,14 @@ from providers.gpt import GPTProvider
 from providers.deepseek import DeepSeekProvider
 from providers.local import LocalLLMProvider
 
+logger = logging.getLogger("arkadia.providers")
+
+AUTH_TTL_S         = float(os.environ.get("ARKADIA_PROVIDER_AUTH_TTL", "60"))
+HEALTH_TTL_S       = float(os.environ.get("ARKADIA_PROVIDER_HEALTH_TTL", "60"))
+HEALTH_DEADLINE_S  = float(os.environ.get("ARKADIA_PROVIDER_HEALTH_DEADLINE", "10"))
+BREAKER_FAILURES   = int(os.environ.get("ARKADIA_PROVIDER_BREAKER_FAILURES", "3"))
+BREAKER_COOLDOWN_S = float(os.environ.get("ARKADIA_PROVIDER_BREAKER_COOLDOWN", "30"))
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Provider registry — ordered by priority (lower = higher priority)
@@ -36,6 +67,10 @@ def _init_registry() -> None:
     _REGISTRY["deepseek"] = DeepSeekProvider(model=os.environ.get("DEEPSEEK_MODEL", "deepseek-chat"))
     _REGISTRY["local"]    = LocalLLMProvider(model=os.environ.get("LOCAL_LLM_MODEL", "llama3"))
     _INITIALISED = True
+    # Warm the auth cache in parallel so the first selection does not pay for
+    # each probe in turn.
+    futures = [_submit_auth(name) for name in _REGISTRY]
+    wait([f for f in futures if f], timeout=HEALTH_DEADLINE_S)
 
 
 def get_provider(name: str) -> Optional[BaseProvider]:
@@ -50,12 +85,132 @@ def list_providers() -> list[dict]:
             "name": name,
             "display_name": provider.display_name,
             "capabilities": provider.capabilities(),
-            "authenticated": provider.authenticate(),
+            "authenticated": _authenticated(name),
+            "circuit": _state(name).circuit,
         }
         for name, provider in _REGISTRY.items()
     ]
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Cached auth / health and circuit breaker
+# ─────────────────────────────────────────────────────────────────────────────
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class _ProviderState:
+    __slots__ = (
+        "authenticated", "auth_checked_at", "auth_future",
+        "circuit", "failures", "opened_at", "trial_started_at",
+        "health", "health_checked_at", "health_future",
+    )
+
+    def __init__(self) -> None:
+        self.authenticated = False
+        self.auth_checked_at: Optional[float] = None
+        self.auth_future: Optional[Future] = None
+        self.circuit = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_started_at: Optional[float] = None
+        self.health: Optional[dict] = None
+        self.health_checked_at = 0.0
+        self.health_future: Optional[Future] = None
+
+
+_STATE: dict[str, _ProviderState] = {}
+_STATE_LOCK = threading.Lock()
+_PROBES = ThreadPoolExecutor(max_workers=8, thread_name_prefix="provider-probe")
+
+
+def _state(name: str) -> _ProviderState:
+    st = _STATE.get(name)
+    if st is None:
+        with _STATE_LOCK:
+            st = _STATE.setdefault(name, _ProviderState())
+    return st
+
+
+def _check_auth(name: str) -> bool:
+    try:
+        ok = bool(_REGISTRY[name].authenticate())
+    except Exception as e:
+        logger.warning(f"[PROVIDERS] {name} authenticate() failed: {e}")
+        ok = False
+    st = _state(name)
+    with _STATE_LOCK:
+        st.authenticated, st.auth_checked_at = ok, time.monotonic()
+    return ok
+
+
+def _submit_auth(name: str) -> Optional[Future]:
+    """Start a background auth check unless one is already running."""
+    st = _state(name)
+    with _STATE_LOCK:
+        if st.auth_future is not None and not st.auth_future.done():
+            return st.auth_future
+        st.auth_future = _PROBES.submit(_check_auth, name)
+        return st.auth_future
+
+
+def _authenticated(name: str) -> bool:
+    """Cached authenticate(). Stale entries answer as-is and re-check in the background."""
+    st = _state(name)
+    if st.auth_checked_at is None:
+        if st.auth_future is not None:      # warm-up probe still running
+            return False
+        return _check_auth(name)            # registered after warm-up: check once inline
+    if time.monotonic() - st.auth_checked_at > AUTH_TTL_S:
+        _submit_auth(name)
+    return st.authenticated
+
+
+def _circuit_allows(name: str) -> bool:
+    """True when the circuit lets a call through; claims the half-open trial."""
+    st = _state(name)
+    now = time.monotonic()
+    with _STATE_LOCK:
+        if st.circuit == OPEN:
+            if now - st.opened_at < BREAKER_COOLDOWN_S:
+                return False
+            st.circuit, st.trial_started_at = HALF_OPEN, None
+        if st.circuit == HALF_OPEN:
+            # One trial at a time; a trial whose outcome never came back
+            # (caller abandoned it) is given up after another cooldown.
+            if st.trial_started_at is not None and now - st.trial_started_at < BREAKER_COOLDOWN_S:
+                return False
+            st.trial_started_at = now
+        return True
+
+
+def record_success(name: str) -> None:
+    st = _state(name)
+    with _STATE_LOCK:
+        if st.circuit != CLOSED:
+            logger.info(f"[PROVIDERS] {name} circuit closed")
+        st.circuit, st.failures, st.trial_started_at = CLOSED, 0, None
+
+
+def record_failure(name: str) -> None:
+    st = _state(name)
+    with _STATE_LOCK:
+        st.failures += 1
+        if st.circuit == HALF_OPEN or st.failures >= BREAKER_FAILURES:
+            if st.circuit != OPEN:
+                logger.warning(f"[PROVIDERS] {name} circuit open after {st.failures} failure(s)")
+            st.circuit, st.opened_at, st.trial_started_at = OPEN, time.monotonic(), None
+
+
+def _usable(name: str, required_capabilities: list[str]) -> bool:
+    provider = _REGISTRY[name]
+    return (
+        _authenticated(name)
+        and all(c in provider.capabilities() for c in required_capabilities)
+        and _circuit_allows(name)
+    )
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Auto-selection
 # ─────────────────────────────────────────────────────────────────────────────
@@ -72,23 +227,17 @@ def select_provider(
     Select the best available provider:
     1. If preferred is specified and can satisfy required_capabilities, use it.
     2. Otherwise walk _PRIORITY_ORDER, return first authenticated match.
+    Providers whose circuit is open are skipped. Reads cached state only.
     """
     _init_registry()
     required_capabilities = required_capabilities or ["chat"]
 
-    if preferred and preferred in _REGISTRY:
-        p = _REGISTRY[preferred]
-        if p.authenticate() and all(c in p.capabilities() for c in required_capabilities):
-            return p
+    if preferred and preferred in _REGISTRY and _usable(preferred, required_capabilities):
+        return _REGISTRY[preferred]
 
     for name in _PRIORITY_ORDER:
-        if name not in _REGISTRY:
-            continue
-        provider = _REGISTRY[name]
-        if not provider.authenticate():
-            continue
-        if all(c in provider.capabilities() for c in required_capabilities):
-            return provider
+        if name in _REGISTRY and name != preferred and _usable(name, required_capabilities):
+            return _REGISTRY[name]
 
     return None
 
@@ -117,11 +266,17 @@ def send(
         raise RuntimeError(
             "No authenticated AI provider available. "
             "Set at least one of: GEMINI_API_KEY, ANTHROPIC_API_KEY, OPENAI_API_KEY, DEEPSEEK_API_KEY, "
-            "or start Ollama locally."
+            "or start Ollama locally. Providers with an open circuit are skipped until their cooldown ends."
         )
 
     canonical_msgs = [ProviderMessage(m["role"], m["content"]) for m in messages]
-    return provider.send(canonical_msgs, system_prompt=system_prompt, temperature=temperature, max_tokens=max_tokens)
+    try:
+        response = provider.send(canonical_msgs, system_prompt=system_prompt, temperature=temperature, max_tokens=max_tokens)
+    except Exception:
+        record_failure(provider.name)
+        raise
+    record_success(provider.name)
+    return response
 
 
 def _resolve_persona_prompt(persona_name: str) -> Optional[str]:
@@ -137,14 +292,52 @@ def _resolve_persona_prompt(persona_name: str) -> Optional[str]:
 # Health check (all registered providers)
 # ─────────────────────────────────────────────────────────────────────────────
 
-def health_all() -> list[dict]:
+def _check_health(name: str) -> dict:
+    try:
+        h = _REGISTRY[name].health()
+    except Exception as e:
+        h = {"status": "error", "model": "unknown", "latency_ms": 0, "reason": str(e)}
+    if h.get("status") == "ok":
+        record_success(name)
+    elif h.get("status") == "error":
+        record_failure(name)
+    st = _state(name)
+    with _STATE_LOCK:
+        st.health, st.health_checked_at = h, time.monotonic()
+    return h
+
+
+def health_all(max_age: float = HEALTH_TTL_S, deadline: float = HEALTH_DEADLINE_S) -> list[dict]:
+    """
+    Health of every registered provider. Results younger than max_age come
+    from the cache; the rest are probed concurrently, and any probe still
+    running after *deadline* seconds is reported as an error.
+    """
     _init_registry()
+    now = time.monotonic()
+    pending: dict[str, Future] = {}
+    for name in _REGISTRY:
+        st = _state(name)
+        if st.health is not None and now - st.health_checked_at <= max_age:
+            continue
+        with _STATE_LOCK:
+            if st.health_future is None or st.health_future.done():
+                st.health_future = _PROBES.submit(_check_health, name)
+            pending[name] = st.health_future
+    if pending:
+        wait(pending.values(), timeout=deadline)
+
     results = []
-    for name, provider in _REGISTRY.items():
-        try:
-            h = provider.health()
-        except Exception as e:
-            h = {"status": "error", "model": "unknown", "latency_ms": 0, "reason": str(e)}
+    for name in _REGISTRY:
+        future = pending.get(name)
+        if future is None:
+            h = dict(_state(name).health)
+        elif future.done():
+            h = dict(future.result())
+        else:
+            h = {"status": "error", "model": getattr(_REGISTRY[name], "model", "unknown"),
+                 "latency_ms": int(deadline * 1000), "reason": f"health check exceeded {deadline:g}s"}
         h["provider"] = name
+        h["circuit"] = _state(name).circuit
         results.append(h)
     return results
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Arkadia Knowledge OS — chunk embedding throughput benchmark
+===========================================================
+Embeds N synthetic chunks through embed_texts() serially and with the default
+number of concurrent batch requests, and reports chunks per second for each.
+
+Runs offline by default: the fake embedder with a simulated per-batch round
+trip (ARKADIA_FAKE_EMBED_LATENCY_MS, default 50 ms here), so concurrency shows
+up without a network. --real uses the configured backend and spends API quota.
+
+Usage:
+  python scripts/bench_embeddings.py [--chunks 2000] [--latency-ms 50] [--real]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    ap.add_argument("--chunks", type=int, default=2000)
+    ap.add_argument("--latency-ms", type=float, default=50.0)
+    ap.add_argument("--real", action="store_true", help="use the configured embedder (spends quota)")
+    args = ap.parse_args()
+
+    if not args.real:
+        os.environ["ARKADIA_EMBEDDER"] = "fake"
+        os.environ["ARKADIA_FAKE_EMBED_LATENCY_MS"] = str(args.latency_ms)
+
+    from knowledge import embeddings
+
+    texts = [f"benchmark chunk {i} about resonance, archives and the eastern attic" for i in range(args.chunks)]
+    for concurrency in (1, embeddings._MAX_CONCURRENCY):
+        started = time.perf_counter()
+        vectors = embeddings.embed_texts(texts, max_concurrency=concurrency)
+        elapsed = time.perf_counter() - started
+        ok = sum(1 for v in vectors if v)
+        print(f"{embeddings._embedder()} concurrency={concurrency}: {ok}/{args.chunks} chunks in {elapsed:.2f}s "
+              f"({ok / elapsed if elapsed else 0:.0f} chunks/s)")
+
+
+if __name__ == "__main__":
+    main()
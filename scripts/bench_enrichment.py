@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Arkadia Knowledge OS — enrichment scaling benchmark
+===================================================
+Per-note enrich_note() latency at growing corpus sizes. Each size gets a fresh
+throwaway database seeded with a static-corpus-like mix: documents, scrolls
+and numbered chapters sharing a Zipf-distributed tag vocabulary (plus the
+corpus-wide "static-corpus" tag), projects and source providers.
+
+The enrichment scorers should do bounded work per note, so p50 / p95 should
+stay roughly flat as the corpus grows. Edge writes are included; the one-off
+title-key backfill after seeding is reported separately.
+
+Usage:
+  python scripts/bench_enrichment.py [sizes...]      (default: 1000 10000 100000)
+"""
+
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLES = 200
+WORDS = ("spiral codex resonance sovereign harmonic lattice covenant threshold "
+         "luminous archive meridian oracle cascade vessel emergence").split()
+
+
+def populate(n_notes: int) -> None:
+    from knowledge.db import get_connection
+
+    rng = random.Random(5)
+    conn = get_connection()
+    tag_names = ["static-corpus"] + [f"tag{i}" for i in range(300)]
+    with conn:
+        conn.executemany("INSERT INTO tags (id, name) VALUES (?, ?)", list(enumerate(tag_names, 1)))
+        conn.executemany("INSERT INTO projects (id, uuid, name) VALUES (?, ?, ?)",
+                         [(i, f"p{i}", f"Project {i}") for i in range(1, 51)])
+        notes, note_tags = [], []
+        for i in range(1, n_notes + 1):
+            kind = rng.choice(("document", "scroll", "chapter", "note"))
+            title = (f"Chapter {rng.randint(1, 400)} " if kind == "chapter" else "") + \
+                " ".join(rng.sample(WORDS, 3)).title()
+            tags = {1} | {min(int(rng.paretovariate(1.2)), 300) + 1 for _ in range(3)}
+            notes.append((i, f"u{i}", title, kind, json.dumps([tag_names[t - 1] for t in tags]),
+                          rng.randint(1, 50) if rng.random() < 0.3 else None,
+                          rng.choice(("gemini", "claude", "static:docs", None))))
+            note_tags.extend((i, t) for t in tags)
+        conn.executemany(
+            "INSERT INTO notes (id, uuid, title, vault_path, note_type, tags, project_id, source_provider) "
+            "VALUES (?, ?, ?, '', ?, ?, ?, ?)",
+            notes,
+        )
+        conn.executemany("INSERT INTO note_tags (note_id, tag_id) VALUES (?, ?)", note_tags)
+
+
+def run_one(n_notes: int) -> dict:
+    from knowledge import enrichment, title_keys
+
+    populate(n_notes)
+    t0 = time.perf_counter()
+    title_keys.sync()
+    backfill_ms = (time.perf_counter() - t0) * 1000
+
+    rng = random.Random(9)
+    samples = []
+    for note_id in rng.sample(range(1, n_notes + 1), min(SAMPLES, n_notes)):
+        t0 = time.perf_counter()
+        enrichment.enrich_note(note_id)
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return {
+        "notes": n_notes,
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3),
+        "backfill_ms": round(backfill_ms, 1),
+    }
+
+
+def main() -> None:
+    if len(sys.argv) > 2 and sys.argv[1] == "--one":
+        # Child process: fresh module state and database per size
+        sys.path.insert(0, ROOT)
+        print(json.dumps(run_one(int(sys.argv[2]))))
+        return
+    sizes = [int(a) for a in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    for n in sizes:
+        tmp = tempfile.mkdtemp(prefix="arkadia_enrich_bench_")
+        env = {**os.environ, "ARKADIA_DB_PATH": os.path.join(tmp, "bench.db")}
+        out = subprocess.run([sys.executable, __file__, "--one", str(n)], env=env, cwd=tmp,
+                             capture_output=True, text=True, check=True)
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        print(f"{r['notes']:>7} notes: enrich_note p50 {r['p50_ms']:.2f} ms  p95 {r['p95_ms']:.2f} ms"
+              f"  (title-key backfill {r['backfill_ms']:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Arkadia Knowledge OS — graph traversal benchmark
+================================================
+Synthetic graph (default 50k notes, 500k edges) in a throwaway database.
+Compares the in-process adjacency index (knowledge/graph_index.py) with the
+previous implementation (accessible_note_ids() on every call, SQL per BFS
+level in traverse, SQL per popped node in find_path).
+
+Usage:
+  python scripts/bench_graph_index.py [notes] [edges]
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import deque
+
+_TMP = tempfile.mkdtemp(prefix="arkadia_graph_bench_")
+os.environ["ARKADIA_DB_PATH"] = os.path.join(_TMP, "bench.db")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from knowledge.db import execute, get_connection  # noqa: E402
+from knowledge.graph import accessible_note_ids, find_path, traverse  # noqa: E402
+from knowledge.graph_index import get_graph_index  # noqa: E402
+
+RELS = ["references", "extends", "derived_from", "belongs_to"]
+
+
+def populate(n_notes: int, n_edges: int) -> None:
+    rng = random.Random(7)
+    conn = get_connection()
+    with conn:
+        conn.executemany(
+            "INSERT INTO notes (id, uuid, title, vault_path, user_id) VALUES (?, ?, ?, '', ?)",
+            [(i, f"u{i}", f"note {i}", "bench-user" if i % 10 == 0 else None)
+             for i in range(1, n_notes + 1)],
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO graph_edges (source_note_id, target_note_id, relationship) "
+            "VALUES (?, ?, ?)",
+            ((rng.randint(1, n_notes), rng.randint(1, n_notes), rng.choice(RELS))
+             for _ in range(n_edges)),
+        )
+
+
+def legacy_traverse(start_id: int, max_depth: int) -> int:
+    allowed = accessible_note_ids(None)
+    visited, frontier = {start_id}, [start_id]
+    for _ in range(max_depth):
+        if not frontier:
+            break
+        phs = ",".join("?" * len(frontier))
+        edges = execute(
+            f"SELECT * FROM graph_edges WHERE source_note_id IN ({phs}) OR target_note_id IN ({phs})",
+            tuple(frontier + frontier),
+        )
+        nxt = []
+        for e in edges:
+            for nid in (e["source_note_id"], e["target_note_id"]):
+                if nid not in visited and nid in allowed:
+                    visited.add(nid)
+                    nxt.append(nid)
+        frontier = nxt
+    phs = ",".join("?" * len(visited))
+    return len(execute(f"SELECT id, uuid, title FROM notes WHERE id IN ({phs})", tuple(visited)))
+
+
+def legacy_find_path(start_id: int, end_id: int, max_depth: int) -> list[int]:
+    allowed = accessible_note_ids(None)
+    queue, visited = deque([[start_id]]), {start_id}
+    while queue:
+        path = queue.popleft()
+        if len(path) > max_depth + 1:
+            break
+        rows = execute(
+            "SELECT target_note_id AS neighbor FROM graph_edges WHERE source_note_id = ? "
+            "UNION SELECT source_note_id AS neighbor FROM graph_edges WHERE target_note_id = ?",
+            (path[-1], path[-1]),
+        )
+        for r in rows:
+            nb = r["neighbor"]
+            if nb not in allowed:
+                continue
+            if nb == end_id:
+                return path + [nb]
+            if nb not in visited:
+                visited.add(nb)
+                queue.append(path + [nb])
+    return []
+
+
+def timed(fn, runs) -> tuple[float, float]:
+    samples = []
+    for args in runs:
+        t0 = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def main() -> None:
+    n_notes = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    n_edges = int(sys.argv[2]) if len(sys.argv) > 2 else 500_000
+    t0 = time.perf_counter()
+    populate(n_notes, n_edges)
+    print(f"populated {n_notes} notes / {n_edges} edges in {time.perf_counter() - t0:.1f}s")
+
+    t0 = time.perf_counter()
+    get_graph_index()
+    print(f"index cold build: {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+    rng = random.Random(11)
+    starts = [(rng.randint(1, n_notes),) for _ in range(20)]
+    pairs = [(rng.randint(1, n_notes), rng.randint(1, n_notes)) for _ in range(20)]
+
+    for depth in (1, 2):
+        new = timed(lambda s: traverse(s, max_depth=depth), starts)
+        old = timed(lambda s: legacy_traverse(s, depth), starts)
+        print(f"traverse depth={depth}: index p50 {new[0]:.1f} ms (max {new[1]:.1f}) | "
+              f"legacy p50 {old[0]:.1f} ms (max {old[1]:.1f})")
+    new = timed(lambda a, b: find_path(a, b, max_depth=3), pairs)
+    old = timed(lambda a, b: legacy_find_path(a, b, 3), pairs[:5])
+    print(f"find_path depth=3: index p50 {new[0]:.1f} ms (max {new[1]:.1f}) | "
+          f"legacy p50 {old[0]:.1f} ms (max {old[1]:.1f}, 5 pairs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Arkadia Knowledge OS — hot-path benchmark suite
+===============================================
+Offline, reproducible latency benchmarks for the Knowledge OS entry points:
+
+    ingest            knowledge.pipeline.ingest (chunk + fake-embed + timeline)
+    semantic_search   knowledge.search.semantic_search
+    fulltext_search   knowledge.search.fulltext_search
+    graph_traverse    knowledge.graph.traverse (depth 2)
+    assemble_context  knowledge.context_engine.assemble_context
+    graph_health      knowledge.graph_health.evaluate_graph_health
+
+A seeded synthetic corpus (topic-clustered vocabulary, chunks, embeddings,
+graph edges) is bulk-loaded into a throwaway database, so a given --scale and
+--seed always produce the same corpus. Embeddings come from the deterministic
+offline embedder (ARKADIA_EMBEDDER=fake) — no network, no API keys.
+
+Each scenario reports p50 / p95 / mean / max latency (ms), throughput (calls/s)
+and the process peak RSS (MB) after the scenario. Results are JSON. With
+--baseline the run is compared against a stored result: any scenario whose
+p50 or p95 grew by more than --threshold (and by more than --floor-ms) is a
+regression, and the exit status is 1.
+
+Usage:
+  python scripts/bench_knowledge.py --scale 1k
+  python scripts/bench_knowledge.py --scale 10k --save-baseline bench/10k.json
+  python scripts/bench_knowledge.py --scale 10k --baseline bench/10k.json --out run.json
+  python scripts/bench_knowledge.py --scale 500 --only semantic_search,graph_traverse
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCALES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+SCENARIOS = (
+    "ingest", "semantic_search", "fulltext_search",
+    "graph_traverse", "assemble_context", "graph_health",
+)
+RELS = ["references", "extends", "derived_from", "belongs_to", "supports"]
+COMMON = ("the and for with from into over under about between across while "
+          "system field pattern signal memory thread project people").split()
+SYLLABLES = ("ka ri so le mon ta vel ar ki na dor sil ven ul ra the om is "
+             "lu pen gar fi zo cal mer tor wyn ash").split()
+
+# Latency percentiles are noisy below this many ms; smaller deltas never count as regressions
+DEFAULT_FLOOR_MS = 0.5
+DEFAULT_THRESHOLD = 0.25
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Synthetic corpus
+# ─────────────────────────────────────────────────────────────────────────────
+
+class Corpus:
+    """Deterministic topic-clustered text generator."""
+
+    def __init__(self, seed: int, topics: int = 64, words_per_topic: int = 48):
+        self.rng = random.Random(seed)
+        seen: set[str] = set()
+        self.topics: list[list[str]] = []
+        for _ in range(topics):
+            words = []
+            while len(words) < words_per_topic:
+                w = "".join(self.rng.choice(SYLLABLES) for _ in range(self.rng.randint(2, 4)))
+                if w not in seen:
+                    seen.add(w)
+                    words.append(w)
+            self.topics.append(words)
+
+    def note(self, i: int) -> tuple[str, str, int]:
+        """Return (title, content, topic) for note *i*."""
+        rng = self.rng
+        topic = i % len(self.topics)
+        vocab = self.topics[topic]
+        title = f"{' '.join(rng.sample(vocab, 3)).title()} {i}"
+        words = [rng.choice(vocab) if rng.random() < 0.7 else rng.choice(COMMON)
+                 for _ in range(rng.randint(80, 320))]
+        sentences = [" ".join(words[j:j + 12]).capitalize() + "." for j in range(0, len(words), 12)]
+        return title, " ".join(sentences), topic
+
+    def query(self) -> str:
+        return " ".join(self.rng.sample(self.rng.choice(self.topics), 3))
+
+
+def seed_corpus(corpus: Corpus, n_notes: int, batch: int = 500) -> dict:
+    """Bulk-load notes, chunks, BM25 postings, fake embeddings and graph edges."""
+    from knowledge.db import get_connection
+    from knowledge.embeddings import FAKE_MODEL, _fake_embed, store_chunk_embeddings
+    from knowledge.pipeline import chunk_text
+    from knowledge.term_stats import index_chunks
+
+    conn = get_connection()
+    n_chunks = 0
+    for start in range(0, n_notes, batch):
+        notes = [corpus.note(i) for i in range(start, min(start + batch, n_notes))]
+        chunk_rows: list[tuple[int, int, str]] = []
+        with conn:
+            for title, content, topic in notes:
+                cur = conn.execute(
+                    "INSERT INTO notes (uuid, title, content, vault_path, note_type, tags, "
+                    "embedding_status, checksum) VALUES (?, ?, ?, ?, 'note', ?, 'complete', ?)",
+                    (str(uuid.uuid4()), title, content, f"Ideas/{title}.md",
+                     json.dumps([f"topic-{topic}"]), hashlib.sha256(content.encode()).hexdigest()),
+                )
+                note_id = cur.lastrowid
+                for pos, text in enumerate(chunk_text(content)):
+                    c = conn.execute(
+                        "INSERT INTO chunks (note_id, content, position, token_count) VALUES (?, ?, ?, ?)",
+                        (note_id, text, pos, len(text.split())),
+                    )
+                    chunk_rows.append((c.lastrowid, note_id, text))
+        index_chunks(chunk_rows)
+        store_chunk_embeddings([(cid, _fake_embed(text)) for cid, _, text in chunk_rows], model=FAKE_MODEL)
+        n_chunks += len(chunk_rows)
+        print(f"  seeded {min(start + batch, n_notes)}/{n_notes} notes", file=sys.stderr)
+
+    # ~3 edges per note; 70% stay inside the topic cluster
+    rng = corpus.rng
+    n_topics = len(corpus.topics)
+    ids = [r[0] for r in conn.execute("SELECT id FROM notes ORDER BY id")]
+    edges = []
+    for idx, nid in enumerate(ids):
+        for _ in range(3):
+            if rng.random() < 0.7:
+                j = rng.randrange(idx % n_topics, len(ids), n_topics)
+            else:
+                j = rng.randrange(len(ids))
+            if ids[j] != nid:
+                edges.append((nid, ids[j], rng.choice(RELS), round(rng.uniform(0.3, 1.0), 3)))
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO graph_edges (source_note_id, target_note_id, relationship, weight) "
+            "VALUES (?, ?, ?, ?)",
+            edges,
+        )
+    n_edges = conn.execute("SELECT COUNT(*) FROM graph_edges").fetchone()[0]
+    return {"notes": n_notes, "chunks": n_chunks, "edges": n_edges}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Measurement
+# ─────────────────────────────────────────────────────────────────────────────
+
+def peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def measure(fn, args_list: list[tuple], warmup: int = 1) -> dict:
+    """Time fn(*args) for every args tuple. The first *warmup* calls are reported separately."""
+    warm = []
+    for args in args_list[:warmup]:
+        t0 = time.perf_counter()
+        fn(*args)
+        warm.append((time.perf_counter() - t0) * 1000)
+    samples = []
+    for args in args_list[warmup:]:
+        t0 = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - t0) * 1000)
+    total_s = sum(samples) / 1000
+    return {
+        "n": len(samples),
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "max_ms": round(max(samples), 3),
+        "warmup_ms": round(warm[0], 3) if warm else None,
+        "throughput_per_s": round(len(samples) / total_s, 2) if total_s else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_scenarios(corpus: Corpus, n_notes: int, iterations: int, n_ingest: int, only: set[str]) -> dict:
+    from knowledge.context_engine import assemble_context
+    from knowledge.graph import traverse
+    from knowledge.graph_health import evaluate_graph_health
+    from knowledge.pipeline import ingest
+    from knowledge.search import fulltext_search, semantic_search
+
+    rng = corpus.rng
+    queries = [(corpus.query(),) for _ in range(iterations + 1)]
+    starts = [(rng.randint(1, n_notes),) for _ in range(iterations + 1)]
+    plan = {
+        "semantic_search":  (lambda q: semantic_search(q, top_k=10), queries),
+        "fulltext_search":  (lambda q: fulltext_search(q, limit=20), queries),
+        "graph_traverse":   (lambda s: traverse(s, max_depth=2), starts),
+        "assemble_context": (lambda q: assemble_context(q), queries),
+        "graph_health":     (evaluate_graph_health, [()] * (min(iterations, 10) + 1)),
+    }
+    results: dict[str, dict] = {}
+    for name in SCENARIOS:
+        if name not in only:
+            continue
+        print(f"  running {name}", file=sys.stderr)
+        if name == "ingest":
+            # Runs last-in-corpus indices so ingested notes never duplicate seeded ones
+            docs = [corpus.note(n_notes + i)[:2] for i in range(n_ingest + 1)]
+            results[name] = measure(lambda t, c: ingest(t, c, auto_link=False), docs)
+        else:
+            fn, args = plan[name]
+            results[name] = measure(fn, args)
+    return results
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Baseline comparison
+# ─────────────────────────────────────────────────────────────────────────────
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD,
+            floor_ms: float = DEFAULT_FLOOR_MS) -> list[dict]:
+    """Return one entry per scenario metric that regressed against *baseline*."""
+    regressions = []
+    base_scenarios = baseline.get("scenarios", {})
+    for name, cur in current.get("scenarios", {}).items():
+        base = base_scenarios.get(name)
+        if not base:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            old, new = base.get(metric), cur.get(metric)
+            if old is None or new is None:
+                continue
+            if new - old > floor_ms and new > old * (1 + threshold):
+                regressions.append({
+                    "scenario": name, "metric": metric, "baseline": old, "current": new,
+                    "change_pct": round((new / old - 1) * 100, 1) if old else None,
+                })
+    return regressions
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _parse_scale(value: str) -> int:
+    if value.lower() in SCALES:
+        return SCALES[value.lower()]
+    return int(value)
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--scale", default="1k", help="1k | 10k | 100k | <notes>")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--iterations", type=int, default=50, help="timed calls per query scenario")
+    ap.add_argument("--ingest", type=int, default=100, help="notes ingested through the pipeline")
+    ap.add_argument("--only", default="", help="comma-separated scenario names")
+    ap.add_argument("--out", help="write results JSON here (default: stdout)")
+    ap.add_argument("--baseline", help="compare against this results JSON")
+    ap.add_argument("--save-baseline", help="also write results JSON here as the new baseline")
+    ap.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                    help="relative p50/p95 growth counted as a regression (default 0.25)")
+    ap.add_argument("--floor-ms", type=float, default=DEFAULT_FLOOR_MS)
+    ap.add_argument("--workdir", help="database / vault directory (default: fresh temp dir)")
+    args = ap.parse_args(argv)
+
+    only = {s.strip() for s in args.only.split(",") if s.strip()} or set(SCENARIOS)
+    unknown = only - set(SCENARIOS)
+    if unknown:
+        ap.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+    n_notes = _parse_scale(args.scale)
+    for attr in ("out", "baseline", "save_baseline"):
+        if getattr(args, attr):
+            setattr(args, attr, os.path.abspath(getattr(args, attr)))
+
+    # Everything below must be configured before knowledge.* is imported:
+    # knowledge.db reads ARKADIA_DB_PATH at import, vault writes are cwd-relative.
+    workdir = args.workdir or tempfile.mkdtemp(prefix="arkadia_bench_")
+    os.makedirs(workdir, exist_ok=True)
+    os.environ["ARKADIA_DB_PATH"] = os.path.join(workdir, "bench.db")
+    os.environ["ARKADIA_EMBEDDER"] = "fake"
+    os.environ.pop("ARKADIA_VECTOR_INDEX_PATH", None)
+    sys.path.insert(0, ROOT)
+    os.chdir(workdir)
+
+    corpus = Corpus(args.seed)
+    print(f"seeding {n_notes} notes in {workdir}", file=sys.stderr)
+    t0 = time.perf_counter()
+    sizes = seed_corpus(corpus, n_notes)
+    seed_s = time.perf_counter() - t0
+
+    scenarios = run_scenarios(corpus, n_notes, args.iterations, args.ingest, only)
+    result = {
+        "meta": {
+            "scale": n_notes, "seed": args.seed, "iterations": args.iterations,
+            "ingest": args.ingest, "corpus": sizes, "seed_seconds": round(seed_s, 2),
+            "commit": _git_commit(), "python": platform.python_version(),
+            "platform": platform.platform(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "scenarios": scenarios,
+    }
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("scale") != n_notes:
+            print(f"warning: baseline scale {baseline.get('meta', {}).get('scale')} != {n_notes}",
+                  file=sys.stderr)
+        regressions = compare(result, baseline, args.threshold, args.floor_ms)
+        result["comparison"] = {
+            "baseline": args.baseline,
+            "threshold": args.threshold,
+            "regressions": regressions,
+        }
+        for r in regressions:
+            print(f"REGRESSION {r['scenario']} {r['metric']}: {r['baseline']} → {r['current']} ms "
+                  f"(+{r['change_pct']}%)", file=sys.stderr)
+        status = 1 if regressions else 0
+
+    text = json.dumps(result, indent=2)
+    for path in (args.out, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+    if not args.out:
+        print(text)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Arkadia — rate limiter contention benchmark
+===========================================
+Drives check_rate_limit() from several threads at once with a Zipf-skewed
+client population (a few hot clients, a long tail of one-off IPs) and
+reports throughput, per-check p50 / p99 latency and how many keys the backend
+still tracks afterwards. The target is comfortably above 10k checks/s with
+the key count held at ARKADIA_RL_MAX_KEYS.
+
+Usage:
+  python scripts/bench_rate_limit.py [--backend memory|sqlite] [--threads 1 8 32]
+                                     [--requests 200000] [--clients 500000]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from api import rate_limit  # noqa: E402
+
+
+def make_keys(n: int, clients: int, seed: int) -> list[str]:
+    """Half the traffic from Zipf-hot clients, half spread over the whole population."""
+    rng = random.Random(seed)
+    keys = []
+    for _ in range(n):
+        c = min(int(rng.paretovariate(1.0)), clients) if rng.random() < 0.5 else rng.randint(1, clients)
+        keys.append(f"ip:10.{c >> 16 & 255}.{c >> 8 & 255}.{c & 255}|/api/")
+    return keys
+
+
+def run(backend, threads: int, requests: int, clients: int) -> dict:
+    rate_limit.set_backend(backend)
+    backend.reset()
+    per_thread = requests // threads
+    key_sets = [make_keys(per_thread, clients, seed) for seed in range(threads)]
+    latencies: list[list[float]] = [[] for _ in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(i: int) -> None:
+        check, lat, perf = rate_limit.check_rate_limit, latencies[i], time.perf_counter
+        barrier.wait()
+        for key in key_sets[i]:
+            t0 = perf()
+            check(key, 120, 60)
+            lat.append(perf() - t0)
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    t0 = time.perf_counter()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    merged = sorted(x for lat in latencies for x in lat)
+    return {
+        "backend": backend.name,
+        "threads": threads,
+        "checks": len(merged),
+        "checks_per_s": round(len(merged) / elapsed),
+        "p50_us": round(statistics.median(merged) * 1e6, 2),
+        "p99_us": round(merged[int(len(merged) * 0.99)] * 1e6, 2),
+        "tracked_keys": backend.stats()["tracked_keys"],
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    ap.add_argument("--backend", choices=("memory", "sqlite"), default="memory")
+    ap.add_argument("--threads", type=int, nargs="+", default=[1, 8, 32])
+    ap.add_argument("--requests", type=int, default=200_000)
+    ap.add_argument("--clients", type=int, default=500_000)
+    ap.add_argument("--max-keys", type=int, default=100_000)
+    args = ap.parse_args()
+
+    if args.backend == "sqlite":
+        backend = rate_limit.SQLiteBackend(os.path.join(tempfile.mkdtemp(), "rl.db"), max_keys=args.max_keys)
+    else:
+        backend = rate_limit.MemoryBackend(max_keys=args.max_keys)
+    for threads in args.threads:
+        print(json.dumps(run(backend, threads, args.requests, args.clients)))
+
+
+if __name__ == "__main__":
+    main()
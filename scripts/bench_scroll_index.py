@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Arkadia — corpus RAG index benchmark
+====================================
+Builds a synthetic corpus (default 5,000 scrolls of ~600 words drawn from a
+Zipf-skewed vocabulary) and compares the legacy per-request substring scan in
+_rag_context against api/scroll_index.search(). Reports index build time, an
+unchanged-text refresh, and p50 / p95 lookup latency for both paths.
+
+Usage:
+  python scripts/bench_scroll_index.py [--scrolls 5000] [--words 600] [--queries 300]
+"""
+
+import argparse
+import json
+import random
+import re
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from api import scroll_index  # noqa: E402
+
+
+def make_vocab(n: int, rng: random.Random) -> list[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(3, 10))) for _ in range(n)]
+
+
+def make_corpus(n: int, words: int, vocab: list[str], rng: random.Random) -> dict:
+    weights = [1 / (i + 1) for i in range(len(vocab))]
+    scrolls = {}
+    for i in range(n):
+        content = " ".join(rng.choices(vocab, weights, k=words))
+        scrolls[f"s{i}"] = {"id": f"s{i}", "label": f"Scroll {i}", "description": "",
+                            "preview": content[:200], "content": content, "category": "codex"}
+    return scrolls
+
+
+def legacy(query: str, scrolls: dict, top_n: int = 5) -> list[dict]:
+    """The substring scan _rag_context ran on every request before the index."""
+    words = set(re.findall(r"\w{3,}", query.lower()))
+    scored = []
+    for s in scrolls.values():
+        if not s.get("content") and not s.get("preview"):
+            continue
+        haystack = (s.get("label", "") + " " + s.get("description", "") + " " +
+                    s.get("preview", "") + " " + s.get("content", "")).lower()
+        hits = sum(1 for w in words if w in haystack)
+        if hits:
+            scored.append((hits, s))
+    scored.sort(key=lambda x: -x[0])
+    return [s for _, s in scored[:top_n]]
+
+
+def timed(fn, queries: list[str], scrolls: dict) -> dict:
+    lat = []
+    for q in queries:
+        t0 = time.perf_counter()
+        fn(q, scrolls)
+        lat.append(time.perf_counter() - t0)
+    lat.sort()
+    return {"p50_ms": round(statistics.median(lat) * 1000, 3),
+            "p95_ms": round(lat[int(len(lat) * 0.95)] * 1000, 3)}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    ap.add_argument("--scrolls", type=int, default=5000)
+    ap.add_argument("--words", type=int, default=600)
+    ap.add_argument("--vocab", type=int, default=20000)
+    ap.add_argument("--queries", type=int, default=300)
+    args = ap.parse_args()
+
+    rng = random.Random(7)
+    vocab = make_vocab(args.vocab, rng)
+    scrolls = make_corpus(args.scrolls, args.words, vocab, rng)
+    queries = [" ".join(rng.sample(vocab[:5000], rng.randint(2, 6))) for _ in range(args.queries)]
+
+    t0 = time.perf_counter()
+    scroll_index._rebuild(list(scrolls.values()))
+    build_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    scroll_index._rebuild([dict(s) for s in scrolls.values()])
+    unchanged_s = time.perf_counter() - t0
+
+    print(json.dumps({
+        "scrolls": args.scrolls,
+        **scroll_index.stats(),
+        "build_s": round(build_s, 3),
+        "unchanged_refresh_s": round(unchanged_s, 3),
+        "legacy": timed(legacy, queries[: max(args.queries // 10, 20)], scrolls),
+        "indexed": timed(scroll_index.search, queries, scrolls),
+    }))
+
+
+if __name__ == "__main__":
+    main()
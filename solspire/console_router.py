@@ -25,7 +25,7 @@ Endpoints:
 """
 from __future__ import annotations
 
-import re
+import asyncio
 import time
 from typing import Any
 
@@ -546,36 +546,16 @@ async def project_upload_file(project_id: str, request: Request) -> dict[str, An
     indexed inside the project), and ingests it into the Knowledge OS so the
     project's documents flow through the personal knowledge graph.
     """
-    content_type = request.headers.get("content-type", "")
-    if not content_type.startswith("multipart/form-data"):
-        raise HTTPException(status_code=400, detail="Expected multipart/form-data")
-    body = await request.body()
-    boundary = content_type.split("boundary=")[-1].strip('"')
-
-    file_name = "upload"
-    raw: bytes = b""
-    for part in body.split(("--" + boundary).encode()):
-        if b"Content-Disposition" not in part:
-            continue
-        hdr_end = part.find(b"\r\n\r\n")
-        if hdr_end == -1:
-            continue
-        headers = part[:hdr_end].decode("utf-8", errors="ignore")
-        content = part[hdr_end + 4:]
-        if content.endswith(b"\r\n"):
-            content = content[:-2]
-        if 'filename="' in headers:
-            fm = re.search(r'filename="([^"]+)"', headers)
-            if fm:
-                import urllib.parse
-                file_name = urllib.parse.unquote(fm.group(1))
-            raw = content
-
-    if not raw:
-        raise HTTPException(status_code=400, detail="No file provided")
-
+    from api.upload_stream import parse_upload
     from kernel.doc_extract import extract_text, make_label
-    extracted_text, mime_type = extract_text(file_name, raw)
+
+    async with parse_upload(request) as form:
+        upload = next(iter(form.files.values()), None)
+        if not upload or not upload.size:
+            raise HTTPException(status_code=400, detail="No file provided")
+        file_name = upload.filename
+        extracted_text, mime_type = await asyncio.to_thread(extract_text, file_name, upload.source)
+
     if not extracted_text.strip():
         raise HTTPException(status_code=400, detail="Could not extract any text from the uploaded file.")
 
@@ -200,7 +200,7 @@ class ProviderManager:
                     return result
                 except Exception as exc:
                     if self.get_auto_fallback() and _is_quota_error(exc):
-                        report_failure(key)
+                        report_failure(key, quota=True)
                         logger.warning("ProviderManager: pool key exhausted (%s), rotating", exc)
                         rotated = acquire_key()
                         if rotated and rotated != key:
@@ -210,7 +210,7 @@ class ProviderManager:
                                 return result
                             except Exception as exc2:
                                 if self.get_auto_fallback() and _is_quota_error(exc2):
-                                    report_failure(rotated)
+                                    report_failure(rotated, quota=True)
                     raise
         except Exception as _pe:
             logger.debug("ProviderManager: key_pool unavailable (%s), using local candidates", _pe)
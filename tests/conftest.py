@@ -0,0 +1,51 @@
+"""Shared fixtures for the Knowledge OS tests.
+
+Test modules point ARKADIA_DB_PATH at a temporary database before importing
+knowledge.*, so nothing here imports knowledge.db at collection time.
+
+    pytestmark = pytest.mark.usefixtures("clean_knowledge_db")
+    from conftest import make_note
+"""
+from __future__ import annotations
+
+import itertools
+import json
+
+import pytest
+
+# Child tables first: graph_edges / chunks / note_tags reference notes.
+KNOWLEDGE_TABLES = ("graph_edges", "embeddings", "chunks", "note_tags", "title_key_queue", "notes")
+
+_uuids = itertools.count(1)
+
+
+@pytest.fixture()
+def clean_knowledge_db():
+    """Empty the note, chunk, embedding and graph tables before the test."""
+    from knowledge.db import execute
+
+    for table in KNOWLEDGE_TABLES:
+        execute(f"DELETE FROM {table}")
+    yield
+
+
+def make_note(title: str, *, tags: list[str] | None = None, **cols) -> int:
+    """Insert a bare notes row and return its id.
+
+    *cols* are extra notes columns (content, note_type, user_id, checksum, ...).
+    *tags* are stored in notes.tags and linked through tags / note_tags.
+    """
+    from knowledge.db import execute, last_insert_id
+
+    row = {"uuid": f"uuid-{title}-{next(_uuids)}", "title": title, "content": "", "vault_path": "", **cols}
+    if tags is not None:
+        row["tags"] = json.dumps(tags)
+    execute(
+        f"INSERT INTO notes ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+        tuple(row.values()),
+    )
+    note_id = last_insert_id()
+    for tag in tags or []:
+        execute("INSERT OR IGNORE INTO tags (name) VALUES (?)", (tag,))
+        execute("INSERT INTO note_tags (note_id, tag_id) SELECT ?, id FROM tags WHERE name = ?", (note_id, tag))
+    return note_id
@@ -47,8 +47,8 @@ def test_aetheria_edge_fallback_is_listenable():
 
 def test_synthesize_uses_per_voice_settings(monkeypatch):
     """_synthesize_elevenlabs must pass _voice_settings output, not a hardcoded dict."""
-    import sys, types
     from kernel import tts
+    from providers import http_pool
 
     captured = {}
 
@@ -59,24 +59,12 @@ def test_synthesize_uses_per_voice_settings(monkeypatch):
         text = ""
 
     class FakeClient:
-        def __init__(self, *a, **k):
-            pass
-
-        async def __aenter__(self):
-            return self
-
-        async def __aexit__(self, *a):
-            pass
-
-        async def post(self, url, json=None, headers=None):
+        async def post(self, url, json=None, headers=None, timeout=None):
             captured["payload"] = json
             return FakeResp()
 
-    # Install a fake httpx module (httpx may not be installed in the test env,
-    # and tts imports it lazily inside _synthesize_elevenlabs).
-    fake_httpx = types.ModuleType("httpx")
-    fake_httpx.AsyncClient = FakeClient
-    monkeypatch.setitem(sys.modules, "httpx", fake_httpx)
+    # ElevenLabs calls go through the shared pool; hand it a fake client.
+    monkeypatch.setattr(http_pool, "async_client", lambda: FakeClient())
 
     import asyncio
     loop = asyncio.new_event_loop()
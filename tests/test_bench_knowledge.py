@@ -0,0 +1,60 @@
+"""Knowledge OS benchmark harness tests (scripts/bench_knowledge.py).
+
+Covers:
+- Tiny end-to-end run emits machine-readable JSON for every scenario
+- Same seed → same synthetic corpus
+- Baseline comparison flags p50/p95 regressions beyond threshold and floor
+"""
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       "scripts", "bench_knowledge.py")
+_spec = importlib.util.spec_from_file_location("bench_knowledge", _SCRIPT)
+bench = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bench)
+
+
+def _run(tmp_path, *extra: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, _SCRIPT, "--scale", "60", "--iterations", "4", "--ingest", "3",
+         "--workdir", str(tmp_path / "work"), *extra],
+        capture_output=True, text=True, timeout=120,
+    )
+
+
+def test_small_run_reports_every_scenario(tmp_path):
+    proc = _run(tmp_path, "--out", str(tmp_path / "run.json"))
+    assert proc.returncode == 0, proc.stderr
+    result = json.loads((tmp_path / "run.json").read_text())
+    assert result["meta"]["corpus"]["notes"] == 60 and result["meta"]["corpus"]["edges"] > 0
+    assert set(result["scenarios"]) == set(bench.SCENARIOS)
+    for stats in result["scenarios"].values():
+        assert {"p50_ms", "p95_ms", "throughput_per_s", "peak_rss_mb"} <= set(stats)
+        assert stats["p95_ms"] >= stats["p50_ms"] > 0
+
+
+def test_corpus_is_deterministic():
+    a, b = bench.Corpus(3), bench.Corpus(3)
+    assert [a.note(i) for i in range(5)] == [b.note(i) for i in range(5)]
+    assert a.query() == b.query()
+    assert bench.Corpus(4).note(0) != bench.Corpus(3).note(0)
+
+
+def test_compare_flags_regressions(tmp_path):
+    base = {"scenarios": {"x": {"p50_ms": 10.0, "p95_ms": 20.0}, "y": {"p50_ms": 0.2, "p95_ms": 0.3}}}
+    cur = {"scenarios": {"x": {"p50_ms": 11.0, "p95_ms": 30.0}, "y": {"p50_ms": 0.5, "p95_ms": 0.6}}}
+    regs = bench.compare(cur, base, threshold=0.25, floor_ms=0.5)
+    assert [(r["scenario"], r["metric"]) for r in regs] == [("x", "p95_ms")]
+    assert regs[0]["change_pct"] == 50.0
+
+    inflated = {"scenarios": {name: {"p50_ms": 0.0001, "p95_ms": 0.0001} for name in ("ingest",)}}
+    (tmp_path / "base.json").write_text(json.dumps({"meta": {"scale": 60}, **inflated}))
+    proc = _run(tmp_path, "--only", "ingest", "--baseline", str(tmp_path / "base.json"), "--floor-ms", "0")
+    assert proc.returncode == 1 and "REGRESSION ingest" in proc.stderr
+    assert json.loads(proc.stdout)["comparison"]["regressions"]
@@ -0,0 +1,116 @@
+"""Knowledge OS — BM25 term statistics tests.
+
+Covers:
+- store_chunks() maintaining df, document length and corpus size
+- Scores matching textbook Okapi BM25 over the live corpus
+- Chunk and note deletion unwinding the statistics via trigger
+- One-time backfill of chunks that predate the statistics tables
+- note_ids access filter and the semantic_search() offline fallback
+"""
+from __future__ import annotations
+
+import math
+import os
+import tempfile
+
+import pytest
+
+_tmpdir = tempfile.mkdtemp(prefix="arkadia_bm25_")
+os.environ.setdefault("ARKADIA_DB_PATH", os.path.join(_tmpdir, "test.db"))
+
+from knowledge import term_stats  # noqa: E402
+from knowledge.db import execute, execute_one  # noqa: E402
+from knowledge.pipeline import store_chunks  # noqa: E402
+from conftest import make_note  # noqa: E402
+
+
+pytestmark = pytest.mark.usefixtures("clean_knowledge_db")
+
+
+def _corpus() -> tuple[int, int]:
+    row = execute_one("SELECT doc_count, total_length FROM bm25_corpus WHERE id = 1")
+    return row["doc_count"], row["total_length"]
+
+
+def _df(term: str) -> int:
+    row = execute_one("SELECT df FROM term_stats WHERE term = ?", (term,))
+    return row["df"] if row else 0
+
+
+def test_store_chunks_maintains_statistics():
+    n = make_note("a")
+    store_chunks(n, ["amber amber river", "river stone", "quiet meadow grass"])
+    assert _corpus() == (3, 8)
+    assert _df("river") == 2 and _df("amber") == 1
+    tf = execute_one("SELECT tf FROM chunk_terms WHERE term = 'amber'")["tf"]
+    assert tf == 2
+
+
+def test_scores_match_okapi_bm25():
+    n = make_note("a")
+    docs = ["amber amber river", "river stone", "quiet meadow grass"]
+    ids = store_chunks(n, docs)
+    hits = term_stats.bm25_search("amber river", top_k=10)
+
+    n_docs, avg_dl = 3, 8 / 3
+
+    def expected(doc: str) -> float:
+        tokens = doc.split()
+        total = 0.0
+        for term, df in (("amber", 1), ("river", 2)):
+            tf = tokens.count(term)
+            if not tf:
+                continue
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            total += idf * tf * 2.5 / (tf + 1.5 * (0.25 + 0.75 * len(tokens) / avg_dl))
+        return total
+
+    assert [h["chunk_id"] for h in hits] == ids[:2]
+    assert hits[0]["score"] == pytest.approx(expected(docs[0]))
+    assert hits[1]["score"] == pytest.approx(expected(docs[1]))
+    assert hits[0]["content"] == docs[0]
+
+
+def test_rare_terms_outweigh_common_ones():
+    n = make_note("a")
+    store_chunks(n, [f"common filler text {i}" for i in range(10)] + ["common beacon"])
+    hits = term_stats.bm25_search("common beacon", top_k=3)
+    assert hits[0]["content"] == "common beacon"
+
+
+def test_deletes_unwind_statistics():
+    a, b = make_note("a"), make_note("b")
+    ids = store_chunks(a, ["amber river", "amber stone"])
+    store_chunks(b, ["amber meadow"])
+    execute("DELETE FROM chunks WHERE id = ?", (ids[0],))
+    assert _corpus() == (2, 4) and _df("amber") == 2 and _df("river") == 0
+    assert not term_stats.bm25_search("river")
+
+    execute("DELETE FROM notes WHERE id = ?", (b,))  # cascades to chunks
+    assert _corpus() == (1, 2) and _df("amber") == 1
+    assert execute_one("SELECT COUNT(*) AS n FROM chunk_terms")["n"] == 2
+
+
+def test_backfills_legacy_chunks(monkeypatch):
+    n = make_note("a")
+    execute("INSERT INTO chunks (note_id, content) VALUES (?, 'legacy harbour record')", (n,))
+    monkeypatch.setattr(term_stats, "_backfilled", False)
+    hits = term_stats.bm25_search("harbour")
+    assert [h["content"] for h in hits] == ["legacy harbour record"]
+    assert _corpus() == (1, 3)
+
+
+def test_note_filter_and_semantic_fallback(monkeypatch):
+    import knowledge.search as search
+
+    public = make_note("public")
+    private = make_note("private", user_id="someone-else")
+    store_chunks(public, ["lantern public note"])
+    store_chunks(private, ["lantern private note"])
+
+    assert [h["note_id"] for h in term_stats.bm25_search("lantern", note_ids={private})] == [private]
+    assert term_stats.bm25_search("lantern", note_ids=set()) == []
+
+    monkeypatch.setattr(search, "embed_text", lambda text, task_type="RETRIEVAL_QUERY": None)
+    hits = search.semantic_search("lantern", top_k=5)
+    assert [h["title"] for h in hits] == ["public"]
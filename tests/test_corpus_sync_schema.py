@@ -54,7 +54,7 @@ def test_corpus_sync_state_columns(db_path):
     conn = sqlite3.connect(db_path)
     cols = _columns(conn, "corpus_sync_state")
     conn.close()
-    assert cols == {"key", "tree_sha", "synced_at", "file_count"}
+    assert cols == {"key", "tree_sha", "synced_at", "file_count", "etag"}
 
 
 def test_corpus_sync_state_index(db_path):
@@ -123,7 +123,7 @@ def test_corpus_file_state_columns(db_path):
     conn = sqlite3.connect(db_path)
     cols = _columns(conn, "corpus_file_state")
     conn.close()
-    assert cols == {"repo_key", "path", "file_sha", "ingested_at"}
+    assert cols == {"repo_key", "path", "file_sha", "ingested_at", "etag", "content"}
 
 
 def test_corpus_file_state_index(db_path):
@@ -0,0 +1,92 @@
+"""Direct scroll store (api/direct_scrolls.py over kernel/storage/direct_scroll_store.py).
+
+Covers:
+- add/remove touch one row; scrolls() lists newest first
+- scrolls() serves from memory until a mutation or invalidate()
+- Legacy direct_scrolls.json files (data dir and CWD data/) imported once, then renamed
+- A legacy file that cannot be renamed (read-only, cross-device) still leaves a working store
+"""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from api import direct_scrolls
+from kernel.storage.direct_scroll_store import DirectScrollStore
+
+
+def _scroll(sid: str) -> dict:
+    return {"id": sid, "label": sid, "content": f"body of {sid}", "created_at": "2026-01-01T00:00:00+00:00"}
+
+
+@pytest.fixture()
+def store(tmp_path, monkeypatch):
+    s = DirectScrollStore(str(tmp_path / "runtime.db"))
+    monkeypatch.setattr(direct_scrolls, "_store", s)
+    direct_scrolls.invalidate()
+    yield s
+    direct_scrolls.invalidate()
+
+
+def test_add_remove_newest_first(store):
+    direct_scrolls.add(_scroll("a"))
+    direct_scrolls.add(_scroll("b"))
+    assert [s["id"] for s in direct_scrolls.scrolls()] == ["b", "a"]
+    assert direct_scrolls.remove("a") is True
+    assert direct_scrolls.remove("a") is False
+    assert [s["id"] for s in direct_scrolls.scrolls()] == ["b"]
+
+
+def test_reads_served_from_memory(store, monkeypatch):
+    direct_scrolls.add(_scroll("a"))
+    direct_scrolls.scrolls()
+    calls = []
+    monkeypatch.setattr(store, "all", lambda: calls.append(1) or [])
+    for _ in range(5):
+        assert [s["id"] for s in direct_scrolls.scrolls()] == ["a"]
+    assert calls == []
+
+    direct_scrolls.invalidate()                 # e.g. a manual DB edit
+    assert direct_scrolls.scrolls() == [] and calls == [1]
+
+
+def test_legacy_json_imported_once(tmp_path, monkeypatch):
+    legacy = tmp_path / "direct_scrolls.json"
+    legacy.write_text(json.dumps({"scrolls": [_scroll("new"), _scroll("old")]}), encoding="utf-8")
+    cwd_legacy = tmp_path / "cwd_direct_scrolls.json"       # the old CWD-relative data/ file
+    cwd_legacy.write_text(json.dumps({"scrolls": [_scroll("cwd")]}), encoding="utf-8")
+    monkeypatch.setattr(direct_scrolls, "LEGACY_PATHS", (str(cwd_legacy), str(legacy)))
+    monkeypatch.setattr(direct_scrolls, "_store", None)
+    monkeypatch.setattr(direct_scrolls, "DirectScrollStore", lambda: DirectScrollStore(str(tmp_path / "runtime.db")))
+    direct_scrolls.invalidate()
+
+    assert [s["id"] for s in direct_scrolls.scrolls()] == ["new", "old", "cwd"]
+    assert not legacy.exists() and (tmp_path / "direct_scrolls.json.imported").exists()
+    assert not cwd_legacy.exists()
+
+    direct_scrolls.remove("old")
+    monkeypatch.setattr(direct_scrolls, "_store", None)
+    direct_scrolls.invalidate()
+    assert [s["id"] for s in direct_scrolls.scrolls()] == ["new", "cwd"]
+    direct_scrolls.invalidate()
+
+
+def test_unrenamable_legacy_json_keeps_the_store(tmp_path, monkeypatch):
+    legacy = tmp_path / "direct_scrolls.json"
+    legacy.write_text(json.dumps({"scrolls": [_scroll("old")]}), encoding="utf-8")
+    monkeypatch.setattr(direct_scrolls, "LEGACY_PATHS", (str(legacy),))
+    monkeypatch.setattr(direct_scrolls, "_store", None)
+    monkeypatch.setattr(direct_scrolls, "DirectScrollStore", lambda: DirectScrollStore(str(tmp_path / "runtime.db")))
+
+    def read_only(src, dst):
+        raise PermissionError(30, "Read-only file system", src)
+
+    monkeypatch.setattr(direct_scrolls.os, "replace", read_only)
+    direct_scrolls.invalidate()
+
+    assert [s["id"] for s in direct_scrolls.scrolls()] == ["old"]
+    assert legacy.exists()
+    direct_scrolls.add(_scroll("new"))
+    assert [s["id"] for s in direct_scrolls.scrolls()] == ["new", "old"]
+    direct_scrolls.invalidate()
@@ -0,0 +1,123 @@
+"""Knowledge OS — batched embedding tests.
+
+Covers:
+- embed_texts() alignment, batch splitting and the concurrency cap
+- Gemini batch endpoint with per-item retry on partial failure (fake genai module)
+- embed_note_chunks() skipping embedded chunks and writing vectors in one transaction
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+
+import pytest
+
+_tmpdir = tempfile.mkdtemp(prefix="arkadia_embed_batch_")
+os.environ.setdefault("ARKADIA_DB_PATH", os.path.join(_tmpdir, "test.db"))
+
+from knowledge import embeddings  # noqa: E402
+from knowledge.db import execute, execute_one  # noqa: E402
+from knowledge.pipeline import embed_note_chunks, store_chunks  # noqa: E402
+from conftest import make_note  # noqa: E402
+
+
+pytestmark = pytest.mark.usefixtures("clean_knowledge_db")
+
+
+@pytest.fixture(autouse=True)
+def _fake_embedder(monkeypatch):
+    monkeypatch.setenv("ARKADIA_EMBEDDER", "fake")
+
+
+def test_fake_embedder_is_deterministic_and_aligned():
+    texts = ["amber river", "quiet meadow", "amber river"]
+    vectors = embeddings.embed_texts(texts, batch_size=2)
+    assert len(vectors) == 3 and len(vectors[0]) == embeddings.EMBED_DIM
+    assert vectors[0] == vectors[2] != vectors[1]
+    assert embeddings.embed_text("amber river") == vectors[0]
+
+
+def test_concurrency_is_capped(monkeypatch):
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+    real = embeddings._fake_embed_batch
+
+    def slow_batch(texts):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+        return real(texts)
+
+    monkeypatch.setattr(embeddings, "_fake_embed_batch", slow_batch)
+    vectors = embeddings.embed_texts([f"t{i}" for i in range(40)], batch_size=4, max_concurrency=3)
+    assert len(vectors) == 40 and all(vectors)
+    assert 1 < peak <= 3
+
+
+def test_gemini_batch_partial_failure(monkeypatch):
+    calls: list = []
+
+    def embed_content(model, content, task_type):
+        calls.append(content)
+        if isinstance(content, list):
+            if "bad" in content:
+                raise RuntimeError("batch rejected")
+            return {"embedding": [[float(len(t))] for t in content]}
+        if content == "bad":
+            raise RuntimeError("item rejected")
+        return {"embedding": [float(len(content))]}
+
+    genai = types.SimpleNamespace(configure=lambda api_key: calls.append(("configure", api_key)),
+                                  embed_content=embed_content)
+    google = types.ModuleType("google")
+    google.generativeai = genai
+    monkeypatch.setitem(sys.modules, "google", google)
+    monkeypatch.setitem(sys.modules, "google.generativeai", genai)
+    monkeypatch.setenv("ARKADIA_EMBEDDER", "gemini")
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(embeddings, "_configured_key", None)
+
+    vectors = embeddings.embed_texts(["ok", "bad", "fine", "good"], batch_size=2)
+    assert vectors == [[2.0], None, [4.0], [4.0]]
+    assert calls.count(("configure", "test-key")) == 1
+    # Healthy batch: one round trip. Failed batch: one attempt plus per-item retries.
+    assert sum(isinstance(c, list) for c in calls) == 2
+    assert sum(isinstance(c, str) for c in calls) == 2
+
+
+def test_embed_note_chunks_batches_and_skips_embedded(monkeypatch):
+    nid = make_note("a")
+    ids = store_chunks(nid, ["amber river", "quiet meadow", "stone bridge"])
+    embeddings.store_chunk_embedding(ids[0], [1.0] * embeddings.EMBED_DIM)
+
+    seen: list[list[str]] = []
+    real = embeddings.embed_texts
+
+    def record(texts, *a, **k):
+        seen.append(list(texts))
+        out = real(texts, *a, **k)
+        out[-1] = None  # the provider drops the last item
+        return out
+
+    import knowledge.pipeline as pipeline
+    monkeypatch.setattr(pipeline, "embed_texts", record)
+
+    assert embed_note_chunks(nid) is False
+    assert seen == [["quiet meadow", "stone bridge"]]
+    rows = execute("SELECT chunk_id, model FROM embeddings ORDER BY chunk_id")
+    assert [r["chunk_id"] for r in rows] == ids[:2]
+    assert rows[1]["model"] == embeddings.FAKE_MODEL
+    assert execute_one("SELECT embedding_status FROM notes WHERE id = ?", (nid,))["embedding_status"] == "partial"
+
+    monkeypatch.setattr(pipeline, "embed_texts", real)
+    assert embed_note_chunks(nid) is True
+    assert execute_one("SELECT COUNT(*) AS n FROM embeddings")["n"] == 3
@@ -0,0 +1,100 @@
+"""Knowledge OS — query embedding cache (knowledge/embedding_cache.py).
+
+Covers:
+- embed_text() serves repeated and case/whitespace-variant queries from cache
+- The persistent tier survives a cold in-process tier
+- Disk hits refresh last_used only when it is TOUCH_INTERVAL_S stale
+- TTL expiry, the entry cap and failed embeddings are never cached
+- Hit rate and saved round trips in stats() and /api/knowledge/status
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+_tmpdir = tempfile.mkdtemp(prefix="arkadia_embed_cache_")
+os.environ.setdefault("ARKADIA_DB_PATH", os.path.join(_tmpdir, "test.db"))
+
+from knowledge import embedding_cache, embeddings  # noqa: E402
+from knowledge.db import execute  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache(monkeypatch):
+    monkeypatch.setenv("ARKADIA_EMBEDDER", "fake")
+    embedding_cache.clear()
+    calls = []
+    real = embeddings._fake_embed
+    monkeypatch.setattr(embeddings, "_fake_embed", lambda text: calls.append(text) or real(text))
+    yield calls
+
+
+def _rows() -> int:
+    return execute("SELECT COUNT(*) AS n FROM query_embedding_cache")[0]["n"]
+
+
+def test_repeated_and_normalised_queries_hit(_fresh_cache):
+    calls = _fresh_cache
+    first = embeddings.embed_text("Amber  river\n", task_type="RETRIEVAL_QUERY")
+    assert embeddings.embed_text("amber river", task_type="RETRIEVAL_QUERY") == first
+    assert embeddings.embed_text("AMBER RIVER", task_type="RETRIEVAL_QUERY") == first
+    embeddings.embed_text("amber river", task_type="RETRIEVAL_DOCUMENT")   # other task type
+    assert len(calls) == 2
+
+    stats = embedding_cache.stats()
+    assert stats["lookups"] == 4 and stats["hits"] == 2 and stats["saved_round_trips"] == 2
+    assert stats["hit_rate"] == 0.5
+
+
+def test_persistent_tier_survives_cold_memory(_fresh_cache):
+    calls = _fresh_cache
+    vec = embeddings.embed_text("quiet meadow", task_type="RETRIEVAL_QUERY")
+    embedding_cache._memory.clear()                        # e.g. another worker or a restart
+    assert embeddings.embed_text("quiet meadow", task_type="RETRIEVAL_QUERY") == vec
+    assert len(calls) == 1 and embedding_cache.stats()["disk_hits"] == 1
+
+
+def test_disk_hits_touch_last_used_only_when_stale(_fresh_cache, monkeypatch):
+    embeddings.embed_text("quiet meadow", task_type="RETRIEVAL_QUERY")
+    stored = execute("SELECT last_used FROM query_embedding_cache")[0]["last_used"]
+
+    embedding_cache._memory.clear()
+    embeddings.embed_text("quiet meadow", task_type="RETRIEVAL_QUERY")
+    assert execute("SELECT last_used FROM query_embedding_cache")[0]["last_used"] == stored
+
+    monkeypatch.setattr(embedding_cache, "TOUCH_INTERVAL_S", 0.0)
+    embedding_cache._memory.clear()
+    embeddings.embed_text("quiet meadow", task_type="RETRIEVAL_QUERY")
+    assert execute("SELECT last_used FROM query_embedding_cache")[0]["last_used"] > stored
+
+
+def test_expired_entries_are_embedded_again(_fresh_cache, monkeypatch):
+    monkeypatch.setattr(embedding_cache, "TTL_S", 0.0)
+    embeddings.embed_text("stale query")
+    embeddings.embed_text("stale query")
+    assert len(_fresh_cache) == 2
+
+
+def test_entry_cap_and_failures_not_cached(monkeypatch):
+    monkeypatch.setattr(embedding_cache, "MAX_ENTRIES", 3)
+    for i in range(6):
+        embeddings.embed_text(f"query {i}")
+    embedding_cache.trim()
+    assert _rows() == 3
+
+    monkeypatch.setenv("ARKADIA_EMBEDDER", "gemini")       # unconfigured → None
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    assert embeddings.embed_text("offline query") is None
+    assert _rows() == 3
+
+
+def test_status_reports_cache_metrics():
+    from api.knowledge_routes import knowledge_os_status
+
+    embeddings.embed_text("status probe", task_type="RETRIEVAL_QUERY")
+    embeddings.embed_text("status probe", task_type="RETRIEVAL_QUERY")
+    cache = asyncio.run(knowledge_os_status())["query_embedding_cache"]
+    assert cache["hits"] == 1 and cache["hit_rate"] == 0.5
@@ -0,0 +1,123 @@
+"""Knowledge OS — enrichment worker pool and batched edge writes (knowledge/enrichment.py).
+
+Covers:
+- _write_edges() writes one batched upsert per note and skips unchanged edges
+- The queue deduplicates by note id and never runs one note twice at once
+- Thread count stays bounded by the worker setting under bulk submits
+- enrichment_stats() counters and rates; the rate window is trimmed as notes finish
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+
+import pytest
+
+_tmpdir = tempfile.mkdtemp(prefix="arkadia_enrich_queue_")
+os.environ.setdefault("ARKADIA_DB_PATH", os.path.join(_tmpdir, "test.db"))
+
+from knowledge import db, enrichment  # noqa: E402
+from knowledge.db import execute_one  # noqa: E402
+from knowledge.enrichment import EnrichmentQueue  # noqa: E402
+from conftest import make_note  # noqa: E402
+
+
+pytestmark = pytest.mark.usefixtures("clean_knowledge_db")
+
+
+def _versions() -> tuple[int, int]:
+    row = execute_one("SELECT edges_version, edges_removed FROM graph_version WHERE id = 1")
+    return row["edges_version"], row["edges_removed"]
+
+
+def test_write_edges_is_one_batched_upsert():
+    src, *targets = [make_note(f"n{i}") for i in range(6)]
+    candidates = [(t, "references", 0.5, "test") for t in targets]
+    candidates += [(targets[0], "references", 0.9, "stronger"), (targets[1], "bogus", 0.9, "x"),
+                   (targets[2], "relates_to", 0.1, "weak"), (src, "references", 0.9, "self")]
+
+    seen: list[str] = []
+    conn = db.get_connection()
+    conn.set_trace_callback(seen.append)
+    try:
+        assert enrichment._write_edges(src, candidates) == 5
+    finally:
+        conn.set_trace_callback(None)
+    assert sum(s.strip().upper().startswith("COMMIT") for s in seen) == 1
+    assert execute_one("SELECT weight FROM graph_edges WHERE target_note_id = ?", (targets[0],))["weight"] == 0.9
+
+    before = _versions()
+    assert enrichment._write_edges(src, candidates) == 0          # idempotent, no index invalidation
+    assert _versions() == before
+    assert enrichment._write_edges(src, [(targets[1], "references", 0.7, "re-weighted")]) == 1
+    assert execute_one("SELECT COUNT(*) AS n FROM graph_edges")["n"] == 5
+
+
+@pytest.fixture()
+def blocked(monkeypatch):
+    gate = threading.Event()
+    calls: list[int] = []
+    active: list[int] = []
+    overlap: list[int] = []
+    lock = threading.Lock()
+
+    def fake_enrich(note_id: int) -> dict:
+        with lock:
+            if note_id in active:
+                overlap.append(note_id)
+            active.append(note_id)
+            calls.append(note_id)
+        gate.wait(5)
+        with lock:
+            active.remove(note_id)
+        return {"edges_created": 3}
+
+    monkeypatch.setattr(enrichment, "enrich_note", fake_enrich)
+    return gate, calls, overlap
+
+
+def test_queue_dedups_and_bounds_threads(blocked):
+    gate, calls, overlap = blocked
+    q = EnrichmentQueue(workers=3)
+    before = threading.active_count()
+    for note_id in list(range(40)) + list(range(40)):
+        q.submit(note_id)
+    assert threading.active_count() - before == 3
+    stats = q.stats()
+    # ids already picked up by a worker are queued again, the rest deduplicate
+    assert stats["enqueued"] + stats["deduplicated"] == 80 and stats["deduplicated"] >= 37
+    gate.set()
+    assert q.wait_idle(5)
+    assert len(calls) <= 43 and sorted(set(calls)) == list(range(40))
+    assert not overlap
+    stats = q.stats()
+    assert stats["queue_depth"] == stats["running"] == 0 and stats["threads"] == 3
+    assert stats["edges_written"] == 3 * stats["processed"] and stats["edges_per_second"] > 0
+
+
+def test_resubmit_while_running_runs_once_more(blocked):
+    gate, calls, overlap = blocked
+    q = EnrichmentQueue(workers=2)
+    q.submit(7)
+    while not calls:
+        time.sleep(0.001)
+    q.submit(7)                     # running → queued for exactly one more pass
+    q.submit(7)                     # already waiting → deduplicated
+    gate.set()
+    assert q.wait_idle(5)
+    assert calls == [7, 7] and not overlap
+    assert q.stats()["deduplicated"] == 1
+
+
+def test_rate_window_trimmed_without_polling(blocked, monkeypatch):
+    gate, calls, _ = blocked
+    monkeypatch.setattr(enrichment, "_RATE_WINDOW_S", 0.0)
+    gate.set()
+    q = EnrichmentQueue(workers=1)
+    for note_id in range(50):
+        q.submit(note_id)
+        time.sleep(0.001)
+    assert q.wait_idle(5) and len(calls) == 50
+    assert len(q._recent) <= 1              # trimmed as notes finish, not only in stats()
@@ -0,0 +1,95 @@
+"""Knowledge OS — graph adjacency index tests (knowledge/graph_index.py).
+
+Covers:
+- traverse() / find_path() results over the in-memory index
+- Invalidation through every edge write path (add_edge, REPLACE, raw SQL, cascade)
+- Insert-only edge changes are appended, not rebuilt
+- Ownership changes re-filter access without touching edges
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+
+import pytest
+
+_tmpdir = tempfile.mkdtemp(prefix="arkadia_graph_index_")
+os.environ.setdefault("ARKADIA_DB_PATH", os.path.join(_tmpdir, "test.db"))
+
+import knowledge.graph_index as graph_index  # noqa: E402
+from knowledge.db import execute  # noqa: E402
+from knowledge.graph import add_edge, find_path, remove_edge, traverse  # noqa: E402
+from knowledge.graph_index import get_graph_index  # noqa: E402
+from conftest import make_note  # noqa: E402
+
+
+pytestmark = pytest.mark.usefixtures("clean_knowledge_db")
+
+
+def _chain(n: int) -> list[int]:
+    ids = [make_note(f"n{i}") for i in range(n)]
+    for a, b in zip(ids, ids[1:]):
+        add_edge(a, b, "references")
+    return ids
+
+
+def test_traverse_depth_and_relationship_filter():
+    a, b, c, d = _chain(4)
+    add_edge(a, c, "extends")
+    result = traverse(a, max_depth=1)
+    assert {n["id"] for n in result["nodes"]} == {a, b, c}
+    assert len(result["edges"]) == 2 and set(result["edges"][0]) >= {"id", "weight", "created_at"}
+
+    result = traverse(a, max_depth=2, relationship_filter="references")
+    assert {n["id"] for n in result["nodes"]} == {a, b, c}
+    assert {e["relationship"] for e in result["edges"]} == {"references"}
+    assert traverse(a, max_depth=3, relationship_filter="contradicts")["nodes"][0]["id"] == a
+
+
+def test_find_path_shortest_and_hop_limit():
+    ids = _chain(6)
+    assert find_path(ids[0], ids[5], max_depth=4) == ids
+    assert find_path(ids[0], ids[5], max_depth=3) == []
+    add_edge(ids[4], ids[1], "extends")       # direction is ignored
+    assert find_path(ids[0], ids[5], max_depth=2) == [ids[0], ids[1], ids[4], ids[5]]
+    assert find_path(ids[5], ids[0], max_depth=2) == [ids[5], ids[4], ids[1], ids[0]]
+    assert find_path(ids[2], ids[2]) == [ids[2]]
+
+
+def test_every_edge_write_path_invalidates():
+    a, b, c = _chain(3)
+    assert find_path(a, c) == [a, b, c]
+
+    remove_edge(b, c, "references")
+    assert find_path(a, c) == []
+    add_edge(a, c, "references")
+    assert find_path(a, c) == [a, c]
+    execute("DELETE FROM graph_edges WHERE source_note_id = ?", (a,))
+    assert find_path(a, c) == []
+    add_edge(c, b, "references")
+    execute("DELETE FROM notes WHERE id = ?", (b,))   # ON DELETE CASCADE
+    assert [n["id"] for n in traverse(c, max_depth=2)["nodes"]] == [c]
+    assert get_graph_index().edge_count() == 0
+
+
+def test_inserts_append_without_full_reload(monkeypatch):
+    a, b, c = _chain(3)
+    get_graph_index()
+    monkeypatch.setattr(graph_index, "_load_edges", lambda *a: pytest.fail("full reload"))
+    d = make_note("d")
+    add_edge(c, d, "references")
+    assert find_path(a, d) == [a, b, c, d]
+
+    add_edge(c, d, "references", weight=0.5)     # REPLACE removes a row → full reload
+    monkeypatch.undo()
+    assert find_path(a, d) == [a, b, c, d]
+    assert get_graph_index().edge_count() == 3
+
+
+def test_ownership_change_refilters_access():
+    a, b, c = _chain(3)
+    assert find_path(a, c) == [a, b, c]
+    execute("UPDATE notes SET user_id = 'owner-1' WHERE id = ?", (b,))
+    assert find_path(a, c) == []
+    assert find_path(a, c, user_id="owner-1") == [a, b, c]
+    assert {n["id"] for n in traverse(a, max_depth=2, user_id="someone-else")["nodes"]} == {a}
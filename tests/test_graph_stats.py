@@ -0,0 +1,110 @@
+"""Knowledge OS — incremental graph statistics (knowledge/graph_stats.py).
+
+Covers:
+- Trigger-maintained counters follow inserts, updates, upserts and cascaded
+  deletes, and agree with a full recount
+- Connectivity unions appended edges incrementally and rebuilds after deletes
+- connectivity(wait=False) answers stale and refreshes in the background
+- created_since() agrees with a created_at range count across date formats
+- /api/knowledge/status and evaluate_graph_health() read the counters
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+import time
+
+import pytest
+
+_tmpdir = tempfile.mkdtemp(prefix="arkadia_graph_stats_")
+os.environ.setdefault("ARKADIA_DB_PATH", os.path.join(_tmpdir, "test.db"))
+
+from knowledge import graph, graph_stats  # noqa: E402
+from knowledge.db import execute  # noqa: E402
+from knowledge.graph_health import evaluate_graph_health  # noqa: E402
+from conftest import make_note  # noqa: E402
+
+
+pytestmark = pytest.mark.usefixtures("clean_knowledge_db")
+
+
+def _nonzero(counts: dict) -> dict:
+    return {k: n for k, n in counts.items() if n}
+
+
+def test_counters_follow_writes_and_match_recount():
+    a, b = make_note("a", checksum="same", note_type="chapter"), make_note("b", checksum="same")
+    c, d = make_note("c"), make_note("d")
+    graph.add_edge(a, b, "relates_to")
+    graph.add_edge(a, b, "relates_to", 0.5)          # upsert: still one edge
+    graph.add_edge(c, c, "references")               # self-loop links one note
+    execute("UPDATE notes SET embedding_status = 'complete' WHERE id = ?", (d,))
+
+    counts = graph_stats.counters()
+    assert counts["notes"] == 4 and counts["edges"] == 2
+    assert counts["notes.linked"] == 3 and counts["notes.dup_groups"] == 1
+    assert counts["notes.type:chapter"] == 1 and counts["notes.embed:complete"] == 1
+    assert graph_stats.grouped(counts, "edges.rel:") == {"relates_to": 1, "references": 1}
+
+    execute("DELETE FROM notes WHERE id = ?", (b,))  # cascades its edge
+    counts = graph_stats.counters()
+    assert counts["edges"] == 1 and counts["notes.linked"] == 1 and counts["notes.dup_groups"] == 0
+
+    graph_stats.recount()
+    assert _nonzero(graph_stats.counters()) == _nonzero(counts)
+
+
+def test_connectivity_incremental_and_rebuild():
+    a, b, c, d = (make_note(t) for t in "abcd")
+    graph.add_edge(a, b, "relates_to")
+    graph.add_edge(c, d, "relates_to")
+    assert graph_stats.connectivity()["components"] == 2
+    graph.add_edge(b, c, "references")               # insert-only: appended
+    assert graph_stats.connectivity()["components"] == 1
+    graph.remove_edge(b, c, "references")            # removal: rebuilt
+    snap = graph_stats.connectivity()
+    assert snap["components"] == 2 and snap["dangling_edges"] == 0
+
+
+def test_connectivity_without_wait_refreshes_in_background():
+    a, b, c = make_note("a"), make_note("b"), make_note("c")
+    graph.add_edge(a, b, "relates_to")
+    assert graph_stats.connectivity()["components"] == 1
+    graph.add_edge(c, c, "relates_to")
+    stale = graph_stats.connectivity(wait=False)
+    assert stale["stale"] and stale["components"] == 1
+    deadline = time.time() + 5
+    while graph_stats.connectivity(wait=False)["stale"] and time.time() < deadline:
+        time.sleep(0.01)
+    assert graph_stats.connectivity(wait=False)["components"] == 2
+
+
+def test_status_and_health_use_counters():
+    from api.knowledge_routes import knowledge_os_status
+
+    a, b, _ = make_note("a", note_type="chapter"), make_note("b"), make_note("c")
+    graph.add_edge(a, b, "relates_to")
+    status = asyncio.run(knowledge_os_status())
+    assert status["vault"]["notes"] == 3 and status["graph"]["edges"] == 1
+    assert status["nodes_by_type"] == {"note": 2, "chapter": 1}
+    assert status["relationships_by_type"] == {"relates_to": 1}
+    assert status["growth"]["semantic_links"] == 1
+
+    health = evaluate_graph_health()
+    assert health["checks"]["orphan_nodes"]["orphan_nodes"] == 1
+    assert health["checks"]["graph_connectivity"]["components"] == 1
+    assert health["checks"]["ontology_violations"]["violation_count"] == 0
+
+
+def test_created_since_matches_range_count():
+    for i, ts in enumerate(("2026-01-01 08:00:00", "2026-01-03T09:30:00+00:00",
+                            "2026-01-03 23:59:59", "2026-01-05T00:00:01")):
+        execute(
+            "INSERT INTO notes (uuid, title, content, vault_path, created_at) VALUES (?, ?, '', '', ?)",
+            (f"uuid-day-{i}", f"day {i}", ts),
+        )
+    for cutoff in ("2026-01-01T00:00:00+00:00", "2026-01-03T09:00:00+00:00",
+                   "2026-01-03T10:00:00+00:00", "2026-01-06T00:00:00+00:00"):
+        expected = execute("SELECT COUNT(*) AS n FROM notes WHERE created_at >= ?", (cutoff,))[0]["n"]
+        assert graph_stats.created_since("notes", cutoff) == expected
@@ -0,0 +1,106 @@
+"""Shared HTTP client pools (providers/http_pool.py) against a local stub server.
+
+Covers:
+- The sync pool reuses one keep-alive connection across sequential requests
+- The async pool does the same per event loop and is replaced after aclose()
+- The per-host cap bounds concurrent requests and counts queued ones
+- Streamed responses release their slot when closed
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from providers import http_pool
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"          # keep-alive
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path.startswith("/slow"):
+            time.sleep(0.1)
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+def _host(base: str, kind: str) -> dict:
+    return http_pool.stats()[kind]["hosts"][base.removeprefix("http://")]
+
+
+def test_sync_pool_reuses_connection(server):
+    http_pool.close()
+    client = http_pool.sync_client()
+    assert http_pool.sync_client() is client
+    for _ in range(5):
+        assert client.get(f"{server}/ping").text == "ok"
+    host = _host(server, "sync")
+    assert host["requests"] == 5
+    assert host["connections_opened"] == 1
+    assert host["in_flight"] == 0
+
+
+def test_async_pool_reuses_connection_per_loop(server):
+    async def run() -> None:
+        client = http_pool.async_client()
+        assert http_pool.async_client() is client
+        for _ in range(4):
+            assert (await client.get(f"{server}/ping")).text == "ok"
+        await http_pool.aclose()
+        assert client.is_closed and http_pool.async_client() is not client
+        await http_pool.aclose()
+
+    asyncio.run(run())
+    host = _host(server, "async")
+    assert host["requests"] == 4
+    assert host["connections_opened"] == 1
+
+
+def test_per_host_cap_bounds_concurrency(server, monkeypatch):
+    monkeypatch.setattr(http_pool, "MAX_PER_HOST", 2)
+
+    async def run() -> None:
+        client = http_pool.async_client()
+        await asyncio.gather(*(client.get(f"{server}/slow") for _ in range(6)))
+        await http_pool.aclose()
+
+    asyncio.run(run())
+    host = _host(server, "async")
+    assert host["peak_in_flight"] == 2
+    assert host["waited"] >= 4
+    assert host["in_flight"] == 0
+
+
+def test_streamed_response_releases_slot(server):
+    http_pool.close()
+    with http_pool.sync_client().stream("GET", f"{server}/stream") as response:
+        assert _host(server, "sync")["in_flight"] == 1
+        assert response.read() == b"ok"
+    assert _host(server, "sync")["in_flight"] == 0
+
+    response = http_pool.sync_client().send(
+        http_pool.sync_client().build_request("GET", f"{server}/stream"), stream=True
+    )
+    assert _host(server, "sync")["in_flight"] == 1
+    response.close()                           # abandoned before reading the body
+    assert _host(server, "sync")["in_flight"] == 0
@@ -0,0 +1,88 @@
+"""Knowledge OS — single-transaction ingest tests.
+
+Covers:
+- knowledge.db.transaction(): one commit, nested blocks join, rollback on error
+- pipeline.ingest() commits once for note + tags + chunks + vectors + timeline
+- A failure mid-ingest leaves no partial rows behind
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+
+import pytest
+
+_tmpdir = tempfile.mkdtemp(prefix="arkadia_ingest_txn_")
+os.environ.setdefault("ARKADIA_DB_PATH", os.path.join(_tmpdir, "test.db"))
+
+from knowledge import db, pipeline  # noqa: E402
+from knowledge.db import execute, execute_one  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _fresh_db(monkeypatch, tmp_path):
+    monkeypatch.setenv("ARKADIA_EMBEDDER", "fake")
+    monkeypatch.chdir(tmp_path)                 # vault/ Markdown lands in tmp
+    for table in ("embeddings", "chunks", "note_tags", "graph_edges", "notes"):
+        execute(f"DELETE FROM {table}")
+    yield
+
+
+@pytest.fixture()
+def commits():
+    seen: list[str] = []
+    conn = db.get_connection()
+    conn.set_trace_callback(seen.append)
+    yield lambda: sum(1 for s in seen if s.strip().upper().startswith("COMMIT"))
+    conn.set_trace_callback(None)
+
+
+def _count(table: str) -> int:
+    return execute_one(f"SELECT COUNT(*) AS n FROM {table}")["n"]
+
+
+def test_transaction_commits_once_and_nests(commits):
+    with db.transaction():
+        execute("INSERT INTO tags (name) VALUES ('txn-a')")
+        with db.transaction() as conn:
+            conn.execute("INSERT INTO tags (name) VALUES ('txn-b')")
+        assert db.in_transaction() and commits() == 0
+    assert not db.in_transaction() and commits() == 1
+    assert _count("tags WHERE name IN ('txn-a', 'txn-b')") == 2
+
+
+def test_transaction_rolls_back_on_error():
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            execute("INSERT INTO tags (name) VALUES ('txn-rollback')")
+            raise RuntimeError("boom")
+    assert _count("tags WHERE name = 'txn-rollback'") == 0
+    execute("INSERT INTO tags (name) VALUES ('txn-after')")   # autocommit resumes
+    assert _count("tags WHERE name = 'txn-after'") == 1
+
+
+def test_ingest_commits_once(commits):
+    content = "\n\n".join(f"Paragraph {p} " + " ".join(f"word{p}x{i}" for i in range(300)) for p in range(12))
+    note = pipeline.ingest("Many chunks", content, tags=["alpha", "Beta", "alpha"], auto_link=False)
+    assert note["chunks_created"] > 5
+    assert commits() == 1
+    assert _count("embeddings") == note["chunks_created"]
+    assert execute_one("SELECT embedding_status FROM notes WHERE id = ?", (note["id"],))["embedding_status"] == "complete"
+    tags = {r["name"] for r in execute(
+        "SELECT t.name FROM tags t JOIN note_tags nt ON nt.tag_id = t.id WHERE nt.note_id = ?", (note["id"],)
+    )}
+    assert {"alpha", "beta"} <= tags
+    positions = [r["position"] for r in execute(
+        "SELECT position FROM chunks WHERE note_id = ? ORDER BY id", (note["id"],)
+    )]
+    assert positions == list(range(note["chunks_created"]))
+
+
+def test_failed_ingest_leaves_no_partial_rows(monkeypatch):
+    def fail(event_type, *a, **kw):
+        if event_type == "knowledge_created":
+            raise RuntimeError("timeline down")
+    monkeypatch.setattr(pipeline.tl, "record", fail)
+    with pytest.raises(RuntimeError):
+        pipeline.ingest("Doomed", "some content that will not survive", auto_link=False)
+    assert _count("notes") == _count("chunks") == _count("embeddings") == 0
@@ -32,7 +32,13 @@ def key_pool(tmp_path, monkeypatch):
     if "api.key_pool" in sys.modules:
         importlib.reload(sys.modules["api.key_pool"])
     from api import key_pool
-    return key_pool
+    yield key_pool
+    # Put the real data dir, env keys and cooldown back, then reload the
+    # stores and the pool so later modules never see this temp dir.
+    monkeypatch.undo()
+    for mod in ("api.provider_key_store", "api.key_manager", "api.key_pool"):
+        importlib.reload(sys.modules[mod])
+    key_pool.invalidate()
 
 
 def _seed(key_pool, keys):
@@ -100,6 +106,48 @@ def test_acquire_returns_none_when_empty(key_pool):
     assert key_pool.acquire_key() == ""
 
 
+def test_recent_429_lowers_key_share(key_pool):
+    _seed(key_pool, ["AAA", "BBB"])
+    key_pool.report_failure("AAA", cooldown=0, quota=True)     # penalised, not cooled
+    picks = [key_pool.acquire_key() for _ in range(18)]
+    assert picks.count("AAA") == 6 and picks.count("BBB") == 12   # weight 4 vs 8
+    key_pool.reset_key("AAA")
+    picks = [key_pool.acquire_key() for _ in range(8)]
+    assert picks.count("AAA") == 4
+
+
+def test_transient_failure_cools_without_penalty(key_pool):
+    _seed(key_pool, ["AAA", "BBB"])
+    key_pool.report_failure("AAA", cooldown=0)                 # e.g. a 5xx or timeout
+    picks = [key_pool.acquire_key() for _ in range(8)]
+    assert picks.count("AAA") == 4
+
+
+def test_acquire_reads_no_files_between_rechecks(key_pool, monkeypatch):
+    _seed(key_pool, ["AAA", "BBB"])
+    key_pool.acquire_key()
+    calls = []
+    monkeypatch.setattr(key_pool, "_store_signature", lambda: calls.append(1) or ())
+    monkeypatch.setattr(key_pool, "_collect_keys", lambda: calls.append(1) or [])
+    for _ in range(100):
+        key_pool.acquire_key()
+    assert calls == []
+
+
+def test_store_writes_and_file_edits_reload_keys(key_pool, monkeypatch):
+    _seed(key_pool, ["AAA"])
+    assert key_pool.acquire_key() == "AAA"
+    from api import provider_key_store
+    provider_key_store.set_key("gemini", "GGG")     # in-process write invalidates
+    assert {key_pool.acquire_key() for _ in range(4)} == {"AAA", "GGG"}
+
+    monkeypatch.setattr(key_pool, "RECHECK_S", 0.0)
+    Path(os.environ["SOLSPIRE_DATA_DIR"], "api_keys.json").write_text(
+        '{"keys": {"k0": {"key": "AAA"}, "k1": {"key": "ZZZ-edited"}}, "active_id": null}'
+    )                                                # out-of-process edit: size/mtime change
+    assert "ZZZ-edited" in {key_pool.acquire_key() for _ in range(6)}
+
+
 # ── TTS round-robin ──────────────────────────────────────────────────────────
 
 
@@ -7,50 +7,36 @@ a session_id in one surface must be retrievable in a subsequent turn under
 the SAME session_id, regardless of which surface initiated it.
 
 The Gemini embedding API is not available in the test environment, so
-embed_text / store_chunk_embedding are stubbed with deterministic local
-vectors. This is strictly necessary to exercise the REAL retrieval plumbing
+the deterministic local embedder (ARKADIA_EMBEDDER=fake) supplies vectors. This is strictly necessary to exercise the REAL retrieval plumbing
 (chunk storage, thread_id filtering, cosine/BM25 scoring,
 format_context_for_provider) offline. Every other code path runs unmodified.
 """
 from __future__ import annotations
 
-import math
 import os
+import tempfile
 import threading
 
 import pytest
 
 # Point the Knowledge OS at a throwaway DB BEFORE any knowledge import touches it.
-_DB_PATH = os.path.join(os.path.dirname(__file__), "_spine_test.db")
-if os.path.exists(_DB_PATH):
-    os.remove(_DB_PATH)
+_DB_PATH = os.path.join(tempfile.mkdtemp(prefix="arkadia_spine_"), "spine_test.db")
 os.environ["ARKADIA_DB_PATH"] = _DB_PATH
 
 
-# ── Deterministic local embedding stub (replaces unavailable Gemini API) ─────
-# Bag-of-words hashing into a fixed-size vector. Same text → same vector,
-# semantically overlapping texts → non-zero cosine similarity. Sufficient to
-# exercise the real retrieval scoring path without a network model.
-_EMBED_DIM = 256
-
-
-def _hash_vec(text: str) -> list[float]:
-    vec = [0.0] * _EMBED_DIM
-    for tok in ''.join(c if c.isalnum() else ' ' for c in text.lower()).split():
-        h = hash(tok) % _EMBED_DIM
-        vec[h] += 1.0
-    mag = math.sqrt(sum(v * v for v in vec))
-    if mag:
-        vec = [v / mag for v in vec]
-    return vec
+# ── Deterministic local embedder (replaces unavailable Gemini API) ───────────
+# ARKADIA_EMBEDDER=fake selects knowledge.embeddings' hashed bag-of-words
+# embedder. Same text → same vector, overlapping texts → non-zero cosine
+# similarity. It is read at call time, so every import site of embed_text /
+# embed_texts sees it regardless of test ordering.
+@pytest.fixture(autouse=True)
+def _fake_embedder(monkeypatch):
+    monkeypatch.setenv("ARKADIA_EMBEDDER", "fake")
 
 
 @pytest.fixture(autouse=True)
-def _stub_embeddings(monkeypatch):
-    import knowledge.embeddings as emb
-    monkeypatch.setattr(emb, "embed_text", lambda text, task_type="RETRIEVAL_DOCUMENT": _hash_vec(text or ""))
-    # Persist the stub vector so all_chunk_embeddings() (chunks JOIN embeddings) returns rows.
-    monkeypatch.setattr(emb, "store_chunk_embedding", lambda chunk_id, vector, model="stub": _store_stub(chunk_id, vector, model))
+def _isolated_vault(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)                 # vault/ Markdown lands in tmp
 
 
 @pytest.fixture(autouse=True)
@@ -65,21 +51,6 @@ def _clean_knowledge_db():
     yield
 
 
-def _store_stub(chunk_id, vector, model):
-    import json
-    from knowledge.db import execute, execute_one
-    existing = execute_one("SELECT id FROM embeddings WHERE chunk_id = ?", (chunk_id,))
-    if existing:
-        execute("UPDATE embeddings SET vector = ?, model = ? WHERE chunk_id = ?", (json.dumps(vector), model, chunk_id))
-        return existing["id"]
-    execute(
-        "INSERT INTO embeddings (chunk_id, vector, model) VALUES (?, ?, ?)",
-        (chunk_id, json.dumps(vector), model),
-    )
-    from knowledge.db import last_insert_id
-    return last_insert_id()
-
-
 # ── Spine continuity test ────────────────────────────────────────────────────
 
 def test_conversational_spine_archives_and_retrieves_across_interfaces():
@@ -169,7 +140,7 @@ def test_archive_survives_thread_boundary():
     assert marker in block
 
 
-def test_retrieval_works_with_zero_embeddings_bm25_fallback():
+def test_retrieval_works_with_zero_embeddings_bm25_fallback(monkeypatch):
     """PRODUCTION-PROOF: the conversational spine must retrieve archived turns
     even when NO embeddings exist (Gemini offline/unconfigured) — the exact
     condition observed on arkadia-kw64.onrender.com (chunks: 90, embeddings: 0).
@@ -179,65 +150,43 @@ def test_retrieval_works_with_zero_embeddings_bm25_fallback():
     score raw chunks WITHOUT the embeddings JOIN, or the spine's retrieval is
     silently dead in the offline/unconfigured condition.
 
-    This test forces that condition: no embedding rows, and embed_text patched
-    to return None (offline). assemble_context must STILL retrieve the archived
-    turn via BM25.
+    This test forces that condition: no embedding rows, and the Gemini backend
+    selected with no API key (offline). assemble_context must STILL retrieve
+    the archived turn via BM25.
     """
-    import knowledge.embeddings as emb
-    import knowledge.pipeline as pipe
-    import knowledge.context_engine as ctx
     # Force the offline condition: Gemini unavailable AND no embeddings stored.
-    # Patch every import binding site (embeddings, pipeline, context_engine) since
-    # each module imported embed_text by name at load time.
-    orig_embed = emb.embed_text
-    orig_store = emb.store_chunk_embedding
-    orig_pipe_embed = pipe.embed_text
-    orig_pipe_store = pipe.store_chunk_embedding
-    orig_ctx_embed = ctx.embed_text
-    _none = lambda text, task_type="RETRIEVAL_QUERY": None
-    _noop = lambda *a, **k: None
-    emb.embed_text = _none
-    emb.store_chunk_embedding = _noop
-    pipe.embed_text = _none
-    pipe.store_chunk_embedding = _noop
-    ctx.embed_text = _none
-    try:
-        from api.oracle_spine import archive_oracle_turn, build_memory_block
-        # Purge any embeddings from prior tests so the JOIN truly returns [].
-        from knowledge.db import execute
-        execute("DELETE FROM embeddings")
-        execute("DELETE FROM chunks")
-        execute("DELETE FROM notes")
-        execute("DELETE FROM threads")
-
-        session_id = "arkana-spine-bm25-004"
-        marker = "SOLARIUN-117-BM25-anchor"
-        archive_oracle_turn(
-            f"Remember this anchor: the project codename is {marker}. Jessica is due soon. Eden Farm.",
-            f"Stored: codename {marker}, Jessica/Eden Farm context.",
-            session_id,
-        )
-        import time; time.sleep(0.05)
-
-        # Confirm the offline condition is real: zero embeddings, nonzero chunks.
-        embs = execute("SELECT COUNT(*) AS n FROM embeddings")[0]["n"]
-        chs = execute("SELECT COUNT(*) AS n FROM chunks")[0]["n"]
-        assert embs == 0, "test precondition: 0 embeddings (offline)"
-        assert chs > 0, "test precondition: chunks exist (archive worked)"
-
-        block, meta = build_memory_block(
-            f"What was the codename {marker} and what is the context?",
-            session_id,
-        )
-        assert meta["notes_retrieved"] >= 1, \
-            "BM25 fallback must retrieve the archived turn when embeddings are absent"
-        assert marker in block, "retrieved context must contain the anchor"
-    finally:
-        emb.embed_text = orig_embed
-        emb.store_chunk_embedding = orig_store
-        pipe.embed_text = orig_pipe_embed
-        pipe.store_chunk_embedding = orig_pipe_store
-        ctx.embed_text = orig_ctx_embed
+    monkeypatch.setenv("ARKADIA_EMBEDDER", "gemini")
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    from api.oracle_spine import archive_oracle_turn, build_memory_block
+    # Purge any embeddings from prior tests so the JOIN truly returns [].
+    from knowledge.db import execute
+    execute("DELETE FROM embeddings")
+    execute("DELETE FROM chunks")
+    execute("DELETE FROM notes")
+    execute("DELETE FROM threads")
+
+    session_id = "arkana-spine-bm25-004"
+    marker = "SOLARIUN-117-BM25-anchor"
+    archive_oracle_turn(
+        f"Remember this anchor: the project codename is {marker}. Jessica is due soon. Eden Farm.",
+        f"Stored: codename {marker}, Jessica/Eden Farm context.",
+        session_id,
+    )
+    import time; time.sleep(0.05)
+
+    # Confirm the offline condition is real: zero embeddings, nonzero chunks.
+    embs = execute("SELECT COUNT(*) AS n FROM embeddings")[0]["n"]
+    chs = execute("SELECT COUNT(*) AS n FROM chunks")[0]["n"]
+    assert embs == 0, "test precondition: 0 embeddings (offline)"
+    assert chs > 0, "test precondition: chunks exist (archive worked)"
+
+    block, meta = build_memory_block(
+        f"What was the codename {marker} and what is the context?",
+        session_id,
+    )
+    assert meta["notes_retrieved"] >= 1, \
+        "BM25 fallback must retrieve the archived turn when embeddings are absent"
+    assert marker in block, "retrieved context must contain the anchor"
 
 
 def test_private_boundary_user_id_scoping():
@@ -315,3 +264,76 @@ def test_search_private_boundary_cross_user():
     assert any(marker in str(h) for h in uni_a.get("fulltext", []))
     assert not any(marker in str(h) for h in uni_b.get("fulltext", []))
     assert not any(marker in str(h) for h in uni_b.get("semantic", []))
+
+
+# ── Async memory assembly (build_memory_block_async) ─────────────────────────
+
+def test_async_memory_block_matches_sync():
+    import asyncio
+    from api.oracle_spine import archive_oracle_turn, build_memory_block, build_memory_block_async
+
+    session_id = "arkana-spine-async-006"
+    marker = "OpalTessellate4Drift"
+    archive_oracle_turn(f"Keep this: {marker}.", f"Kept {marker}.", session_id)
+
+    block_sync, meta_sync = build_memory_block(marker, session_id)
+    block_async, meta_async = asyncio.run(build_memory_block_async(marker, session_id))
+    assert block_async == block_sync and marker in block_async
+    assert meta_async == meta_sync
+
+
+def test_slow_embedding_degrades_to_keyword_context(monkeypatch):
+    import asyncio
+    import time
+    import api.oracle_spine as spine
+
+    session_id = "arkana-spine-async-007"
+    marker = "KeywordFallbackLumen"        # BM25 tokens are alphabetic
+    spine.archive_oracle_turn(f"Anchor {marker} in the archive.", f"Archived {marker}.", session_id)
+    monkeypatch.setattr(spine, "_embed_query", lambda message: time.sleep(0.5) or [0.1] * 8)
+
+    t0 = time.perf_counter()
+    block, meta = asyncio.run(spine.build_memory_block_async(marker, session_id, embed_deadline=0.05))
+    assert time.perf_counter() - t0 < 0.45
+    assert meta["degraded"] == "embedding_timeout"
+    assert meta["notes_retrieved"] >= 1 and marker in block
+
+
+def test_concurrent_chats_do_not_serialize_on_embedding(monkeypatch):
+    """Load check: 8 chats whose embeddings each take 0.2s finish in well under
+    the 1.6s a blocking call would take, and the event loop stays responsive."""
+    import asyncio
+    import time
+    import api.oracle_spine as spine
+
+    for i in range(8):
+        spine.archive_oracle_turn(f"Load turn {i} ParallelMarker", f"Ack {i}.", f"arkana-load-{i}")
+    real_embed = spine._embed_query
+    monkeypatch.setattr(spine, "_embed_query", lambda message: time.sleep(0.2) or real_embed(message))
+
+    async def run() -> tuple[float, float, list]:
+        lag = 0.0
+        stop = False
+
+        async def heartbeat() -> None:
+            nonlocal lag
+            while not stop:
+                t = time.perf_counter()
+                await asyncio.sleep(0.01)
+                lag = max(lag, time.perf_counter() - t - 0.01)
+
+        beat = asyncio.create_task(heartbeat())
+        t0 = time.perf_counter()
+        results = await asyncio.gather(*(
+            spine.build_memory_block_async("ParallelMarker", f"arkana-load-{i}", embed_deadline=5)
+            for i in range(8)
+        ))
+        elapsed = time.perf_counter() - t0
+        stop = True
+        await beat
+        return elapsed, lag, results
+
+    elapsed, lag, results = asyncio.run(run())
+    assert all(meta["notes_retrieved"] >= 1 for _, meta in results)
+    assert elapsed < 1.2, f"chats serialized: {elapsed:.2f}s"
+    assert lag < 0.1, f"event loop blocked for {lag:.3f}s"
@@ -0,0 +1,125 @@
+"""Oracle token streaming tests (api/oracle_stream.py).
+
+A fake BaseProvider stands in for Gemini; the key pool is stubbed per test.
+
+Covers:
+- First SSE chunk arrives after the first token, not after the full completion
+- The full reply is archived through archive_oracle_turn once the stream ends
+- Fallback across models and keys before the first token
+- No fallback (and no archive) once the first token has been sent
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+import pytest
+
+import api.key_pool as key_pool
+import api.oracle_spine as oracle_spine
+from api.oracle_stream import gemini_stream, oracle_sse, wants_stream
+
+TOKEN_DELAY = 0.05
+
+
+class FakeProvider:
+    """Scripted BaseProvider.stream: behaviour keyed on (model, api_key)."""
+    script: dict = {}
+    calls: list = []
+
+    def __init__(self, model: str, api_key: str | None = None):
+        self.model, self.api_key = model, api_key
+
+    async def stream(self, messages, system_prompt=None, temperature=0.7, **kwargs):
+        FakeProvider.calls.append((self.model, self.api_key))
+        action = self.script.get((self.model, self.api_key), "ok")
+        if action == "quota":
+            raise httpx.HTTPStatusError("429", request=httpx.Request("POST", "https://x"),
+                                        response=httpx.Response(429))
+        if action == "error":
+            raise RuntimeError("model unavailable")
+        for i, token in enumerate(["The ", "field ", "is ", "open", "."]):
+            if i:
+                await asyncio.sleep(TOKEN_DELAY)
+            if action == "break" and i == 2:
+                raise RuntimeError("connection reset")
+            yield token
+
+
+@pytest.fixture(autouse=True)
+def _fakes(monkeypatch):
+    FakeProvider.script, FakeProvider.calls = {}, []
+    keys = iter(["k2", "k3"])
+    failures: list[str] = []
+    monkeypatch.setattr(key_pool, "acquire_key", lambda: next(keys, None))
+    monkeypatch.setattr(key_pool, "report_failure", lambda k, *a, **kw: failures.append(k))
+    monkeypatch.setattr(key_pool, "report_success", lambda k: None)
+    archived: list[tuple] = []
+    done = threading.Event()
+
+    def archive(*args):
+        archived.append(args)
+        done.set()
+
+    monkeypatch.setattr(oracle_spine, "archive_oracle_turn", archive)
+    return {"failures": failures, "archived": archived, "archive_done": done}
+
+
+def _collect(models=("m1", "m2")):
+    """Run the SSE pipeline → [(seconds_since_start, event, data)]."""
+    async def run():
+        t0 = time.perf_counter()
+        chunks = gemini_stream([{"role": "user", "content": "hi"}], "sys", "k1", models,
+                               provider_factory=FakeProvider)
+        out = []
+        async for frame in oracle_sse(chunks, "hi", "sess-1", "uid-1", {"rag_hits": 0}):
+            event, data = frame.strip().split("\n")
+            out.append((time.perf_counter() - t0, event[len("event: "):], json.loads(data[len("data: "):])))
+        return out
+    return asyncio.run(run())
+
+
+def test_first_chunk_precedes_full_completion(_fakes):
+    events = _collect()
+    first_at, total_at = events[0][0], events[-1][0]
+    assert events[0][1:] == ("delta", {"text": "The "})
+    assert first_at < TOKEN_DELAY
+    assert total_at >= 4 * TOKEN_DELAY
+    assert events[-1][1] == "done" and events[-1][2]["rag_hits"] == 0
+
+    assert _fakes["archive_done"].wait(2.0)
+    assert _fakes["archived"] == [("hi", "The field is open.", "sess-1", "uid-1")]
+
+
+def test_fallback_across_models_and_keys_before_first_token(_fakes):
+    FakeProvider.script = {("m1", "k1"): "quota", ("m1", "k2"): "error"}
+    events = _collect()
+    assert "".join(d["text"] for _, e, d in events if e == "delta") == "The field is open."
+    assert FakeProvider.calls == [("m1", "k1"), ("m1", "k2"), ("m2", "k2")]
+    assert _fakes["failures"] == ["k1"]
+
+
+def test_all_attempts_fail_reports_error(_fakes):
+    FakeProvider.script = {(m, k): "error" for m in ("m1", "m2") for k in ("k1", "k2", "k3")}
+    events = _collect()
+    assert [e for _, e, _ in events] == ["error"]
+    assert events[0][2]["partial"] is False
+    assert not _fakes["archived"]
+
+
+def test_no_fallback_after_first_token(_fakes):
+    FakeProvider.script = {("m1", "k1"): "break"}
+    events = _collect()
+    assert [e for _, e, _ in events] == ["delta", "delta", "error"]
+    assert events[-1][2]["partial"] is True
+    assert FakeProvider.calls == [("m1", "k1")]
+    assert not _fakes["archived"]
+
+
+def test_wants_stream():
+    assert wants_stream({"stream": True}, {})
+    assert wants_stream({}, {"accept": "text/event-stream"})
+    assert not wants_stream({}, {"accept": "application/json"})
@@ -0,0 +1,125 @@
+"""Provider selection and health caching (providers/router.py) with fake providers.
+
+Covers:
+- select_provider() reuses cached authenticate() results and re-checks stale
+  ones in the background
+- The circuit opens after repeated send failures, lets one half-open trial
+  through after the cooldown, and closes on success
+- health_all() probes concurrently, answers by its deadline, and caches results
+"""
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from providers import router
+from providers.base import BaseProvider, ProviderResponse
+
+
+class _Fake(BaseProvider):
+    def __init__(self, name: str, authed: bool = True, health_delay: float = 0.0) -> None:
+        self.name = self.display_name = self.model = name
+        self.authed = authed
+        self.health_delay = health_delay
+        self.fail = False
+        self.auth_calls = self.health_calls = 0
+
+    def authenticate(self) -> bool:
+        self.auth_calls += 1
+        return self.authed
+
+    def send(self, messages, system_prompt=None, temperature=0.7, max_tokens=2048, **kwargs):
+        if self.fail:
+            raise RuntimeError("upstream 503")
+        return ProviderResponse("hi", self.model, self.name)
+
+    async def stream(self, messages, system_prompt=None, temperature=0.7, **kwargs):
+        yield "hi"
+
+    def models(self) -> list[str]:
+        return [self.model]
+
+    def capabilities(self) -> list[str]:
+        return ["chat"]
+
+    def health(self) -> dict:
+        self.health_calls += 1
+        time.sleep(self.health_delay)
+        return {"status": "ok", "model": self.model, "latency_ms": 0}
+
+
+@pytest.fixture()
+def fakes(monkeypatch):
+    providers = {"gemini": _Fake("gemini"), "claude": _Fake("claude")}
+    monkeypatch.setattr(router, "_REGISTRY", providers)
+    monkeypatch.setattr(router, "_STATE", {})
+    monkeypatch.setattr(router, "_INITIALISED", True)
+    return providers
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_selection_uses_cached_auth(fakes, monkeypatch):
+    for _ in range(10):
+        assert router.select_provider() is fakes["gemini"]
+    assert fakes["gemini"].auth_calls == 1
+
+    fakes["gemini"].authed = False
+    monkeypatch.setattr(router, "AUTH_TTL_S", 0.0)
+    assert router.select_provider() is fakes["gemini"]          # stale answer, re-check queued
+    _wait_for(lambda: not router._state("gemini").authenticated)
+    assert router.select_provider() is fakes["claude"]
+
+
+def test_circuit_opens_and_recovers(fakes, monkeypatch):
+    monkeypatch.setattr(router, "BREAKER_FAILURES", 2)
+    monkeypatch.setattr(router, "BREAKER_COOLDOWN_S", 0.05)
+    msgs = [{"role": "user", "content": "x"}]
+    fakes["gemini"].fail = True
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            router.send(msgs)
+    assert router._state("gemini").circuit == router.OPEN
+    assert router.send(msgs).provider_name == "claude"         # open circuit skipped
+
+    time.sleep(0.06)
+    fakes["gemini"].fail = False
+    assert router.select_provider() is fakes["gemini"]          # claims the half-open trial
+    assert router.select_provider() is fakes["claude"]          # trial already in flight
+    router.record_success("gemini")
+    assert router._state("gemini").circuit == router.CLOSED
+    assert router.send(msgs).provider_name == "gemini"
+
+
+def test_half_open_failure_reopens(fakes, monkeypatch):
+    monkeypatch.setattr(router, "BREAKER_FAILURES", 1)
+    monkeypatch.setattr(router, "BREAKER_COOLDOWN_S", 0.05)
+    router.record_failure("gemini")
+    time.sleep(0.06)
+    assert router.select_provider() is fakes["gemini"]
+    router.record_failure("gemini")
+    assert router._state("gemini").circuit == router.OPEN
+    assert router.select_provider() is fakes["claude"]
+
+
+def test_health_all_concurrent_with_deadline(fakes):
+    fakes["gemini"].health_delay = 0.3
+    fakes["claude"].health_delay = 0.3
+    fakes["local"] = _Fake("local", health_delay=2.0)
+
+    t0 = time.perf_counter()
+    results = {h["provider"]: h for h in router.health_all(deadline=0.6)}
+    elapsed = time.perf_counter() - t0
+    assert elapsed < 1.0                                         # parallel, bounded by the deadline
+    assert results["gemini"]["status"] == results["claude"]["status"] == "ok"
+    assert results["local"]["status"] == "error" and "exceeded" in results["local"]["reason"]
+
+    router.health_all(deadline=0.6)                              # cached; slow probe not restarted
+    assert fakes["gemini"].health_calls == 1 and fakes["local"].health_calls == 1
+    _wait_for(lambda: router._state("local").health is not None)
+    assert {h["provider"]: h["status"] for h in router.health_all()}["local"] == "ok"
@@ -1,7 +1,12 @@
 """Phase 1 — rate limit unit tests (in-process, no network)."""
 from __future__ import annotations
 
+import pytest
+
+import api.rate_limit as rate_limit
 from api.rate_limit import (
+    MemoryBackend,
+    SQLiteBackend,
     check_rate_limit,
     reset_rate_limit_state,
     load_limits,
@@ -49,3 +54,51 @@ def test_exempt_paths():
     assert _is_exempt("/api/knowledge/status")
     assert _is_exempt("/health")
     assert not _is_exempt("/api/commune/resonance")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(rate_limit.time, "time", lambda: now[0])
+    return now
+
+
+def test_tokens_refill_over_window(clock):
+    for _ in range(3):
+        check_rate_limit("t3", max_requests=3, window=60)
+    ok, retry = check_rate_limit("t3", max_requests=3, window=60)
+    assert not ok and retry == 20          # one token per 20s
+    clock[0] += 20
+    assert check_rate_limit("t3", max_requests=3, window=60) == (True, 0)
+    assert not check_rate_limit("t3", max_requests=3, window=60)[0]
+
+
+def test_idle_buckets_evicted_and_key_count_capped(clock):
+    backend = MemoryBackend(max_keys=8, shards=1)
+    for i in range(5):
+        backend.check(f"ip:{i}", 3, 60)
+    clock[0] += 61                          # all five refilled → evictable
+    backend.check("ip:new", 3, 60)
+    assert backend.stats()["tracked_keys"] == 1
+    assert backend.stats()["evicted_idle"] == 5
+
+    for i in range(20):
+        backend.check(f"burst:{i}", 3, 60)
+    stats = backend.stats()
+    assert stats["tracked_keys"] == 8 and stats["evicted_cap"] == 13
+
+
+def test_sqlite_backend_shared_between_workers(tmp_path, clock):
+    path = str(tmp_path / "rl.db")
+    worker_a, worker_b = SQLiteBackend(path), SQLiteBackend(path)
+    assert worker_a.check("uid:u|/api/", 3, 60) == (True, 0)
+    assert worker_b.check("uid:u|/api/", 3, 60) == (True, 0)
+    assert worker_a.check("uid:u|/api/", 3, 60) == (True, 0)
+    assert worker_b.check("uid:u|/api/", 3, 60) == (False, 20)
+    clock[0] += 20
+    assert worker_b.check("uid:u|/api/", 3, 60) == (True, 0)
+
+    clock[0] += 3600
+    worker_a._next_sweep = 0
+    worker_a.check("uid:other|/api/", 3, 60)   # sweep drops the refilled bucket
+    assert worker_b.stats()["tracked_keys"] == 1
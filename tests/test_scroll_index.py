@@ -0,0 +1,86 @@
+"""Corpus RAG index (api/scroll_index.py).
+
+Covers:
+- Ranking puts scrolls matching more query words first, BM25 within a tier
+- Query words match as prefixes of indexed terms only (no mid-word matches);
+  capped expansions keep the terms found in the most scrolls
+- Scrolls missing from the index (direct uploads) are still found
+- A refresh with unchanged text keeps the index; changed text re-tokenises
+  only the changed scrolls and swaps the index in
+"""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from api import scroll_index
+
+
+def _scroll(sid: str, content: str, label: str = "") -> dict:
+    return {"id": sid, "label": label or sid, "description": "", "preview": content[:40],
+            "content": content, "category": "codex"}
+
+
+@pytest.fixture()
+def corpus(monkeypatch):
+    monkeypatch.setattr(scroll_index, "_index", scroll_index._EMPTY)
+    scrolls = {s["id"]: s for s in (
+        _scroll("a", "the spiral resonance of the lattice and the lattice again"),
+        _scroll("b", "resonant harmonics across the spiral"),
+        _scroll("c", "notes about gardening and soil"),
+        _scroll("d", ""),
+    )}
+    asyncio.run(scroll_index.refresh(scrolls))
+    return scrolls
+
+
+def test_ranks_by_coverage_then_bm25(corpus):
+    top = scroll_index.search("spiral lattice", corpus)
+    assert [s["id"] for s in top] == ["a", "b"]
+    assert scroll_index.search("gardening", corpus)[0]["id"] == "c"
+    assert scroll_index.search("xyzzy nothing", corpus) == []
+    assert scroll_index.search("of", corpus) == []              # shorter than three characters
+
+
+def test_prefix_matching(corpus):
+    ids = {s["id"] for s in scroll_index.search("resonan", corpus)}
+    assert ids == {"a", "b"}
+
+
+def test_unindexed_scrolls_are_scored(corpus):
+    scrolls = dict(corpus, upload=_scroll("upload", "a fresh lattice upload"))
+    assert "upload" in {s["id"] for s in scroll_index.search("lattice", scrolls)}
+    assert scroll_index.search("lattice", {}) == []
+
+
+def test_refresh_reuses_unchanged_text(corpus):
+    before = scroll_index._index
+    copy = {sid: dict(s) for sid, s in corpus.items()}
+    asyncio.run(scroll_index.refresh(copy))
+    assert scroll_index._index is before
+    assert scroll_index.search("gardening", copy)[0] is copy["c"]   # served from the live dict
+
+    copy["c"] = _scroll("c", "composting and lattice soil")
+    asyncio.run(scroll_index.refresh(copy))
+    assert scroll_index._index is not before
+    assert scroll_index._index.retokenised == 1
+    assert {s["id"] for s in scroll_index.search("composting", copy)} == {"c"}
+    assert scroll_index.stats()["scrolls"] == 3
+
+
+def test_prefix_only_no_mid_word_matches(corpus):
+    assert scroll_index.search("sonance", corpus) == []         # the old substring scan matched "resonance"
+    assert scroll_index.search("resonance", corpus)[0]["id"] == "a"
+
+
+def test_capped_expansions_keep_most_widespread_terms(monkeypatch):
+    monkeypatch.setattr(scroll_index, "_index", scroll_index._EMPTY)
+    monkeypatch.setattr(scroll_index, "MAX_PREFIX_EXPANSIONS", 3)
+    scrolls = {f"s{i}": _scroll(f"s{i}", f"stone{chr(97 + i)} " + "stonez " * (i % 2)) for i in range(6)}
+    scrolls["w"] = _scroll("w", "stonez stone")
+    asyncio.run(scroll_index.refresh(scrolls))
+    # "stone" itself, then "stonez" (in four scrolls) before the alphabetically earlier one-off terms
+    assert scroll_index._index.expand("stone")[:2] == ["stone", "stonez"]
+    assert len(scroll_index._index.expand("stone")) == 3
+    assert "w" in {s["id"] for s in scroll_index.search("stone", scrolls, top_n=10)}
@@ -0,0 +1,164 @@
+"""Incremental GitHub scroll sync tests (api/scroll_sync.py).
+
+GitHub is simulated with httpx.MockTransport; sync state lives in a
+temporary runtime DB.
+
+Covers:
+- First sync downloads every readable file through one shared client
+- Without an explicit client, syncs reuse the pooled client and never close it
+- No-change sync = one conditional tree request (also after a restart)
+- Changed tree → only files whose blob SHA changed are fetched; removed files dropped
+- Failed downloads are reported and retried on the next sync
+- Download concurrency is bounded
+"""
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from api.scroll_sync import sync_corpus
+from kernel.storage.corpus_sync_store import CorpusSyncStore
+
+REPO, BRANCH = "owner/repo", "main"
+
+
+class FakeGitHub:
+    def __init__(self, files: dict[str, str]):
+        self.files = dict(files)
+        self.requests: list[httpx.Request] = []
+        self.fail: set[str] = set()
+        self.in_flight = 0
+        self.peak = 0
+
+    def _sha(self, path: str) -> str:
+        return f"sha-{abs(hash(self.files[path]))}"
+
+    def tree_sha(self) -> str:
+        return "tree-" + "-".join(self._sha(p) for p in sorted(self.files))
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.url.host == "api.github.com":
+            etag = f'"{self.tree_sha()}"'
+            if request.headers.get("If-None-Match") == etag:
+                return httpx.Response(304)
+            tree = [{"path": p, "type": "blob", "sha": self._sha(p)} for p in self.files]
+            return httpx.Response(200, json={"sha": self.tree_sha(), "tree": tree},
+                                  headers={"ETag": etag})
+        path = request.url.path.split(f"/{REPO}/{BRANCH}/", 1)[1]
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.005)
+        self.in_flight -= 1
+        if path in self.fail:
+            return httpx.Response(500)
+        etag = f'"{self._sha(path)}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        return httpx.Response(200, text=self.files[path], headers={"ETag": etag})
+
+    def raw_requests(self) -> list[str]:
+        return [r.url.path for r in self.requests if r.url.host != "api.github.com"]
+
+
+@pytest.fixture()
+def db_path(tmp_path):
+    return str(tmp_path / "runtime.db")
+
+
+def _sync(gh: FakeGitHub, db_path: str, **kw):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(gh.handler)) as client:
+            return await sync_corpus(
+                REPO, BRANCH, "token",
+                is_corpus_file=lambda p: p.endswith((".md", ".docx")),
+                is_readable=lambda p: p.endswith(".md"),
+                client=client, store=CorpusSyncStore(db_path), **kw,
+            )
+    return asyncio.run(run())
+
+
+def test_first_sync_fetches_all_readable_files(db_path):
+    gh = FakeGitHub({"docs/a.md": "alpha", "docs/b.md": "beta", "Oversoul_Prism/c.docx": "bin"})
+    result = _sync(gh, db_path)
+    assert result.fetched == 2 and not result.unchanged
+    assert result.files["docs/a.md"]["content"] == "alpha"
+    assert result.files["Oversoul_Prism/c.docx"]["content"] == ""
+    assert len(gh.raw_requests()) == 2
+
+
+def test_unchanged_sync_is_one_request_even_after_restart(db_path):
+    gh = FakeGitHub({"docs/a.md": "alpha", "docs/b.md": "beta"})
+    _sync(gh, db_path)
+    gh.requests.clear()
+
+    result = _sync(gh, db_path)   # fresh CorpusSyncStore = restarted process
+    assert len(gh.requests) == 1
+    assert gh.requests[0].headers["If-None-Match"] == f'"{gh.tree_sha()}"'
+    assert result.unchanged
+    assert {p: f["content"] for p, f in result.files.items()} == {"docs/a.md": "alpha", "docs/b.md": "beta"}
+
+
+def test_only_changed_files_are_fetched(db_path):
+    gh = FakeGitHub({"docs/a.md": "alpha", "docs/b.md": "beta", "docs/gone.md": "x"})
+    _sync(gh, db_path)
+    gh.requests.clear()
+
+    gh.files["docs/b.md"] = "beta v2"
+    del gh.files["docs/gone.md"]
+    result = _sync(gh, db_path)
+    assert gh.raw_requests() == [f"/{REPO}/{BRANCH}/docs/b.md"]
+    assert result.files["docs/b.md"]["content"] == "beta v2"
+    assert "docs/gone.md" not in result.files
+    assert set(CorpusSyncStore(db_path).files(f"{REPO}:{BRANCH}")) == {"docs/a.md", "docs/b.md"}
+
+
+def test_failed_download_is_retried_next_sync(db_path):
+    gh = FakeGitHub({"docs/a.md": "alpha", "docs/b.md": "beta"})
+    gh.fail.add("docs/b.md")
+    result = _sync(gh, db_path)
+    assert result.errors == 1 and result.files["docs/b.md"]["error"]
+    assert CorpusSyncStore(db_path).tree_state(f"{REPO}:{BRANCH}") is None
+
+    gh.fail.clear()
+    gh.requests.clear()
+    result = _sync(gh, db_path)
+    assert gh.raw_requests() == [f"/{REPO}/{BRANCH}/docs/b.md"]
+    assert result.files["docs/b.md"]["content"] == "beta" and not result.errors
+
+
+def test_download_concurrency_is_bounded(db_path):
+    gh = FakeGitHub({f"docs/{i}.md": f"body {i}" for i in range(30)})
+    result = _sync(gh, db_path, concurrency=4)
+    assert result.fetched == 30
+    assert 1 < gh.peak <= 4
+
+
+def test_default_client_is_the_shared_pool(db_path, monkeypatch):
+    from providers import http_pool
+
+    gh = FakeGitHub({"docs/a.md": "alpha"})
+    pooled = []
+
+    def async_client():
+        if not pooled:
+            pooled.append(httpx.AsyncClient(transport=httpx.MockTransport(gh.handler)))
+        return pooled[0]
+
+    monkeypatch.setattr(http_pool, "async_client", async_client)
+
+    async def run():
+        for _ in range(2):
+            await sync_corpus(
+                REPO, BRANCH, "token",
+                is_corpus_file=lambda p: p.endswith(".md"), is_readable=lambda p: True,
+                store=CorpusSyncStore(db_path),
+            )
+        closed = pooled[0].is_closed
+        await pooled[0].aclose()
+        return closed
+
+    assert asyncio.run(run()) is False       # kept open for the next sync
+    assert len(gh.requests) == 3             # tree + file, then one conditional tree request
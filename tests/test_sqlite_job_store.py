@@ -255,3 +255,71 @@ def test_reset_clears_all_jobs(store):
     store.reset()
     assert store.list() == []
     assert store.stats()["total"] == 0
+
+
+# ── event-driven wake-up ──────────────────────────────────────────────────────
+
+def test_waiting_worker_woken_by_create(store):
+    """A blocked next_job_id() returns as soon as a job is enqueued in-process,
+    not on the next re-check tick."""
+    result: dict = {}
+
+    def worker():
+        result["job_id"] = store.next_job_id(timeout=2.0)
+        result["claimed_at"] = time.perf_counter()
+
+    t = threading.Thread(target=worker)
+    t.start()
+    time.sleep(0.01)   # let the worker block
+    enqueued_at = time.perf_counter()
+    job = store.create({"t": "wake"})
+    t.join()
+    assert result["job_id"] == job["job_id"]
+    # well before the 0.5 s re-check tick, with room for a loaded runner
+    assert result["claimed_at"] - enqueued_at < 0.1
+
+
+def test_requeue_wakes_waiter(store):
+    jid = store.create({"t": 1})["job_id"]
+    assert store.next_job_id(timeout=0.1) == jid
+    got: list = []
+    t = threading.Thread(target=lambda: got.append(store.next_job_id(timeout=2.0)))
+    t.start()
+    time.sleep(0.01)
+    started = time.perf_counter()
+    store.requeue_for_retry(jid, error="transient")
+    t.join()
+    assert got == [jid]
+    assert time.perf_counter() - started < 0.25
+
+
+def test_update_does_not_reread(store, monkeypatch):
+    job = store.create({"t": 1})
+    monkeypatch.setattr(store, "get", lambda job_id: pytest.fail("update must not re-read"))
+    done = store.mark_completed(job["job_id"], result={"ok": True})
+    assert done["status"] == COMPLETED and done["result"] == {"ok": True}
+    assert store.update("job_missing", status=FAILED) is None
+
+
+# ── default store + legacy snapshot import ────────────────────────────────────
+
+def test_get_store_defaults_to_sqlite_and_imports_snapshot(tmp_path, monkeypatch):
+    import json
+    import kernel.jobs as jobs
+
+    snapshot = tmp_path / "job_store.json"
+    snapshot.write_text(json.dumps({
+        "job_done": {"job_id": "job_done", "status": COMPLETED, "intent": {"t": 1},
+                     "result": {"ok": True}, "created_at": 1.0},
+        "job_busy": {"job_id": "job_busy", "status": RUNNING, "intent": {"t": 2},
+                     "created_at": 2.0},
+    }))
+    monkeypatch.setenv("ARKADIA_DB_PATH", str(tmp_path / "runtime.db"))
+    monkeypatch.delenv("SOLSPIRE_JOB_STORE", raising=False)
+    monkeypatch.setattr(jobs, "_SNAPSHOT_PATH", str(snapshot))
+    monkeypatch.setattr(jobs, "_store", None)
+
+    store = jobs.get_store()
+    assert isinstance(store, SQLiteJobStore)
+    assert store.get("job_done")["result"] == {"ok": True}
+    assert store.next_job_id(timeout=0.1) == "job_busy"
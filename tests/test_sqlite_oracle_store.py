@@ -0,0 +1,97 @@
+"""Oracle store tests (kernel/oracle_store.py over kernel/storage/sqlite_oracle_store.py).
+
+Covers:
+- Public API return shapes unchanged (transactions, balance, loops, assets, events)
+- Open loops upsert by loop text
+- snapshot() is bounded to the newest rows, oldest first
+- Event log compaction keeps the newest `retention` events
+- Legacy data/oracle_store.json imported on first open
+- memory.retrieve_context() reads through the bounded API
+"""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from kernel import memory, oracle_store
+from kernel.storage import sqlite_oracle_store
+from kernel.storage.sqlite_oracle_store import SQLiteOracleStore
+
+
+@pytest.fixture()
+def store(tmp_path, monkeypatch):
+    s = SQLiteOracleStore(str(tmp_path / "runtime.db"), retention=50)
+    monkeypatch.setattr(oracle_store, "_store", s)
+    return s
+
+
+def test_public_api_shapes(store):
+    written = oracle_store.write_transaction({"amount": "12.5", "currency": "usd", "party": "A"})
+    assert written["status"] == "written"
+    assert written["transaction"]["currency"] == "USD" and written["transaction"]["amount"] == 12.5
+    oracle_store.write_transaction({"amount": -2.25, "currency": "USD"})
+    oracle_store.write_transaction({"amount": "bad", "currency": "EUR"})
+    assert oracle_store.update_balance({}) == {"status": "success", "balance": {"USD": 10.25, "EUR": 0.0}}
+
+    asset = oracle_store.store_asset({"kind": "image", "count": "3", "prompt": "sun"}, refs=["r1"])
+    assert asset["asset"]["refs"] == ["r1"] and asset["asset"]["count"] == 3
+    evt = oracle_store.log_event("ping", {"payload": {"x": 1}})
+    assert evt["status"] == "written" and evt["event_id"].startswith("evt_")
+
+    snap = oracle_store.snapshot()
+    assert set(snap) == {"transactions", "open_loops", "assets", "balance", "events"}
+    assert snap["balance"] == {"USD": 10.25, "EUR": 0.0}
+    assert snap["assets"][0]["prompt"] == "sun"
+    assert snap["events"][-1]["payload"] == {"kind": "ping", "payload": {"x": 1}}
+    assert [e["payload"]["kind"] for e in snap["events"]].count("transaction") == 3
+
+
+def test_open_loops_upsert_by_text(store):
+    assert oracle_store.update_open_loops({"loop": "  "})["status"] == "skipped"
+    first = oracle_store.update_open_loops({"loop": "Ship v2"})["loop"]
+    second = oracle_store.update_open_loops({"loop": "Ship v2", "status": "CLOSED"})["loop"]
+    assert second["id"] == first["id"] and second["status"] == "closed"
+    assert len(oracle_store.snapshot()["open_loops"]) == 1
+
+
+def test_snapshot_is_bounded_and_ordered(store):
+    for i in range(30):
+        oracle_store.write_to_oracle({"n": i})
+    snap = oracle_store.snapshot(limit=5)
+    assert [e["payload"]["n"] for e in snap["events"]] == [25, 26, 27, 28, 29]
+    assert len(oracle_store.snapshot(limit=None)["events"]) == 30
+    assert next(oracle_store.iter_events())["payload"] == {"n": 29}
+
+
+def test_compaction_keeps_newest_events(store, monkeypatch):
+    monkeypatch.setattr(sqlite_oracle_store, "COMPACT_EVERY", 20)
+    for i in range(120):
+        store.append_event({"n": i})
+    assert 50 <= store.stats()["events"] < 70
+    store.compact()
+    events = list(store.iter_events(newest_first=False))
+    assert len(events) == 50 and events[0]["payload"] == {"n": 70}
+
+
+def test_legacy_json_imported_on_first_open(tmp_path, monkeypatch):
+    legacy = tmp_path / "oracle_store.json"
+    legacy.write_text(json.dumps({
+        "transactions": [{"id": "txn_1", "ts": 1.0, "amount": 5, "currency": "usd"}],
+        "open_loops": [{"id": "loop_1", "ts": 1.0, "loop": "Old loop", "status": "open"}],
+        "assets": [],
+        "balance": {"USD": 5},
+        "events": [{"id": f"evt_{i}", "ts": float(i), "payload": {"n": i}} for i in range(80)],
+    }))
+    monkeypatch.setattr(oracle_store, "_STORE_PATH", str(legacy))
+    monkeypatch.setattr(oracle_store, "_store", None)
+    monkeypatch.setenv("ARKADIA_DB_PATH", str(tmp_path / "runtime.db"))
+
+    snap = oracle_store.snapshot(limit=None)
+    assert snap["balance"] == {"USD": 5.0}
+    assert snap["transactions"][0]["id"] == "txn_1"
+    assert snap["open_loops"][0]["loop"] == "Old loop"
+    assert len(snap["events"]) == 80 and snap["events"][-1]["id"] == "evt_79"
+
+    ctx = memory.retrieve_context("unrelated words", max_items=1)
+    assert ctx["balance"] == {"USD": 5.0} and len(ctx["recent_transactions"]) == 1
@@ -0,0 +1,74 @@
+"""Knowledge OS — static ingestion manifest tests (knowledge/static_ingestion.py).
+
+Covers:
+- First run ingests every file and records the manifest
+- Unchanged files are skipped without being read
+- Touched-but-identical files refresh the manifest without re-ingesting
+- Edited files are re-ingested in scan order; directories matching the glob are ignored
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+
+import pytest
+
+_tmpdir = tempfile.mkdtemp(prefix="arkadia_static_ingest_")
+os.environ.setdefault("ARKADIA_DB_PATH", os.path.join(_tmpdir, "test.db"))
+
+from knowledge import static_ingestion as k5  # noqa: E402
+from knowledge.db import execute, execute_one  # noqa: E402
+
+
+@pytest.fixture()
+def corpus(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)                 # vault/ Markdown lands in tmp
+    root = tmp_path / "static"
+    root.mkdir()
+    monkeypatch.setattr(k5, "_REPO_ROOT", tmp_path)
+    monkeypatch.setattr(k5, "_SOURCES", [{
+        "root": root, "glob": "**/*.md", "note_type": "scroll",
+        "tags": ["static-corpus"], "source_provider": "static:test",
+    }])
+    for table in ("static_manifest", "chunks", "note_tags", "notes"):
+        execute(f"DELETE FROM {table}")
+    for i in range(12):
+        (root / f"scroll_{i}.md").write_text(f"---\ntitle: Scroll {i}\n---\n" + f"Line {i} of the codex. " * 20)
+    (root / "tiny.md").write_text("too short")
+    reads: list[str] = []
+    real = k5._prepare
+    monkeypatch.setattr(k5, "_prepare", lambda path: (reads.append(path.name), real(path))[1])
+    return root, reads
+
+
+def test_first_run_ingests_and_records_manifest(corpus):
+    root, reads = corpus
+    summary = k5.run_static_ingestion(max_workers=4)
+    assert summary == {"ingested": 12, "skipped": 1, "unchanged": 0, "errors": 0}
+    assert len(reads) == 13
+    row = execute_one("SELECT * FROM static_manifest WHERE path = 'static/scroll_3.md'")
+    assert row["note_id"] and row["size"] == (root / "scroll_3.md").stat().st_size
+    titles = [r["title"] for r in execute("SELECT title FROM notes ORDER BY id")]
+    assert titles == [f"Scroll {p.stem.split('_')[1]}" for p in sorted(root.glob("scroll_*.md"))]
+
+
+def test_unchanged_tree_is_not_read(corpus):
+    k5.run_static_ingestion()
+    corpus[1].clear()
+    assert k5.run_static_ingestion() == {"ingested": 0, "skipped": 0, "unchanged": 13, "errors": 0}
+    assert corpus[1] == []
+
+
+def test_touched_edited_and_broken_files(corpus):
+    root, reads = corpus
+    k5.run_static_ingestion()
+    reads.clear()
+    touched, edited = root / "scroll_1.md", root / "scroll_2.md"
+    os.utime(touched, ns=(0, touched.stat().st_mtime_ns + 10**9))
+    edited.write_text(edited.read_text() + "\nA new verse.")
+    (root / "broken.md").mkdir()                 # glob match that is not a file → ignored
+    summary = k5.run_static_ingestion()
+    assert summary == {"ingested": 1, "skipped": 1, "unchanged": 11, "errors": 0}
+    assert sorted(reads) == ["scroll_1.md", "scroll_2.md"]
+    assert execute_one("SELECT COUNT(*) AS n FROM notes")["n"] == 13
+    assert k5.run_static_ingestion()["unchanged"] == 13
@@ -0,0 +1,75 @@
+"""Knowledge OS — indexed candidate generation for enrichment (knowledge/title_keys.py).
+
+Covers:
+- Triggers queue new and retitled notes; sync() (re)indexes them, deletes cascade
+- Chapter sequence and title-word scorers find peers through the index
+- Shared-tag candidates are capped per scorer even for a corpus-wide tag
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+
+import pytest
+
+_tmpdir = tempfile.mkdtemp(prefix="arkadia_title_keys_")
+os.environ.setdefault("ARKADIA_DB_PATH", os.path.join(_tmpdir, "test.db"))
+
+from knowledge import enrichment, title_keys  # noqa: E402
+from knowledge.db import execute, execute_one  # noqa: E402
+from conftest import make_note  # noqa: E402
+
+
+pytestmark = pytest.mark.usefixtures("clean_knowledge_db")
+
+
+def _keys(note_id: int) -> set[tuple[str, str]]:
+    return {(r["kind"], r["key"]) for r in execute(
+        "SELECT kind, key FROM title_keys WHERE note_id = ?", (note_id,)
+    )}
+
+
+def test_triggers_queue_and_sync_maintains_keys():
+    ch = make_note("Chapter 7 The Lattice", note_type="chapter")
+    doc = make_note("Harmonic Lattice Covenant", note_type="document")
+    assert execute_one("SELECT COUNT(*) AS n FROM title_key_queue")["n"] >= 2
+    assert title_keys.sync() >= 2
+    assert _keys(ch) == {("chapter", "7")}
+    assert _keys(doc) == {("word", "harmonic"), ("word", "lattice"), ("word", "covenant")}
+    assert title_keys.sync() == 0
+
+    execute("UPDATE notes SET title = 'Chapter 8 Onward' WHERE id = ?", (ch,))
+    title_keys.sync()
+    assert _keys(ch) == {("chapter", "8")}
+
+    execute("DELETE FROM notes WHERE id = ?", (doc,))
+    assert _keys(doc) == set()
+
+
+def test_type_affinity_uses_index():
+    prev = make_note("Chapter 3 Origins", note_type="chapter")
+    make_note("Chapter 5 Elsewhere", note_type="chapter")
+    peer = make_note("Spiral Codex Resonance", note_type="scroll")
+    make_note("Unrelated Threshold Meridian", note_type="document")
+    cur = make_note("Chapter 4 Descent", note_type="chapter")
+    doc = make_note("Spiral Codex Archive", note_type="document")
+    title_keys.sync()
+
+    chapter_links = enrichment._type_affinity_links(execute_one("SELECT * FROM notes WHERE id = ?", (cur,)))
+    assert [(t, rel) for t, rel, _, _ in chapter_links] == [(prev, "follows")]
+
+    doc_links = enrichment._type_affinity_links(execute_one("SELECT * FROM notes WHERE id = ?", (doc,)))
+    assert [(t, rel, w) for t, rel, w, _ in doc_links] == [(peer, "references", 0.5)]
+
+
+def test_shared_tag_candidates_are_capped():
+    for i in range(enrichment.MAX_CANDIDATES_PER_SCORER + 20):
+        make_note(f"bulk {i}", tags=["static-corpus", "codex"])
+    target = make_note("target", tags=["static-corpus", "codex"])
+    result = enrichment.enrich_note(target)
+    assert result["candidates"] == enrichment.MAX_CANDIDATES_PER_SCORER
+    assert result["edges_created"] == enrichment.MAX_CANDIDATES_PER_SCORER
+    weights = {r["weight"] for r in execute(
+        "SELECT weight FROM graph_edges WHERE source_note_id = ?", (target,)
+    )}
+    assert weights == {1.0}
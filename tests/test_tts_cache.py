@@ -0,0 +1,93 @@
+"""TTS audio cache tests (kernel/tts_cache.py + kernel.tts.synthesize).
+
+Covers:
+- Byte-budgeted LRU eviction, with recency refreshed on hit
+- Index rebuilt from disk (recency survives a restart)
+- synthesize() serves repeated phrases from disk without calling the engine
+- Cache key separates voice / speed but ignores whitespace differences
+- synthesize_async() runs on the shared executor
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from kernel import tts
+from kernel.tts_cache import AudioCache, get_audio_cache, reset_audio_cache
+
+
+def test_lru_eviction_respects_byte_budget(tmp_path):
+    cache = AudioCache(str(tmp_path), max_bytes=250)
+    for name in ("a", "b"):
+        cache.put(name, name.encode() * 100, "audio/mpeg")
+    assert cache.get("a")[0] == b"a" * 100          # a becomes most recent
+    cache.put("c", b"c" * 100, "audio/wav")          # 300 bytes > 250 → evict b
+    assert cache.get("b") is None
+    assert cache.get("c") == (b"c" * 100, "audio/wav")
+    s = cache.stats()
+    assert (s["entries"], s["bytes"], s["evictions"]) == (2, 200, 1)
+    assert (s["hits"], s["misses"]) == (2, 1)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.mp3", "c.wav"]
+
+
+def test_index_survives_restart(tmp_path):
+    cache = AudioCache(str(tmp_path), max_bytes=250)
+    cache.put("a", b"a" * 100, "audio/mpeg")
+    time.sleep(0.01)
+    cache.put("b", b"b" * 100, "audio/mpeg")
+    time.sleep(0.01)
+    cache.get("a")
+
+    reopened = AudioCache(str(tmp_path), max_bytes=250)
+    assert reopened.stats()["bytes"] == 200
+    reopened.put("c", b"c" * 100, "audio/mpeg")
+    assert reopened.get("b") is None and reopened.get("a") is not None
+
+
+@pytest.fixture()
+def edge_calls(tmp_path, monkeypatch):
+    monkeypatch.setenv("ARKADIA_TTS_CACHE_DIR", str(tmp_path / "tts"))
+    monkeypatch.setenv("ARKADIA_TTS_CACHE_MB", "1")
+    monkeypatch.setattr(tts, "_get_elevenlabs_key", lambda: "")
+    reset_audio_cache()
+    calls: list[tuple] = []
+
+    async def fake_edge(plain, voice_id, rate):
+        calls.append((plain, voice_id, rate))
+        await asyncio.sleep(0.2)
+        return b"ID3" + plain.encode() * 10
+
+    monkeypatch.setattr(tts, "_synthesize_edge", fake_edge)
+    yield calls
+    reset_audio_cache()
+
+
+def test_repeated_phrase_served_from_disk(edge_calls):
+    audio, media, engine = tts.synthesize("The **field** is open.", "aria")
+    assert engine == "edge_tts" and media == "audio/mpeg"
+
+    t0 = time.perf_counter()
+    again = tts.synthesize("The field   is open.", "aria")
+    assert time.perf_counter() - t0 < 0.05
+    assert again == (audio, media, engine)
+    assert len(edge_calls) == 1
+    assert get_audio_cache().stats()["hits"] == 1
+
+
+def test_voice_and_speed_are_part_of_the_key(edge_calls):
+    tts.synthesize("Resonance holds.", "aria")
+    tts.synthesize("Resonance holds.", "george")
+    tts.synthesize("Resonance holds.", "aria", speed=1.5)
+    tts.synthesize("Resonance holds.", "aria")
+    assert len(edge_calls) == 3
+
+
+def test_synthesize_async_uses_shared_executor(edge_calls):
+    async def run():
+        return await asyncio.gather(*(tts.synthesize_async(f"phrase {i}") for i in range(4)))
+    t0 = time.perf_counter()
+    results = asyncio.run(run())
+    assert [r[2] for r in results] == ["edge_tts"] * 4
+    assert time.perf_counter() - t0 < 0.6   # 4 × 0.2 s ran concurrently
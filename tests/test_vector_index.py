@@ -0,0 +1,157 @@
+"""Knowledge OS — memory-mapped vector index tests.
+
+Covers:
+- Incremental sync from the embeddings table (no rebuild per query)
+- Top-k ordering and the note_ids access filter
+- Deletes and vector updates flowing through the embedding_changes triggers
+- Applied change rows are pruned; a reader behind the pruned log rebuilds
+- Persistence across instances and rebuild when SQLite is behind the watermarks
+- semantic_search() served from the index
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+_tmpdir = tempfile.mkdtemp(prefix="arkadia_vecindex_")
+os.environ.setdefault("ARKADIA_DB_PATH", os.path.join(_tmpdir, "test.db"))
+
+from knowledge.db import execute, last_insert_id  # noqa: E402
+from knowledge.vector_index import VectorIndex  # noqa: E402
+from conftest import make_note  # noqa: E402
+
+
+pytestmark = pytest.mark.usefixtures("clean_knowledge_db")
+
+
+@pytest.fixture()
+def index(tmp_path):
+    return VectorIndex(tmp_path / "vecindex")
+
+
+def _chunk(note_id: int, content: str, vector: list[float]) -> int:
+    execute("INSERT INTO chunks (note_id, content) VALUES (?, ?)", (note_id, content))
+    chunk_id = last_insert_id()
+    execute(
+        "INSERT INTO embeddings (chunk_id, vector) VALUES (?, ?)",
+        (chunk_id, json.dumps(vector)),
+    )
+    return chunk_id
+
+
+def test_search_ranks_by_cosine(index):
+    n = make_note("a")
+    c_x = _chunk(n, "x", [1.0, 0.0, 0.0])
+    c_xy = _chunk(n, "xy", [1.0, 1.0, 0.0])
+    _chunk(n, "z", [0.0, 0.0, 1.0])
+
+    hits = index.search([1.0, 0.0, 0.0], top_k=2)
+    assert [h["chunk_id"] for h in hits] == [c_x, c_xy]
+    assert hits[0]["score"] == pytest.approx(1.0, abs=1e-6)
+    assert hits[1]["score"] == pytest.approx(2 ** -0.5, abs=1e-6)
+
+
+def test_new_embeddings_picked_up_incrementally(index):
+    n = make_note("a")
+    _chunk(n, "x", [1.0, 0.0])
+    assert len(index.search([1.0, 0.0], top_k=10)) == 1
+    c2 = _chunk(n, "y", [0.0, 1.0])
+    hits = index.search([0.0, 1.0], top_k=10)
+    assert hits[0]["chunk_id"] == c2
+    assert index.stats()["rows"] == 2
+
+
+def test_note_filter(index):
+    a = make_note("a")
+    b = make_note("b")
+    _chunk(a, "a", [1.0, 0.0])
+    cb = _chunk(b, "b", [0.9, 0.1])
+    hits = index.search([1.0, 0.0], top_k=10, note_ids={b})
+    assert [h["chunk_id"] for h in hits] == [cb]
+    assert index.search([1.0, 0.0], top_k=10, note_ids=set()) == []
+
+
+def test_delete_and_update_flow_through_triggers(index):
+    n = make_note("a")
+    c1 = _chunk(n, "one", [1.0, 0.0])
+    c2 = _chunk(n, "two", [0.0, 1.0])
+    assert len(index.search([1.0, 0.0], top_k=10)) == 2
+
+    execute("DELETE FROM chunks WHERE id = ?", (c1,))  # cascades to embeddings
+    assert [h["chunk_id"] for h in index.search([1.0, 0.0], top_k=10)] == [c2]
+
+    execute("UPDATE embeddings SET vector = ? WHERE chunk_id = ?", (json.dumps([1.0, 0.0]), c2))
+    hits = index.search([1.0, 0.0], top_k=10)
+    assert hits[0]["chunk_id"] == c2
+    assert hits[0]["score"] == pytest.approx(1.0, abs=1e-6)
+
+
+def test_applied_changes_are_pruned(tmp_path):
+    n = make_note("a")
+    chunks = [_chunk(n, f"c{i}", [1.0, float(i)]) for i in range(5)]
+    first = VectorIndex(tmp_path / "first")
+    lagging = VectorIndex(tmp_path / "lagging")
+    first.search([1.0, 0.0])
+    lagging.search([1.0, 0.0])
+
+    for chunk_id in chunks[:3]:
+        execute("DELETE FROM chunks WHERE id = ?", (chunk_id,))
+    assert len(first.search([1.0, 0.0], top_k=10)) == 2
+    # only the watermark row survives, so the log cannot grow without bound
+    rows = execute("SELECT id FROM embedding_changes")
+    assert [r["id"] for r in rows] == [first.stats()["change_watermark"]]
+
+    execute("DELETE FROM chunks WHERE id = ?", (chunks[3],))
+    assert len(first.search([1.0, 0.0], top_k=10)) == 1
+    # the lagging reader missed pruned deletes: it rebuilds instead of serving them
+    assert [h["chunk_id"] for h in lagging.search([1.0, 0.0], top_k=10)] == [chunks[4]]
+
+
+def test_persists_across_instances(tmp_path):
+    n = make_note("a")
+    c1 = _chunk(n, "x", [0.6, 0.8])
+    first = VectorIndex(tmp_path / "vecindex")
+    first.search([0.6, 0.8])
+
+    second = VectorIndex(tmp_path / "vecindex")
+    stats = second.stats()
+    assert stats["rows"] == 1
+    assert stats["embedding_watermark"] == first.stats()["embedding_watermark"]
+    assert second.search([0.6, 0.8])[0]["chunk_id"] == c1
+
+
+def test_rebuilds_when_database_is_behind(tmp_path):
+    n = make_note("a")
+    _chunk(n, "x", [1.0, 0.0])
+    VectorIndex(tmp_path / "vecindex").search([1.0, 0.0])
+
+    meta_path = tmp_path / "vecindex" / "meta.json"
+    meta = json.loads(meta_path.read_text())
+    meta["embedding_watermark"] += 1000  # simulate a recreated database
+    meta_path.write_text(json.dumps(meta))
+
+    reopened = VectorIndex(tmp_path / "vecindex")
+    assert len(reopened.search([1.0, 0.0], top_k=10)) == 1
+
+
+def test_semantic_search_uses_index(monkeypatch, tmp_path):
+    import knowledge.search as search
+    import knowledge.vector_index as vi
+
+    monkeypatch.setattr(vi, "_index", VectorIndex(tmp_path / "vecindex"))
+    monkeypatch.setattr(search, "embed_text", lambda text, task_type="RETRIEVAL_QUERY": [0.0, 1.0])
+    monkeypatch.setattr(search, "all_chunk_embeddings", lambda: pytest.fail("index must avoid the JSON scan"))
+
+    public = make_note("public")
+    private = make_note("private", user_id="someone-else")
+    _chunk(public, "public chunk", [0.1, 1.0])
+    _chunk(private, "private chunk", [0.0, 1.0])
+
+    hits = search.semantic_search("anything", top_k=5)
+    assert [h["content"] for h in hits] == ["public chunk"]
+    assert hits[0]["title"] == "public"